@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Script para criar os sentinelas de email (``EMAIL#<email>``) dos usuários antigos.
+Script to create the email sentinels (``EMAIL#<email>``) of legacy users.
+
+A busca por email lê o sentinela em O(1). Usuários gravados antes dele só
+são encontrados pelo ``email-index``; depois deste backfill, a aplicação
+pode rodar com ``USER_EMAIL_INDEX_FALLBACK=false``. O script é idempotente.
+
+Uso/Usage:
+    python backfill_email_sentinels.py [--page-size <N>]
+
+Exemplo/Example:
+    python backfill_email_sentinels.py --page-size 500
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from infraestructure.repositoryes.user.repository import UserRepository  # noqa: E402
+
+
+def backfill(page_size: int) -> int:
+    """Cria os sentinelas que faltam e retorna o número de conflitos"""
+    repository = UserRepository()
+    processed = conflicts = 0
+    last_key = None
+    while True:
+        page = repository.list_users_paginated(page_size, last_key)
+        for user in page["users"]:
+            if not user.email:
+                continue
+            if not repository.backfill_email_sentinel(user.user_id, user.email):
+                conflicts += 1
+                print(
+                    f"⚠️  {user.email} já pertence a outro usuário "
+                    f"(ignorado: {user.user_id})",
+                    file=sys.stderr,
+                )
+            processed += 1
+        print(f"⏳ {processed} usuários processados", file=sys.stderr)
+        last_key = page["last_evaluated_key"]
+        if not last_key:
+            break
+
+    print(
+        f"✅ {processed} usuários processados, {conflicts} conflitos", file=sys.stderr
+    )
+    return conflicts
+
+
+def main():
+    """Função principal do script"""
+    parser = argparse.ArgumentParser(
+        description="Cria os sentinelas de email dos usuários antigos"
+    )
+    parser.add_argument(
+        "--page-size", type=int, default=500, help="Usuários lidos por página"
+    )
+    args = parser.parse_args()
+
+    sys.exit(1 if backfill(args.page_size) else 0)
+
+
+if __name__ == "__main__":
+    main()
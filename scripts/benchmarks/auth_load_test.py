@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Teste de carga de login contra um Cognito simulado.
+Login load test against a local Cognito stand-in.
+
+Dispara uma rajada de logins enquanto um "stream" emite um chunk a cada
+``--stream-interval-ms`` no mesmo event loop, e mede o atraso do loop
+(heartbeat) e o maior intervalo entre chunks. Compara dois modos:
+
+- ``inline``: ``AuthRepository.login`` chamado direto no event loop (boto3
+  bloqueante, como em uma rota ``async`` que chama o repositório síncrono);
+- ``executor``: ``AsyncAuthRepository`` sobre o bulkhead ``cognito`` (pool
+  dedicado, fila limitada e timeout).
+
+Uso/Usage:
+    python auth_load_test.py [--logins 200] [--concurrency 50] [--latency-ms 120]
+
+Exemplo/Example:
+    python auth_load_test.py --logins 500 --concurrency 100 --workers 8 --queue 32
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from core.exceptions import ServiceUnavailableException, TimeoutException  # noqa: E402
+from infraestructure.bulkhead import COGNITO, Bulkhead  # noqa: E402
+from infraestructure.repositoryes.auth.async_repository import (  # noqa: E402
+    AsyncAuthRepository,
+)
+from infraestructure.repositoryes.auth.repository import AuthRepository  # noqa: E402
+from infraestructure.telemetry.metrics import MetricsRegistry  # noqa: E402
+
+
+class FakeCognito:
+    """Cliente cognito-idp mínimo com latência de rede simulada"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def initiate_auth(self, **kwargs: Any) -> Dict[str, Any]:
+        self.calls += 1
+        time.sleep(self.latency)
+        return {
+            "AuthenticationResult": {
+                "AccessToken": f"access-{self.calls}",
+                "RefreshToken": "refresh",
+                "IdToken": "id",
+                "TokenType": "Bearer",
+                "ExpiresIn": 3600,
+            }
+        }
+
+
+async def heartbeat(interval: float, lags: List[float], stop: asyncio.Event) -> None:
+    """Mede quanto o loop atrasa para acordar uma tarefa periódica"""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(time.perf_counter() - expected, 0.0) * 1000)
+
+
+async def login_storm(
+    mode: str,
+    repository: AuthRepository,
+    async_repository: AsyncAuthRepository,
+    logins: int,
+    concurrency: int,
+) -> Dict[str, int]:
+    outcome = {"ok": 0, "rejected": 0, "timeouts": 0}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            try:
+                if mode == "inline":
+                    repository.login(f"user{i}@example.com", "Password123!")
+                else:
+                    await async_repository.login(f"user{i}@example.com", "Password123!")
+                outcome["ok"] += 1
+            except ServiceUnavailableException:
+                outcome["rejected"] += 1
+            except TimeoutException:
+                outcome["timeouts"] += 1
+
+    await asyncio.gather(*(one(i) for i in range(logins)))
+    return outcome
+
+
+async def run_mode(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    repository = AuthRepository(verifier=None, cognito=FakeCognito(args.latency_ms / 1000))
+    bulkhead = Bulkhead(
+        COGNITO, args.workers, args.queue, args.timeout, metrics=MetricsRegistry()
+    )
+    async_repository = AsyncAuthRepository(repository, bulkhead)
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(args.stream_interval_ms / 1000, lags, stop))
+    await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    outcome = await login_storm(
+        mode, repository, async_repository, args.logins, args.concurrency
+    )
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await monitor
+    bulkhead.shutdown()
+
+    lag = np.array(lags or [0.0])
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "logins_per_second": outcome["ok"] / elapsed if elapsed else 0.0,
+        "p50": float(np.percentile(lag, 50)),
+        "p95": float(np.percentile(lag, 95)),
+        "max": float(lag.max()),
+        **outcome,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=120.0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--queue", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--stream-interval-ms", type=float, default=10.0)
+    parser.add_argument("--modes", default="inline,executor")
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':<10}{'seconds':>9}{'logins/s':>10}{'ok':>6}{'503':>6}{'504':>6}"
+        f"{'lag p50':>10}{'lag p95':>10}{'lag max':>10}"
+    )
+    for mode in args.modes.split(","):
+        result = asyncio.run(run_mode(mode.strip(), args))
+        print(
+            f"{result['mode']:<10}{result['seconds']:>9.2f}"
+            f"{result['logins_per_second']:>10.1f}{result['ok']:>6}"
+            f"{result['rejected']:>6}{result['timeouts']:>6}"
+            f"{result['p50']:>8.1f}ms{result['p95']:>8.1f}ms{result['max']:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Custo de construção de clientes AWS: frio vs quente.
+AWS client construction cost: cold vs warm.
+
+``cold`` limpa o cache do ``AWSClientFactory`` antes de cada chamada, o que
+reproduz o comportamento antigo (uma ``boto3.Session`` e um cliente novos,
+com pool de conexões vazio, a cada ``dynamo()``/``cognito()``). ``warm``
+reutiliza o cliente em cache. Nenhuma chamada de rede é feita: credenciais
+fictícias são usadas quando não há credenciais configuradas.
+
+Uso/Usage:
+    python aws_client_factory_benchmark.py [--iterations 50] [--region us-east-1]
+
+Exemplo/Example:
+    python aws_client_factory_benchmark.py --iterations 200 --services dynamo,cognito
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from configs.load_env import settings  # noqa: E402
+from infraestructure.client_factory.aws import AWSClientFactory  # noqa: E402
+
+SERVICES: Dict[str, Callable[[AWSClientFactory], object]] = {
+    "dynamo": lambda factory: factory.dynamo(),
+    "dynamo_table": lambda factory: factory.dynamo_table("benchmark"),
+    "s3": lambda factory: factory.s3(),
+    "cognito": lambda factory: factory.cognito(),
+}
+
+
+def measure(
+    build: Callable[[AWSClientFactory], object], region: str, iterations: int, cold: bool
+) -> List[float]:
+    AWSClientFactory.clear()
+    build(AWSClientFactory(region_name=region))  # aquece imports e modelos
+
+    timings: List[float] = []
+    for _ in range(iterations):
+        if cold:
+            AWSClientFactory.clear()
+        started = time.perf_counter()
+        build(AWSClientFactory(region_name=region))
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--region", default=settings.region_name or "us-east-1")
+    parser.add_argument("--services", default=",".join(SERVICES))
+    args = parser.parse_args()
+
+    if not settings.aws_access_key_id:
+        settings.aws_access_key_id = "benchmark"
+        settings.aws_secret_access_key = "benchmark"
+
+    print(f"{'service':<14}{'mode':<6}{'p50':>10}{'p95':>10}{'max':>10}{'speedup':>10}")
+    for service in args.services.split(","):
+        build = SERVICES[service.strip()]
+        cold = np.array(measure(build, args.region, args.iterations, cold=True))
+        warm = np.array(measure(build, args.region, args.iterations, cold=False))
+        speedup = np.median(cold) / max(np.median(warm), 1e-6)
+        for mode, timings in (("cold", cold), ("warm", warm)):
+            print(
+                f"{service:<14}{mode:<6}"
+                f"{np.percentile(timings, 50):>8.3f}ms{np.percentile(timings, 95):>8.3f}ms"
+                f"{timings.max():>8.3f}ms"
+                + (f"{speedup:>9.0f}x" if mode == "warm" else "")
+            )
+
+
+if __name__ == "__main__":
+    main()
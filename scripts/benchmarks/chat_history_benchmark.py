@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Latência da leitura paginada do histórico de um chat grande.
+Paginated history read latency for a large chat.
+
+Cria um chat descartável com ``--messages`` mensagens e mede:
+
+- ``relationship``: carregar o ``ChatModel`` com ``messages`` inteiro (o que
+  uma leitura ingênua do histórico faria);
+- ``keyset first`` / ``keyset deep``: ``PostgresChatRepository.get_messages``
+  na primeira página e numa página ``--depth`` páginas atrás da mais recente;
+- ``offset deep``: a mesma página profunda via ``OFFSET``, para comparação.
+
+Precisa de um Postgres acessível pelas settings ``db_*`` com as tabelas de
+chat migradas. O chat é apagado ao final (a menos que ``--keep``).
+
+Uso/Usage:
+    python chat_history_benchmark.py [--messages 100000] [--limit 50]
+
+Exemplo/Example:
+    python chat_history_benchmark.py --messages 100000 --depth 1000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import selectinload
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from configs.load_env import settings  # noqa: E402
+from infraestructure.database.models import ChatMessageModel, ChatModel  # noqa: E402
+from infraestructure.repositoryes.chat.postgres_chat_repository import (  # noqa: E402
+    PostgresChatRepository,
+    encode_keyset_cursor,
+)
+from infraestructure.resources import get_resources  # noqa: E402
+
+INSERT_BATCH_SIZE = 5_000
+BENCHMARK_USER = "chat-history-benchmark"
+
+
+async def seed_chat(session_factory: Any, messages: int) -> str:
+    """Cria o chat e as mensagens em lotes; retorna o ``chat_id``"""
+    chat_id = str(uuid4())
+    started_at = datetime.utcnow() - timedelta(seconds=messages)
+    async with session_factory() as session:
+        session.add(ChatModel(chat_id=chat_id, user_id=BENCHMARK_USER))
+        await session.flush()
+        for start in range(0, messages, INSERT_BATCH_SIZE):
+            batch = [
+                {
+                    "message_id": str(uuid4()),
+                    "chat_id": chat_id,
+                    "user_id": BENCHMARK_USER,
+                    "content": f"message {index}",
+                    "timestamp": started_at + timedelta(seconds=index),
+                }
+                for index in range(start, min(start + INSERT_BATCH_SIZE, messages))
+            ]
+            await session.execute(insert(ChatMessageModel), batch)
+            print(f"⏳ {start + len(batch)}/{messages} mensagens", file=sys.stderr)
+        await session.execute(
+            update(ChatModel)
+            .where(ChatModel.chat_id == chat_id)
+            .values(
+                message_count=messages,
+                last_message_at=started_at + timedelta(seconds=messages - 1),
+            )
+        )
+        await session.commit()
+    return chat_id
+
+
+async def drop_chat(session_factory: Any, chat_id: str) -> None:
+    async with session_factory() as session:
+        await session.execute(
+            delete(ChatMessageModel).where(ChatMessageModel.chat_id == chat_id)
+        )
+        await session.execute(delete(ChatModel).where(ChatModel.chat_id == chat_id))
+        await session.commit()
+
+
+async def measure(
+    operation: Callable[[], Awaitable[Any]], repeat: int
+) -> Dict[str, float]:
+    """Latências em ms de ``repeat`` execuções (uma de aquecimento antes)"""
+    await operation()
+    latencies: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await operation()
+        latencies.append((time.perf_counter() - started) * 1000)
+    lat = np.array(latencies)
+    return {"p50": float(np.percentile(lat, 50)), "p99": float(np.percentile(lat, 99))}
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    resources = get_resources()
+    session_factory = resources.async_session_factory
+    repository = PostgresChatRepository(session_factory=session_factory)
+    chat_id = await seed_chat(session_factory, args.messages)
+    offset = max(1, min(args.depth * args.limit, args.messages - args.limit))
+
+    try:
+        # Chave da última mensagem da página anterior à página profunda
+        async with session_factory() as session:
+            anchor = (
+                await session.execute(
+                    select(ChatMessageModel.timestamp, ChatMessageModel.message_id)
+                    .where(ChatMessageModel.chat_id == chat_id)
+                    .order_by(
+                        ChatMessageModel.timestamp.desc(),
+                        ChatMessageModel.message_id.desc(),
+                    )
+                    .offset(offset - 1)
+                    .limit(1)
+                )
+            ).one()
+        deep_cursor = encode_keyset_cursor(anchor.timestamp, anchor.message_id)
+
+        async def relationship() -> None:
+            async with session_factory() as session:
+                chat = (
+                    await session.execute(
+                        select(ChatModel)
+                        .options(selectinload(ChatModel.messages))
+                        .where(ChatModel.chat_id == chat_id)
+                    )
+                ).scalar_one()
+                assert len(chat.messages) == args.messages
+
+        async def offset_deep() -> None:
+            async with session_factory() as session:
+                await session.execute(
+                    select(
+                        ChatMessageModel.message_id,
+                        ChatMessageModel.user_id,
+                        ChatMessageModel.content,
+                        ChatMessageModel.timestamp,
+                    )
+                    .where(ChatMessageModel.chat_id == chat_id)
+                    .order_by(
+                        ChatMessageModel.timestamp.desc(),
+                        ChatMessageModel.message_id.desc(),
+                    )
+                    .offset(offset)
+                    .limit(args.limit)
+                )
+
+        operations = [
+            ("relationship", relationship, max(1, args.repeat // 10)),
+            (
+                "keyset first",
+                lambda: repository.get_messages(chat_id, limit=args.limit),
+                args.repeat,
+            ),
+            (
+                "keyset deep",
+                lambda: repository.get_messages(
+                    chat_id, before=deep_cursor, limit=args.limit
+                ),
+                args.repeat,
+            ),
+            ("offset deep", offset_deep, args.repeat),
+        ]
+        results = []
+        for name, operation, repeat in operations:
+            results.append({"name": name, **await measure(operation, repeat)})
+        return results
+    finally:
+        if not args.keep:
+            await drop_chat(session_factory, chat_id)
+        await resources.shutdown()
+
+
+def main():
+    """Função principal do script"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=1000,
+        help="Páginas entre a mais recente e a página profunda",
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--keep", action="store_true", help="Não apaga o chat de benchmark"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"Postgres at {settings.db_host}:{settings.db_port}, "
+        f"{args.messages} messages, page {args.limit}, depth {args.depth}"
+    )
+    results = asyncio.run(run(args))
+    print(f"{'read':<14}{'p50':>12}{'p99':>12}")
+    for result in results:
+        print(f"{result['name']:<14}{result['p50']:>10.2f}ms{result['p99']:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
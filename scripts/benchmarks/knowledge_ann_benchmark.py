@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Benchmark de recall@k e latência da busca híbrida da base de conhecimento.
+Recall@k and latency benchmark for the knowledge base hybrid search.
+
+Cria uma tabela descartável com vetores e textos sintéticos, mede a busca
+híbrida exata (pontuação sobre a tabela inteira, como no agno) como ground
+truth e compara com a consulta de produção (``hybrid_search_sql``: candidatos
+do índice ANN unidos aos do índice GIN e repontuados) para cada valor de
+``ef_search`` (HNSW) ou ``probes`` (IVFFlat).
+
+Cada layout (full, binary, half) é medido sobre os mesmos vetores: a coluna
+é convertida para ``layout.column_type`` e o índice usa a expressão e o
+operator class do layout, como o ``KnowledgeIndexManager``.
+
+Uso/Usage:
+    python knowledge_ann_benchmark.py [--rows 10000,100000,1000000] [--index-type hnsw]
+
+Exemplo/Example:
+    python knowledge_ann_benchmark.py --rows 10000,100000 --dimensions 1536
+    python knowledge_ann_benchmark.py --index-type ivfflat --probes 1,10,40
+    python knowledge_ann_benchmark.py --layouts full,half,binary --rescore-factor 4
+"""
+
+import argparse
+import io
+import re
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import psycopg2
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from infraestructure.database.config import get_database_url  # noqa: E402
+from infraestructure.knowledge.vector_store import (  # noqa: E402
+    KNOWLEDGE_CONTENT_LANGUAGE,
+    VectorLayout,
+    hybrid_score_expression,
+    hybrid_search_sql,
+)
+
+BENCHMARK_TABLE = "ai.knowledge_ann_benchmark"
+COPY_BATCH_SIZE = 20_000
+
+
+def synthetic_vectors(
+    rng: np.random.Generator, count: int, centroids: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gera vetores normalizados agrupados em torno de centróides (mais realista
+    que ruído uniforme, onde todas as distâncias ficam praticamente iguais).
+    Retorna também o centróide de cada vetor, usado como tópico do texto.
+    """
+    labels = rng.integers(0, len(centroids), size=count)
+    noise = rng.normal(scale=0.35, size=(count, centroids.shape[1]))
+    vectors = centroids[labels] + noise
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32), labels
+
+
+def copy_binary_payload(vectors: np.ndarray, labels: np.ndarray) -> io.BytesIO:
+    """
+    Serializa tópicos e vetores no formato COPY BINARY do Postgres/pgvector.
+    Serializes topics and vectors in Postgres/pgvector COPY BINARY format.
+    """
+    count, dimensions = vectors.shape
+    rows = np.empty(
+        count,
+        dtype=[
+            ("fields", ">i2"),
+            ("topic_length", ">i4"),
+            ("topic", ">i4"),
+            ("length", ">i4"),
+            ("dim", ">i2"),
+            ("unused", ">i2"),
+            ("values", ">f4", (dimensions,)),
+        ],
+    )
+    rows["fields"] = 2
+    rows["topic_length"] = 4
+    rows["topic"] = labels
+    rows["length"] = 4 + 4 * dimensions
+    rows["dim"] = dimensions
+    rows["unused"] = 0
+    rows["values"] = vectors
+
+    buffer = io.BytesIO()
+    buffer.write(b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0))
+    buffer.write(rows.tobytes())
+    buffer.write(struct.pack(">h", -1))
+    buffer.seek(0)
+    return buffer
+
+
+def vector_literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{value:.7f}" for value in vector) + "]"
+
+
+def load_table(connection, rng, rows: int, dimensions: int, centroids) -> None:
+    """Cria e popula a tabela de benchmark, com o índice GIN do texto"""
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {BENCHMARK_TABLE}")
+        cursor.execute(
+            f"CREATE TABLE {BENCHMARK_TABLE} (id bigserial PRIMARY KEY, "
+            f"topic integer, content text, embedding vector({dimensions}))"
+        )
+        loaded = 0
+        while loaded < rows:
+            batch = min(COPY_BATCH_SIZE, rows - loaded)
+            payload = copy_binary_payload(*synthetic_vectors(rng, batch, centroids))
+            cursor.copy_expert(
+                f"COPY {BENCHMARK_TABLE} (topic, embedding) "
+                f"FROM STDIN WITH (FORMAT binary)",
+                payload,
+            )
+            loaded += batch
+        # Texto ligado ao centróide, para o termo da consulta ser seletivo
+        cursor.execute(
+            f"UPDATE {BENCHMARK_TABLE} SET content = "
+            f"format('topic%s section%s chunk', topic, id % 97)"
+        )
+        cursor.execute(
+            f"CREATE INDEX knowledge_ann_benchmark_content_index ON {BENCHMARK_TABLE} "
+            f"USING gin (to_tsvector('{KNOWLEDGE_CONTENT_LANGUAGE}', content))"
+        )
+        cursor.execute(f"ANALYZE {BENCHMARK_TABLE}")
+    connection.commit()
+
+
+def convert_column(connection, layout: VectorLayout) -> None:
+    """Converte a coluna para o tipo do layout (vector ou halfvec)"""
+    with connection.cursor() as cursor:
+        cursor.execute("DROP INDEX IF EXISTS ai.knowledge_ann_benchmark_index")
+        cursor.execute(
+            f"ALTER TABLE {BENCHMARK_TABLE} ALTER COLUMN embedding "
+            f"TYPE {layout.column_type} USING embedding::{layout.column_type}"
+        )
+        cursor.execute(f"ANALYZE {BENCHMARK_TABLE}")
+    connection.commit()
+
+
+def build_index(connection, index_type: str, rows: int, layout: VectorLayout) -> tuple:
+    """Constrói o índice ANN e retorna (segundos de build, tamanho em bytes)"""
+    key = f"{layout.index_expression} {layout.operator_class}"
+    if index_type == "hnsw":
+        options = f"USING hnsw ({key}) WITH (m = 16, ef_construction = 200)"
+    else:
+        lists = max(rows // 1000, 10) if rows <= 1_000_000 else int(np.sqrt(rows))
+        options = f"USING ivfflat ({key}) WITH (lists = {lists})"
+
+    with connection.cursor() as cursor:
+        cursor.execute("DROP INDEX IF EXISTS ai.knowledge_ann_benchmark_index")
+        cursor.execute("SET maintenance_work_mem = '2GB'")
+        started = time.perf_counter()
+        cursor.execute(
+            f"CREATE INDEX knowledge_ann_benchmark_index ON {BENCHMARK_TABLE} {options}"
+        )
+        elapsed = time.perf_counter() - started
+        cursor.execute(
+            "SELECT pg_relation_size('ai.knowledge_ann_benchmark_index'::regclass)"
+        )
+        size_bytes = cursor.fetchone()[0]
+    connection.commit()
+    return elapsed, size_bytes
+
+
+def psycopg2_sql(sql: str) -> str:
+    """Troca os parâmetros ``:nome`` do SQLAlchemy por ``%(nome)s``"""
+    return re.sub(r"(?<!:):(\w+)", r"%(\1)s", sql.replace("%", "%%"))
+
+
+def exact_sql(layout: VectorLayout) -> str:
+    """Pontuação híbrida sobre a tabela inteira (busca original do agno)"""
+    score = hybrid_score_expression(layout.distance_expression())
+    return psycopg2_sql(
+        f"SELECT id FROM {BENCHMARK_TABLE} ORDER BY {score} DESC LIMIT :limit"
+    )
+
+
+def query_sql(layout: VectorLayout) -> str:
+    """A mesma consulta de candidatos + repontuação usada em produção"""
+    return psycopg2_sql(hybrid_search_sql(BENCHMARK_TABLE, layout, filters=False))
+
+
+def run_queries(
+    connection,
+    queries: Sequence[Tuple[str, str]],
+    params: Dict[str, int],
+    settings: Dict[str, str],
+    sql: str,
+) -> tuple:
+    """Executa as consultas e retorna (ids por consulta, latências em ms)"""
+    results: List[List[int]] = []
+    latencies: List[float] = []
+    with connection.cursor() as cursor:
+        for name, value in settings.items():
+            cursor.execute(f"SET {name} = {value}")
+        for embedding, text in queries:
+            started = time.perf_counter()
+            cursor.execute(sql, {"embedding": embedding, "query": text, **params})
+            ids = [row[0] for row in cursor.fetchall()]
+            latencies.append((time.perf_counter() - started) * 1000)
+            results.append(ids)
+        cursor.execute("RESET ALL")
+    connection.commit()
+    return results, latencies
+
+
+def recall_at_k(exact: List[List[int]], approximate: List[List[int]], k: int) -> float:
+    hits = sum(len(set(e) & set(a)) for e, a in zip(exact, approximate))
+    return hits / (k * len(exact))
+
+
+def main():
+    """Função principal do script"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark de recall@k e latência dos índices ANN (pgvector)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--rows", default="10000,100000,1000000")
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--index-type", choices=["hnsw", "ivfflat"], default="hnsw")
+    parser.add_argument("--ef-search", default="10,40,100,200")
+    parser.add_argument("--probes", default="1,10,20,40")
+    parser.add_argument("--layouts", default="full,half,binary")
+    parser.add_argument("--candidate-factor", type=int, default=4)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="Mantém a tabela no final")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    centroids = rng.normal(size=(256, args.dimensions))
+    if args.index_type == "hnsw":
+        knob, values = "hnsw.ef_search", args.ef_search.split(",")
+    else:
+        knob, values = "ivfflat.probes", args.probes.split(",")
+
+    connection = psycopg2.connect(get_database_url())
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            cursor.execute("CREATE SCHEMA IF NOT EXISTS ai")
+        connection.commit()
+
+        print(
+            f"{'rows':>9} {'layout':>7} {knob:>15} {'recall@' + str(args.k):>10} "
+            f"{'p50 ms':>8} {'p95 ms':>8}"
+        )
+        # half por último: a conversão para halfvec perde precisão
+        layouts = sorted(args.layouts.split(","), key=lambda name: name == "half")
+        for rows in (int(value) for value in args.rows.split(",")):
+            load_table(connection, rng, rows, args.dimensions, centroids)
+            vectors, labels = synthetic_vectors(rng, args.queries, centroids)
+            queries = [
+                (vector_literal(vector), f"topic{label}")
+                for vector, label in zip(vectors, labels)
+            ]
+
+            full = VectorLayout(precision="full", dimensions=args.dimensions)
+            exact, exact_latencies = run_queries(
+                connection, queries, {"limit": args.k}, {}, exact_sql(full)
+            )
+            print(
+                f"{rows:>9} {'full':>7} {'exact':>15} {1.0:>10.3f} "
+                f"{np.percentile(exact_latencies, 50):>8.2f} "
+                f"{np.percentile(exact_latencies, 95):>8.2f}"
+            )
+
+            for name in layouts:
+                layout = VectorLayout(precision=name, dimensions=args.dimensions)
+                convert_column(connection, layout)
+                build_seconds, size_bytes = build_index(
+                    connection, args.index_type, rows, layout
+                )
+                print(
+                    f"{rows:>9} {name:>7} {'build':>15} "
+                    f"{build_seconds:>9.1f}s {size_bytes / (1024 * 1024):>8.1f} MB"
+                )
+                sql = query_sql(layout)
+                factor = (
+                    args.rescore_factor if layout.rescored else args.candidate_factor
+                )
+                params = {"limit": args.k, "candidates": args.k * factor}
+
+                for value in values:
+                    knob_value = value
+                    if args.index_type == "hnsw":
+                        # O HNSW devolve no máximo ef_search candidatos
+                        knob_value = str(max(int(value), params["candidates"]))
+                    approximate, latencies = run_queries(
+                        connection, queries, params, {knob: knob_value}, sql
+                    )
+                    print(
+                        f"{rows:>9} {name:>7} {knob_value:>15} "
+                        f"{recall_at_k(exact, approximate, args.k):>10.3f} "
+                        f"{np.percentile(latencies, 50):>8.2f} "
+                        f"{np.percentile(latencies, 95):>8.2f}"
+                    )
+
+        if not args.keep:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {BENCHMARK_TABLE}")
+            connection.commit()
+    except KeyboardInterrupt:
+        print("\n\n❌ Benchmark interrompido pelo usuário.")
+        sys.exit(1)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Vazão do Postgres assíncrono por tamanho de pool.
+Async Postgres throughput per pool size.
+
+Dispara ``--requests`` consultas ``SELECT pg_sleep(...)`` com
+``--concurrency`` tarefas simultâneas, cada uma numa ``AsyncSession`` nova
+(como o ``PostgresChatRepository``), para cada tamanho em ``--pool-sizes``.
+O modo ``static`` reproduz o antigo ``StaticPool`` (uma conexão por worker)
+como referência. Precisa de um Postgres acessível pelas settings ``db_*``.
+
+Uso/Usage:
+    python postgres_pool_benchmark.py [--requests 500] [--concurrency 50]
+
+Exemplo/Example:
+    python postgres_pool_benchmark.py --pool-sizes static,1,5,10,20 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from configs.load_env import settings  # noqa: E402
+from infraestructure.database.config import DatabaseConfig  # noqa: E402
+from infraestructure.telemetry.metrics import get_metrics_registry  # noqa: E402
+
+
+def build_engine(mode: str) -> Any:
+    config = DatabaseConfig()
+    if mode == "static":
+        return create_async_engine(
+            config._get_async_database_url(), poolclass=StaticPool
+        )
+    settings.db_pool_size = int(mode)
+    settings.db_max_overflow = 0
+    return config.get_async_engine()
+
+
+async def run_mode(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    engine = build_engine(mode)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    metrics = get_metrics_registry()
+    metrics.reset()
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    query = text("SELECT pg_sleep(:seconds)")
+    seconds = args.latency_ms / 1000
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            async with session_factory() as session:
+                await session.execute(query, {"seconds": seconds})
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    # Abre a primeira conexão fora da medição
+    async with session_factory() as session:
+        await session.execute(text("SELECT 1"))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    lat = np.array(latencies)
+    wait = metrics.snapshot()["summaries"].get("db_pool.checkout_wait_ms", {})
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "rps": args.requests / elapsed,
+        "p50": float(np.percentile(lat, 50)),
+        "p99": float(np.percentile(lat, 99)),
+        "wait": wait.get("avg", 0.0),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--pool-sizes", default="static,1,5,10,20")
+    args = parser.parse_args()
+
+    print(
+        f"Postgres at {settings.db_host}:{settings.db_port}, query {args.latency_ms:.0f}ms"
+    )
+    print(f"{'pool':<8}{'seconds':>9}{'req/s':>10}{'p50':>10}{'p99':>10}{'wait':>10}")
+    for mode in args.pool_sizes.split(","):
+        result = asyncio.run(run_mode(mode.strip(), args))
+        print(
+            f"{result['mode']:<8}{result['seconds']:>9.2f}{result['rps']:>10.1f}"
+            f"{result['p50']:>8.1f}ms{result['p99']:>8.1f}ms{result['wait']:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
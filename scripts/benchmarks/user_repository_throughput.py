@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Vazão do repositório de usuários: bulkhead (boto3) vs cliente async.
+User repository throughput: bulkhead (boto3) vs async client.
+
+Sobe um stand-in local do DynamoDB (aiohttp, em outra thread) que responde
+``GetItem`` com latência simulada e dispara ``--requests`` leituras com
+``--concurrency`` tarefas simultâneas por dois caminhos:
+
+- ``bulkhead``: ``UserRepository.get_user`` (boto3 síncrono) no bulkhead
+  ``dynamodb`` com ``--workers`` threads;
+- ``async``: ``AsyncUserRepository.get_user`` sobre o aiobotocore, limitado
+  apenas pelo pool de conexões (``aws_max_pool_connections``).
+
+Uso/Usage:
+    python user_repository_throughput.py [--requests 2000] [--concurrency 200]
+
+Exemplo/Example:
+    python user_repository_throughput.py --latency-ms 20 --workers 16 --pool 100
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from configs.load_env import settings  # noqa: E402
+from core.exceptions import ServiceUnavailableException  # noqa: E402
+from infraestructure.bulkhead import DYNAMODB, Bulkhead  # noqa: E402
+from infraestructure.client_factory.aws import (  # noqa: E402
+    AsyncAWSClientFactory,
+    AWSClientFactory,
+)
+from infraestructure.repositoryes.user.async_repository import (  # noqa: E402
+    AsyncUserRepository,
+)
+from infraestructure.repositoryes.user.repository import UserRepository  # noqa: E402
+from infraestructure.telemetry.metrics import MetricsRegistry  # noqa: E402
+
+USER_COUNT = 100
+
+
+class DynamoStandIn:
+    """Servidor DynamoDB mínimo: GetItem sobre um dict em memória"""
+
+    def __init__(self, latency: float, users: int = USER_COUNT):
+        self.latency = latency
+        self.items = {
+            f"user-{i}": {
+                "userId": {"S": f"user-{i}"},
+                "email": {"S": f"user{i}@example.com"},
+                "isActive": {"BOOL": True},
+            }
+            for i in range(users)
+        }
+        self.port = 0
+        self._ready = threading.Event()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        target = request.headers.get("X-Amz-Target", "").split(".")[-1]
+        body = json.loads(await request.read())
+        await asyncio.sleep(self.latency)
+        if target == "GetItem":
+            item = self.items.get(body["Key"]["userId"]["S"])
+            payload: Dict[str, Any] = {"Item": item} if item else {}
+        else:
+            return web.json_response(
+                {"__type": "UnknownOperationException"}, status=400
+            )
+        return web.Response(
+            body=json.dumps(payload), content_type="application/x-amz-json-1.0"
+        )
+
+    def start(self) -> str:
+        threading.Thread(target=self._serve, daemon=True).start()
+        self._ready.wait()
+        return f"http://127.0.0.1:{self.port}"
+
+    def _serve(self) -> None:
+        loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_post("/", self.handle)
+        runner = web.AppRunner(app, access_log=None)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0, backlog=4096)
+        loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        loop.run_forever()
+
+
+async def run_mode(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    latencies: List[float] = []
+    rejected = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    if mode == "bulkhead":
+        repository = UserRepository()
+        bulkhead = Bulkhead(
+            DYNAMODB, args.workers, args.requests, 60.0, metrics=MetricsRegistry()
+        )
+
+        async def get(user_id: str) -> Any:
+            return await bulkhead.run(repository.get_user, user_id)
+
+    else:
+        async_repository = AsyncUserRepository()
+        await async_repository.get_user("user-0")  # cria o cliente fora da medição
+
+        async def get(user_id: str) -> Any:
+            return await async_repository.get_user(user_id)
+
+    async def one(i: int) -> None:
+        nonlocal rejected
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await get(f"user-{i % USER_COUNT}")
+            except ServiceUnavailableException:
+                rejected += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    if mode == "bulkhead":
+        bulkhead.shutdown()
+    else:
+        await AsyncAWSClientFactory.close()
+
+    lat = np.array(latencies)
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "rps": args.requests / elapsed,
+        "p50": float(np.percentile(lat, 50)),
+        "p99": float(np.percentile(lat, 99)),
+        "rejected": rejected,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=settings.dynamodb_executor_max_workers)
+    parser.add_argument("--pool", type=int, default=settings.aws_max_pool_connections)
+    parser.add_argument("--modes", default="bulkhead,async")
+    args = parser.parse_args()
+
+    endpoint = DynamoStandIn(args.latency_ms / 1000).start()
+    settings.dynamodb_endpoint_url = endpoint
+    settings.region_name = settings.region_name or "us-east-1"
+    settings.aws_access_key_id = settings.aws_access_key_id or "benchmark"
+    settings.aws_secret_access_key = settings.aws_secret_access_key or "benchmark"
+    settings.aws_max_pool_connections = args.pool
+    AWSClientFactory.clear()
+
+    print(f"stand-in at {endpoint}, GetItem latency {args.latency_ms:.0f}ms")
+    print(f"{'mode':<10}{'seconds':>9}{'req/s':>10}{'p50':>10}{'p99':>10}{'503':>6}")
+    for mode in args.modes.split(","):
+        result = asyncio.run(run_mode(mode.strip(), args))
+        print(
+            f"{result['mode']:<10}{result['seconds']:>9.2f}{result['rps']:>10.1f}"
+            f"{result['p50']:>8.1f}ms{result['p99']:>8.1f}ms{result['rejected']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Script para exportar todos os usuários do DynamoDB como NDJSON.
+Script to export every DynamoDB user as NDJSON.
+
+Lê a tabela com um scan paralelo (um worker por segmento) e grava cada
+usuário assim que chega, sem acumular a tabela em memória.
+
+Uso/Usage:
+    python export_users.py [--output <ARQUIVO>] [--segments <N>]
+
+Exemplo/Example:
+    python export_users.py --output users.ndjson --segments 8
+    python export_users.py --segments 4 > users.ndjson
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from configs.load_env import settings  # noqa: E402
+from infraestructure.client_factory.aws import AsyncAWSClientFactory  # noqa: E402
+from infraestructure.repositoryes.user.async_repository import (  # noqa: E402
+    AsyncUserRepository,
+)
+
+PROGRESS_INTERVAL_SECONDS = 5.0
+
+
+async def export(output, segments: int) -> int:
+    """Grava os usuários em ``output`` e reporta o progresso no stderr"""
+    repository = AsyncUserRepository()
+    started = last_report = time.perf_counter()
+    exported = 0
+    try:
+        async for user in repository.export_users(segments):
+            output.write(json.dumps(user.model_dump(mode="json", by_alias=True)))
+            output.write("\n")
+            exported += 1
+
+            now = time.perf_counter()
+            if now - last_report >= PROGRESS_INTERVAL_SECONDS:
+                rate = exported / (now - started)
+                print(f"⏳ {exported} usuários ({rate:.0f}/s)", file=sys.stderr)
+                last_report = now
+    finally:
+        await AsyncAWSClientFactory.close()
+
+    elapsed = time.perf_counter() - started
+    throttled = repository.metrics.counter("user_export.throttled")
+    print(
+        f"✅ {exported} usuários exportados em {elapsed:.1f}s "
+        f"({exported / max(elapsed, 1e-6):.0f}/s, {throttled:.0f} throttles)",
+        file=sys.stderr,
+    )
+    return exported
+
+
+def main():
+    """Função principal do script"""
+    parser = argparse.ArgumentParser(
+        description="Exporta todos os usuários do DynamoDB como NDJSON"
+    )
+    parser.add_argument(
+        "--output", help="Arquivo de saída (padrão: stdout)", default=None
+    )
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=settings.user_export_segments,
+        help="Segmentos do scan paralelo",
+    )
+    args = parser.parse_args()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            asyncio.run(export(output, args.segments))
+    else:
+        asyncio.run(export(sys.stdout, args.segments))
+
+
+if __name__ == "__main__":
+    main()
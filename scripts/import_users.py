@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Script para importar usuários em massa de um arquivo CSV ou NDJSON.
+Script to bulk import users from a CSV or NDJSON file.
+
+Cada linha vira um cadastro no Cognito (concorrência e taxa limitadas) e
+os usuários são gravados no DynamoDB em lote. O progresso fica num arquivo
+de checkpoint: rodar o mesmo comando de novo retoma da primeira linha
+ainda não processada. As linhas com falha vão para um arquivo NDJSON.
+
+Uso/Usage:
+    python import_users.py --file <ARQUIVO> [--format csv|ndjson]
+        [--checkpoint <ARQUIVO>] [--failures <ARQUIVO>]
+
+Exemplo/Example:
+    python import_users.py --file users.csv
+    python import_users.py --file users.ndjson --failures failed.ndjson
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from typing import AsyncIterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.dtos.user.user_dtos import (  # noqa: E402
+    UserImportCheckpointDto,
+    UserImportFailureDto,
+)
+from core.usecases.user.usecases import AsyncImportUsersUseCase  # noqa: E402
+from infraestructure.bulkhead import shutdown_bulkheads  # noqa: E402
+from infraestructure.client_factory.aws import AsyncAWSClientFactory  # noqa: E402
+from infraestructure.repositoryes.auth.async_repository import (  # noqa: E402
+    AsyncAuthRepository,
+)
+from infraestructure.repositoryes.auth.repository import AuthRepository  # noqa: E402
+from infraestructure.repositoryes.user.async_repository import (  # noqa: E402
+    AsyncUserRepository,
+)
+from infraestructure.utils.user_import_reader import (  # noqa: E402
+    IMPORT_FORMATS,
+    import_format,
+    iter_lines,
+    read_import_rows,
+)
+
+READ_CHUNK_BYTES = 64 * 1024
+
+
+def load_checkpoint(path: Path) -> int:
+    """Primeira linha a processar, a partir do checkpoint (1 se não houver)"""
+    if not path.exists():
+        return 1
+    checkpoint = UserImportCheckpointDto.model_validate_json(path.read_text())
+    return checkpoint.next_row
+
+
+def save_checkpoint(path: Path, checkpoint: UserImportCheckpointDto) -> None:
+    """Grava o checkpoint de forma atômica (arquivo temporário + rename)"""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(checkpoint.model_dump_json())
+    os.replace(tmp, path)
+
+
+async def read_chunks(path: Path) -> AsyncIterator[bytes]:
+    """Lê o arquivo em blocos, sem carregá-lo inteiro"""
+    with open(path, "rb") as source:
+        while chunk := source.read(READ_CHUNK_BYTES):
+            yield chunk
+
+
+async def run_import(
+    path: Path, fmt: str, checkpoint_path: Path, failures_path: Path
+) -> UserImportCheckpointDto:
+    """Importa o arquivo, gravando checkpoints e falhas a cada lote"""
+    start_row = load_checkpoint(checkpoint_path)
+    if start_row > 1:
+        print(f"↪️  Retomando da linha {start_row}", file=sys.stderr)
+
+    use_case = AsyncImportUsersUseCase(
+        AsyncUserRepository(), AsyncAuthRepository(AuthRepository())
+    )
+    rows = read_import_rows(iter_lines(read_chunks(path)), fmt)
+    checkpoint = UserImportCheckpointDto(next_row=start_row, imported=0, failed=0)
+    try:
+        with open(failures_path, "a", encoding="utf-8") as failures:
+            async for event in use_case.execute(rows, start_row):
+                if isinstance(event, UserImportFailureDto):
+                    failures.write(json.dumps(event.model_dump()) + "\n")
+                    continue
+                failures.flush()
+                save_checkpoint(checkpoint_path, event)
+                checkpoint = event
+                print(
+                    f"⏳ linha {event.next_row}: {event.imported} importados, "
+                    f"{event.failed} falhas",
+                    file=sys.stderr,
+                )
+    finally:
+        await AsyncAWSClientFactory.close()
+        shutdown_bulkheads()
+    return checkpoint
+
+
+def main():
+    """Função principal do script"""
+    parser = argparse.ArgumentParser(
+        description="Importa usuários em massa de um arquivo CSV ou NDJSON"
+    )
+    parser.add_argument("--file", required=True, help="Arquivo de entrada")
+    parser.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        default=None,
+        help="Formato do arquivo (padrão: pela extensão)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Arquivo de checkpoint (padrão: <arquivo>.checkpoint.json)",
+    )
+    parser.add_argument(
+        "--failures",
+        default=None,
+        help="Arquivo NDJSON das linhas com falha (padrão: <arquivo>.failures.ndjson)",
+    )
+    args = parser.parse_args()
+
+    path = Path(args.file)
+    if not path.exists():
+        print(f"❌ Arquivo não encontrado: {path}", file=sys.stderr)
+        sys.exit(1)
+
+    checkpoint = asyncio.run(
+        run_import(
+            path,
+            args.format or import_format(path.name),
+            Path(args.checkpoint or f"{path}.checkpoint.json"),
+            Path(args.failures or f"{path}.failures.ndjson"),
+        )
+    )
+    print(
+        f"✅ {checkpoint.imported} usuários importados, {checkpoint.failed} falhas",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
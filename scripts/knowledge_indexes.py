@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Script para gerenciar os índices ANN e full-text da base de conhecimento.
+Script to manage the knowledge base ANN and full-text indexes.
+
+Uso/Usage:
+    python knowledge_indexes.py {create,rebuild,tenants,convert,status} [--index-type hnsw|ivfflat]
+
+Exemplo/Example:
+    python knowledge_indexes.py create
+    python knowledge_indexes.py rebuild --index-type ivfflat
+    python knowledge_indexes.py tenants --threshold 50000
+    python knowledge_indexes.py convert --precision half
+    python knowledge_indexes.py status
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from infraestructure.knowledge.index_manager import (  # noqa: E402
+    SUPPORTED_INDEX_TYPES,
+    KnowledgeIndexManager,
+)
+from infraestructure.knowledge.vector_store import (  # noqa: E402
+    SUPPORTED_PRECISIONS,
+    get_vector_layout,
+)
+
+
+def print_status(manager: KnowledgeIndexManager) -> None:
+    """Imprime os índices existentes da tabela de conhecimento"""
+    indexes = manager.index_status()
+    if not indexes:
+        print("📭 Nenhum índice encontrado.")
+        return
+
+    print(f"📊 Índices de {manager.table_fullname} (~{manager.row_count()} linhas):")
+    for index in indexes:
+        status = "✅" if index["valid"] else "❌ inválido"
+        size_mb = index["size_bytes"] / (1024 * 1024)
+        print(f"  {status} {index['name']} ({size_mb:.1f} MB)")
+        print(f"     {index['definition']}")
+
+
+def main():
+    """Função principal do script"""
+    parser = argparse.ArgumentParser(
+        description="Gerencia os índices da base de conhecimento (pgvector)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos de uso:
+  %(prog)s create
+  %(prog)s rebuild --index-type ivfflat
+  %(prog)s tenants --threshold 50000
+  %(prog)s convert --precision half
+  %(prog)s status
+
+Nota: os índices são criados com CONCURRENTLY e não bloqueiam escritas.
+        """,
+    )
+    parser.add_argument("command", choices=["create", "rebuild", "tenants", "convert", "status"])
+    parser.add_argument(
+        "--index-type",
+        choices=SUPPORTED_INDEX_TYPES,
+        default=None,
+        help="Tipo do índice vetorial (padrão: KNOWLEDGE_INDEX_TYPE)",
+    )
+    parser.add_argument(
+        "--maintenance-work-mem",
+        default="2GB",
+        help="maintenance_work_mem usado no build (padrão: 2GB)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=int,
+        default=None,
+        help="Linhas a partir das quais um tenant ganha índice parcial "
+        "(padrão: KNOWLEDGE_TENANT_INDEX_THRESHOLD)",
+    )
+    parser.add_argument(
+        "--precision",
+        choices=SUPPORTED_PRECISIONS,
+        default=None,
+        help="Layout dos embeddings (padrão: KNOWLEDGE_VECTOR_PRECISION)",
+    )
+    args = parser.parse_args()
+
+    manager = KnowledgeIndexManager(
+        index_type=args.index_type,
+        maintenance_work_mem=args.maintenance_work_mem,
+        layout=get_vector_layout(args.precision),
+    )
+
+    try:
+        if args.command == "create":
+            print(f"🔄 Criando índices ({manager.index_type})...")
+            created = manager.create_indexes()
+            if not created:
+                print("⚠️  Tabela de conhecimento ainda não existe.")
+                sys.exit(0)
+            print("✅ Índices prontos!")
+        elif args.command == "rebuild":
+            print(f"🔄 Reconstruindo índice vetorial ({manager.index_type})...")
+            manager.rebuild_vector_index()
+            print("✅ Índice reconstruído!")
+        elif args.command == "tenants":
+            print("🔄 Sincronizando índices parciais por tenant...")
+            created = manager.sync_tenant_indexes(args.threshold)
+            print(f"✅ {len(created)} índice(s) de tenant criado(s)!")
+        elif args.command == "convert":
+            print(f"🔄 Convertendo embeddings ({manager.layout.precision})...")
+            print("⚠️  A troca de tipo da coluna reescreve a tabela sob lock.")
+            column_type = manager.convert_precision()
+            print(f"✅ Embeddings em {column_type}!")
+
+        print_status(manager)
+    except KeyboardInterrupt:
+        print("\n\n❌ Operação interrompida pelo usuário.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Erro inesperado: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Script para migrar os chats do layout antigo (lista ``messages`` num item)
+para a tabela ``chat-items`` (um item por mensagem).
+Script to migrate chats from the old layout (a ``messages`` list in one item)
+to the ``chat-items`` table (one item per message).
+
+A tabela antiga é lida página a página e cada chat vira o item de
+metadados mais um item por mensagem, gravados com ``batch_writer``. As
+chaves são determinísticas, então rodar de novo não duplica nada. O
+progresso (``LastEvaluatedKey``) fica num arquivo de checkpoint para retomar.
+
+Uso/Usage:
+    python migrate_chat_items.py [--page-size <N>] [--checkpoint <ARQUIVO>]
+        [--dry-run]
+
+Exemplo/Example:
+    python migrate_chat_items.py --dry-run
+    python migrate_chat_items.py --page-size 100
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from configs.load_env import settings  # noqa: E402
+from core.entities.chat import Chat  # noqa: E402
+from infraestructure.client_factory.aws import AWSClientFactory  # noqa: E402
+from infraestructure.repositoryes.chat.chat_repository import (  # noqa: E402
+    SORT_KEY,
+    chat_items_table_name,
+    chat_layout_items,
+)
+
+
+def load_checkpoint(path: Path) -> Optional[Dict[str, Any]]:
+    """``ExclusiveStartKey`` salvo pela execução anterior (None se não houver)"""
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def save_checkpoint(path: Path, last_key: Optional[Dict[str, Any]]) -> None:
+    """Grava o checkpoint de forma atômica; remove-o ao terminar"""
+    if not last_key:
+        path.unlink(missing_ok=True)
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(last_key))
+    os.replace(tmp, path)
+
+
+def migrate(page_size: int, checkpoint_path: Path, dry_run: bool) -> int:
+    """Migra todos os chats e retorna o número de chats ignorados"""
+    factory = AWSClientFactory()
+    source = factory.dynamo_table(f"{settings.app_prefix}-{settings.environment}-chats")
+    target = factory.dynamo_table(chat_items_table_name())
+
+    last_key = load_checkpoint(checkpoint_path)
+    if last_key:
+        print(f"↪️  Retomando a partir de {last_key}", file=sys.stderr)
+
+    chats = messages = skipped = 0
+    while True:
+        scan_kwargs: Dict[str, Any] = {"Limit": page_size}
+        if last_key:
+            scan_kwargs["ExclusiveStartKey"] = last_key
+        response = source.scan(**scan_kwargs)
+
+        items = []
+        for raw in response.get("Items", []):
+            try:
+                chat = Chat.model_validate(raw)
+            except ValueError as e:
+                skipped += 1
+                print(f"⚠️  Chat ignorado {raw.get('chatId')}: {e}", file=sys.stderr)
+                continue
+            items.extend(chat_layout_items(chat))
+            chats += 1
+            messages += len(chat.messages or [])
+
+        if not dry_run:
+            with target.batch_writer(overwrite_by_pkeys=["chatId", SORT_KEY]) as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+
+        last_key = response.get("LastEvaluatedKey")
+        if not dry_run:
+            save_checkpoint(checkpoint_path, last_key)
+        print(f"⏳ {chats} chats, {messages} mensagens", file=sys.stderr)
+        if not last_key:
+            break
+
+    prefix = "🔍 [dry-run] " if dry_run else "✅ "
+    print(
+        f"{prefix}{chats} chats e {messages} mensagens migrados, {skipped} ignorados",
+        file=sys.stderr,
+    )
+    return skipped
+
+
+def main():
+    """Função principal do script"""
+    parser = argparse.ArgumentParser(
+        description="Migra os chats para o layout de um item por mensagem"
+    )
+    parser.add_argument(
+        "--page-size", type=int, default=100, help="Chats lidos por página do scan"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default="migrate_chat_items.checkpoint.json",
+        help="Arquivo de checkpoint para retomar a migração",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Só lê e conta, sem gravar"
+    )
+    args = parser.parse_args()
+
+    skipped = migrate(args.page_size, Path(args.checkpoint), args.dry_run)
+    sys.exit(1 if skipped else 0)
+
+
+if __name__ == "__main__":
+    main()
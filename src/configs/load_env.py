@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from dotenv import load_dotenv
 from pydantic import Field
@@ -15,9 +15,259 @@ class Settings(BaseSettings):
     aws_access_key_id: Optional[str] = Field(default=None)
     aws_secret_access_key: Optional[str] = Field(default=None)
     region_name: Optional[str] = Field(default=None)
+    aws_max_pool_connections: int = Field(
+        default=50,
+        title="AWS Max Pool Connections",
+        description="HTTP connections kept per boto3 client (>= bulkhead workers)",
+    )
+    aws_retry_mode: str = Field(
+        default="adaptive",
+        title="AWS Retry Mode",
+        description="botocore retry mode: legacy, standard or adaptive",
+    )
+    aws_max_attempts: int = Field(
+        default=5,
+        title="AWS Max Attempts",
+        description="Total attempts per AWS call, including the first one",
+    )
+    aws_connect_timeout_seconds: float = Field(
+        default=2.0,
+        title="AWS Connect Timeout Seconds",
+        description="Seconds to establish a connection to an AWS endpoint",
+    )
+    aws_read_timeout_seconds: float = Field(
+        default=10.0,
+        title="AWS Read Timeout Seconds",
+        description="Seconds to wait for an AWS response on an open connection",
+    )
+    aws_tcp_keepalive: bool = Field(
+        default=True,
+        title="AWS TCP Keepalive",
+        description="Enable TCP keepalive on pooled AWS connections",
+    )
+    dynamodb_endpoint_url: Optional[str] = Field(
+        default=None,
+        title="DynamoDB Endpoint URL",
+        description="Override the DynamoDB endpoint (DynamoDB Local, stand-ins)",
+    )
 
     cognito_user_pool_id: Optional[str] = Field(default=None)
     cognito_user_pool_client_id: Optional[str] = Field(default=None)
+    cognito_local_verification: bool = Field(
+        default=True,
+        title="Cognito Local Verification",
+        description="Verify access tokens locally against the pool JWKS",
+    )
+    cognito_jwks_refresh_seconds: int = Field(
+        default=3600,
+        title="Cognito JWKS Refresh Seconds",
+        description="Age after which the cached JWKS is refreshed in background",
+    )
+    cognito_jwt_leeway_seconds: int = Field(
+        default=30,
+        title="Cognito JWT Leeway Seconds",
+        description="Clock skew tolerated when checking exp and iat",
+    )
+    cognito_profile_cache_seconds: int = Field(
+        default=900,
+        title="Cognito Profile Cache Seconds",
+        description="Seconds a user profile resolved from Cognito stays cached",
+    )
+    cognito_profile_cache_max_entries: int = Field(
+        default=10000,
+        title="Cognito Profile Cache Max Entries",
+        description="Maximum number of cached Cognito profiles (LRU eviction)",
+    )
+    auth_revocation_refresh_seconds: float = Field(
+        default=5.0,
+        title="Auth Revocation Refresh Seconds",
+        description="Seconds between reloads of the shared (Postgres) token revocations",
+    )
+    auth_admin_groups: List[str] = Field(
+        default=["admin"],
+        title="Auth Admin Groups",
+        description="Cognito groups allowed to list, export and import users",
+    )
+    auth_principal_cache_ttl_seconds: int = Field(
+        default=300,
+        title="Auth Principal Cache TTL Seconds",
+        description="Upper bound for caching a resolved principal (capped by token exp)",
+    )
+    auth_principal_negative_ttl_seconds: int = Field(
+        default=10,
+        title="Auth Principal Negative TTL Seconds",
+        description="Seconds an invalid token stays cached as rejected",
+    )
+    auth_principal_cache_max_entries: int = Field(
+        default=10000,
+        title="Auth Principal Cache Max Entries",
+        description="Maximum number of cached principals (LRU eviction)",
+    )
+    cognito_executor_max_workers: int = Field(
+        default=8,
+        title="Cognito Executor Max Workers",
+        description="Threads dedicated to blocking Cognito calls",
+    )
+    cognito_executor_max_queue: int = Field(
+        default=32,
+        title="Cognito Executor Max Queue",
+        description="Cognito calls allowed to wait for a thread before failing fast",
+    )
+    cognito_call_timeout_seconds: float = Field(
+        default=10.0,
+        title="Cognito Call Timeout Seconds",
+        description="Seconds an async caller waits for a Cognito call",
+    )
+    dynamodb_executor_max_workers: int = Field(
+        default=16,
+        title="DynamoDB Executor Max Workers",
+        description="Threads dedicated to blocking DynamoDB calls",
+    )
+    dynamodb_executor_max_queue: int = Field(
+        default=64,
+        title="DynamoDB Executor Max Queue",
+        description="DynamoDB calls allowed to wait for a thread before failing fast",
+    )
+    dynamodb_call_timeout_seconds: float = Field(
+        default=5.0,
+        title="DynamoDB Call Timeout Seconds",
+        description="Seconds an async caller waits for a DynamoDB call",
+    )
+    s3_executor_max_workers: int = Field(
+        default=8,
+        title="S3 Executor Max Workers",
+        description="Threads dedicated to blocking S3 calls",
+    )
+    s3_executor_max_queue: int = Field(
+        default=32,
+        title="S3 Executor Max Queue",
+        description="S3 calls allowed to wait for a thread before failing fast",
+    )
+    s3_call_timeout_seconds: float = Field(
+        default=30.0,
+        title="S3 Call Timeout Seconds",
+        description="Seconds an async caller waits for an S3 call",
+    )
+    principal_executor_max_workers: int = Field(
+        default=8,
+        title="Principal Executor Max Workers",
+        description="Threads resolving bearer tokens (local verification, profile lookups)",
+    )
+    principal_executor_max_queue: int = Field(
+        default=64,
+        title="Principal Executor Max Queue",
+        description="Principal resolutions allowed to wait for a thread before failing fast",
+    )
+    principal_call_timeout_seconds: float = Field(
+        default=10.0,
+        title="Principal Call Timeout Seconds",
+        description="Seconds a request waits for its principal to be resolved",
+    )
+    user_list_default_page_size: int = Field(
+        default=25,
+        title="User List Default Page Size",
+        description="Users returned per page when the client sends no limit",
+    )
+    user_list_max_page_size: int = Field(
+        default=100,
+        title="User List Max Page Size",
+        description="Upper bound for the page size of the user listing",
+    )
+    chat_messages_default_page_size: int = Field(
+        default=50,
+        title="Chat Messages Default Page Size",
+        description="Messages returned per history page when no limit is given",
+    )
+    chat_messages_max_page_size: int = Field(
+        default=200,
+        title="Chat Messages Max Page Size",
+        description="Upper bound for the page size of a chat history read",
+    )
+    chat_list_default_page_size: int = Field(
+        default=20,
+        title="Chat List Default Page Size",
+        description="Chats returned per listing page when the client sends no limit",
+    )
+    chat_list_max_page_size: int = Field(
+        default=100,
+        title="Chat List Max Page Size",
+        description="Upper bound for the page size of the chat listing",
+    )
+    user_cache_enabled: bool = Field(
+        default=True,
+        title="User Cache Enabled",
+        description="Serve get_user/get_user_by_email from an in-process cache",
+    )
+    user_cache_ttl_seconds: float = Field(
+        default=60.0,
+        title="User Cache TTL Seconds",
+        description="Upper bound for how long a cached user is served",
+    )
+    user_cache_max_entries: int = Field(
+        default=10000,
+        title="User Cache Max Entries",
+        description="Maximum number of cached users per worker (LRU eviction)",
+    )
+    user_cache_channel: str = Field(
+        default="user_cache_invalidation",
+        title="User Cache Channel",
+        description="Postgres LISTEN/NOTIFY channel that broadcasts user invalidations",
+    )
+    user_email_index_fallback: bool = Field(
+        default=True,
+        title="User Email Index Fallback",
+        description="Query email-index for users without an email sentinel (disable after the backfill)",
+    )
+    user_batch_get_concurrency: int = Field(
+        default=8,
+        title="User Batch Get Concurrency",
+        description="BatchGetItem calls (100 keys each) in flight per get_users call",
+    )
+    user_batch_get_max_retries: int = Field(
+        default=8,
+        title="User Batch Max Retries",
+        description="Retries of UnprocessedKeys/UnprocessedItems before a batch call fails with 503",
+    )
+    user_import_batch_size: int = Field(
+        default=100,
+        title="User Import Batch Size",
+        description="Rows signed up and written per import chunk (one checkpoint each)",
+    )
+    user_import_cognito_concurrency: int = Field(
+        default=4,
+        title="User Import Cognito Concurrency",
+        description="Concurrent Cognito signups of an import (keep below the cognito bulkhead)",
+    )
+    user_import_signups_per_second: float = Field(
+        default=10.0,
+        title="User Import Signups Per Second",
+        description="Rate limit for Cognito signups issued by an import",
+    )
+    user_export_segments: int = Field(
+        default=4,
+        title="User Export Segments",
+        description="Parallel scan segments (concurrent workers) used by the user export",
+    )
+    user_export_max_segments: int = Field(
+        default=32,
+        title="User Export Max Segments",
+        description="Upper bound for the segments a caller may request",
+    )
+    user_export_queue_pages: int = Field(
+        default=8,
+        title="User Export Queue Pages",
+        description="Scanned pages buffered before workers wait for the consumer",
+    )
+    user_export_page_size: int = Field(
+        default=500,
+        title="User Export Page Size",
+        description="Items evaluated per scan call of the user export",
+    )
+    user_export_max_retries: int = Field(
+        default=8,
+        title="User Export Max Retries",
+        description="Throttled scan calls retried per page before the export fails",
+    )
     user_password: Optional[str] = Field(default=None)
 
     # PostgreSQL Configuration
@@ -26,6 +276,31 @@ class Settings(BaseSettings):
     db_user: str = Field(default="inner")
     db_password: str = Field(default="inner")
     db_name: str = Field(default="inner_chat")
+    db_pool_size: int = Field(
+        default=10,
+        title="DB Pool Size",
+        description="Persistent asyncpg connections kept per worker",
+    )
+    db_max_overflow: int = Field(
+        default=10,
+        title="DB Max Overflow",
+        description="Extra connections opened above db_pool_size under bursts",
+    )
+    db_pool_timeout: float = Field(
+        default=30.0,
+        title="DB Pool Timeout",
+        description="Seconds a session waits for a free connection before failing",
+    )
+    db_pool_recycle: int = Field(
+        default=1800,
+        title="DB Pool Recycle",
+        description="Seconds after which a pooled connection is replaced",
+    )
+    db_pool_pre_ping: bool = Field(
+        default=True,
+        title="DB Pool Pre-Ping",
+        description="Check each connection on checkout and replace dead ones",
+    )
 
     # agent configuration
     default_model: str = Field(
@@ -72,6 +347,112 @@ class Settings(BaseSettings):
         title="LangSmith Project",
         description="Project name for LangSmith services",
     )
+    # knowledge base configuration
+    knowledge_index_type: str = Field(
+        default="hnsw",
+        title="Knowledge Index Type",
+        description="ANN index used by the knowledge base (hnsw or ivfflat)",
+    )
+    knowledge_hnsw_m: int = Field(
+        default=16,
+        title="HNSW M",
+        description="Max connections per HNSW graph layer",
+    )
+    knowledge_hnsw_ef_construction: int = Field(
+        default=200,
+        title="HNSW ef_construction",
+        description="Candidate list size used while building the HNSW graph",
+    )
+    knowledge_ivfflat_lists: int = Field(
+        default=0,
+        title="IVFFlat Lists",
+        description="Number of IVFFlat lists (0 derives it from the row count)",
+    )
+    knowledge_ef_search_interactive: int = Field(
+        default=40,
+        title="Interactive ef_search",
+        description="hnsw.ef_search for latency-sensitive chat turns",
+    )
+    knowledge_ef_search_complex: int = Field(
+        default=100,
+        title="Complex ef_search",
+        description="hnsw.ef_search for recall-oriented complex tasks",
+    )
+    knowledge_ef_search_batch: int = Field(
+        default=200,
+        title="Batch ef_search",
+        description="hnsw.ef_search for offline and evaluation workloads",
+    )
+    knowledge_probes_interactive: int = Field(
+        default=10,
+        title="Interactive probes",
+        description="ivfflat.probes for latency-sensitive chat turns",
+    )
+    knowledge_probes_complex: int = Field(
+        default=20,
+        title="Complex probes",
+        description="ivfflat.probes for recall-oriented complex tasks",
+    )
+    knowledge_probes_batch: int = Field(
+        default=40,
+        title="Batch probes",
+        description="ivfflat.probes for offline and evaluation workloads",
+    )
+    knowledge_rerank_enabled: bool = Field(
+        default=True,
+        title="Knowledge Rerank Enabled",
+        description="Rerank retrieved chunks with BM25 before building the prompt",
+    )
+    knowledge_rerank_overfetch: int = Field(
+        default=3,
+        title="Knowledge Rerank Overfetch",
+        description="Candidates fetched per returned chunk for the reranker",
+    )
+    knowledge_context_token_budget: int = Field(
+        default=1500,
+        title="Knowledge Context Token Budget",
+        description="Maximum prompt tokens spent on knowledge chunks per search",
+    )
+    knowledge_rerank_cache_size: int = Field(
+        default=4096,
+        title="Knowledge Rerank Cache Size",
+        description="Chunks kept in the BM25 term-statistics cache",
+    )
+    knowledge_rerank_max_terms: int = Field(
+        default=200_000,
+        title="Knowledge Rerank Max Terms",
+        description="Distinct terms kept in the BM25 vocabulary before evicting chunks",
+    )
+    knowledge_tenant_scoped: bool = Field(
+        default=False,
+        title="Knowledge Tenant Scoped",
+        description="Restrict knowledge searches to the requesting user (needs chunks ingested with a user_id)",
+    )
+    knowledge_tenant_index_threshold: int = Field(
+        default=10000,
+        title="Knowledge Tenant Index Threshold",
+        description="Rows above which a tenant gets its own partial ANN index",
+    )
+    knowledge_embedding_dimensions: int = Field(
+        default=1536,
+        title="Knowledge Embedding Dimensions",
+        description="Dimensions of the knowledge embeddings",
+    )
+    knowledge_vector_precision: str = Field(
+        default="full",
+        title="Knowledge Vector Precision",
+        description="Embedding layout: full (vector), half (halfvec) or binary (bit index + rescoring)",
+    )
+    knowledge_binary_rescore_factor: int = Field(
+        default=4,
+        title="Knowledge Binary Rescore Factor",
+        description="Candidates fetched by hamming distance per returned chunk before rescoring",
+    )
+    knowledge_hybrid_candidate_factor: int = Field(
+        default=4,
+        title="Knowledge Hybrid Candidate Factor",
+        description="ANN candidates per returned chunk re-ranked by the hybrid (vector + keyword) score",
+    )
 
 
 load_dotenv()
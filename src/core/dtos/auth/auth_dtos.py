@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -18,6 +18,9 @@ class UserDetailsResponseDto(BaseModel):
     name: Optional[str] = Field(None, description="Full name of the user")
     email_verified: bool = Field(True, description="Indicates if email is verified")
     is_active: bool = Field(..., description="Indicates if the user is active")
+    groups: List[str] = Field(
+        default_factory=list, description="Cognito groups the user belongs to"
+    )
 
 
 class LoginDto(BaseModel):
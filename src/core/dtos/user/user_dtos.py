@@ -43,3 +43,17 @@ class ReponseUserDto(BaseModel):
     email: EmailStr = Field(..., description="Email do usuário")
     first_name: Optional[str] = Field(None, description="Primeiro nome do usuário")
     last_name: Optional[str] = Field(None, description="Último nome do usuário")
+
+
+class UserImportFailureDto(BaseModel):
+    row: int = Field(..., description="Número da linha de dados (a partir de 1)")
+    email: Optional[str] = Field(None, description="Email da linha, se legível")
+    error_code: str = Field(..., description="Código do erro")
+    message: str = Field(..., description="Descrição do erro")
+
+
+class UserImportCheckpointDto(BaseModel):
+    next_row: int = Field(..., description="Primeira linha ainda não processada")
+    imported: int = Field(..., description="Usuários importados até aqui")
+    failed: int = Field(..., description="Linhas com falha até aqui")
+    done: bool = Field(False, description="Indica o fim do arquivo")
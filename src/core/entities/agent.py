@@ -3,15 +3,17 @@ from typing import Any, Dict, List, Literal, Optional, Type, Union
 from agno.agent import Agent as AgnoAgent
 from agno.knowledge.agent import AgentKnowledge
 from agno.storage.base import Storage
-from agno.storage.postgres import PostgresStorage
 from agno.tools import Toolkit
 from agno.tools.dalle import DalleTools
 from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.vectordb.pgvector import PgVector, SearchType
 from pydantic import BaseModel, ConfigDict, Field
 
 from configs.load_env import settings
-from infraestructure.database.config import get_database_url
+
+IntentType = Literal["generate_image", "complexity_task", "simple_task"]
+
+# Intenções cujas respostas dependem da base de conhecimento
+KNOWLEDGE_INTENTS = frozenset({"complexity_task"})
 
 
 class AgentConfig(BaseModel):
@@ -88,12 +90,12 @@ class BaseAgent(BaseModel):
         description="List of tools the agent can use",
     )
     storage: Optional[Storage] = Field(
-        default=PostgresStorage(
-            db_url=get_database_url(),
-            table_name="chat_messages",
-        ),
+        default=None,
         title="Storage",
-        description="Storage mechanism for the agent",
+        description=(
+            "Storage mechanism for the agent; defaults to the process-wide "
+            "Postgres storage when the agent is built"
+        ),
     )
     configs: AgentConfig = Field(
         default=AgentConfig(),
@@ -107,21 +109,48 @@ class BaseAgent(BaseModel):
         None, title="Instructions", description="Instructions for the agent"
     )
     knowledge_base: Optional[AgentKnowledge] = Field(
-        default=AgentKnowledge(
-            vector_db=PgVector(
-                db_url=get_database_url(),
-                table_name="agent_knowledge_base",
-                search_type=SearchType.hybrid,
-            )
-        ),
+        default=None,
         title="Knowledge Base",
-        description="Knowledge base for the agent",
+        description="Explicit knowledge base; when empty it is resolved lazily from the profile",
+    )
+    knowledge_profile: Optional[str] = Field(
+        default="interactive",
+        title="Knowledge Profile",
+        description="Search profile (interactive, complex, batch) used for lazy retrieval",
+    )
+    intent: Optional[IntentType] = Field(
+        default=None,
+        title="Intent",
+        description="Intent served by the agent; None means a general purpose agent",
+    )
+    routed_intents: Optional[List[IntentType]] = Field(
+        default=None,
+        title="Routed Intents",
+        description="Intents assigned to the current request by the router",
     )
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
     )
 
+    def requires_knowledge(self) -> bool:
+        """
+        Indica se o agente deve receber acesso à base de conhecimento.
+        Whether the agent should be given access to the knowledge base.
+        """
+        if self.knowledge_base is None and self.knowledge_profile is None:
+            return False
+        return self.intent is None or self.intent in KNOWLEDGE_INTENTS
+
+    def retrieval_enabled(self) -> bool:
+        """
+        Indica se a requisição atual foi roteada para uma intenção com retrieval.
+        Whether the current request was routed to an intent that needs retrieval.
+        """
+        if self.routed_intents is None:
+            return True
+        return any(intent in KNOWLEDGE_INTENTS for intent in self.routed_intents)
+
 
 class ComplexityAgent(BaseAgent):
     """Base class for complex agents that handle more sophisticated tasks"""
@@ -147,6 +176,12 @@ class ComplexityAgent(BaseAgent):
         title="Configurations",
         description="Configuration settings for the complex agent",
     )
+    knowledge_profile: Optional[str] = Field(
+        default="complex",
+        title="Knowledge Profile",
+        description="Search profile tuned for recall on complex tasks",
+    )
+    intent: Optional[IntentType] = "complexity_task"
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
@@ -156,18 +191,16 @@ class ComplexityAgent(BaseAgent):
 class OutputIntent(BaseModel):
     """Model for the output intent of a user message"""
 
-    intent: List[
-        Literal[
-            "generate_image",
-            "complexity_task",
-            "simple_task",
-        ]
-    ] = Field(
+    intent: List[IntentType] = Field(
         default=["simple_task"],
         title="Intent",
         description="The intent of the user message",
     )
 
+    @property
+    def requires_knowledge(self) -> bool:
+        return any(intent in KNOWLEDGE_INTENTS for intent in self.intent)
+
 
 class JudgingBaseAgent(BaseAgent):
     """Base class for agents that judge user messages"""
@@ -193,6 +226,7 @@ class JudgingBaseAgent(BaseAgent):
         title="Configurations",
         description="Configuration settings for the agent when judging intents",
     )
+    knowledge_profile: Optional[str] = None
     description: str = "You are an AI agent that judges the intent of user messages."
     instructions: str = """
         analize a mensagem do usuario e retorne a intenção
@@ -215,6 +249,7 @@ class GeneratorImageAgent(BaseAgent):
         title="Tools",
         description="List of tools the agent can use for generating images",
     )
+    intent: Optional[IntentType] = "generate_image"
     description: str = (
         "You are an AI agent specialized in generating high-quality images using DALL-E."
     )
@@ -67,4 +67,66 @@ class Chat(BaseModel):
         title="Update Timestamp",
         description="Timestamp when the chat was last updated",
         alias="updatedAt"
-    )
\ No newline at end of file
+    )
+
+
+class ChatMessagePage(BaseModel):
+    """
+    Uma página do histórico de mensagens de um chat, em ordem cronológica.
+    One page of a chat's message history, in chronological order.
+    """
+
+    messages: List[ChatMessage] = Field(
+        default_factory=list,
+        title="Messages",
+        description="Messages in this page, oldest first",
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        title="Next Cursor",
+        description="Opaque cursor for the previous (older) page, None at the start",
+    )
+
+
+class ChatSummary(Chat):
+    """
+    Chat da barra lateral: o chat, a última mensagem e o total de mensagens.
+    Sidebar chat: the chat, its latest message and its message count.
+    """
+
+    last_message: Optional[ChatMessage] = Field(
+        default=None,
+        title="Last Message",
+        description="Most recent message of the chat, None when it has none",
+        alias="lastMessage",
+    )
+    last_message_at: Optional[datetime] = Field(
+        default=None,
+        title="Last Message Timestamp",
+        description="Timestamp of the most recent message",
+        alias="lastMessageAt",
+    )
+    message_count: int = Field(
+        default=0,
+        title="Message Count",
+        description="Number of messages in the chat",
+        alias="messageCount",
+    )
+
+
+class ChatPage(BaseModel):
+    """
+    Uma página da listagem de chats, do mais recente para o mais antigo.
+    One page of the chat listing, most recently active first.
+    """
+
+    chats: List[ChatSummary] = Field(
+        default_factory=list,
+        title="Chats",
+        description="Chats in this page, most recently updated first",
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        title="Next Cursor",
+        description="Opaque cursor for the next page (None on the last page)",
+    )
@@ -99,3 +99,21 @@ class User(BaseModel):
         if dt:
             return dt.isoformat()
         return None
+
+
+class UserPage(BaseModel):
+    """
+    Uma página da listagem de usuários.
+    One page of the user listing.
+    """
+
+    users: List[User] = Field(
+        default_factory=list,
+        title="Users",
+        description="Users in this page",
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        title="Next Cursor",
+        description="Opaque cursor for the next page (None on the last page)",
+    )
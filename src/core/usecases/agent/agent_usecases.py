@@ -10,6 +10,7 @@ from core.entities.agent import (
     ComplexityAgent,
     GeneratorImageAgent,
     JudgingBaseAgent,
+    OutputIntent,
     TeamAgent,
 )
 from core.exceptions.agent import (
@@ -18,40 +19,36 @@ from core.exceptions.agent import (
     AgentStreamException,
 )
 from interface.agent.agent_interface import AgentInterface
-from interface.auth.auth_interface import AuthInterface
+
+
+def ensure_principal(user: Optional[UserDetailsResponseDto], operation: str) -> None:
+    """
+    Garante que o principal resolvido pela requisição é utilizável.
+    Ensures the principal resolved for the request is usable.
+    """
+    if user is None or not user.user_id:
+        raise AgentAuthenticationException(
+            details={
+                "message": "Invalid token or user not found",
+                "operation": operation,
+            }
+        )
 
 
 class CreateAgentUseCase:
     def __init__(
         self,
-        auth_repository: AuthInterface,
         agent_repository: AgentInterface,
     ):
-        self.auth_repository = auth_repository
         self.agent_repository = agent_repository
 
-    def validate_token(self, token: str) -> UserDetailsResponseDto:
-        """Validate the provided token"""
-        try:
-            user = self.auth_repository.get_user_details(token)
-            if not user:
-                raise AgentAuthenticationException(
-                    details={
-                        "message": "Invalid token or user not found",
-                        "operation": "validate_token",
-                    }
-                )
-            return user
-        except Exception as e:
-            raise AgentAuthenticationException(
-                details={"original_error": str(e), "operation": "validate_token"}
-            ) from e
-
-    async def execute(self, token, agent_data: BaseAgent) -> Agent:
-        """Create a new agent"""
+    async def execute(
+        self, user: UserDetailsResponseDto, agent_data: BaseAgent
+    ) -> Agent:
+        """Create a new agent for the already authenticated user"""
+        ensure_principal(user, "execute_create_agent")
         try:
             session_id = str(uuid4())
-            user = self.validate_token(token)
 
             agent_data = BaseAgent(
                 model_id=agent_data.model_id,
@@ -63,6 +60,8 @@ class CreateAgentUseCase:
                 tools=agent_data.tools,
                 storage=agent_data.storage,
                 knowledge_base=agent_data.knowledge_base,
+                knowledge_profile=agent_data.knowledge_profile,
+                intent=agent_data.intent,
             )
 
             return await self.agent_repository.create_basic_agent_chat(agent_data)
@@ -75,11 +74,7 @@ class CreateAgentUseCase:
                 details={
                     "original_error": str(e),
                     "operation": "execute_create_agent",
-                    "user_id": (
-                        getattr(user, "user_id", "unknown")
-                        if "user" in locals()
-                        else "unknown"
-                    ),
+                    "user_id": user.user_id,
                     "agent_name": agent_data.name if agent_data else "unknown",
                 }
             ) from e
@@ -89,37 +84,43 @@ class StreamAgentResponseUseCase:
     def __init__(
         self,
         agent_create_usecase: CreateAgentUseCase,
-        auth_repository: AuthInterface,
         agent_repository: AgentInterface,
     ):
         self.agent_create_usecase = agent_create_usecase
-        self.auth_repository = auth_repository
         self.agent_repository = agent_repository
 
-    def validate_token(self, token: str) -> UserDetailsResponseDto:
-        """Validate the provided token"""
-        try:
-            user = self.auth_repository.get_user_details(token)
-            if not user:
-                raise AgentAuthenticationException(
-                    details={
-                        "message": "Invalid token or user not found",
-                        "operation": "validate_token_stream",
-                    }
+    @staticmethod
+    def routed_intents(messages: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """
+        Intenções informadas pelo roteador nos metadados da última mensagem.
+        Intents provided by the router in the last message metadata.
+
+        A rota achata ``metadata`` no próprio dicionário da mensagem.
+        """
+        for msg in reversed(messages):
+            if not isinstance(msg, dict) or msg.get("role") != "user":
+                continue
+            intent = msg.get("intent") or (msg.get("metadata") or {}).get("intent")
+            if not intent:
+                return None
+            try:
+                return list(
+                    OutputIntent(
+                        intent=[intent] if isinstance(intent, str) else intent
+                    ).intent
                 )
-            return user
-        except Exception as e:
-            raise AgentAuthenticationException(
-                details={"original_error": str(e), "operation": "validate_token_stream"}
-            ) from e
+            except ValueError:
+                return None
+        return None
 
     async def execute(
-        self, token: str, messages: List[Dict[str, Any]]
+        self, user: UserDetailsResponseDto, messages: List[Dict[str, Any]]
     ) -> AsyncGenerator:
         """Stream response from the agent"""
+        ensure_principal(user, "execute_stream_agent")
         try:
             session_id = str(uuid4())
-            user = self.validate_token(token)
+            routed_intents = self.routed_intents(messages)
 
             basic_agent_data = BaseAgent(
                 user_id=user.user_id,
@@ -127,6 +128,8 @@ class StreamAgentResponseUseCase:
                 name="inner_basic_chat_agent",
                 description="Basic chat agent for streaming responses",
                 instructions="You are a basic chat agent that streams responses.",
+                intent="simple_task",
+                routed_intents=routed_intents,
             )
 
             judge_agent_data = JudgingBaseAgent(
@@ -139,12 +142,14 @@ class StreamAgentResponseUseCase:
                 user_id=user.user_id,
                 session_id=session_id,
                 name="inner_complexity_chat_agent",
+                routed_intents=routed_intents,
             )
 
             generator_image_data = GeneratorImageAgent(
                 user_id=user.user_id,
                 session_id=session_id,
                 name="inner_generator_image_agent",
+                routed_intents=routed_intents,
             )
 
             team_agent_data = TeamAgent(
@@ -227,11 +232,7 @@ class StreamAgentResponseUseCase:
                     "original_error": str(e),
                     "operation": "execute_stream_agent",
                     "messages_count": len(messages) if messages else 0,
-                    "user_id": (
-                        getattr(user, "user_id", "unknown")
-                        if "user" in locals()
-                        else "unknown"
-                    ),
+                    "user_id": user.user_id,
                 }
             ) from e
 
@@ -240,38 +241,19 @@ class DefineTeamToPlaygroundUseCase:
     def __init__(
         self,
         agent_create_usecase: CreateAgentUseCase,
-        auth_repository: AuthInterface,
         agent_repository: AgentInterface,
     ):
         self.agent_create_usecase = agent_create_usecase
-        self.auth_repository = auth_repository
         self.agent_repository = agent_repository
 
-    def validate_token(self, token: str) -> UserDetailsResponseDto:
-        """Validate the provided token"""
-        try:
-            user = self.auth_repository.get_user_details(token)
-            if not user:
-                raise AgentAuthenticationException(
-                    details={
-                        "message": "Invalid token or user not found",
-                        "operation": "validate_token_stream",
-                    }
-                )
-            return user
-        except Exception as e:
-            raise AgentAuthenticationException(
-                details={"original_error": str(e), "operation": "validate_token_stream"}
-            ) from e
-
     async def execute(
         self,
-        token: str,
+        user: UserDetailsResponseDto,
     ):
         """Stream response from the agent"""
+        ensure_principal(user, "execute_define_team")
         try:
             session_id = str(uuid4())
-            user = self.validate_token(token)
 
             basic_agent_data = BaseAgent(
                 user_id=user.user_id,
@@ -279,6 +261,7 @@ class DefineTeamToPlaygroundUseCase:
                 name="inner_basic_chat_agent",
                 description="Basic chat agent for streaming responses",
                 instructions="You are a basic chat agent that streams responses.",
+                intent="simple_task",
             )
 
             judge_agent_data = JudgingBaseAgent(
@@ -346,10 +329,6 @@ class DefineTeamToPlaygroundUseCase:
                 details={
                     "original_error": str(e),
                     "operation": "execute_stream_agent",
-                    "user_id": (
-                        getattr(user, "user_id", "unknown")
-                        if "user" in locals()
-                        else "unknown"
-                    ),
+                    "user_id": user.user_id,
                 }
             ) from e
@@ -1,13 +1,17 @@
 from typing import Any, Dict
 
-from core.exceptions import InfrastructureException
+from core.exceptions import (
+    InfrastructureException,
+    ServiceUnavailableException,
+    TimeoutException,
+)
 from core.exceptions.auth.auth_exceptions import (
     AuthenticationException,
     InvalidCredentialsException,
 )
 from core.exceptions.user.exceptions import UserNotFoundException
-from interface.auth.auth_interface import AuthInterface
-from interface.user.user_interface import UserInterface
+from interface.auth.auth_interface import AsyncAuthInterface, AuthInterface
+from interface.user.user_interface import AsyncUserInterface, UserInterface
 
 
 class ConfirmUserUseCase:
@@ -47,3 +51,49 @@ class ConfirmUserUseCase:
                 operation="confirm",
                 error_code="USER_CONFIRM_ERROR",
             ) from e
+
+
+class AsyncConfirmUserUseCase:
+    """
+    Confirmação de email sem bloquear o event loop: busca no DynamoDB via
+    cliente async e chamada ao Cognito no bulkhead.
+    """
+
+    def __init__(
+        self, user_interface: AsyncUserInterface, auth_interface: AsyncAuthInterface
+    ):
+        self.user_interface = user_interface
+        self.auth_interface = auth_interface
+
+    async def execute(self, email: str, confirmation_token: str) -> Dict[str, Any]:
+        try:
+            user = await self.user_interface.get_user_by_email(email)
+            if not user:
+                raise UserNotFoundException(
+                    identifier=email,
+                    field="email",
+                    details={"email": email},
+                )
+
+            if await self.auth_interface.confirm_email(user.email, confirmation_token):
+                return {"status": "success"}
+
+            return {"status": "error"}
+
+        except InvalidCredentialsException as e:
+            raise AuthenticationException(
+                message_pt="Credenciais inválidas",
+                message_en="Invalid credentials",
+                details={"email": email},
+                error_code="INVALID_CREDENTIALS",
+            ) from e
+        except (ServiceUnavailableException, TimeoutException):
+            raise
+        except Exception as e:
+            raise InfrastructureException(
+                message_pt="Erro ao confirmar usuário",
+                message_en="Error confirming user",
+                service="user_service",
+                operation="confirm",
+                error_code="USER_CONFIRM_ERROR",
+            ) from e
@@ -1,10 +1,12 @@
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
+from configs.load_env import settings
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
 from core.dtos.chat.chat_dtos import CreateChatResponseDto
-from core.entities.chat import Chat
-from interface.auth.auth_interface import AuthInterface
+from core.entities.chat import Chat, ChatPage
+from core.exceptions import ValidationException
 from interface.chat.chat_interface import ChatInterface, AsyncChatInterface
 
 
@@ -19,19 +21,16 @@ class CreateChatUseCase:
     def __init__(
         self,
         chat_interface: ChatInterface,
-        auth_interface: AuthInterface,
     ):
         self.chat_interface = chat_interface
-        self.auth_interface = auth_interface
 
     def execute(
         self,
-        token: str,
+        user: UserDetailsResponseDto,
     ) -> CreateChatResponseDto:
         """
-        Cria um novo chat
+        Cria um novo chat para o usuário já autenticado
         """
-        user = self.auth_interface.get_user_details(token)
         if not user:
             raise ValueError("Invalid token")
 
@@ -70,19 +69,16 @@ class AsyncCreateChatUseCase:
     def __init__(
         self,
         chat_interface: AsyncChatInterface,
-        auth_interface: AuthInterface,
     ):
         self.chat_interface = chat_interface
-        self.auth_interface = auth_interface
 
     async def execute(
         self,
-        token: str,
+        user: UserDetailsResponseDto,
     ) -> CreateChatResponseDto:
         """
-        Cria um novo chat de forma assíncrona
+        Cria um novo chat de forma assíncrona para o usuário já autenticado
         """
-        user = self.auth_interface.get_user_details(token)
         if not user:
             raise ValueError("Invalid token")
         
@@ -110,3 +106,55 @@ class AsyncCreateChatUseCase:
         except Exception as e:
             logger.error(f"Failed to create chat: {str(e)}")
             raise ValueError("Failed to create chat") from e
+
+
+def chat_page_size(limit: Optional[int]) -> int:
+    """
+    Tamanho de página efetivo: o padrão das settings, limitado ao máximo.
+    Effective page size: the settings default, capped at the maximum.
+    """
+    if limit is None:
+        limit = settings.chat_list_default_page_size
+    if limit < 1:
+        raise ValidationException(
+            message_pt="O tamanho da página deve ser positivo",
+            message_en="Page size must be positive",
+            field="limit",
+            value=limit,
+            error_code="INVALID_PAGE_SIZE",
+        )
+    return min(limit, settings.chat_list_max_page_size)
+
+
+class AsyncListChatsUseCase:
+    """
+    Caso de uso assíncrono para listar os chats do usuário por atividade recente
+    """
+
+    def __init__(
+        self,
+        chat_interface: AsyncChatInterface,
+    ):
+        self.chat_interface = chat_interface
+
+    async def execute(
+        self,
+        user: UserDetailsResponseDto,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> ChatPage:
+        """
+        Lista uma página dos chats do usuário já autenticado
+        """
+        if not user:
+            raise ValueError("Invalid token")
+
+        if not user.is_active:
+            raise ValueError("User is not active")
+
+        if not user.user_id:
+            raise ValueError("User not found")
+
+        return await self.chat_interface.list_chats_page(
+            user.user_id, chat_page_size(limit), cursor
+        )
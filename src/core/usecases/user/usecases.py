@@ -1,8 +1,32 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from pydantic import ValidationError as PydanticValidationError
 
-from core.dtos.user.user_dtos import CreateRequestUserDto
-from core.entities.user import User
-from core.exceptions import InfrastructureException, ValidationException
+from configs.load_env import settings
+from core.dtos.user.user_dtos import (
+    CreateRequestUserDto,
+    UserImportCheckpointDto,
+    UserImportFailureDto,
+)
+from core.entities.user import User, UserPage
+from core.exceptions import (
+    BaseApplicationException,
+    InfrastructureException,
+    ServiceUnavailableException,
+    TimeoutException,
+    ValidationException,
+)
 from core.exceptions.auth.auth_exceptions import (
     AuthenticationException,
     InvalidCredentialsException,
@@ -13,43 +37,126 @@ from core.exceptions.user.exceptions import (
     UserValidationException,
 )
 from infraestructure.utils.generate_slug import generate_slug
-from interface.auth.auth_interface import AuthInterface
-from interface.user.user_interface import UserInterface
+from infraestructure.utils.rate_limiter import AsyncRateLimiter
+from interface.auth.auth_interface import AsyncAuthInterface, AuthInterface
+from interface.user.user_interface import AsyncUserInterface, UserInterface
 
 
 class CreateUserUseCase:
+    """
+    Cadastro síncrono: conta no Cognito e depois o usuário no DynamoDB.
+
+    ``signup`` e ``store`` são expostos separadamente para que o controller
+    rode cada etapa no bulkhead da sua dependência; ``execute`` faz as duas.
+    """
+
     def __init__(self, user_interface: UserInterface, auth_interface: AuthInterface):
         self.user_interface = user_interface
         self.auth_interface = auth_interface
 
     def execute(self, user_data: CreateRequestUserDto) -> User:
+        return self.store(self.signup(user_data))
+
+    def signup(self, user_data: CreateRequestUserDto) -> User:
+        """Cria a conta no serviço de autenticação e monta o usuário"""
+        return self._translated(self._signup, user_data)
+
+    def store(self, user: User) -> User:
+        """Grava no banco o usuário montado por ``signup``"""
+        return self._translated(self._store, user)
+
+    def _signup(self, user_data: CreateRequestUserDto) -> User:
+        auth_user = self.auth_interface.signup(
+            user_data.email,
+            user_data.password,
+            user_data.first_name,
+            user_data.last_name,
+        )
+        return User(
+            **user_data.model_dump(),
+            userId=auth_user["user_sub"],
+            slug=generate_slug(
+                user_data.first_name if user_data.first_name else user_data.email
+            ),
+        )
+
+    def _store(self, user: User) -> User:
+        created_user = self.user_interface.create_user(user)
+        if not created_user:
+            # Se falhou ao criar no banco, remover do auth service
+            try:
+                self.user_interface.delete_user(user.user_id)
+            except Exception:
+                pass  # Ignorar erro de cleanup
+
+            raise InfrastructureException(
+                message_pt="Erro ao criar usuário no banco de dados",
+                message_en="Error creating user in database",
+                service="user_service",
+                operation="create",
+                error_code="USER_CREATE_ERROR",
+            )
+
+        return created_user
+
+    def _translated(self, func: Callable[..., User], *args: Any) -> User:
         try:
-            # Criar usuário no serviço de autenticação primeiro
-            user = self.auth_interface.signup(
+            return func(*args)
+        except UserAlreadyExistsException:
+            # Re-raise exceções específicas de usuário
+            raise
+        except AuthenticationException as e:
+            # Converter exceções de auth para o contexto de criação de usuário
+            raise UserValidationException(
+                message_pt=f"Erro na criação da conta de autenticação: {e.message_pt}",
+                message_en=f"Error creating authentication account: {e.message_en}",
+                error_code="USER_AUTH_CREATION_ERROR",
+            )
+        except InfrastructureException:
+            # Re-raise exceções de infraestrutura
+            raise
+        except Exception as e:
+            # Capturar outras exceções não esperadas
+            raise InfrastructureException(
+                message_pt="Erro inesperado ao criar usuário",
+                message_en="Unexpected error creating user",
+                service="user_service",
+                operation="create",
+                details={"original_error": str(e)},
+                error_code="USER_CREATE_UNEXPECTED_ERROR",
+            )
+
+
+class AsyncCreateUserUseCase:
+    """
+    Cadastro com Cognito e DynamoDB sem bloquear o event loop.
+    """
+
+    def __init__(
+        self, user_interface: AsyncUserInterface, auth_interface: AsyncAuthInterface
+    ):
+        self.user_interface = user_interface
+        self.auth_interface = auth_interface
+
+    async def execute(self, user_data: CreateRequestUserDto) -> User:
+        try:
+            auth_user = await self.auth_interface.signup(
                 user_data.email,
                 user_data.password,
                 user_data.first_name,
                 user_data.last_name,
             )
 
-            # Criar usuário no banco de dados
-            user_dict = user_data.model_dump()
             user = User(
-                **user_dict,
-                userId=user["user_sub"],
+                **user_data.model_dump(),
+                userId=auth_user["user_sub"],
                 slug=generate_slug(
                     user_data.first_name if user_data.first_name else user_data.email
                 ),
             )
 
-            created_user = self.user_interface.create_user(user)
+            created_user = await self.user_interface.create_user(user)
             if not created_user:
-                # Se falhou ao criar no banco, remover do auth service
-                try:
-                    self.user_interface.delete_user(user.user_id)
-                except Exception:
-                    pass  # Ignorar erro de cleanup
-
                 raise InfrastructureException(
                     message_pt="Erro ao criar usuário no banco de dados",
                     message_en="Error creating user in database",
@@ -60,21 +167,20 @@ class CreateUserUseCase:
 
             return created_user
 
-        except UserAlreadyExistsException:
-            # Re-raise exceções específicas de usuário
+        except (
+            UserAlreadyExistsException,
+            InfrastructureException,
+            ServiceUnavailableException,
+            TimeoutException,
+        ):
             raise
         except AuthenticationException as e:
-            # Converter exceções de auth para o contexto de criação de usuário
             raise UserValidationException(
                 message_pt=f"Erro na criação da conta de autenticação: {e.message_pt}",
                 message_en=f"Error creating authentication account: {e.message_en}",
                 error_code="USER_AUTH_CREATION_ERROR",
             )
-        except InfrastructureException:
-            # Re-raise exceções de infraestrutura
-            raise
         except Exception as e:
-            # Capturar outras exceções não esperadas
             raise InfrastructureException(
                 message_pt="Erro inesperado ao criar usuário",
                 message_en="Unexpected error creating user",
@@ -85,6 +191,194 @@ class CreateUserUseCase:
             )
 
 
+ImportEvent = Union[UserImportFailureDto, UserImportCheckpointDto]
+
+
+def import_failure(
+    row: int, email: Optional[str], error: Exception
+) -> UserImportFailureDto:
+    """Falha de uma linha a partir da exceção que a interrompeu"""
+    if isinstance(error, BaseApplicationException):
+        return UserImportFailureDto(
+            row=row,
+            email=email,
+            error_code=error.error_code or "USER_IMPORT_ERROR",
+            message=error.message_en,
+        )
+    return UserImportFailureDto(
+        row=row,
+        email=email,
+        error_code="USER_IMPORT_UNEXPECTED_ERROR",
+        message=f"{type(error).__name__}: {error}",
+    )
+
+
+class AsyncImportUsersUseCase:
+    """
+    Importação em massa: cadastro no Cognito com concorrência e taxa
+    limitadas e gravação em lote no DynamoDB, um lote por vez.
+
+    Produz as falhas de cada linha (sem abortar a importação) e, ao fim de
+    cada lote, um checkpoint com ``next_row``: reiniciar com
+    ``start_row=next_row`` retoma de onde parou. Se a gravação do lote
+    falha, os cadastros do lote são desfeitos no Cognito, para que as
+    linhas possam ser reimportadas.
+    """
+
+    def __init__(
+        self,
+        user_interface: AsyncUserInterface,
+        auth_interface: AsyncAuthInterface,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        signups_per_second: Optional[float] = None,
+    ):
+        self.user_interface = user_interface
+        self.auth_interface = auth_interface
+        self.batch_size = batch_size or settings.user_import_batch_size
+        self.concurrency = concurrency or settings.user_import_cognito_concurrency
+        self.signups_per_second = (
+            signups_per_second
+            if signups_per_second is not None
+            else settings.user_import_signups_per_second
+        )
+
+    async def execute(
+        self, rows: AsyncIterable[Tuple[int, Any]], start_row: int = 1
+    ) -> AsyncIterator[ImportEvent]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        rate_limiter = AsyncRateLimiter(self.signups_per_second)
+        imported = failed = 0
+        next_row = start_row
+        chunk: List[Tuple[int, Any]] = []
+
+        async def flush() -> AsyncIterator[ImportEvent]:
+            nonlocal imported, failed, next_row
+            created, failures = await self._import_chunk(chunk, semaphore, rate_limiter)
+            imported += created
+            failed += len(failures)
+            next_row = chunk[-1][0] + 1
+            chunk.clear()
+            for failure in failures:
+                yield failure
+            yield UserImportCheckpointDto(
+                next_row=next_row, imported=imported, failed=failed
+            )
+
+        async for row, record in rows:
+            if row < start_row:
+                continue
+            chunk.append((row, record))
+            if len(chunk) >= self.batch_size:
+                async for event in flush():
+                    yield event
+        if chunk:
+            async for event in flush():
+                yield event
+
+        yield UserImportCheckpointDto(
+            next_row=next_row, imported=imported, failed=failed, done=True
+        )
+
+    async def _import_chunk(
+        self,
+        chunk: List[Tuple[int, Any]],
+        semaphore: asyncio.Semaphore,
+        rate_limiter: AsyncRateLimiter,
+    ) -> Tuple[int, List[UserImportFailureDto]]:
+        results = await asyncio.gather(
+            *(
+                self._signup(row, record, semaphore, rate_limiter)
+                for row, record in chunk
+            )
+        )
+        failures = [
+            result for result in results if isinstance(result, UserImportFailureDto)
+        ]
+        signed_up = [result for result in results if isinstance(result, tuple)]
+        if not signed_up:
+            return 0, failures
+
+        try:
+            await self.user_interface.create_users([user for _, user in signed_up])
+        except Exception as e:
+            # Desfaz os cadastros no Cognito para a linha poder ser reimportada
+            rolled_back = await asyncio.gather(
+                *(self._rollback_signup(user, semaphore) for _, user in signed_up)
+            )
+            for (row, user), removed in zip(signed_up, rolled_back):
+                failure = import_failure(row, user.email, e)
+                if not removed:
+                    failure = failure.model_copy(
+                        update={
+                            "error_code": "USER_IMPORT_AUTH_ORPHANED",
+                            "message": f"{failure.message} "
+                            "(Cognito signup could not be rolled back)",
+                        }
+                    )
+                failures.append(failure)
+            failures.sort(key=lambda failure: failure.row)
+            return 0, failures
+        return len(signed_up), failures
+
+    async def _rollback_signup(self, user: User, semaphore: asyncio.Semaphore) -> bool:
+        try:
+            async with semaphore:
+                return await self.auth_interface.delete_user(user.email)
+        except Exception:
+            return False
+
+    async def _signup(
+        self,
+        row: int,
+        record: Any,
+        semaphore: asyncio.Semaphore,
+        rate_limiter: AsyncRateLimiter,
+    ) -> Union[Tuple[int, User], UserImportFailureDto]:
+        email = record.get("email") if isinstance(record, dict) else None
+        if isinstance(record, Exception):
+            return UserImportFailureDto(
+                row=row, error_code="INVALID_ROW", message=str(record)
+            )
+        try:
+            user_data = CreateRequestUserDto.model_validate(record)
+        except PydanticValidationError as e:
+            fields = ", ".join(
+                str(error["loc"][0]) for error in e.errors() if error["loc"]
+            )
+            return UserImportFailureDto(
+                row=row,
+                email=email,
+                error_code="INVALID_ROW",
+                message=f"Invalid fields: {fields}",
+            )
+
+        try:
+            async with semaphore:
+                await rate_limiter.acquire()
+                auth_user = await self.auth_interface.signup(
+                    user_data.email,
+                    user_data.password,
+                    user_data.first_name,
+                    user_data.last_name,
+                )
+        except Exception as e:
+            return import_failure(row, email, e)
+        if not auth_user.get("user_sub"):
+            return UserImportFailureDto(
+                row=row,
+                email=email,
+                error_code="USER_AUTH_CREATION_ERROR",
+                message=str(auth_user.get("error", "Signup failed")),
+            )
+
+        return row, User(
+            **user_data.model_dump(),
+            userId=auth_user["user_sub"],
+            slug=generate_slug(user_data.first_name or user_data.email),
+        )
+
+
 class LoginUserUseCase:
     def __init__(self, auth_interface: AuthInterface):
         self.auth_interface = auth_interface
@@ -119,6 +413,44 @@ class LoginUserUseCase:
             )
 
 
+class AsyncLoginUserUseCase:
+    """
+    Login sem bloquear o event loop; saturação e timeout do provedor de
+    identidade são propagados como 503/504.
+    """
+
+    def __init__(self, auth_interface: AsyncAuthInterface):
+        self.auth_interface = auth_interface
+
+    async def execute(self, email: str, password: str) -> Dict[str, Any]:
+        try:
+            auth_data = await self.auth_interface.login(email, password)
+
+            if not auth_data:
+                raise InvalidCredentialsException(details={"email": email})
+
+            return {
+                "success": True,
+                "access_token": auth_data.get("access_token"),
+                "token_type": auth_data.get("token_type", "Bearer"),
+                "expires_in": auth_data.get("expires_in"),
+                "refresh_token": auth_data.get("refresh_token"),
+            }
+        except (
+            AuthenticationException,
+            ServiceUnavailableException,
+            TimeoutException,
+        ):
+            raise
+        except Exception as e:
+            raise AuthenticationException(
+                message_pt="Erro inesperado durante o login",
+                message_en="Unexpected error during login",
+                details={"original_error": str(e)},
+                error_code="LOGIN_UNEXPECTED_ERROR",
+            )
+
+
 class GetUserUseCase:
     def __init__(self, user_interface: UserInterface):
         self.user_interface = user_interface
@@ -136,6 +468,21 @@ class GetUserUseCase:
             )
 
 
+class AsyncGetUserUseCase:
+    def __init__(self, user_interface: AsyncUserInterface):
+        self.user_interface = user_interface
+
+    async def execute(self, user_id: str) -> Optional[User]:
+        try:
+            return await self.user_interface.get_user(user_id)
+        except UserNotFoundException:
+            raise
+        except Exception as e:
+            raise UserNotFoundException(
+                identifier=user_id, field="id", details={"original_error": str(e)}
+            )
+
+
 class ListUsersUseCase:
     def __init__(self, user_interface: UserInterface):
         self.user_interface = user_interface
@@ -144,18 +491,85 @@ class ListUsersUseCase:
         return self.user_interface.list_users()
 
 
+class AsyncListUsersUseCase:
+    def __init__(self, user_interface: AsyncUserInterface):
+        self.user_interface = user_interface
+
+    async def execute(self) -> List[User]:
+        return await self.user_interface.list_users()
+
+
+def page_size(limit: Optional[int]) -> int:
+    """
+    Tamanho de página efetivo: o padrão das settings, limitado ao máximo.
+    Effective page size: the settings default, capped at the maximum.
+    """
+    if limit is None:
+        limit = settings.user_list_default_page_size
+    if limit < 1:
+        raise ValidationException(
+            message_pt="O tamanho da página deve ser positivo",
+            message_en="Page size must be positive",
+            field="limit",
+            value=limit,
+            error_code="INVALID_PAGE_SIZE",
+        )
+    return min(limit, settings.user_list_max_page_size)
+
+
+class ListUsersPageUseCase:
+    def __init__(self, user_interface: UserInterface):
+        self.user_interface = user_interface
+
+    def execute(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> UserPage:
+        return self.user_interface.list_users_page(page_size(limit), cursor)
+
+
+class AsyncListUsersPageUseCase:
+    def __init__(self, user_interface: AsyncUserInterface):
+        self.user_interface = user_interface
+
+    async def execute(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> UserPage:
+        return await self.user_interface.list_users_page(page_size(limit), cursor)
+
+
+class AsyncExportUsersUseCase:
+    def __init__(self, user_interface: AsyncUserInterface):
+        self.user_interface = user_interface
+
+    def execute(self, total_segments: Optional[int] = None) -> AsyncIterator[User]:
+        if total_segments is None:
+            total_segments = settings.user_export_segments
+        if not 1 <= total_segments <= settings.user_export_max_segments:
+            raise ValidationException(
+                message_pt="Número de segmentos da exportação fora do limite",
+                message_en="Export segment count out of range",
+                field="total_segments",
+                value=total_segments,
+                error_code="INVALID_EXPORT_SEGMENTS",
+            )
+        return self.user_interface.export_users(total_segments)
+
+
 class UpdateUserUseCase:
     def __init__(self, user_interface: UserInterface):
         self.user_interface = user_interface
 
-    def execute(self, user_id: str, user_data: dict) -> Optional[User]:
-        user = self.user_interface.get_user(user_id)
-        if user:
-            # Usar model_copy para criar uma nova instância com os dados atualizados
-            updated_user = user.model_copy(update=user_data)
-            self.user_interface.update_user(updated_user)
-            return updated_user
-        return None
+    def execute(self, user_id: str, user_data: dict) -> User:
+        # Atualização parcial direta; usuário inexistente vira UserNotFoundException
+        return self.user_interface.update_user(user_id, user_data)
+
+
+class AsyncUpdateUserUseCase:
+    def __init__(self, user_interface: AsyncUserInterface):
+        self.user_interface = user_interface
+
+    async def execute(self, user_id: str, user_data: dict) -> User:
+        return await self.user_interface.update_user(user_id, user_data)
 
 
 class DeleteUserUseCase:
@@ -164,3 +578,11 @@ class DeleteUserUseCase:
 
     def execute(self, user_id: str) -> bool:
         return self.user_interface.delete_user(user_id)
+
+
+class AsyncDeleteUserUseCase:
+    def __init__(self, user_interface: AsyncUserInterface):
+        self.user_interface = user_interface
+
+    async def execute(self, user_id: str) -> bool:
+        return await self.user_interface.delete_user(user_id)
@@ -0,0 +1,30 @@
+"""
+Isolamento de chamadas síncronas a dependências externas.
+Isolation of synchronous calls to external dependencies.
+"""
+
+from .bulkhead import (
+    BULKHEADS,
+    COGNITO,
+    DYNAMODB,
+    PRINCIPAL,
+    S3,
+    Bulkhead,
+    bulkheads_snapshot,
+    get_bulkhead,
+    run_in_bulkhead,
+    shutdown_bulkheads,
+)
+
+__all__ = [
+    "BULKHEADS",
+    "Bulkhead",
+    "COGNITO",
+    "DYNAMODB",
+    "PRINCIPAL",
+    "S3",
+    "bulkheads_snapshot",
+    "get_bulkhead",
+    "run_in_bulkhead",
+    "shutdown_bulkheads",
+]
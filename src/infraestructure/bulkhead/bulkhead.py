@@ -0,0 +1,188 @@
+"""
+Bulkheads: pools de threads isolados por dependência síncrona.
+Bulkheads: isolated thread pools per synchronous dependency.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from configs.load_env import settings
+from core.exceptions import ServiceUnavailableException, TimeoutException
+from infraestructure.telemetry.metrics import MetricsRegistry, get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+COGNITO = "cognito"
+DYNAMODB = "dynamodb"
+S3 = "s3"
+# Resolução de principals (verificação local + perfil), isolada do Cognito
+PRINCIPAL = "principal"
+BULKHEADS = (COGNITO, DYNAMODB, S3, PRINCIPAL)
+
+T = TypeVar("T")
+
+
+class Bulkhead:
+    """
+    Pool de threads dedicado a uma dependência, com fila limitada e timeout.
+    Thread pool dedicated to one dependency, with a bounded queue and timeout.
+
+    No máximo ``max_workers + max_queue`` chamadas ficam pendentes; acima
+    disso a chamada falha na hora (503) em vez de esperar. Quem espera mais
+    que ``timeout`` recebe 504, mas o slot só é liberado quando a thread
+    termina, para que timeouts não sobrecarreguem o pool.
+
+    Métricas (``bulkhead.<nome>.*``): inflight, saturation, rejected,
+    timeouts, queue_wait_ms e latency_ms.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue: int,
+        timeout: float,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.capacity = max_workers + max_queue
+        self.timeout = timeout
+        self.metrics = metrics or get_metrics_registry()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"bulkhead-{name}"
+        )
+        self._inflight = 0
+        self._lock = threading.Lock()
+
+    def metric(self, suffix: str) -> str:
+        return f"bulkhead.{self.name}.{suffix}"
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    @property
+    def saturation(self) -> float:
+        return self._inflight / self.capacity if self.capacity else 1.0
+
+    def _update_gauges(self) -> None:
+        self.metrics.set_gauge(self.metric("inflight"), self._inflight)
+        self.metrics.set_gauge(self.metric("saturation"), round(self.saturation, 4))
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            if self._inflight >= self.capacity:
+                return False
+            self._inflight += 1
+        self._update_gauges()
+        return True
+
+    def _release(self, _future: Any = None) -> None:
+        with self._lock:
+            self._inflight -= 1
+        self._update_gauges()
+
+    def _timed(self, submitted_at: float, func: Callable[..., T]) -> T:
+        self.metrics.observe(
+            self.metric("queue_wait_ms"), (time.perf_counter() - submitted_at) * 1000
+        )
+        with self.metrics.timer(self.metric("latency_ms")):
+            return func()
+
+    async def run(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        operation: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """
+        Executa ``func(*args, **kwargs)`` no pool e aguarda o resultado.
+        Runs ``func(*args, **kwargs)`` on the pool and awaits the result.
+
+        Raises:
+            ServiceUnavailableException: pool e fila cheios
+            TimeoutException: resultado não chegou dentro do timeout
+        """
+        operation = operation or getattr(func, "__name__", "call")
+        if not self._acquire():
+            self.metrics.increment(self.metric("rejected"))
+            raise ServiceUnavailableException(
+                service=self.name, reason="bulkhead_saturated", retry_after=1
+            )
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(
+                self._executor,
+                partial(self._timed, time.perf_counter(), partial(func, *args, **kwargs)),
+            )
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        limit = timeout or self.timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), limit)
+        except asyncio.TimeoutError:
+            self.metrics.increment(self.metric("timeouts"))
+            logger.warning(f"{self.name}.{operation} timed out after {limit}s")
+            raise TimeoutException(
+                service=self.name, operation=operation, timeout_seconds=int(limit)
+            )
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "timeout": self.timeout,
+            "inflight": self._inflight,
+            "saturation": round(self.saturation, 4),
+        }
+
+
+@lru_cache()
+def get_bulkhead(name: str) -> Bulkhead:
+    """
+    Bulkhead compartilhado por dependência, configurado pelas settings
+    ``<nome>_executor_max_workers``, ``<nome>_executor_max_queue`` e
+    ``<nome>_call_timeout_seconds``.
+    """
+    if name not in BULKHEADS:
+        raise ValueError(f"Unknown bulkhead: {name}. Use one of {BULKHEADS}")
+    return Bulkhead(
+        name=name,
+        max_workers=getattr(settings, f"{name}_executor_max_workers"),
+        max_queue=getattr(settings, f"{name}_executor_max_queue"),
+        timeout=getattr(settings, f"{name}_call_timeout_seconds"),
+    )
+
+
+async def run_in_bulkhead(
+    name: str, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Atalho awaitable para ``get_bulkhead(name).run(...)``"""
+    return await get_bulkhead(name).run(func, *args, **kwargs)
+
+
+def bulkheads_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Estado de cada bulkhead / State of every bulkhead"""
+    return {name: get_bulkhead(name).snapshot() for name in BULKHEADS}
+
+
+def shutdown_bulkheads() -> None:
+    for name in BULKHEADS:
+        get_bulkhead(name).shutdown()
+    get_bulkhead.cache_clear()
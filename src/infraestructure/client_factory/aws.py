@@ -1,12 +1,80 @@
 """
 build a clients factory for AWS services
 """
+import asyncio
+import threading
+from contextlib import AsyncExitStack
+from typing import Any, Dict, Optional, Tuple
+
+from aiobotocore.config import AioConfig
+from aiobotocore.session import AioSession, get_session
 from boto3 import Session
-from configs.load_env import settings 
+from botocore.config import Config
+from configs.load_env import settings
+
+
+def config_options() -> Dict[str, Any]:
+    """
+    Botocore options shared by sync and async clients, read from settings.
+    """
+    return {
+        "max_pool_connections": settings.aws_max_pool_connections,
+        "retries": {
+            "mode": settings.aws_retry_mode,
+            "total_max_attempts": settings.aws_max_attempts,
+        },
+        "connect_timeout": settings.aws_connect_timeout_seconds,
+        "read_timeout": settings.aws_read_timeout_seconds,
+        "tcp_keepalive": settings.aws_tcp_keepalive,
+    }
+
+
+def client_config() -> Config:
+    """
+    Build the botocore configuration shared by every client.
+
+    :return: A botocore Config with pool size, retries, timeouts and keepalive.
+    """
+    return Config(**config_options())
+
+
+def endpoint_url(service: str) -> Optional[str]:
+    """
+    Endpoint override for a service (e.g. DynamoDB Local), if configured.
+    """
+    if service == "dynamodb":
+        return settings.dynamodb_endpoint_url
+    return None
 
 
 class AWSClientFactory:
-    
+    """
+    Process-wide cache of boto3 sessions, clients and resources.
+
+    Creating a session or client loads the service model and opens a new
+    connection pool, so each one is built once per (service, region) and
+    shared by every factory instance. Clients are thread-safe and shared
+    across threads; resources are not, so each thread gets its own.
+    """
+
+    _lock = threading.RLock()
+    _sessions: Dict[Optional[str], Session] = {}
+    _clients: Dict[Tuple[str, Optional[str]], Any] = {}
+    _local = threading.local()
+
+    def __init__(self, region_name: Optional[str] = None):
+        self.region_name = region_name or settings.region_name
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Drop every cached session, client and resource.
+        """
+        with cls._lock:
+            cls._sessions.clear()
+            cls._clients.clear()
+            cls._local = threading.local()
+
     def _create_session(self) -> Session:
         """
         Create a Boto3 session with the provided credentials and region.
@@ -14,45 +82,166 @@ class AWSClientFactory:
         return Session(
             aws_access_key_id=settings.aws_access_key_id,
             aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.region_name,
+            region_name=self.region_name,
         )
 
+    def _session(self) -> Session:
+        session = self._sessions.get(self.region_name)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(self.region_name)
+                if session is None:
+                    session = self._create_session()
+                    self._sessions[self.region_name] = session
+        return session
+
+    def client(self, service: str):
+        """
+        Return the cached Boto3 client for a service in this region.
+
+        :param service: The AWS service name, e.g. "dynamodb".
+        :return: A shared, thread-safe Boto3 client.
+        """
+        key = (service, self.region_name)
+        client = self._clients.get(key)
+        if client is None:
+            # Session.client is not thread-safe, so creation is serialized
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._session().client(
+                        service,
+                        endpoint_url=endpoint_url(service),
+                        config=client_config(),
+                    )
+                    self._clients[key] = client
+        return client
+
+    def resource(self, service: str):
+        """
+        Return this thread's cached Boto3 resource for a service in this region.
+
+        :param service: The AWS service name, e.g. "dynamodb".
+        :return: A Boto3 resource owned by the calling thread.
+        """
+        resources = getattr(self._local, "resources", None)
+        if resources is None:
+            resources = self._local.resources = {}
+        key = (service, self.region_name)
+        resource = resources.get(key)
+        if resource is None:
+            with self._lock:
+                resource = self._session().resource(
+                    service, endpoint_url=endpoint_url(service), config=client_config()
+                )
+            resources[key] = resource
+        return resource
+
     def dynamo(self):
         """
         Create a Boto3 DynamoDB client.
-        
-        :param kwargs: Additional keyword arguments to pass to the client.
+
         :return: A Boto3 DynamoDB client.
         """
-        session = self._create_session()
-        return session.client("dynamodb")
-    
+        return self.client("dynamodb")
+
     def dynamo_table(self, table_name: str):
         """
         Create a Boto3 DynamoDB resource for a specific table.
-        
+
         :param table_name: The name of the DynamoDB table.
         :return: A Boto3 DynamoDB resource for the specified table.
         """
-        session = self._create_session()
-        return session.resource("dynamodb").Table(table_name)
-    
+        return self.resource("dynamodb").Table(table_name)
+
     def s3(self):
         """
         Create a Boto3 S3 client.
-        
-        :param kwargs: Additional keyword arguments to pass to the client.
+
         :return: A Boto3 S3 client.
         """
-        session = self._create_session()
-        return session.client("s3")
-    
+        return self.client("s3")
+
     def cognito(self):
         """
         Create a Boto3 Cognito client.
-        
-        :param kwargs: Additional keyword arguments to pass to the client.
+
         :return: A Boto3 Cognito client.
         """
-        session = self._create_session()
-        return session.client("cognito-idp")
+        return self.client("cognito-idp")
+
+
+class AsyncAWSClientFactory:
+    """
+    Process-wide cache of aiobotocore clients.
+
+    An async client owns an aiohttp connection pool bound to the event loop
+    that created it, so clients are cached per (service, region, loop) and
+    must be released with ``close()`` before the loop stops.
+    """
+
+    _session: Optional[AioSession] = None
+    _clients: Dict[Tuple[str, Optional[str], asyncio.AbstractEventLoop], Any] = {}
+    _stacks: Dict[asyncio.AbstractEventLoop, AsyncExitStack] = {}
+    _locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+
+    def __init__(self, region_name: Optional[str] = None):
+        self.region_name = region_name or settings.region_name
+
+    @classmethod
+    def _get_session(cls) -> AioSession:
+        if cls._session is None:
+            cls._session = get_session()
+        return cls._session
+
+    async def client(self, service: str):
+        """
+        Return the cached aiobotocore client for a service in this region.
+
+        :param service: The AWS service name, e.g. "dynamodb".
+        :return: An aiobotocore client bound to the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        key = (service, self.region_name, loop)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        lock = self._locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            client = self._clients.get(key)
+            if client is None:
+                stack = self._stacks.setdefault(loop, AsyncExitStack())
+                client = await stack.enter_async_context(
+                    self._get_session().create_client(
+                        service,
+                        region_name=self.region_name,
+                        endpoint_url=endpoint_url(service),
+                        aws_access_key_id=settings.aws_access_key_id,
+                        aws_secret_access_key=settings.aws_secret_access_key,
+                        config=AioConfig(**config_options()),
+                    )
+                )
+                self._clients[key] = client
+        return client
+
+    async def dynamo(self):
+        """
+        Return the async DynamoDB client.
+
+        :return: An aiobotocore DynamoDB client.
+        """
+        return await self.client("dynamodb")
+
+    @classmethod
+    async def close(cls) -> None:
+        """
+        Close every client created on the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        stack = cls._stacks.pop(loop, None)
+        cls._locks.pop(loop, None)
+        for key in [key for key in cls._clients if key[2] is loop]:
+            del cls._clients[key]
+        if stack is not None:
+            await stack.aclose()
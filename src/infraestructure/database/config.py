@@ -10,10 +10,10 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 
 # Importa as configurações do projeto
 from configs.load_env import settings
+from infraestructure.database.pool import InstrumentedAsyncPool
 
 # Base para os modelos SQLAlchemy
 Base = declarative_base()
@@ -58,12 +58,21 @@ class DatabaseConfig:
         """
         Cria e retorna o engine assíncrono do SQLAlchemy
         Creates and returns SQLAlchemy async engine
+
+        Usa um pool de fila (``db_pool_*`` nas settings), então sessões
+        concorrentes usam conexões distintas em vez de se serializarem
+        numa conexão única.
         """
         async_url = self._get_async_database_url()
         return create_async_engine(
             async_url,
             echo=echo,
-            poolclass=StaticPool,  # Usa um pool estático para conexões assíncronas
+            poolclass=InstrumentedAsyncPool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
             future=True,  # Habilita o uso de novas APIs do SQLAlchemy
         )
 
@@ -89,14 +98,10 @@ class DatabaseConfig:
         )
 
 
-# Instância global da configuração
+# Instância global da configuração (só monta URLs; os engines do processo
+# ficam em ``infraestructure.resources`` e nascem depois do fork)
 db_config = DatabaseConfig()
 
-# Engine e SessionLocal para uso em outros módulos
-engine = db_config.get_engine()
-SessionLocal = db_config.get_session_factory()
-AsyncSessionLocal = db_config.get_async_session_factory()
-
 
 def get_database_url() -> str:
     """
@@ -105,14 +110,3 @@ def get_database_url() -> str:
     """
     return db_config.database_url
 
-
-def get_db_session():
-    """
-    Dependency para obter uma sessão de banco de dados
-    Dependency to get a database session
-    """
-    session = SessionLocal()
-    try:
-        return session
-    finally:
-        session.close()
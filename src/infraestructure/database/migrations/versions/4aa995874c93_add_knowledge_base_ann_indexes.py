@@ -0,0 +1,61 @@
+"""add_knowledge_base_ann_indexes
+
+Revision ID: 4aa995874c93
+Revises: d87c614fc5a9
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4aa995874c93'
+down_revision: Union[str, Sequence[str], None] = 'd87c614fc5a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "ai"
+TABLE = "agent_knowledge_base"
+HNSW_INDEX = f"{TABLE}_hnsw_index"
+GIN_INDEX = f"{TABLE}_content_gin_index"
+
+
+def _knowledge_table_exists() -> bool:
+    # A tabela é criada pelo agno na primeira carga da base de conhecimento
+    return sa.inspect(op.get_bind()).has_table(TABLE, schema=SCHEMA)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.execute(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}")
+
+    if not _knowledge_table_exists():
+        return
+
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        op.execute("SET maintenance_work_mem = '2GB'")
+        op.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{HNSW_INDEX}" '
+            f'ON "{SCHEMA}"."{TABLE}" USING hnsw (embedding vector_cosine_ops) '
+            f"WITH (m = 16, ef_construction = 200)"
+        )
+        op.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{GIN_INDEX}" '
+            f'ON "{SCHEMA}"."{TABLE}" '
+            f"USING GIN (to_tsvector('english', content))"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _knowledge_table_exists():
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{SCHEMA}"."{GIN_INDEX}"')
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{SCHEMA}"."{HNSW_INDEX}"')
@@ -0,0 +1,116 @@
+"""add_chat_message_counters
+
+Revision ID: 52c34806bacf
+Revises: a6da394d0b97
+Create Date: 2026-10-19 16:03:51.774120
+
+Os contadores são mantidos por um trigger em ``chat_messages``, então
+qualquer caminho que grave ou apague mensagens os mantém em dia.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '52c34806bacf'
+down_revision: Union[str, Sequence[str], None] = 'a6da394d0b97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHATS = "chats"
+MESSAGES = "chat_messages"
+HISTORY_INDEX = "ix_chat_messages_chat_id_timestamp"
+COUNTERS_FUNCTION = "chat_messages_maintain_counters"
+COUNTERS_TRIGGER = "trg_chat_messages_counters"
+
+
+def _chat_tables_exist() -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return inspector.has_table(CHATS) and inspector.has_table(MESSAGES)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _chat_tables_exist():
+        return
+
+    op.add_column(CHATS, sa.Column("last_message_at", sa.DateTime(), nullable=True))
+    op.add_column(
+        CHATS,
+        sa.Column(
+            "message_count", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+
+    # Trigger antes do backfill: o CREATE TRIGGER bloqueia escritas em
+    # chat_messages até o commit, então nenhuma mensagem fica de fora
+    # nem é contada duas vezes
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION {COUNTERS_FUNCTION}() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE "{CHATS}"
+                SET message_count = message_count + 1,
+                    last_message_at = GREATEST(last_message_at, NEW.timestamp)
+                WHERE chat_id = NEW.chat_id;
+                RETURN NEW;
+            END IF;
+            UPDATE "{CHATS}"
+            SET message_count = GREATEST(message_count - 1, 0),
+                last_message_at = CASE
+                    WHEN last_message_at > OLD.timestamp THEN last_message_at
+                    ELSE (
+                        SELECT max(timestamp) FROM "{MESSAGES}"
+                        WHERE chat_id = OLD.chat_id
+                    )
+                END
+            WHERE chat_id = OLD.chat_id;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        f'CREATE TRIGGER "{COUNTERS_TRIGGER}" '
+        f'AFTER INSERT OR DELETE ON "{MESSAGES}" '
+        f"FOR EACH ROW EXECUTE FUNCTION {COUNTERS_FUNCTION}()"
+    )
+
+    # Preenche os contadores dos chats existentes numa única passada
+    op.execute(
+        f"""
+        UPDATE "{CHATS}" AS c
+        SET message_count = m.message_count, last_message_at = m.last_message_at
+        FROM (
+            SELECT chat_id, count(*) AS message_count,
+                   max(timestamp) AS last_message_at
+            FROM "{MESSAGES}"
+            GROUP BY chat_id
+        ) AS m
+        WHERE c.chat_id = m.chat_id
+        """
+    )
+
+    # Última mensagem (LATERAL ... LIMIT 1) e páginas do histórico por chat
+    with op.get_context().autocommit_block():
+        op.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{HISTORY_INDEX}" '
+            f'ON "{MESSAGES}" (chat_id, timestamp DESC, message_id DESC)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _chat_tables_exist():
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{HISTORY_INDEX}"')
+    op.execute(f'DROP TRIGGER IF EXISTS "{COUNTERS_TRIGGER}" ON "{MESSAGES}"')
+    op.execute(f"DROP FUNCTION IF EXISTS {COUNTERS_FUNCTION}()")
+    op.drop_column(CHATS, "message_count")
+    op.drop_column(CHATS, "last_message_at")
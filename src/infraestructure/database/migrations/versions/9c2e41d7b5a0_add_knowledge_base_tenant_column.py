@@ -0,0 +1,56 @@
+"""add_knowledge_base_tenant_column
+
+Revision ID: 9c2e41d7b5a0
+Revises: 4aa995874c93
+Create Date: 2026-10-19 11:04:27.552190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2e41d7b5a0'
+down_revision: Union[str, Sequence[str], None] = '4aa995874c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "ai"
+TABLE = "agent_knowledge_base"
+TENANT_INDEX = f"{TABLE}_user_id_index"
+
+
+def _knowledge_table_exists() -> bool:
+    # A tabela é criada pelo agno na primeira carga da base de conhecimento
+    return sa.inspect(op.get_bind()).has_table(TABLE, schema=SCHEMA)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _knowledge_table_exists():
+        # Tabelas criadas depois já nascem com a coluna (KnowledgeVectorDb.create)
+        return
+
+    # Coluna gerada a partir do meta_data gravado pelo agno (reescreve a tabela)
+    op.execute(
+        f'ALTER TABLE "{SCHEMA}"."{TABLE}" ADD COLUMN IF NOT EXISTS user_id text '
+        f"GENERATED ALWAYS AS (meta_data->>'user_id') STORED"
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{TENANT_INDEX}" '
+            f'ON "{SCHEMA}"."{TABLE}" (user_id)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _knowledge_table_exists():
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{SCHEMA}"."{TENANT_INDEX}"')
+    op.execute(f'ALTER TABLE "{SCHEMA}"."{TABLE}" DROP COLUMN IF EXISTS user_id')
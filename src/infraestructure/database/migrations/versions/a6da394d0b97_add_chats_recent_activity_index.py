@@ -0,0 +1,47 @@
+"""add_chats_recent_activity_index
+
+Revision ID: a6da394d0b97
+Revises: c5f81a2e9d34
+Create Date: 2026-10-19 15:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6da394d0b97'
+down_revision: Union[str, Sequence[str], None] = 'c5f81a2e9d34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "chats"
+RECENT_ACTIVITY_INDEX = "ix_chats_user_id_updated_at_chat_id"
+
+
+def _chats_table_exists() -> bool:
+    return sa.inspect(op.get_bind()).has_table(TABLE)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _chats_table_exists():
+        return
+
+    # Serve a listagem keyset (updated_at DESC, chat_id DESC) por usuário
+    with op.get_context().autocommit_block():
+        op.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{RECENT_ACTIVITY_INDEX}" '
+            f'ON "{TABLE}" (user_id, updated_at DESC, chat_id DESC)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _chats_table_exists():
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{RECENT_ACTIVITY_INDEX}"')
@@ -0,0 +1,153 @@
+"""knowledge_embedding_precision
+
+Revision ID: c5f81a2e9d34
+Revises: 9c2e41d7b5a0
+Create Date: 2026-10-19 14:37:09.881412
+
+O layout vem de ``KNOWLEDGE_VECTOR_PRECISION`` /
+``KNOWLEDGE_EMBEDDING_DIMENSIONS`` (HNSW m=16 / ef_construction=200). Os
+valores podem ser repetidos com ``-x``, mas precisam bater com as settings:
+a aplicação consulta a coluna com o layout das settings.
+
+    alembic -c alembic.ini upgrade head -x knowledge_precision=half \\
+        -x knowledge_dimensions=1536
+
+"""
+from typing import List, Optional, Sequence, Tuple, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from configs.load_env import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f81a2e9d34'
+down_revision: Union[str, Sequence[str], None] = '9c2e41d7b5a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = "ai"
+TABLE = "agent_knowledge_base"
+HNSW_INDEX = f"{TABLE}_hnsw_index"
+PRECISIONS = ("full", "half", "binary")
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+
+
+def _arguments() -> Tuple[str, int]:
+    arguments = context.get_x_argument(as_dictionary=True)
+    configured = settings.knowledge_vector_precision.lower()
+    precision = arguments.get("knowledge_precision", configured).lower()
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unsupported knowledge_precision: {precision}")
+    if precision != configured:
+        # Coluna num layout e consultas em outro quebram a busca em runtime
+        raise ValueError(
+            f"knowledge_precision={precision} does not match "
+            f"KNOWLEDGE_VECTOR_PRECISION={configured}"
+        )
+    configured_dimensions = settings.knowledge_embedding_dimensions
+    dimensions = int(arguments.get("knowledge_dimensions", configured_dimensions))
+    if dimensions != configured_dimensions:
+        raise ValueError(
+            f"knowledge_dimensions={dimensions} does not match "
+            f"KNOWLEDGE_EMBEDDING_DIMENSIONS={configured_dimensions}"
+        )
+    return precision, dimensions
+
+
+def _index_key(precision: str, dimensions: int) -> str:
+    if precision == "half":
+        return "embedding halfvec_cosine_ops"
+    if precision == "binary":
+        return f"(binary_quantize(embedding)::bit({dimensions})) bit_hamming_ops"
+    return "embedding vector_cosine_ops"
+
+
+def _knowledge_table_exists() -> bool:
+    # A tabela é criada pelo agno na primeira carga da base de conhecimento
+    return sa.inspect(op.get_bind()).has_table(TABLE, schema=SCHEMA)
+
+
+def _vector_indexes() -> List[Tuple[str, Optional[str]]]:
+    # (nome, predicado) dos índices ANN; os parciais por tenant têm predicado
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname, pg_get_expr(i.indpred, i.indrelid) "
+            "FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "JOIN pg_am am ON am.oid = c.relam "
+            "WHERE i.indrelid = to_regclass(:table) "
+            "AND am.amname IN ('hnsw', 'ivfflat')"
+        ),
+        {"table": f"{SCHEMA}.{TABLE}"},
+    ).all()
+    return [(row[0], row[1]) for row in rows]
+
+
+def _drop_vector_indexes() -> List[Tuple[str, str]]:
+    # Índices ANN dependem do tipo da coluna; os parciais são devolvidos para
+    # serem recriados com o novo operator class
+    indexes = _vector_indexes()
+    with op.get_context().autocommit_block():
+        for index, _ in indexes:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{SCHEMA}"."{index}"')
+    return [(index, predicate) for index, predicate in indexes if predicate]
+
+
+def _create_hnsw_index(name: str, key: str, predicate: Optional[str] = None) -> None:
+    where = f" WHERE {predicate}" if predicate else ""
+    with op.get_context().autocommit_block():
+        op.execute("SET maintenance_work_mem = '2GB'")
+        op.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+            f'ON "{SCHEMA}"."{TABLE}" USING hnsw ({key}) '
+            f"WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION}){where}"
+        )
+
+
+def _rebuild_vector_indexes(
+    precision: str, dimensions: int, tenant_indexes: List[Tuple[str, str]]
+) -> None:
+    key = _index_key(precision, dimensions)
+    _create_hnsw_index(HNSW_INDEX, key)
+    for index, predicate in tenant_indexes:
+        _create_hnsw_index(index, key, predicate)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    precision, dimensions = _arguments()
+    if not _knowledge_table_exists():
+        return
+
+    if precision == "full":
+        # Coluna e índices de 4aa995874c93 já servem; só garante o global
+        if not any(predicate is None for _, predicate in _vector_indexes()):
+            _create_hnsw_index(HNSW_INDEX, _index_key(precision, dimensions))
+        return
+
+    tenant_indexes = _drop_vector_indexes()
+    if precision == "half":
+        # Reescreve a tabela convertendo os embeddings existentes
+        op.execute(
+            f'ALTER TABLE "{SCHEMA}"."{TABLE}" ALTER COLUMN embedding '
+            f"TYPE halfvec({dimensions}) USING embedding::halfvec({dimensions})"
+        )
+    # No binário os vetores completos permanecem na tabela para o rescoring
+    _rebuild_vector_indexes(precision, dimensions, tenant_indexes)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _, dimensions = _arguments()
+    if not _knowledge_table_exists():
+        return
+
+    tenant_indexes = _drop_vector_indexes()
+    op.execute(
+        f'ALTER TABLE "{SCHEMA}"."{TABLE}" ALTER COLUMN embedding '
+        f"TYPE vector({dimensions}) USING embedding::vector({dimensions})"
+    )
+    _rebuild_vector_indexes("full", dimensions, tenant_indexes)
@@ -0,0 +1,41 @@
+"""add_auth_revocations
+
+Revision ID: e3a9c71f4b2d
+Revises: 52c34806bacf
+Create Date: 2026-10-19 18:12:40.216583
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9c71f4b2d'
+down_revision: Union[str, Sequence[str], None] = '52c34806bacf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "auth_revocations"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        TABLE,
+        sa.Column("kind", sa.String(length=8), nullable=False),
+        sa.Column("subject", sa.String(length=255), nullable=False),
+        sa.Column("revoked_at", sa.Float(), nullable=False),
+        sa.Column("expires_at", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("kind", "subject"),
+    )
+    op.create_index(
+        op.f("ix_auth_revocations_expires_at"), TABLE, ["expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_auth_revocations_expires_at"), table_name=TABLE)
+    op.drop_table(TABLE)
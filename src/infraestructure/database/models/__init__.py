@@ -4,6 +4,7 @@ SQLAlchemy models for the database
 """
 
 from .agent import Agent
+from .auth_revocation import AuthRevocationModel
 from .chat_model import ChatMessageModel, ChatModel
 
-__all__ = ["Agent", "ChatModel", "ChatMessageModel"]
+__all__ = ["Agent", "AuthRevocationModel", "ChatModel", "ChatMessageModel"]
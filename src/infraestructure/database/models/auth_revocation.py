@@ -0,0 +1,25 @@
+"""
+Modelo SQLAlchemy das revogações de tokens
+SQLAlchemy model for token revocations
+"""
+
+from sqlalchemy import Column, Float, String
+
+from infraestructure.database.config import Base
+
+
+class AuthRevocationModel(Base):
+    """
+    Revogação compartilhada entre workers (logout global ou token único)
+    Revocation shared across workers (global sign-out or single token)
+    """
+
+    __tablename__ = "auth_revocations"
+
+    kind = Column(String(8), primary_key=True, nullable=False)  # "user" | "token"
+    subject = Column(String(255), primary_key=True, nullable=False)  # sub ou jti
+    revoked_at = Column(Float, nullable=False)  # epoch, segundos inteiros
+    expires_at = Column(Float, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<AuthRevocationModel(kind='{self.kind}', subject='{self.subject}')>"
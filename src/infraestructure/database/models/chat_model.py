@@ -6,7 +6,16 @@ SQLAlchemy model for chat and chat messages
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 
 from infraestructure.database.config import Base
@@ -29,6 +38,19 @@ class ChatModel(Base):
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
+    # Desnormalizados, mantidos a cada mensagem inserida
+    last_message_at = Column(DateTime, nullable=True)
+    message_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+    # Listagem por atividade recente com paginação keyset
+    __table_args__ = (
+        Index(
+            "ix_chats_user_id_updated_at_chat_id",
+            "user_id",
+            updated_at.desc(),
+            chat_id.desc(),
+        ),
+    )
 
     # Relacionamento com mensagens
     messages = relationship(
@@ -57,6 +79,16 @@ class ChatMessageModel(Base):
     content = Column(Text, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Histórico e última mensagem de um chat em ordem de envio
+    __table_args__ = (
+        Index(
+            "ix_chat_messages_chat_id_timestamp",
+            "chat_id",
+            timestamp.desc(),
+            message_id.desc(),
+        ),
+    )
+
     # Relacionamento com chat
     chat = relationship("ChatModel", back_populates="messages")
 
@@ -0,0 +1,66 @@
+"""
+Pool de conexões assíncrono instrumentado.
+Instrumented async connection pool.
+"""
+
+import time
+from typing import Any, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from infraestructure.telemetry.metrics import MetricsRegistry, get_metrics_registry
+
+POOL_METRIC_PREFIX = "db_pool"
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    ``AsyncAdaptedQueuePool`` que publica a espera por conexão e a ocupação.
+    ``AsyncAdaptedQueuePool`` that publishes connection wait and utilization.
+
+    - ``db_pool.checkout_wait_ms``: tempo até obter uma conexão (sumário);
+    - ``db_pool.checkout_timeouts``: esperas que estouraram ``pool_timeout``;
+    - ``db_pool.checked_out`` e ``db_pool.utilization``: conexões em uso e a
+      fração de ``pool_size + max_overflow`` ocupada (gauges).
+    """
+
+    metrics: Optional[MetricsRegistry] = None
+
+    def _registry(self) -> MetricsRegistry:
+        return self.metrics or get_metrics_registry()
+
+    def metric(self, suffix: str) -> str:
+        return f"{POOL_METRIC_PREFIX}.{suffix}"
+
+    @property
+    def capacity(self) -> int:
+        return self.size() + max(self._max_overflow, 0)
+
+    def _update_gauges(self) -> None:
+        checked_out = self.checkedout()
+        metrics = self._registry()
+        metrics.set_gauge(self.metric("checked_out"), checked_out)
+        metrics.set_gauge(
+            self.metric("utilization"),
+            round(checked_out / self.capacity, 4) if self.capacity else 1.0,
+        )
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self._registry().increment(self.metric("checkout_timeouts"))
+            raise
+        finally:
+            self._registry().observe(
+                self.metric("checkout_wait_ms"),
+                (time.perf_counter() - started) * 1000,
+            )
+        self._update_gauges()
+        return record
+
+    def _do_return_conn(self, record: Any) -> None:
+        super()._do_return_conn(record)
+        self._update_gauges()
@@ -0,0 +1,22 @@
+"""
+Base de conhecimento dos agentes.
+Agent knowledge base.
+"""
+
+from .index_manager import KnowledgeIndexManager
+from .reranker import BM25Reranker, get_reranker
+from .retriever import KnowledgeRetriever
+from .tenant_search import TenantKnowledgeSearch, get_tenant_search
+from .vector_store import SearchProfile, get_knowledge_base, get_search_profile
+
+__all__ = [
+    "BM25Reranker",
+    "KnowledgeIndexManager",
+    "KnowledgeRetriever",
+    "SearchProfile",
+    "TenantKnowledgeSearch",
+    "get_knowledge_base",
+    "get_reranker",
+    "get_search_profile",
+    "get_tenant_search",
+]
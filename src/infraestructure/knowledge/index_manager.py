@@ -0,0 +1,436 @@
+"""
+Gerenciamento dos índices ANN e full-text da base de conhecimento.
+ANN and full-text index management for the knowledge base.
+"""
+
+import logging
+import math
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from configs.load_env import settings
+from core.exceptions import DatabaseException
+from infraestructure.knowledge.vector_store import (
+    KNOWLEDGE_CONTENT_LANGUAGE,
+    KNOWLEDGE_SCHEMA,
+    KNOWLEDGE_TABLE_NAME,
+    KNOWLEDGE_TENANT_COLUMN,
+    TENANT_INDEX_PREFIX,
+    VectorLayout,
+    get_knowledge_engine,
+    get_vector_layout,
+    tenant_column_sql,
+    tenant_index_name,
+    vector_index_name,
+)
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_INDEX_TYPES = ("hnsw", "ivfflat")
+
+
+class KnowledgeIndexManager:
+    """
+    Cria, reconstrói e inspeciona os índices da tabela de conhecimento.
+    Creates, rebuilds and inspects the knowledge table indexes.
+
+    Todos os índices são criados com ``CONCURRENTLY`` para não bloquear
+    escritas durante o build, por isso as operações rodam em autocommit.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        schema: str = KNOWLEDGE_SCHEMA,
+        table_name: str = KNOWLEDGE_TABLE_NAME,
+        index_type: Optional[str] = None,
+        maintenance_work_mem: str = "2GB",
+        layout: Optional[VectorLayout] = None,
+    ):
+        self.engine = engine or get_knowledge_engine()
+        self.schema = schema
+        self.table_name = table_name
+        self.index_type = (index_type or settings.knowledge_index_type).lower()
+        self.maintenance_work_mem = maintenance_work_mem
+        self.layout = layout or get_vector_layout()
+
+        if self.index_type not in SUPPORTED_INDEX_TYPES:
+            raise ValueError(f"Unsupported knowledge index type: {self.index_type}")
+
+    @property
+    def table_fullname(self) -> str:
+        return f'"{self.schema}"."{self.table_name}"'
+
+    @property
+    def vector_index_name(self) -> str:
+        return vector_index_name(self.index_type)
+
+    @property
+    def fulltext_index_name(self) -> str:
+        return f"{self.table_name}_content_gin_index"
+
+    @property
+    def tenant_btree_index_name(self) -> str:
+        return f"{self.table_name}_{KNOWLEDGE_TENANT_COLUMN}_index"
+
+    @staticmethod
+    def ivfflat_lists(row_count: int) -> int:
+        """
+        Número de listas recomendado pelo pgvector para o volume da tabela.
+        Number of lists recommended by pgvector for the table size.
+        """
+        if settings.knowledge_ivfflat_lists:
+            return settings.knowledge_ivfflat_lists
+        if row_count <= 1_000_000:
+            return max(row_count // 1000, 10)
+        return max(int(math.sqrt(row_count)), 10)
+
+    def vector_index_sql(
+        self, name: str, row_count: int = 0, where: Optional[str] = None
+    ) -> str:
+        """
+        SQL de criação concorrente do índice vetorial (parcial se ``where``).
+        SQL for the concurrent vector index build (partial when ``where``).
+        """
+        key = f"{self.layout.index_expression} {self.layout.operator_class}"
+        if self.index_type == "hnsw":
+            sql = (
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+                f"ON {self.table_fullname} USING hnsw ({key}) "
+                f"WITH (m = {settings.knowledge_hnsw_m}, "
+                f"ef_construction = {settings.knowledge_hnsw_ef_construction})"
+            )
+        else:
+            sql = (
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+                f"ON {self.table_fullname} USING ivfflat ({key}) "
+                f"WITH (lists = {self.ivfflat_lists(row_count)})"
+            )
+        return f"{sql} WHERE {where}" if where else sql
+
+    @staticmethod
+    def tenant_predicate(user_id: str) -> str:
+        """
+        Predicado literal do índice parcial; a consulta precisa repeti-lo
+        com o mesmo valor para que o planner consiga usar o índice.
+        """
+        escaped = user_id.replace("'", "''")
+        return f"{KNOWLEDGE_TENANT_COLUMN} = '{escaped}'"
+
+    def tenant_column_sql(self) -> str:
+        return tenant_column_sql(self.table_fullname)
+
+    def tenant_btree_index_sql(self) -> str:
+        return (
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{self.tenant_btree_index_name}" '
+            f"ON {self.table_fullname} ({KNOWLEDGE_TENANT_COLUMN})"
+        )
+
+    def fulltext_index_sql(self) -> str:
+        """
+        SQL do índice GIN usado pela metade keyword da busca híbrida.
+        SQL for the GIN index used by the keyword half of hybrid search.
+
+        A expressão precisa ser idêntica à usada pelo agno na consulta
+        (``to_tsvector('english', content)``) para o planner usá-la.
+        """
+        return (
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{self.fulltext_index_name}" '
+            f"ON {self.table_fullname} "
+            f"USING GIN (to_tsvector('{KNOWLEDGE_CONTENT_LANGUAGE}', content))"
+        )
+
+    def _autocommit(self) -> Connection:
+        return self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+    def _prepare_session(self, connection: Connection) -> None:
+        connection.execute(
+            text(f"SET maintenance_work_mem = '{self.maintenance_work_mem}'")
+        )
+
+    def table_exists(self) -> bool:
+        with self.engine.connect() as connection:
+            return bool(
+                connection.execute(
+                    text("SELECT to_regclass(:table) IS NOT NULL"),
+                    {"table": f"{self.schema}.{self.table_name}"},
+                ).scalar()
+            )
+
+    def row_count(self) -> int:
+        """
+        Estimativa de linhas via estatísticas do planner (evita COUNT(*)).
+        Row estimate from planner statistics (avoids COUNT(*)).
+        """
+        with self.engine.connect() as connection:
+            estimate = connection.execute(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = to_regclass(:table)"
+                ),
+                {"table": f"{self.schema}.{self.table_name}"},
+            ).scalar()
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+            return int(
+                connection.execute(
+                    text(f"SELECT count(*) FROM {self.table_fullname}")
+                ).scalar()
+                or 0
+            )
+
+    def index_status(self) -> List[Dict[str, Any]]:
+        """
+        Lista os índices da tabela com tamanho e validade.
+        Lists the table indexes with size and validity.
+        """
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                text(
+                    "SELECT c.relname AS name, i.indisvalid AS valid, "
+                    "pg_relation_size(c.oid) AS size_bytes, "
+                    "pg_get_indexdef(c.oid) AS definition "
+                    "FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                    "WHERE i.indrelid = to_regclass(:table) ORDER BY c.relname"
+                ),
+                {"table": f"{self.schema}.{self.table_name}"},
+            ).mappings()
+            return [dict(row) for row in rows]
+
+    def _drop_invalid_indexes(self, connection: Connection) -> None:
+        """
+        Remove índices inválidos deixados por builds concorrentes interrompidos.
+        Drops invalid indexes left behind by interrupted concurrent builds.
+        """
+        for index in self.index_status():
+            if not index["valid"]:
+                logger.warning(f"Dropping invalid knowledge index: {index['name']}")
+                connection.execute(
+                    text(
+                        f'DROP INDEX CONCURRENTLY IF EXISTS "{self.schema}"."{index["name"]}"'
+                    )
+                )
+
+    def create_indexes(self) -> Dict[str, str]:
+        """
+        Cria os índices vetorial e full-text caso ainda não existam.
+        Creates the vector and full-text indexes when missing.
+        """
+        try:
+            if not self.table_exists():
+                logger.warning(
+                    f"Knowledge table {self.table_fullname} does not exist yet, skipping"
+                )
+                return {}
+
+            row_count = self.row_count()
+            with self._autocommit() as connection:
+                self._drop_invalid_indexes(connection)
+                self._prepare_session(connection)
+                connection.execute(
+                    text(self.vector_index_sql(self.vector_index_name, row_count))
+                )
+                connection.execute(text(self.fulltext_index_sql()))
+                connection.execute(text(self.tenant_column_sql()))
+                connection.execute(text(self.tenant_btree_index_sql()))
+
+            logger.info(
+                f"Knowledge indexes ready: {self.vector_index_name}, {self.fulltext_index_name}"
+            )
+            return {
+                "vector_index": self.vector_index_name,
+                "fulltext_index": self.fulltext_index_name,
+                "tenant_index": self.tenant_btree_index_name,
+            }
+        except Exception as e:
+            logger.error(f"Failed to create knowledge indexes: {str(e)}")
+            raise DatabaseException(
+                operation="create_knowledge_indexes",
+                table=f"{self.schema}.{self.table_name}",
+                details={"error": str(e), "index_type": self.index_type},
+                error_code="KNOWLEDGE_INDEX_CREATION_ERROR",
+            ) from e
+
+    def rebuild_vector_index(self) -> str:
+        """
+        Reconstrói o índice vetorial sem indisponibilidade.
+        Rebuilds the vector index without downtime.
+
+        Um novo índice é construído concorrentemente ao lado do atual e só
+        então trocado; índices do outro tipo (hnsw/ivfflat) são removidos.
+        """
+        temporary_name = f"{self.vector_index_name}_rebuild"
+        try:
+            row_count = self.row_count()
+            with self._autocommit() as connection:
+                self._drop_invalid_indexes(connection)
+                self._prepare_session(connection)
+                connection.execute(
+                    text(self.vector_index_sql(temporary_name, row_count))
+                )
+
+                for index_type in SUPPORTED_INDEX_TYPES:
+                    connection.execute(
+                        text(
+                            f"DROP INDEX CONCURRENTLY IF EXISTS "
+                            f'"{self.schema}"."{vector_index_name(index_type)}"'
+                        )
+                    )
+
+                connection.execute(
+                    text(
+                        f'ALTER INDEX "{self.schema}"."{temporary_name}" '
+                        f'RENAME TO "{self.vector_index_name}"'
+                    )
+                )
+
+            logger.info(f"Knowledge vector index rebuilt: {self.vector_index_name}")
+            return self.vector_index_name
+        except Exception as e:
+            logger.error(f"Failed to rebuild knowledge vector index: {str(e)}")
+            raise DatabaseException(
+                operation="rebuild_knowledge_vector_index",
+                table=f"{self.schema}.{self.table_name}",
+                details={"error": str(e), "index_type": self.index_type},
+                error_code="KNOWLEDGE_INDEX_REBUILD_ERROR",
+            ) from e
+
+    def tenant_row_counts(self, min_rows: int = 0) -> Dict[str, int]:
+        """
+        Quantidade de chunks por tenant (usa o índice btree de user_id).
+        Chunk count per tenant (served by the user_id btree index).
+        """
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                text(
+                    f"SELECT {KNOWLEDGE_TENANT_COLUMN} AS user_id, count(*) AS total "
+                    f"FROM {self.table_fullname} "
+                    f"WHERE {KNOWLEDGE_TENANT_COLUMN} IS NOT NULL "
+                    f"GROUP BY {KNOWLEDGE_TENANT_COLUMN} HAVING count(*) >= :min_rows"
+                ),
+                {"min_rows": min_rows},
+            ).mappings()
+            return {row["user_id"]: int(row["total"]) for row in rows}
+
+    def create_tenant_index(self, user_id: str, row_count: int = 0) -> str:
+        """
+        Cria o índice ANN parcial dedicado a um tenant grande.
+        Creates the partial ANN index dedicated to a large tenant.
+        """
+        name = tenant_index_name(user_id)
+        try:
+            with self._autocommit() as connection:
+                self._prepare_session(connection)
+                connection.execute(
+                    text(
+                        self.vector_index_sql(
+                            name, row_count, where=self.tenant_predicate(user_id)
+                        )
+                    )
+                )
+            logger.info(f"Tenant knowledge index ready: {name}")
+            return name
+        except Exception as e:
+            logger.error(f"Failed to create tenant knowledge index: {str(e)}")
+            raise DatabaseException(
+                operation="create_tenant_knowledge_index",
+                table=f"{self.schema}.{self.table_name}",
+                details={"error": str(e), "index_name": name},
+                error_code="KNOWLEDGE_TENANT_INDEX_CREATION_ERROR",
+            ) from e
+
+    def sync_tenant_indexes(self, threshold: Optional[int] = None) -> List[str]:
+        """
+        Garante um índice parcial para cada tenant acima do limite.
+        Ensures a partial index for every tenant above the threshold.
+
+        Tenants pequenos são atendidos pelo btree de user_id com ordenação
+        exata, então nunca percorrem o grafo de um tenant grande.
+        """
+        threshold = threshold or settings.knowledge_tenant_index_threshold
+        existing = {index["name"] for index in self.index_status()}
+        created = []
+        for user_id, total in self.tenant_row_counts(threshold).items():
+            if tenant_index_name(user_id) not in existing:
+                created.append(self.create_tenant_index(user_id, total))
+        return created
+
+    def column_type(self) -> str:
+        """Tipo atual da coluna de embedding / Current embedding column type"""
+        with self.engine.connect() as connection:
+            return connection.execute(
+                text(
+                    "SELECT format_type(a.atttypid, a.atttypmod) FROM pg_attribute a "
+                    "WHERE a.attrelid = to_regclass(:table) AND a.attname = 'embedding'"
+                ),
+                {"table": f"{self.schema}.{self.table_name}"},
+            ).scalar()
+
+    def convert_precision(self) -> str:
+        """
+        Converte a coluna de embedding para o layout configurado e recria os índices.
+        Converts the embedding column to the configured layout and rebuilds the indexes.
+
+        A troca de tipo reescreve a tabela sob lock exclusivo, então os índices
+        vetoriais (cujo operator class depende do tipo) são removidos antes.
+        Sem troca de tipo (full <-> binary) o índice global é reconstruído sem
+        downtime e apenas os índices de tenant desatualizados são removidos.
+        """
+        target = self.layout.column_type
+        try:
+            vector_indexes = self._vector_indexes()
+            if self.column_type() != target:
+                stale = [index["name"] for index in vector_indexes]
+            else:
+                stale = [
+                    index["name"]
+                    for index in vector_indexes
+                    if index["name"].startswith(TENANT_INDEX_PREFIX)
+                    and self.layout.operator_class not in index["definition"]
+                ]
+
+            with self._autocommit() as connection:
+                for index_name in stale:
+                    connection.execute(
+                        text(
+                            f'DROP INDEX CONCURRENTLY IF EXISTS "{self.schema}"."{index_name}"'
+                        )
+                    )
+
+            if self.column_type() != target:
+                with self.engine.begin() as connection:
+                    connection.execute(
+                        text(
+                            f"ALTER TABLE {self.table_fullname} ALTER COLUMN embedding "
+                            f"TYPE {target} USING embedding::{target}"
+                        )
+                    )
+                logger.info(f"Knowledge embeddings converted to {target}")
+
+            self.rebuild_vector_index()
+            for user_id, total in self.tenant_row_counts(
+                settings.knowledge_tenant_index_threshold
+            ).items():
+                self.create_tenant_index(user_id, total)
+            return target
+        except DatabaseException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to convert knowledge embeddings: {str(e)}")
+            raise DatabaseException(
+                operation="convert_knowledge_precision",
+                table=f"{self.schema}.{self.table_name}",
+                details={"error": str(e), "precision": self.layout.precision},
+                error_code="KNOWLEDGE_PRECISION_CONVERSION_ERROR",
+            ) from e
+
+    def _vector_indexes(self) -> List[Dict[str, Any]]:
+        """Índices ANN (global e por tenant) da tabela"""
+        return [
+            index
+            for index in self.index_status()
+            if " USING hnsw " in index["definition"]
+            or " USING ivfflat " in index["definition"]
+        ]
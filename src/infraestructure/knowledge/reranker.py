@@ -0,0 +1,308 @@
+"""
+Reranker BM25 local para os chunks recuperados da base de conhecimento.
+Local BM25 reranker for chunks retrieved from the knowledge base.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from agno.document import Document
+
+from configs.load_env import settings
+from infraestructure.telemetry.metrics import MetricsRegistry, get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = frozenset(
+    {
+        "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how",
+        "in", "is", "it", "of", "on", "or", "that", "the", "this", "to", "was",
+        "what", "when", "where", "which", "who", "why", "with",
+        "o", "os", "um", "uma", "de", "do", "da", "dos", "das", "e", "em",
+        "no", "na", "nos", "nas", "que", "para", "por", "com", "se", "como",
+    }
+)
+
+CONTEXT_TOKENS = "knowledge.rerank.context_tokens"
+TOKENS_SAVED = "knowledge.rerank.tokens_saved"
+CHUNKS_DROPPED = "knowledge.rerank.chunks_dropped"
+
+TokenCounter = Callable[[str], int]
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokenização léxica usada pelo BM25 / Lexical tokenization used by BM25"""
+    return [
+        token
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+@lru_cache()
+def _tiktoken_counter() -> TokenCounter:
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, estimating prompt tokens: {e}")
+        return lambda text: max(len(text) // 4, 1)
+
+
+def count_prompt_tokens(text: str) -> int:
+    """Conta tokens de prompt (cl100k) / Counts prompt tokens (cl100k)"""
+    return _tiktoken_counter()(text)
+
+
+class _CachedChunk:
+    __slots__ = ("term_ids", "counts", "length", "prompt_tokens")
+
+    def __init__(
+        self, term_ids: np.ndarray, counts: np.ndarray, length: int, prompt_tokens: int
+    ):
+        self.term_ids = term_ids
+        self.counts = counts
+        self.length = length
+        self.prompt_tokens = prompt_tokens
+
+
+class TermStatisticsIndex:
+    """
+    Índice de estatísticas de termos com cache LRU por conteúdo do chunk.
+    Term-statistics index with an LRU cache keyed by chunk content.
+
+    Cada chunk é tokenizado uma única vez; as frequências de documento (df)
+    e o comprimento médio são mantidos incrementalmente sobre os chunks em
+    cache, o que aproxima as estatísticas do corpus sem varrer a tabela.
+
+    O vocabulário também é limitado: acima de ``max_terms`` termos vivos os
+    chunks mais antigos são evictados, e os termos que deixam de aparecer em
+    qualquer chunk em cache são descartados numa compactação que renumera os
+    IDs (e incrementa ``generation``).
+    """
+
+    def __init__(
+        self,
+        max_chunks: int = 4096,
+        token_counter: Optional[TokenCounter] = None,
+        max_terms: int = 200_000,
+    ):
+        self.max_chunks = max_chunks
+        self.max_terms = max_terms
+        self.token_counter = token_counter or count_prompt_tokens
+        self.vocabulary: Dict[str, int] = {}
+        self.generation = 0
+        self._document_frequency = np.zeros(1024, dtype=np.float64)
+        self._chunks: "OrderedDict[str, _CachedChunk]" = OrderedDict()
+        self._total_length = 0
+        self._live_terms = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def average_length(self) -> float:
+        return self._total_length / len(self._chunks) if self._chunks else 0.0
+
+    def _term_id(self, term: str) -> int:
+        term_id = self.vocabulary.get(term)
+        if term_id is None:
+            term_id = self.vocabulary[term] = len(self.vocabulary)
+            if term_id >= len(self._document_frequency):
+                self._document_frequency = np.concatenate(
+                    [self._document_frequency, np.zeros_like(self._document_frequency)]
+                )
+        return term_id
+
+    def chunk(self, content: str) -> _CachedChunk:
+        """
+        Retorna o vetor de termos do chunk, indexando-o se necessário.
+        Returns the chunk term vector, indexing it when needed.
+        """
+        key = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        with self._lock:
+            cached = self._chunks.get(key)
+            if cached is not None:
+                self._chunks.move_to_end(key)
+                return cached
+
+            tokens = tokenize(content)
+            ids = np.fromiter(
+                (self._term_id(token) for token in tokens), dtype=np.int64, count=len(tokens)
+            )
+            term_ids, counts = np.unique(ids, return_counts=True)
+            cached = _CachedChunk(
+                term_ids=term_ids,
+                counts=counts.astype(np.float64),
+                length=len(tokens),
+                prompt_tokens=self.token_counter(content),
+            )
+            self._chunks[key] = cached
+            self._document_frequency[term_ids] += 1
+            self._live_terms += int(np.count_nonzero(self._document_frequency[term_ids] == 1))
+            self._total_length += cached.length
+
+            while len(self._chunks) > self.max_chunks or (
+                self._live_terms > self.max_terms and len(self._chunks) > 1
+            ):
+                self._evict()
+            if len(self.vocabulary) > 2 * self.max_terms:
+                self._compact()
+            return cached
+
+    def _evict(self) -> None:
+        _, evicted = self._chunks.popitem(last=False)
+        self._document_frequency[evicted.term_ids] -= 1
+        self._live_terms -= int(np.count_nonzero(self._document_frequency[evicted.term_ids] == 0))
+        self._total_length -= evicted.length
+
+    def _compact(self) -> None:
+        """Descarta termos sem nenhum chunk em cache e renumera os IDs"""
+        size = len(self.vocabulary)
+        live = self._document_frequency[:size] > 0
+        remap = np.cumsum(live) - 1
+        self.vocabulary = {
+            term: int(remap[term_id]) for term, term_id in self.vocabulary.items() if live[term_id]
+        }
+        for cached in self._chunks.values():
+            # O remapeamento é monotônico, então os IDs continuam ordenados
+            cached.term_ids = remap[cached.term_ids]
+        frequency = self._document_frequency[:size][live]
+        self._document_frequency = np.zeros(max(1024, 2 * frequency.size), dtype=np.float64)
+        self._document_frequency[: frequency.size] = frequency
+        self.generation += 1
+
+    def query_terms(self, query: str) -> np.ndarray:
+        """IDs ordenados dos termos conhecidos da consulta"""
+        with self._lock:
+            ids = [self.vocabulary[t] for t in tokenize(query) if t in self.vocabulary]
+        return np.unique(np.asarray(ids, dtype=np.int64))
+
+    def idf(self, term_ids: np.ndarray) -> np.ndarray:
+        """IDF do BM25 (variante sempre positiva) / BM25 IDF (non-negative variant)"""
+        with self._lock:
+            total = len(self._chunks)
+            frequency = self._document_frequency[term_ids]
+        return np.log1p((total - frequency + 0.5) / (frequency + 0.5))
+
+
+class BM25Reranker:
+    """
+    Reordena candidatos com BM25 e corta pelo orçamento de tokens.
+    Reorders candidates with BM25 and trims them to a token budget.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        token_budget: int = 1500,
+        index: Optional[TermStatisticsIndex] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.token_budget = token_budget
+        self.index = index or TermStatisticsIndex()
+        self.metrics = metrics or get_metrics_registry()
+
+    def score(self, query: str, contents: Sequence[str]) -> np.ndarray:
+        """
+        Pontuação BM25 vetorizada de todos os candidatos.
+        Vectorized BM25 score for every candidate.
+        """
+        while True:
+            # Uma compactação do vocabulário no meio do cálculo renumera os IDs
+            generation = self.index.generation
+            scores = self._score(query, contents)
+            if self.index.generation == generation:
+                return scores
+
+    def _score(self, query: str, contents: Sequence[str]) -> np.ndarray:
+        chunks = [self.index.chunk(content) for content in contents]
+        query_terms = self.index.query_terms(query)
+        if not chunks or query_terms.size == 0:
+            return np.zeros(len(chunks))
+
+        # Matriz (candidatos x termos da consulta) montada num único searchsorted
+        rows = np.repeat(np.arange(len(chunks)), [c.term_ids.size for c in chunks])
+        term_ids = np.concatenate([c.term_ids for c in chunks])
+        counts = np.concatenate([c.counts for c in chunks])
+        positions = np.minimum(np.searchsorted(query_terms, term_ids), query_terms.size - 1)
+        hits = query_terms[positions] == term_ids
+
+        frequencies = np.zeros((len(chunks), query_terms.size))
+        frequencies[rows[hits], positions[hits]] = counts[hits]
+
+        lengths = np.array([c.length for c in chunks], dtype=np.float64)
+        average = self.index.average_length or 1.0
+        norm = self.k1 * (1 - self.b + self.b * lengths / average)
+        weights = frequencies * (self.k1 + 1) / (frequencies + norm[:, None])
+        return weights @ self.index.idf(query_terms)
+
+    def rerank(
+        self,
+        query: str,
+        documents: List[Document],
+        top_k: Optional[int] = None,
+        token_budget: Optional[int] = None,
+    ) -> List[Document]:
+        """
+        Retorna os melhores documentos que cabem no orçamento de tokens.
+        Returns the best documents that fit the token budget.
+
+        Candidatos sem nenhuma correspondência léxica são descartados quando
+        ao menos um candidato corresponde; empates preservam a ordem vetorial.
+        """
+        if not documents:
+            return []
+
+        top_k = top_k or len(documents)
+        budget = token_budget or self.token_budget
+        contents = [document.content or "" for document in documents]
+        scores = self.score(query, contents)
+
+        order = np.argsort(-scores, kind="stable")
+        if scores.size and scores.max() > 0:
+            order = order[scores[order] > 0]
+
+        selected: List[Document] = []
+        used = 0
+        for position in order:
+            if len(selected) >= top_k:
+                break
+            tokens = self.index.chunk(contents[position]).prompt_tokens
+            if selected and used + tokens > budget:
+                continue
+            selected.append(documents[position])
+            used += tokens
+
+        baseline = sum(
+            self.index.chunk(content).prompt_tokens for content in contents[:top_k]
+        )
+        self.metrics.observe(CONTEXT_TOKENS, used)
+        self.metrics.increment(TOKENS_SAVED, max(baseline - used, 0))
+        self.metrics.increment(CHUNKS_DROPPED, len(documents) - len(selected))
+        return selected
+
+
+@lru_cache()
+def get_reranker() -> BM25Reranker:
+    """Reranker compartilhado, para reaproveitar o cache de estatísticas"""
+    return BM25Reranker(
+        token_budget=settings.knowledge_context_token_budget,
+        index=TermStatisticsIndex(
+            max_chunks=settings.knowledge_rerank_cache_size,
+            max_terms=settings.knowledge_rerank_max_terms,
+        ),
+    )
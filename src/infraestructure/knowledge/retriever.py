@@ -0,0 +1,120 @@
+"""
+Retriever lazy e sensível à intenção para a base de conhecimento.
+Lazy, intent-aware retriever for the knowledge base.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from agno.knowledge.agent import AgentKnowledge
+
+from infraestructure.knowledge.reranker import BM25Reranker
+from infraestructure.knowledge.tenant_search import TenantKnowledgeSearch
+from infraestructure.knowledge.vector_store import INTERACTIVE, get_knowledge_base
+from infraestructure.telemetry.metrics import MetricsRegistry, get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+RETRIEVALS_PERFORMED = "knowledge.retrievals.performed"
+RETRIEVALS_AVOIDED = "knowledge.retrievals.avoided"
+ATTACHMENTS_SKIPPED = "knowledge.attachments.skipped"
+RETRIEVAL_LATENCY_MS = "knowledge.retrieval.latency_ms"
+LATENCY_SAVED_MS = "knowledge.retrieval.latency_saved_ms"
+
+
+class KnowledgeRetriever:
+    """
+    Retriever do agno que só toca o vector store quando necessário.
+    agno retriever that only touches the vector store when needed.
+
+    A base de conhecimento (e o PgVector por trás dela) só é resolvida na
+    primeira busca efetiva. Quando a requisição foi roteada para uma intenção
+    que não precisa de conhecimento, a busca é evitada e a latência média de
+    uma busca real é contabilizada como economizada.
+
+    Com um reranker, a busca traz ``overfetch`` vezes mais candidatos, que
+    são reordenados por BM25 e cortados pelo orçamento de tokens.
+
+    Com ``tenant_search``, toda busca é restrita ao ``user_id`` do agente.
+
+    A chamada é assíncrona (o agno aguarda retrievers awaitable em
+    ``arun``): a busca no banco e o rerank rodam numa thread, sem bloquear o
+    event loop.
+    """
+
+    def __init__(
+        self,
+        request_class: str = INTERACTIVE,
+        enabled: bool = True,
+        reranker: Optional[BM25Reranker] = None,
+        overfetch: int = 1,
+        tenant_search: Optional[TenantKnowledgeSearch] = None,
+        user_id: Optional[str] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.request_class = request_class
+        self.enabled = enabled
+        self.reranker = reranker
+        self.overfetch = max(overfetch, 1) if reranker else 1
+        self.tenant_search = tenant_search
+        self.user_id = user_id
+        self.metrics = metrics or get_metrics_registry()
+        self._knowledge: Optional[AgentKnowledge] = None
+
+    @property
+    def knowledge(self) -> AgentKnowledge:
+        if self._knowledge is None:
+            self._knowledge = get_knowledge_base(self.request_class)
+        return self._knowledge
+
+    def _search(
+        self,
+        query: str,
+        num_documents: Optional[int],
+        filters: Optional[Dict[str, Any]],
+    ) -> List[Any]:
+        """Busca (e rerank) bloqueante, executada fora do event loop"""
+        limit = num_documents or self.knowledge.num_documents
+        if self.tenant_search is not None:
+            documents = self.tenant_search.search(
+                user_id=self.user_id,
+                query=query,
+                limit=limit * self.overfetch,
+                filters=filters,
+            )
+        else:
+            documents = self.knowledge.search(
+                query=query,
+                num_documents=limit * self.overfetch,
+                filters=filters,
+            )
+        if self.reranker and documents:
+            documents = self.reranker.rerank(query, documents, top_k=limit)
+        return documents
+
+    async def __call__(
+        self,
+        query: str,
+        num_documents: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        agent: Any = None,
+        **kwargs: Any,
+    ) -> Optional[List[Dict[str, Any]]]:
+        if not self.enabled:
+            self.metrics.increment(RETRIEVALS_AVOIDED)
+            self.metrics.increment(
+                LATENCY_SAVED_MS, self.metrics.average(RETRIEVAL_LATENCY_MS)
+            )
+            logger.debug(f"Knowledge retrieval skipped for query: {query[:50]}")
+            return None
+
+        with self.metrics.timer(RETRIEVAL_LATENCY_MS):
+            documents = await asyncio.to_thread(
+                self._search, query, num_documents, filters
+            )
+        self.metrics.increment(RETRIEVALS_PERFORMED)
+
+        if not documents:
+            return None
+        return [document.to_dict() for document in documents]
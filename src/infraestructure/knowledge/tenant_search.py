@@ -0,0 +1,216 @@
+"""
+Busca vetorial restrita ao tenant (usuário) na base de conhecimento.
+Tenant (user) scoped vector search over the knowledge base.
+"""
+
+import json
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set
+
+from agno.document import Document
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from configs.load_env import settings
+from infraestructure.knowledge.vector_store import (
+    INTERACTIVE,
+    KNOWLEDGE_SCHEMA,
+    KNOWLEDGE_TABLE_NAME,
+    KNOWLEDGE_TENANT_COLUMN,
+    TENANT_INDEX_PREFIX,
+    VectorLayout,
+    candidate_factor,
+    get_knowledge_base,
+    get_knowledge_engine,
+    get_search_profile,
+    get_vector_layout,
+    hybrid_score_expression,
+    tenant_index_name,
+    vector_literal,
+)
+from infraestructure.telemetry.metrics import MetricsRegistry, get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+DEDICATED_SEARCHES = "knowledge.tenant.searches.dedicated_index"
+SHARED_SEARCHES = "knowledge.tenant.searches.tenant_scan"
+
+
+class TenantKnowledgeSearch:
+    """
+    Busca com filtro de tenant obrigatório que continua usando índices.
+    Search with a mandatory tenant filter that still uses indexes.
+
+    - Tenants grandes possuem um índice ANN parcial (``WHERE user_id = '...'``);
+      a consulta repete o predicado literal para o planner escolhê-lo.
+    - Tenants pequenos são lidos pelo btree de ``user_id`` e ordenados por
+      distância exata, sem tocar o grafo global nem o de outros tenants.
+
+    A ordenação final é a mesma pontuação híbrida do ``PgVector`` do agno
+    (similaridade de cosseno + ``ts_rank_cd`` do texto). Com índice dedicado,
+    o ANN só escolhe os candidatos; no layout binário por distância de
+    Hamming, reordenados com a distância exata sobre os vetores completos.
+    """
+
+    INDEX_CACHE_SECONDS = 60.0
+
+    def __init__(
+        self,
+        request_class: str = INTERACTIVE,
+        engine: Optional[Engine] = None,
+        embedder: Any = None,
+        layout: Optional[VectorLayout] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.profile = get_search_profile(request_class)
+        self.layout = layout or get_vector_layout()
+        self.request_class = request_class
+        self._engine = engine
+        self._embedder = embedder
+        self.metrics = metrics or get_metrics_registry()
+        self._tenant_indexes: Set[str] = set()
+        self._tenant_indexes_loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            self._engine = get_knowledge_engine()
+        return self._engine
+
+    @property
+    def embedder(self) -> Any:
+        if self._embedder is None:
+            self._embedder = get_knowledge_base(self.request_class).vector_db.embedder
+        return self._embedder
+
+    @property
+    def table_fullname(self) -> str:
+        return f'"{KNOWLEDGE_SCHEMA}"."{KNOWLEDGE_TABLE_NAME}"'
+
+    def tenant_indexes(self) -> Set[str]:
+        """Índices parciais existentes, com cache curto / Existing partial indexes"""
+        with self._lock:
+            if time.monotonic() - self._tenant_indexes_loaded_at < self.INDEX_CACHE_SECONDS:
+                return self._tenant_indexes
+
+        with self.engine.connect() as connection:
+            names = connection.execute(
+                text(
+                    "SELECT indexname FROM pg_indexes "
+                    "WHERE schemaname = :schema AND tablename = :table "
+                    "AND indexname LIKE :prefix"
+                ),
+                {
+                    "schema": KNOWLEDGE_SCHEMA,
+                    "table": KNOWLEDGE_TABLE_NAME,
+                    "prefix": f"{TENANT_INDEX_PREFIX}%",
+                },
+            ).scalars()
+            indexes = set(names)
+
+        with self._lock:
+            self._tenant_indexes = indexes
+            self._tenant_indexes_loaded_at = time.monotonic()
+        return indexes
+
+    def add_documents(self, user_id: str, documents: List[Document]) -> None:
+        """
+        Grava chunks do tenant; o ``user_id`` vai para ``meta_data`` e dali
+        para a coluna gerada usada pelos índices.
+        """
+        if not user_id:
+            raise ValueError("Knowledge documents require a tenant (user_id)")
+        get_knowledge_base(self.request_class).vector_db.upsert(
+            documents, filters={KNOWLEDGE_TENANT_COLUMN: user_id}
+        )
+
+    def search_sql(self, user_id: str, dedicated: bool, filters: bool) -> str:
+        extra = " AND meta_data @> CAST(:filters AS jsonb)" if filters else ""
+        columns = "id, name, meta_data, content, usage"
+        if dedicated:
+            escaped = user_id.replace("'", "''")
+            where = f"WHERE {KNOWLEDGE_TENANT_COLUMN} = '{escaped}'{extra}"
+            score = hybrid_score_expression(self.layout.distance_expression())
+            return (
+                f"SELECT {columns} FROM ("
+                f"SELECT {columns}, embedding FROM {self.table_fullname} {where} "
+                f"ORDER BY {self.layout.index_order_expression()} "
+                f"LIMIT :candidates) AS candidates "
+                f"ORDER BY {score} DESC LIMIT :limit"
+            )
+        # MATERIALIZED força o filtro pelo btree antes da ordenação exata
+        return (
+            f"WITH tenant_chunks AS MATERIALIZED ("
+            f"SELECT {columns}, {self.layout.distance_expression()} AS distance "
+            f"FROM {self.table_fullname} "
+            f"WHERE {KNOWLEDGE_TENANT_COLUMN} = :user_id{extra}) "
+            f"SELECT {columns} FROM tenant_chunks "
+            f"ORDER BY {hybrid_score_expression('distance')} DESC LIMIT :limit"
+        )
+
+    def search(
+        self,
+        user_id: Optional[str],
+        query: str,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Document]:
+        """
+        Busca os chunks mais próximos dentro do tenant.
+        Searches the nearest chunks within the tenant.
+        """
+        if not user_id:
+            raise ValueError("Knowledge search requires a tenant (user_id) filter")
+
+        embedding = self.embedder.get_embedding(query)
+        if not embedding:
+            return []
+
+        dedicated = tenant_index_name(user_id) in self.tenant_indexes()
+        params: Dict[str, Any] = {
+            "user_id": user_id,
+            "query": query,
+            "embedding": vector_literal(embedding),
+            "limit": limit,
+        }
+        if filters:
+            params["filters"] = json.dumps(filters)
+        if dedicated:
+            # Candidatos do ANN reordenados pela pontuação híbrida
+            params["candidates"] = limit * candidate_factor(self.layout)
+
+        with self.engine.begin() as connection:
+            if dedicated and settings.knowledge_index_type.lower() == "ivfflat":
+                connection.execute(
+                    text(f"SET LOCAL ivfflat.probes = {self.profile.probes}")
+                )
+            elif dedicated:
+                # O HNSW devolve no máximo ef_search linhas: cobre os candidatos
+                ef_search = max(self.profile.ef_search, params.get("candidates", 0))
+                connection.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+            rows = connection.execute(
+                text(self.search_sql(user_id, dedicated, bool(filters))), params
+            ).mappings()
+            documents = [
+                Document(
+                    id=row["id"],
+                    name=row["name"],
+                    meta_data=row["meta_data"] or {},
+                    content=row["content"],
+                    usage=row["usage"],
+                )
+                for row in rows
+            ]
+
+        self.metrics.increment(DEDICATED_SEARCHES if dedicated else SHARED_SEARCHES)
+        return documents
+
+
+@lru_cache()
+def get_tenant_search(request_class: str = INTERACTIVE) -> TenantKnowledgeSearch:
+    """Instância compartilhada por classe, para reaproveitar o cache de índices"""
+    return TenantKnowledgeSearch(request_class=request_class)
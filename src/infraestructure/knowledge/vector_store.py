@@ -0,0 +1,403 @@
+"""
+Vector store da base de conhecimento dos agentes.
+Knowledge base vector store for the agents.
+"""
+
+import hashlib
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from agno.document import Document
+from agno.knowledge.agent import AgentKnowledge
+from agno.vectordb.pgvector import HNSW, Ivfflat, PgVector, SearchType
+from pydantic import BaseModel, Field
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from configs.load_env import settings
+from infraestructure.database.config import get_database_url
+
+logger = logging.getLogger(__name__)
+
+KNOWLEDGE_SCHEMA = "ai"
+KNOWLEDGE_TABLE_NAME = "agent_knowledge_base"
+KNOWLEDGE_CONTENT_LANGUAGE = "english"
+KNOWLEDGE_TENANT_COLUMN = "user_id"
+KNOWLEDGE_VECTOR_SCORE_WEIGHT = 0.5
+TENANT_INDEX_PREFIX = f"{KNOWLEDGE_TABLE_NAME}_tenant_"
+
+SUPPORTED_PRECISIONS = ("full", "half", "binary")
+
+INTERACTIVE = "interactive"
+COMPLEX = "complex"
+BATCH = "batch"
+
+
+class SearchProfile(BaseModel):
+    """
+    Parâmetros de busca ANN por classe de requisição.
+    Query-time ANN knobs for a request class.
+    """
+
+    name: str = Field(..., description="Request class name")
+    ef_search: int = Field(..., description="hnsw.ef_search used by the query")
+    probes: int = Field(..., description="ivfflat.probes used by the query")
+    num_documents: int = Field(5, description="Documents returned per search")
+
+
+class VectorLayout(BaseModel):
+    """
+    Layout de armazenamento/indexação dos embeddings.
+    Storage and indexing layout of the embeddings.
+
+    - full: coluna ``vector`` e índice ``vector_cosine_ops``.
+    - half: coluna ``halfvec`` (metade do tamanho) e ``halfvec_cosine_ops``.
+    - binary: coluna ``vector`` completa, índice sobre ``binary_quantize``
+      (distância de Hamming) e rescoring exato dos candidatos.
+    """
+
+    precision: str = Field("full", description="full, half or binary")
+    dimensions: int = Field(1536, description="Embedding dimensions")
+
+    @property
+    def column_type(self) -> str:
+        kind = "halfvec" if self.precision == "half" else "vector"
+        return f"{kind}({self.dimensions})"
+
+    @property
+    def index_expression(self) -> str:
+        if self.precision == "binary":
+            return f"(binary_quantize(embedding)::bit({self.dimensions}))"
+        return "embedding"
+
+    @property
+    def operator_class(self) -> str:
+        return {
+            "half": "halfvec_cosine_ops",
+            "binary": "bit_hamming_ops",
+        }.get(self.precision, "vector_cosine_ops")
+
+    @property
+    def rescored(self) -> bool:
+        return self.precision == "binary"
+
+    def query_vector(self, parameter: str = ":embedding") -> str:
+        return f"CAST({parameter} AS {self.column_type})"
+
+    def distance_expression(self, parameter: str = ":embedding") -> str:
+        """Distância exata de cosseno / Exact cosine distance"""
+        return f"embedding <=> {self.query_vector(parameter)}"
+
+    def index_order_expression(self, parameter: str = ":embedding") -> str:
+        """Expressão de ordenação atendida pelo índice ANN"""
+        if self.precision == "binary":
+            return (
+                f"{self.index_expression} <~> "
+                f"binary_quantize({self.query_vector(parameter)})::bit({self.dimensions})"
+            )
+        return self.distance_expression(parameter)
+
+
+def get_vector_layout(precision: Optional[str] = None) -> VectorLayout:
+    """
+    Retorna o layout configurado dos embeddings.
+    Returns the configured embedding layout.
+    """
+    precision = (precision or settings.knowledge_vector_precision).lower()
+    if precision not in SUPPORTED_PRECISIONS:
+        raise ValueError(f"Unsupported knowledge vector precision: {precision}")
+    return VectorLayout(
+        precision=precision, dimensions=settings.knowledge_embedding_dimensions
+    )
+
+
+def get_search_profiles() -> Dict[str, SearchProfile]:
+    """
+    Retorna os perfis de busca configurados por classe de requisição.
+    Returns the configured search profiles per request class.
+    """
+    return {
+        INTERACTIVE: SearchProfile(
+            name=INTERACTIVE,
+            ef_search=settings.knowledge_ef_search_interactive,
+            probes=settings.knowledge_probes_interactive,
+            num_documents=5,
+        ),
+        COMPLEX: SearchProfile(
+            name=COMPLEX,
+            ef_search=settings.knowledge_ef_search_complex,
+            probes=settings.knowledge_probes_complex,
+            num_documents=8,
+        ),
+        BATCH: SearchProfile(
+            name=BATCH,
+            ef_search=settings.knowledge_ef_search_batch,
+            probes=settings.knowledge_probes_batch,
+            num_documents=20,
+        ),
+    }
+
+
+def get_search_profile(request_class: str) -> SearchProfile:
+    """
+    Retorna o perfil de busca de uma classe de requisição.
+    Returns the search profile for a request class.
+    """
+    profiles = get_search_profiles()
+    if request_class not in profiles:
+        raise ValueError(
+            f"Unknown knowledge request class '{request_class}'. "
+            f"Expected one of: {', '.join(profiles)}"
+        )
+    return profiles[request_class]
+
+
+def vector_index_name(index_type: str) -> str:
+    """
+    Nome do índice vetorial, compatível com a convenção do agno.
+    Vector index name, matching agno's naming convention.
+    """
+    return f"{KNOWLEDGE_TABLE_NAME}_{index_type}_index"
+
+
+def tenant_index_name(user_id: str) -> str:
+    """
+    Nome do índice parcial de um tenant (hash mantém o nome abaixo de 63 bytes).
+    Partial index name for a tenant (hashing keeps it under 63 bytes).
+    """
+    digest = hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:16]
+    return f"{TENANT_INDEX_PREFIX}{digest}_index"
+
+
+def tenant_column_sql(table_fullname: str) -> str:
+    """
+    Coluna gerada com o tenant extraído de ``meta_data`` (escrita pelo agno).
+    Generated column holding the tenant taken from ``meta_data``.
+    """
+    return (
+        f"ALTER TABLE {table_fullname} ADD COLUMN IF NOT EXISTS "
+        f"{KNOWLEDGE_TENANT_COLUMN} text "
+        f"GENERATED ALWAYS AS (meta_data->>'{KNOWLEDGE_TENANT_COLUMN}') STORED"
+    )
+
+
+def vector_literal(embedding: Sequence[float]) -> str:
+    """Embedding no formato textual do pgvector / pgvector text format"""
+    return "[" + ",".join(str(value) for value in embedding) + "]"
+
+
+def candidate_factor(layout: VectorLayout) -> int:
+    """
+    Candidatos do ANN por chunk retornado antes da repontuação.
+    ANN candidates per returned chunk before rescoring.
+    """
+    if layout.rescored:
+        return settings.knowledge_binary_rescore_factor
+    return settings.knowledge_hybrid_candidate_factor
+
+
+def hybrid_score_expression(distance: str) -> str:
+    """
+    Pontuação híbrida idêntica à do ``PgVector.hybrid_search`` do agno.
+    Hybrid score matching agno's ``PgVector.hybrid_search``.
+
+    O idioma vai literal: só assim a expressão casa com o índice GIN.
+    """
+    language = KNOWLEDGE_CONTENT_LANGUAGE
+    return (
+        f"{KNOWLEDGE_VECTOR_SCORE_WEIGHT} * (1 / (1 + ({distance}))) + "
+        f"{1 - KNOWLEDGE_VECTOR_SCORE_WEIGHT} * ts_rank_cd("
+        f"to_tsvector('{language}', content), "
+        f"websearch_to_tsquery('{language}', :query))"
+    )
+
+
+def hybrid_search_sql(table_fullname: str, layout: VectorLayout, filters: bool) -> str:
+    """
+    Busca híbrida em duas etapas, ambas servidas por índice.
+    Two-stage hybrid search, both stages served by an index.
+
+    Os candidatos são a união do top-k do índice ANN com o top-k do índice
+    GIN (``@@``); só eles recebem a pontuação híbrida exata.
+    """
+    language = KNOWLEDGE_CONTENT_LANGUAGE
+    ts_vector = f"to_tsvector('{language}', content)"
+    ts_query = f"websearch_to_tsquery('{language}', :query)"
+    extra = " AND meta_data @> CAST(:filters AS jsonb)" if filters else ""
+    ann_where = " WHERE meta_data @> CAST(:filters AS jsonb)" if filters else ""
+    score = hybrid_score_expression(layout.distance_expression())
+    return (
+        f"SELECT id, name, meta_data, content, usage FROM {table_fullname} "
+        f"WHERE id IN ("
+        f"(SELECT id FROM {table_fullname}{ann_where} "
+        f"ORDER BY {layout.index_order_expression()} LIMIT :candidates) "
+        f"UNION "
+        f"(SELECT id FROM {table_fullname} WHERE {ts_vector} @@ {ts_query}{extra} "
+        f"ORDER BY ts_rank_cd({ts_vector}, {ts_query}) DESC LIMIT :candidates)"
+        f") ORDER BY {score} DESC LIMIT :limit"
+    )
+
+
+class KnowledgeVectorDb(PgVector):
+    """
+    PgVector cuja tabela já nasce com a coluna de tenant e seu btree.
+    PgVector whose table is created with the tenant column and its btree.
+
+    A migração só consegue adicionar a coluna a uma tabela existente; quando
+    é o agno que cria a tabela (primeira carga), a coluna vem daqui.
+
+    A busca híbrida do agno pontua a tabela inteira (nenhum índice atende
+    ``ORDER BY hybrid_score``); aqui ela escolhe candidatos pelos índices
+    ANN e GIN e só então aplica a mesma pontuação. Coluna e consulta seguem
+    o ``VectorLayout`` configurado (halfvec, ou Hamming + rescoring exato).
+    """
+
+    def __init__(
+        self, *args: Any, layout: Optional[VectorLayout] = None, **kwargs: Any
+    ):
+        super().__init__(*args, **kwargs)
+        self.layout = layout or get_vector_layout()
+
+    @property
+    def table_fullname(self) -> str:
+        return f'"{self.schema}"."{self.table_name}"'
+
+    def hybrid_search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Document]:
+        """
+        Busca híbrida sobre os candidatos dos índices ANN e GIN.
+        Hybrid search over the ANN and GIN index candidates.
+        """
+        try:
+            embedding = self.embedder.get_embedding(query)
+            if embedding is None:
+                logger.error(f"Error getting embedding for query: {query}")
+                return []
+
+            candidates = limit * candidate_factor(self.layout)
+            params: Dict[str, Any] = {
+                "query": query,
+                "embedding": vector_literal(embedding),
+                "limit": limit,
+                "candidates": candidates,
+            }
+            if filters is not None:
+                params["filters"] = json.dumps(filters)
+
+            sql = hybrid_search_sql(
+                self.table_fullname, self.layout, filters is not None
+            )
+            with self.Session() as sess, sess.begin():
+                if isinstance(self.vector_index, Ivfflat):
+                    sess.execute(
+                        text(f"SET LOCAL ivfflat.probes = {self.vector_index.probes}")
+                    )
+                elif isinstance(self.vector_index, HNSW):
+                    # O HNSW devolve no máximo ef_search linhas: cobre os candidatos
+                    ef_search = max(self.vector_index.ef_search, candidates)
+                    sess.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+                rows = sess.execute(text(sql), params).mappings().all()
+        except Exception as e:
+            logger.error(f"Error performing hybrid search: {e}")
+            return []
+
+        return [
+            Document(
+                id=row["id"],
+                name=row["name"],
+                meta_data=row["meta_data"] or {},
+                content=row["content"],
+                embedder=self.embedder,
+                usage=row["usage"],
+            )
+            for row in rows
+        ]
+
+    def create(self) -> None:
+        if self.table_exists():
+            return
+        super().create()
+        table = self.table_fullname
+        index = f"{self.table_name}_{KNOWLEDGE_TENANT_COLUMN}_index"
+        with self.Session() as sess, sess.begin():
+            if self.layout.column_type != f"vector({self.dimensions})":
+                # O agno cria vector(n); a tabela ainda vazia é convertida
+                sess.execute(
+                    text(
+                        f"ALTER TABLE {table} ALTER COLUMN embedding "
+                        f"TYPE {self.layout.column_type} "
+                        f"USING embedding::{self.layout.column_type}"
+                    )
+                )
+            sess.execute(text(tenant_column_sql(table)))
+            sess.execute(
+                text(
+                    f'CREATE INDEX IF NOT EXISTS "{index}" '
+                    f"ON {table} ({KNOWLEDGE_TENANT_COLUMN})"
+                )
+            )
+
+
+def build_vector_index(profile: SearchProfile) -> Union[HNSW, Ivfflat]:
+    """
+    Cria a configuração de índice do agno para um perfil de busca.
+    Builds the agno index configuration for a search profile.
+
+    O agno aplica ``ef_search``/``probes`` via ``SET LOCAL`` em cada busca,
+    então cada classe de requisição recebe seu próprio objeto de índice.
+    """
+    index_type = settings.knowledge_index_type.lower()
+
+    if index_type == "hnsw":
+        return HNSW(
+            name=vector_index_name("hnsw"),
+            m=settings.knowledge_hnsw_m,
+            ef_construction=settings.knowledge_hnsw_ef_construction,
+            ef_search=profile.ef_search,
+        )
+
+    if index_type == "ivfflat":
+        return Ivfflat(
+            name=vector_index_name("ivfflat"),
+            lists=settings.knowledge_ivfflat_lists or 100,
+            dynamic_lists=settings.knowledge_ivfflat_lists == 0,
+            probes=profile.probes,
+        )
+
+    raise ValueError(f"Unsupported knowledge index type: {index_type}")
+
+
+@lru_cache()
+def get_knowledge_engine() -> Engine:
+    """
+    Engine compartilhado por todos os perfis da base de conhecimento.
+    Engine shared by every knowledge base profile.
+    """
+    return create_engine(get_database_url(), pool_pre_ping=True)
+
+
+@lru_cache()
+def get_knowledge_base(request_class: str = INTERACTIVE) -> AgentKnowledge:
+    """
+    Retorna a base de conhecimento configurada para uma classe de requisição.
+    Returns the knowledge base configured for a request class.
+    """
+    profile = get_search_profile(request_class)
+    return AgentKnowledge(
+        vector_db=KnowledgeVectorDb(
+            db_engine=get_knowledge_engine(),
+            schema=KNOWLEDGE_SCHEMA,
+            table_name=KNOWLEDGE_TABLE_NAME,
+            search_type=SearchType.hybrid,
+            vector_index=build_vector_index(profile),
+            vector_score_weight=KNOWLEDGE_VECTOR_SCORE_WEIGHT,
+            content_language=KNOWLEDGE_CONTENT_LANGUAGE,
+        ),
+        num_documents=profile.num_documents,
+    )
@@ -3,7 +3,7 @@ from typing import Any, AsyncGenerator, Dict, List, Optional, cast
 from agno.agent import Agent as AgnoAgent
 from agno.models.anthropic import Claude
 from agno.models.openai import OpenAIChat
-from agno.storage.postgres import PostgresStorage
+from agno.storage.base import Storage
 from agno.team.team import Team
 from langsmith import traceable
 from langsmith.wrappers import wrap_anthropic, wrap_openai
@@ -16,19 +16,59 @@ from core.entities.agent import (
     JudgingBaseAgent,
     TeamAgent,
 )
-from infraestructure.database.config import AsyncSessionLocal, DatabaseConfig
+from infraestructure.knowledge.reranker import get_reranker
+from infraestructure.knowledge.retriever import ATTACHMENTS_SKIPPED, KnowledgeRetriever
+from infraestructure.knowledge.tenant_search import get_tenant_search
+from infraestructure.resources import get_agent_storage
 from infraestructure.telemetry.langsmith.telemetry import LangSmithTelemetry
+from infraestructure.telemetry.metrics import get_metrics_registry
 from interface.agent.agent_interface import AgentInterface
 
 
 class AgentRepository(AgentInterface):
     def __init__(self) -> None:
-        self.db_config = DatabaseConfig()
-        self.session = AsyncSessionLocal()
-        self.storage = PostgresStorage(
-            db_url=self.db_config.database_url,
-            table_name="chat_messages",
-        )
+        self.metrics = get_metrics_registry()
+
+    def _storage(self, agent_data: BaseAgent) -> Storage:
+        """
+        Storage do agente ou o storage Postgres compartilhado do processo.
+        The agent storage or the process-wide shared Postgres storage.
+        """
+        if agent_data.storage is not None:
+            return agent_data.storage
+        return get_agent_storage()
+
+    def _knowledge_options(self, agent_data: BaseAgent) -> Dict[str, Any]:
+        """
+        Opções de conhecimento do agno conforme a intenção do agente.
+        agno knowledge options according to the agent intent.
+
+        Agentes de intenções sem conhecimento (simple_task, generate_image)
+        não recebem a ferramenta de busca. Os demais recebem um retriever lazy
+        consultado apenas quando o modelo pede (search_knowledge_base).
+        """
+        if not agent_data.requires_knowledge():
+            self.metrics.increment(ATTACHMENTS_SKIPPED)
+            return {"search_knowledge": False}
+
+        if agent_data.knowledge_base is not None:
+            return {"knowledge": agent_data.knowledge_base, "search_knowledge": True}
+
+        return {
+            "retriever": KnowledgeRetriever(
+                request_class=agent_data.knowledge_profile,
+                enabled=agent_data.retrieval_enabled(),
+                reranker=get_reranker() if settings.knowledge_rerank_enabled else None,
+                overfetch=settings.knowledge_rerank_overfetch,
+                tenant_search=(
+                    get_tenant_search(agent_data.knowledge_profile)
+                    if settings.knowledge_tenant_scoped
+                    else None
+                ),
+                user_id=agent_data.user_id,
+            ),
+            "search_knowledge": True,
+        }
 
     @traceable
     async def create_basic_agent_chat(self, agent_data: BaseAgent) -> AgnoAgent:
@@ -48,8 +88,8 @@ class AgentRepository(AgentInterface):
             tools=cast(Any, agent_data.tools),
             description=agent_data.description,
             instructions=agent_data.instructions,
-            storage=agent_data.storage,
-            knowledge=agent_data.knowledge_base,
+            storage=self._storage(agent_data),
+            **self._knowledge_options(agent_data),
             add_datetime_to_instructions=True,
             add_history_to_messages=True,
             num_history_responses=5,
@@ -85,8 +125,8 @@ class AgentRepository(AgentInterface):
             tools=cast(Any, agent_data.tools),
             description=agent_data.description,
             instructions=agent_data.instructions,
-            storage=agent_data.storage,
-            knowledge=agent_data.knowledge_base,
+            storage=self._storage(agent_data),
+            **self._knowledge_options(agent_data),
             add_datetime_to_instructions=True,
             add_history_to_messages=True,
             num_history_responses=5,
@@ -117,7 +157,8 @@ class AgentRepository(AgentInterface):
             tools=cast(Any, agent_data.tools),
             description=agent_data.description,
             instructions=agent_data.instructions,
-            storage=agent_data.storage,
+            storage=self._storage(agent_data),
+            **self._knowledge_options(agent_data),
             add_datetime_to_instructions=True,
             add_history_to_messages=True,
             num_history_responses=5,
@@ -144,7 +185,8 @@ class AgentRepository(AgentInterface):
             tools=cast(Any, agent_data.tools),
             description=agent_data.description,
             instructions=agent_data.instructions,
-            storage=agent_data.storage,
+            storage=self._storage(agent_data),
+            **self._knowledge_options(agent_data),
             markdown=True,
             show_tool_calls=True,
             add_datetime_to_instructions=True,
@@ -184,7 +226,7 @@ class AgentRepository(AgentInterface):
             ],
             instructions=team_agent_data.instructions,
             description=team_agent_data.description,
-            storage=basic_agent_data.storage,
+            storage=self._storage(basic_agent_data),
             add_datetime_to_instructions=True,
             add_history_to_messages=True,
             markdown=True,
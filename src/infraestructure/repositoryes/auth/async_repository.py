@@ -0,0 +1,88 @@
+"""
+Repositório de autenticação assíncrono sobre o bulkhead do Cognito.
+Async authentication repository over the Cognito bulkhead.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
+from infraestructure.bulkhead import COGNITO, PRINCIPAL, Bulkhead, get_bulkhead
+from infraestructure.repositoryes.auth.principal_cache import CachedAuthRepository
+from interface.auth.auth_interface import AsyncAuthInterface, AuthInterface
+
+
+class AsyncAuthRepository(AsyncAuthInterface):
+    """
+    Expõe um ``AuthInterface`` síncrono (boto3) sem bloquear o event loop.
+    Exposes a synchronous (boto3) ``AuthInterface`` without blocking the event loop.
+
+    As chamadas rodam no bulkhead ``cognito``, separado do threadpool
+    compartilhado do Starlette: uma rajada de logins falha rápido (503) ou
+    por timeout (504) em vez de congelar o streaming do mesmo worker.
+
+    ``get_user_details`` (toda requisição autenticada) não passa por ele: um
+    acerto no cache de principals é respondido no próprio event loop e o
+    restante (verificação local, perfil) roda no bulkhead ``principal``, para
+    que uma rajada de cadastros não derrube a autenticação com 503.
+    """
+
+    def __init__(
+        self,
+        inner: AuthInterface,
+        bulkhead: Optional[Bulkhead] = None,
+        principal_bulkhead: Optional[Bulkhead] = None,
+    ):
+        self.inner = inner
+        self.bulkhead = bulkhead or get_bulkhead(COGNITO)
+        self.principal_bulkhead = principal_bulkhead or get_bulkhead(PRINCIPAL)
+
+    async def _run(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        return await self.bulkhead.run(func, *args, operation=operation)
+
+    async def login(self, username: str, password: str) -> Dict[str, Any]:
+        return await self._run("login", self.inner.login, username, password)
+
+    async def logout(self, token: str) -> bool:
+        return await self._run("logout", self.inner.logout, token)
+
+    async def signup(
+        self,
+        username: str,
+        password: str,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return await self._run(
+            "signup", self.inner.signup, username, password, first_name, last_name
+        )
+
+    async def reset_password(self, username: str, new_password: str) -> bool:
+        return await self._run(
+            "reset_password", self.inner.reset_password, username, new_password
+        )
+
+    async def delete_user(self, username: str) -> bool:
+        return await self._run("delete_user", self.inner.delete_user, username)
+
+    async def get_user_details(self, token: str) -> Optional[UserDetailsResponseDto]:
+        if isinstance(self.inner, CachedAuthRepository):
+            hit, user = self.inner.cache.peek(token)
+            if hit:
+                return user
+        return await self.principal_bulkhead.run(
+            self.inner.get_user_details, token, operation="get_user_details"
+        )
+
+    async def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
+        return await self._run(
+            "refresh_access_token", self.inner.refresh_access_token, refresh_token
+        )
+
+    async def list_active_sessions(self) -> List[Dict[str, Any]]:
+        return await self._run("list_active_sessions", self.inner.list_active_sessions)
+
+    async def revoke_session(self, token: str) -> bool:
+        return await self._run("revoke_session", self.inner.revoke_session, token)
+
+    async def confirm_email(self, email: str, token: str) -> bool:
+        return await self._run("confirm_email", self.inner.confirm_email, email, token)
@@ -0,0 +1,304 @@
+"""
+Cache de principals resolvidos a partir de bearer tokens.
+Cache of principals resolved from bearer tokens.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import jwt
+
+from configs.load_env import settings
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
+from infraestructure.telemetry.metrics import MetricsRegistry, get_metrics_registry
+from infraestructure.repositoryes.auth.token_verifier import RevocationList
+from interface.auth.auth_interface import AuthInterface
+
+PRINCIPAL_HITS = "auth.principal_cache.hits"
+PRINCIPAL_NEGATIVE_HITS = "auth.principal_cache.negative_hits"
+PRINCIPAL_REVOKED = "auth.principal_cache.revoked"
+PRINCIPAL_MISSES = "auth.principal_cache.misses"
+PRINCIPAL_COALESCED = "auth.principal_cache.coalesced"
+PRINCIPAL_ENTRIES = "auth.principal_cache.entries"
+
+
+def token_key(token: str) -> str:
+    """Chave do cache: hash do token, nunca o token em si"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def token_claims(token: str) -> Dict[str, Any]:
+    """
+    Claims do token sem validar assinatura: só servem para limitar o TTL e
+    para reconferir revogações de um principal já verificado pelo loader.
+    """
+    try:
+        return jwt.decode(token, options={"verify_signature": False})
+    except jwt.PyJWTError:
+        return {}
+
+
+def token_expiration(token: str) -> Optional[float]:
+    """``exp`` do token sem validar assinatura (apenas limita o TTL)"""
+    exp = token_claims(token).get("exp")
+    return float(exp) if exp else None
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "claims")
+
+    def __init__(
+        self,
+        value: Optional[UserDetailsResponseDto],
+        expires_at: float,
+        claims: Optional[Dict[str, Any]] = None,
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.claims = claims
+
+
+class _Flight:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Optional[UserDetailsResponseDto] = None
+        self.error: Optional[BaseException] = None
+
+
+class PrincipalCache:
+    """
+    Cache TTL + LRU de principals com cache negativo e single-flight.
+    TTL + LRU principal cache with negative caching and single-flight.
+
+    - Entradas válidas expiram em ``min(ttl, exp do token)``.
+    - Tokens inválidos ficam em cache por ``negative_ttl`` para que um
+      cliente hostil não multiplique chamadas ao Cognito. Só o ``None`` do
+      loader (recusa definitiva) vira entrada negativa; falhas transitórias
+      chegam como exceção e não são cacheadas.
+    - Requisições concorrentes com o mesmo token aguardam uma única
+      resolução; erros do loader não são cacheados.
+    - Cada invalidação incrementa ``generation``; o resultado de uma carga só
+      é gravado se a geração não mudou desde o seu início, então uma carga
+      que cruzou um logout não repõe o principal revogado.
+    - ``invalidate`` só alcança o processo que atendeu o logout. Com
+      ``revocations`` cada acerto reconfere ``jti``/``sub``/``iat`` na lista
+      compartilhada, então um logout em outro worker derruba a entrada
+      assim que a lista recarrega (``auth_revocation_refresh_seconds``).
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        negative_ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        wait_timeout: float = 10.0,
+        clock: Callable[[], float] = time.time,
+        metrics: Optional[MetricsRegistry] = None,
+        revocations: Optional[RevocationList] = None,
+    ):
+        self.ttl = ttl if ttl is not None else settings.auth_principal_cache_ttl_seconds
+        self.negative_ttl = (
+            negative_ttl
+            if negative_ttl is not None
+            else settings.auth_principal_negative_ttl_seconds
+        )
+        self.max_entries = max_entries or settings.auth_principal_cache_max_entries
+        self.wait_timeout = wait_timeout
+        self.clock = clock
+        self.metrics = metrics or get_metrics_registry()
+        self.revocations = revocations
+        self.generation = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= self.clock():
+                return None
+            self._entries.move_to_end(key)
+
+        # Fora do lock: a lista de revogações pode recarregar do store
+        if self._revoked(entry):
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                self.metrics.set_gauge(PRINCIPAL_ENTRIES, len(self._entries))
+            self.metrics.increment(PRINCIPAL_REVOKED)
+            return None
+        self.metrics.increment(
+            PRINCIPAL_HITS if entry.value is not None else PRINCIPAL_NEGATIVE_HITS
+        )
+        return entry
+
+    def _revoked(self, entry: _Entry) -> bool:
+        if self.revocations is None or entry.value is None or not entry.claims:
+            return False
+        return self.revocations.is_revoked(entry.claims)
+
+    def peek(self, token: str) -> Tuple[bool, Optional[UserDetailsResponseDto]]:
+        """
+        Consulta sem carregar nem bloquear: ``(hit, principal)``.
+        Non-loading, non-blocking lookup: ``(hit, principal)``.
+        """
+        entry = self._lookup(token_key(token))
+        return (True, entry.value) if entry is not None else (False, None)
+
+    def get_or_load(
+        self, token: str, loader: Callable[[str], Optional[UserDetailsResponseDto]]
+    ) -> Optional[UserDetailsResponseDto]:
+        key = token_key(token)
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry.value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            generation = self.generation
+
+        if not leader:
+            self.metrics.increment(PRINCIPAL_COALESCED)
+            if not flight.event.wait(self.wait_timeout):
+                return loader(token)
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        self.metrics.increment(PRINCIPAL_MISSES)
+        try:
+            flight.value = loader(token)
+            self._store(key, token, flight.value, generation)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def _store(
+        self,
+        key: str,
+        token: str,
+        value: Optional[UserDetailsResponseDto],
+        generation: int,
+    ) -> None:
+        now = self.clock()
+        claims = None
+        if value is None:
+            expires_at = now + self.negative_ttl
+        else:
+            expires_at = now + self.ttl
+            decoded = token_claims(token)
+            if decoded.get("exp"):
+                expires_at = min(expires_at, float(decoded["exp"]))
+            claims = {
+                name: decoded[name] for name in ("jti", "sub", "iat") if name in decoded
+            }
+        if expires_at <= now:
+            return
+
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = _Entry(value, expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.metrics.set_gauge(PRINCIPAL_ENTRIES, len(self._entries))
+
+    def invalidate(self, token: str) -> None:
+        """
+        Remove o token e, como o logout do Cognito é global, todos os
+        principals do mesmo usuário.
+        """
+        sub = token_claims(token).get("sub")
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(token_key(token), None)
+            if sub:
+                stale = [
+                    key
+                    for key, entry in self._entries.items()
+                    if entry.value is not None and entry.value.user_sub == sub
+                ]
+                for key in stale:
+                    del self._entries[key]
+            self.metrics.set_gauge(PRINCIPAL_ENTRIES, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self.metrics.set_gauge(PRINCIPAL_ENTRIES, 0)
+
+
+class CachedAuthRepository(AuthInterface):
+    """
+    Decorator de ``AuthInterface`` que coloca o PrincipalCache na frente de
+    ``get_user_details``; os demais métodos são delegados.
+    ``AuthInterface`` decorator that fronts ``get_user_details`` with the
+    PrincipalCache; all other methods are delegated.
+
+    Se o repositório interno verifica tokens localmente, o cache passa a
+    reconferir a lista de revogações dele a cada acerto.
+    """
+
+    def __init__(self, inner: AuthInterface, cache: Optional[PrincipalCache] = None):
+        self.inner = inner
+        self.cache = cache if cache is not None else PrincipalCache()
+        revocations = getattr(getattr(inner, "verifier", None), "revocations", None)
+        if self.cache.revocations is None and isinstance(revocations, RevocationList):
+            self.cache.revocations = revocations
+
+    def __getattr__(self, name: str) -> Any:
+        # Métodos fora da interface (refresh_access_token, resend_confirmation_code...)
+        return getattr(self.inner, name)
+
+    def get_user_details(self, token: str) -> Optional[UserDetailsResponseDto]:
+        return self.cache.get_or_load(token, self.inner.get_user_details)
+
+    def login(self, username: str, password: str) -> Dict[str, Any]:
+        return self.inner.login(username, password)
+
+    def logout(self, token: str) -> bool:
+        self.cache.invalidate(token)
+        return self.inner.logout(token)
+
+    def signup(
+        self,
+        username: str,
+        password: str,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return self.inner.signup(username, password, first_name, last_name)
+
+    def reset_password(self, username: str, new_password: str) -> bool:
+        return self.inner.reset_password(username, new_password)
+
+    def delete_user(self, username: str) -> bool:
+        return self.inner.delete_user(username)
+
+    def list_active_sessions(self) -> List[Dict[str, Any]]:
+        return self.inner.list_active_sessions()
+
+    def revoke_session(self, token: str) -> bool:
+        self.cache.invalidate(token)
+        return self.inner.revoke_session(token)
+
+    def confirm_email(self, email: str, token: str) -> bool:
+        return self.inner.confirm_email(email, token)
@@ -1,6 +1,11 @@
-from typing import Any, Dict, List, Optional
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 import boto3
+import jwt
 from botocore.exceptions import ClientError
 
 from configs.load_env import settings
@@ -9,16 +14,84 @@ from core.exceptions.auth.auth_exceptions import (
     AuthenticationException,
     InvalidCredentialsException,
 )
+from core.exceptions.infrastructure_exceptions import ExternalServiceException
 from infraestructure.client_factory.aws import AWSClientFactory
+from infraestructure.repositoryes.auth.revocation_store import PostgresRevocationStore
+from infraestructure.repositoryes.auth.token_verifier import (
+    CognitoTokenVerifier,
+    JWKSCache,
+    RevocationList,
+    cognito_issuer,
+)
 from interface.auth.auth_interface import AuthInterface
 
+logger = logging.getLogger(__name__)
+
+# Respostas do GetUser que provam que o token não serve (cacheáveis)
+INVALID_TOKEN_ERRORS = ("NotAuthorizedException", "UserNotFoundException")
+
+# Claim dos access tokens do Cognito com os grupos do usuário
+GROUPS_CLAIM = "cognito:groups"
+
+
+def _token_groups(claims: Dict[str, Any]) -> List[str]:
+    return list(claims.get(GROUPS_CLAIM) or [])
+
 
 class AuthRepository(AuthInterface):
-    def __init__(self):
+    def __init__(
+        self,
+        verifier: Optional[CognitoTokenVerifier] = None,
+        cognito: Any = None,
+    ):
         self.aws = AWSClientFactory()
-        self.cognito = self.aws.cognito()
+        self.cognito = cognito or self.aws.cognito()
         self.user_pool_id = settings.cognito_user_pool_id
         self.user_pool_client_id = settings.cognito_user_pool_client_id
+        self.verifier = verifier or self._build_verifier()
+        # LRU por ``sub``, limitado a ``cognito_profile_cache_max_entries``
+        self._profiles: "OrderedDict[str, Tuple[float, UserDetailsResponseDto]]" = (
+            OrderedDict()
+        )
+        self._profiles_lock = threading.Lock()
+
+    def _build_verifier(self) -> Optional[CognitoTokenVerifier]:
+        """Verificador local, quando habilitado e configurado"""
+        if not (
+            settings.cognito_local_verification
+            and self.user_pool_id
+            and self.user_pool_client_id
+            and settings.region_name
+        ):
+            return None
+        issuer = cognito_issuer(settings.region_name, self.user_pool_id)
+        return CognitoTokenVerifier(
+            user_pool_id=self.user_pool_id,
+            client_id=self.user_pool_client_id,
+            region=settings.region_name,
+            jwks=JWKSCache(
+                f"{issuer}/.well-known/jwks.json",
+                refresh_seconds=settings.cognito_jwks_refresh_seconds,
+            ),
+            revocations=RevocationList(
+                store=PostgresRevocationStore(),
+                refresh_seconds=settings.auth_revocation_refresh_seconds,
+            ),
+            leeway=settings.cognito_jwt_leeway_seconds,
+        )
+
+    def _revoke_locally(self, token: str) -> None:
+        """Propaga o global_sign_out para a verificação local"""
+        if self.verifier is None:
+            return
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False})
+        except jwt.PyJWTError:
+            return
+        if claims.get("sub"):
+            self.verifier.revocations.revoke_user(claims["sub"])
+            with self._profiles_lock:
+                self._profiles.pop(claims["sub"], None)
 
     def signup(
         self,
@@ -91,6 +164,7 @@ class AuthRepository(AuthInterface):
         """
         try:
             self.cognito.global_sign_out(AccessToken=token)
+            self._revoke_locally(token)
             return True
         except Exception as e:
             return False
@@ -110,34 +184,126 @@ class AuthRepository(AuthInterface):
         except Exception as e:
             return False
 
+    def delete_user(self, email: str) -> bool:
+        """
+        Delete a user from the pool; an already missing user counts as deleted.
+        """
+        try:
+            self.cognito.admin_delete_user(UserPoolId=self.user_pool_id, Username=email)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "UserNotFoundException":
+                return True
+            logger.warning(f"Failed to delete Cognito user {email}: {e}")
+            return False
+        except Exception as e:
+            logger.warning(f"Failed to delete Cognito user {email}: {e}")
+            return False
+
     def get_user_details(self, token: str) -> Optional[UserDetailsResponseDto]:
         """
         Retrieve details of the authenticated user using their token.
+
+        With local verification the token is validated offline and the
+        profile comes from the claims or from a per-user cache; Cognito is
+        only called on a profile cache miss or if the JWKS is unreachable.
+        """
+        if self.verifier is not None:
+            try:
+                claims = self.verifier.verify(token)
+            except AuthenticationException as e:
+                logger.debug(f"Token rejected locally: {e.error_code}")
+                return None
+            except Exception as e:
+                logger.warning(f"Local token verification unavailable: {e}")
+            else:
+                return self._user_details_from_claims(claims, token)
+
+        return self._fetch_user_details(token)
+
+    def _user_details_from_claims(
+        self, claims: Dict[str, Any], token: str
+    ) -> Optional[UserDetailsResponseDto]:
+        """Perfil a partir das claims ou do cache por ``sub``"""
+        if claims.get("email"):
+            return self._build_user_details(claims)
+
+        user = self._cached_profile(claims["sub"], token)
+        if user is None:
+            return None
+        # Os grupos vêm do token verificado, não do perfil em cache
+        return user.model_copy(update={"groups": _token_groups(claims)})
+
+    def _cached_profile(self, sub: str, token: str) -> Optional[UserDetailsResponseDto]:
+        with self._profiles_lock:
+            cached = self._profiles.get(sub)
+            if cached and cached[0] > time.monotonic():
+                self._profiles.move_to_end(sub)
+                return cached[1]
+
+        user = self._fetch_user_details(token)
+        if user is not None:
+            with self._profiles_lock:
+                self._profiles[sub] = (
+                    time.monotonic() + settings.cognito_profile_cache_seconds,
+                    user,
+                )
+                self._profiles.move_to_end(sub)
+                while len(self._profiles) > settings.cognito_profile_cache_max_entries:
+                    self._profiles.popitem(last=False)
+        return user
+
+    def _fetch_user_details(self, token: str) -> Optional[UserDetailsResponseDto]:
+        """
+        ``None`` só quando o Cognito recusa o token; falhas transitórias
+        (rede, throttling) levantam ``ExternalServiceException`` para não
+        serem tratadas (nem cacheadas) como token inválido.
         """
         try:
             resp = self.cognito.get_user(AccessToken=token)
-            user_attributes = {
-                attr["Name"]: attr["Value"] for attr in resp["UserAttributes"]
-            }
-            full_name = user_attributes.get("name", "")
-            first_name = full_name.split()[0] if full_name else ""
-            last_name = (
-                " ".join(full_name.split()[1:]) if len(full_name.split()) > 1 else ""
-            )
-
-            return UserDetailsResponseDto(
-                user_id=user_attributes.get("sub", ""),
-                user_sub=user_attributes.get("sub", ""),
-                email=user_attributes.get("email", ""),
-                first_name=first_name,
-                last_name=last_name,
-                name=full_name,
-                email_verified=user_attributes.get("email_verified", "true").lower()
-                == "true",
-                is_active=True,  # Cognito doesn't provide active status directly
-            )
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code")
+            if error_code in INVALID_TOKEN_ERRORS:
+                return None
+            raise ExternalServiceException(
+                service="cognito",
+                message_pt="Falha ao consultar o usuário no Cognito",
+                message_en="Failed to fetch the user from Cognito",
+                details={"operation": "get_user", "error": error_code},
+            ) from e
         except Exception as e:
-            return None
+            raise ExternalServiceException(
+                service="cognito",
+                message_pt="Falha ao consultar o usuário no Cognito",
+                message_en="Failed to fetch the user from Cognito",
+                details={"operation": "get_user", "error": str(e)},
+            ) from e
+
+        user_attributes = {
+            attr["Name"]: attr["Value"] for attr in resp["UserAttributes"]
+        }
+        return self._build_user_details(user_attributes)
+
+    @staticmethod
+    def _build_user_details(user_attributes: Dict[str, Any]) -> UserDetailsResponseDto:
+        full_name = user_attributes.get("name", "")
+        first_name = full_name.split()[0] if full_name else ""
+        last_name = (
+            " ".join(full_name.split()[1:]) if len(full_name.split()) > 1 else ""
+        )
+
+        return UserDetailsResponseDto(
+            user_id=user_attributes.get("sub", ""),
+            user_sub=user_attributes.get("sub", ""),
+            email=user_attributes.get("email", ""),
+            first_name=first_name,
+            last_name=last_name,
+            name=full_name,
+            email_verified=str(user_attributes.get("email_verified", "true")).lower()
+            == "true",
+            is_active=True,  # Cognito doesn't provide active status directly
+            groups=_token_groups(user_attributes),
+        )
 
     def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
         """
@@ -193,6 +359,7 @@ class AuthRepository(AuthInterface):
         try:
             # AWS Cognito uses global_sign_out for revoking tokens
             self.cognito.global_sign_out(AccessToken=token)
+            self._revoke_locally(token)
             return True
         except Exception as e:
             return False
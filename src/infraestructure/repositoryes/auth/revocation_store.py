@@ -0,0 +1,74 @@
+"""
+Revogações de tokens persistidas no Postgres.
+Token revocations persisted in Postgres.
+"""
+
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from infraestructure.database.models import AuthRevocationModel
+
+Revocation = Tuple[str, str, float, float]
+
+
+class PostgresRevocationStore:
+    """
+    Estado compartilhado das revogações entre workers e réplicas.
+    Revocation state shared across workers and replicas.
+
+    Cada linha é ``(kind, subject, revoked_at, expires_at)``: ``kind`` é
+    ``"user"`` (``sub`` de um logout global) ou ``"token"`` (``jti``).
+    Linhas expiradas são apagadas a cada gravação.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        self._session_factory = session_factory
+
+    @property
+    def session_factory(self) -> Callable[[], Session]:
+        if self._session_factory is None:
+            from infraestructure.resources import get_session_factory
+
+            self._session_factory = get_session_factory()
+        return self._session_factory
+
+    def save(
+        self, kind: str, subject: str, revoked_at: float, expires_at: float
+    ) -> None:
+        """Grava (ou estende) uma revogação / Stores (or extends) a revocation"""
+        table: Any = AuthRevocationModel.__table__
+        statement = insert(table).values(
+            kind=kind, subject=subject, revoked_at=revoked_at, expires_at=expires_at
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.kind, table.c.subject],
+            set_={
+                "revoked_at": func.greatest(
+                    table.c.revoked_at, statement.excluded.revoked_at
+                ),
+                "expires_at": func.greatest(
+                    table.c.expires_at, statement.excluded.expires_at
+                ),
+            },
+        )
+        with self.session_factory() as session:
+            session.execute(statement)
+            session.execute(delete(table).where(table.c.expires_at <= revoked_at))
+            session.commit()
+
+    def active(self, now: float) -> List[Revocation]:
+        """Revogações ainda vigentes / Revocations still in force"""
+        table: Any = AuthRevocationModel.__table__
+        with self.session_factory() as session:
+            rows = session.execute(
+                select(
+                    table.c.kind,
+                    table.c.subject,
+                    table.c.revoked_at,
+                    table.c.expires_at,
+                ).where(table.c.expires_at > now)
+            ).all()
+        return [(row[0], row[1], row[2], row[3]) for row in rows]
@@ -0,0 +1,352 @@
+"""
+Verificação local de access tokens do Cognito.
+Local verification of Cognito access tokens.
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import jwt
+import requests
+
+from core.exceptions.auth.auth_exceptions import (
+    InvalidTokenException,
+    TokenExpiredException,
+)
+from infraestructure.telemetry.metrics import MetricsRegistry, get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+JWKS_REFRESHES = "auth.jwks.refreshes"
+TOKENS_VERIFIED = "auth.tokens.verified_locally"
+TOKENS_REJECTED = "auth.tokens.rejected"
+VERIFICATION_LATENCY_MS = "auth.tokens.verification_latency_ms"
+
+# Vida máxima de um access token do Cognito (24h)
+MAX_ACCESS_TOKEN_SECONDS = 86400
+
+
+def cognito_issuer(region: Optional[str], user_pool_id: Optional[str]) -> str:
+    """Issuer (``iss``) dos tokens emitidos pelo user pool"""
+    return f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}"
+
+
+def fetch_jwks(url: str, timeout: float = 5.0) -> Dict[str, Any]:
+    """Baixa o JWKS público do user pool / Downloads the pool public JWKS"""
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+class JWKSUnavailableError(RuntimeError):
+    """
+    JWKS inacessível (em backoff); a verificação deve cair para o Cognito.
+    JWKS unreachable (backing off); verification should fall back to Cognito.
+    """
+
+
+class JWKSCache:
+    """
+    Cache das chaves públicas do user pool.
+    Cache of the user pool public keys.
+
+    A primeira carga é síncrona; depois disso, chaves vencidas continuam
+    servindo enquanto uma thread em background busca o JWKS novo. Um ``kid``
+    desconhecido (rotação de chaves) força uma recarga síncrona, limitada a
+    uma a cada ``MIN_REFRESH_SECONDS``.
+
+    Uma falha ao buscar o JWKS abre uma janela de backoff exponencial
+    (``FAILURE_BACKOFF_SECONDS`` até ``MAX_FAILURE_BACKOFF_SECONDS``) em que
+    nenhuma busca é feita e ``JWKSUnavailableError`` é levantado sem bloquear.
+    """
+
+    MIN_REFRESH_SECONDS = 60.0
+    FAILURE_BACKOFF_SECONDS = 1.0
+    MAX_FAILURE_BACKOFF_SECONDS = 60.0
+
+    def __init__(
+        self,
+        url: str,
+        refresh_seconds: float = 3600.0,
+        fetcher: Optional[Callable[[str], Dict[str, Any]]] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.url = url
+        self.refresh_seconds = refresh_seconds
+        self.fetcher = fetcher or fetch_jwks
+        self.metrics = metrics or get_metrics_registry()
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._loaded_at = 0.0
+        self._refreshing = False
+        self._failures = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self._loaded_at
+
+    @property
+    def backing_off(self) -> bool:
+        return time.monotonic() < self._retry_at
+
+    def refresh(self) -> None:
+        """Recarrega o JWKS / Reloads the JWKS"""
+        try:
+            jwks = self.fetcher(self.url)
+        except Exception:
+            with self._lock:
+                self._failures += 1
+                self._retry_at = time.monotonic() + min(
+                    self.FAILURE_BACKOFF_SECONDS * 2 ** (self._failures - 1),
+                    self.MAX_FAILURE_BACKOFF_SECONDS,
+                )
+            raise
+
+        keys: Dict[str, jwt.PyJWK] = {}
+        for data in jwks.get("keys", []):
+            try:
+                key = jwt.PyJWK(data)
+            except jwt.PyJWKError as e:
+                logger.warning(f"Ignoring unusable JWK {data.get('kid')}: {e}")
+                continue
+            keys[key.key_id] = key
+
+        with self._lock:
+            self._keys = keys
+            self._loaded_at = time.monotonic()
+            self._failures = 0
+            self._retry_at = 0.0
+        self.metrics.increment(JWKS_REFRESHES)
+
+    def refresh_in_background(self) -> None:
+        """Dispara uma recarga sem bloquear a requisição atual"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run() -> None:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Background JWKS refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="jwks-refresh", daemon=True).start()
+
+    def get_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        if not self._keys:
+            if self.backing_off:
+                raise JWKSUnavailableError(self.url)
+            self.refresh()
+
+        key = self._keys.get(kid)
+        if key is None and self.age >= self.MIN_REFRESH_SECONDS:
+            if self.backing_off:
+                raise JWKSUnavailableError(self.url)
+            self.refresh()
+            key = self._keys.get(kid)
+        elif self.age >= self.refresh_seconds and not self.backing_off:
+            self.refresh_in_background()
+
+        if key is None:
+            raise InvalidTokenException(details={"reason": "unknown_kid", "kid": kid})
+        return key
+
+
+class RevocationList:
+    """
+    Revogações para tokens ainda não expirados.
+    Revocations for tokens that have not expired yet.
+
+    ``global_sign_out`` invalida todos os tokens do usuário emitidos até o
+    momento do logout; a verificação local não enxerga isso, então o
+    instante do logout é guardado por ``sub`` até que qualquer token
+    anterior tenha expirado.
+
+    Com um ``store`` as revogações são gravadas no Postgres e cada processo
+    recarrega as vigentes a cada ``refresh_seconds`` (em background, como o
+    JWKS), então um logout vale em todos os workers. Como ``iat`` tem
+    resolução de segundos, o instante do logout é truncado e só tokens
+    emitidos estritamente antes dele são rejeitados: um login no mesmo
+    segundo do logout continua válido.
+    """
+
+    def __init__(self, store: Any = None, refresh_seconds: float = 5.0):
+        self.store = store
+        self.refresh_seconds = refresh_seconds
+        self._tokens: Dict[str, float] = {}
+        self._users: Dict[str, Tuple[float, float]] = {}
+        self._loaded_at: Optional[float] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._prune(time.time())
+            self._tokens[jti] = expires_at
+        self._save("token", jti, time.time(), expires_at)
+
+    def revoke_user(self, sub: str, revoked_at: Optional[float] = None) -> None:
+        revoked_at = float(math.floor(revoked_at or time.time()))
+        expires_at = revoked_at + MAX_ACCESS_TOKEN_SECONDS
+        with self._lock:
+            self._prune(time.time())
+            self._merge_user(sub, revoked_at, expires_at)
+        self._save("user", sub, revoked_at, expires_at)
+
+    def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        self._sync()
+        if claims.get("jti") in self._tokens:
+            return True
+        revoked = self._users.get(claims.get("sub", ""))
+        return revoked is not None and claims.get("iat", 0) < revoked[0]
+
+    def refresh(self) -> None:
+        """Mescla as revogações vigentes do store / Merges the store revocations"""
+        now = time.time()
+        rows = self.store.active(now)
+        with self._lock:
+            for kind, subject, revoked_at, expires_at in rows:
+                if kind == "token":
+                    self._tokens[subject] = max(
+                        expires_at, self._tokens.get(subject, expires_at)
+                    )
+                else:
+                    self._merge_user(subject, revoked_at, expires_at)
+            self._prune(now)
+            self._loaded_at = time.monotonic()
+
+    def refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run() -> None:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Background revocation refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="revocations-refresh", daemon=True).start()
+
+    def _sync(self) -> None:
+        if self.store is None:
+            return
+        if self._loaded_at is None:
+            # Primeira carga síncrona: sem ela um token revogado passaria
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Could not load shared revocations: {e}")
+                self._loaded_at = time.monotonic()
+        elif time.monotonic() - self._loaded_at >= self.refresh_seconds:
+            self.refresh_in_background()
+
+    def _save(
+        self, kind: str, subject: str, revoked_at: float, expires_at: float
+    ) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.save(kind, subject, revoked_at, expires_at)
+        except Exception as e:
+            logger.warning(f"Revocation kept only in this process: {e}")
+
+    def _merge_user(self, sub: str, revoked_at: float, expires_at: float) -> None:
+        current = self._users.get(sub)
+        if current is None or revoked_at > current[0]:
+            self._users[sub] = (revoked_at, expires_at)
+
+    def _prune(self, now: float) -> None:
+        self._tokens = {jti: exp for jti, exp in self._tokens.items() if exp > now}
+        self._users = {sub: entry for sub, entry in self._users.items() if entry[1] > now}
+
+
+class CognitoTokenVerifier:
+    """
+    Valida access tokens do Cognito sem chamadas de rede por requisição.
+    Validates Cognito access tokens without per-request network calls.
+
+    Verifica assinatura (RS256, JWKS em cache), ``iss``, ``exp``/``iat``
+    com tolerância de relógio, ``token_use == "access"``, ``client_id`` do
+    app client e a lista de revogações.
+    """
+
+    ALGORITHMS = ["RS256"]
+
+    def __init__(
+        self,
+        user_pool_id: Optional[str],
+        client_id: Optional[str],
+        region: Optional[str],
+        jwks: Optional[JWKSCache] = None,
+        revocations: Optional[RevocationList] = None,
+        leeway: int = 30,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.client_id = client_id
+        self.issuer = cognito_issuer(region, user_pool_id)
+        self.metrics = metrics or get_metrics_registry()
+        self.jwks = jwks or JWKSCache(
+            f"{self.issuer}/.well-known/jwks.json", metrics=self.metrics
+        )
+        self.revocations = revocations if revocations is not None else RevocationList()
+        self.leeway = leeway
+
+    def reject(self, reason: str) -> InvalidTokenException:
+        self.metrics.increment(TOKENS_REJECTED)
+        return InvalidTokenException(details={"reason": reason})
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Retorna as claims de um access token válido.
+        Returns the claims of a valid access token.
+
+        Raises:
+            TokenExpiredException: token expirado
+            InvalidTokenException: assinatura, emissor, uso, cliente ou revogação inválidos
+        """
+        with self.metrics.timer(VERIFICATION_LATENCY_MS):
+            try:
+                header = jwt.get_unverified_header(token)
+                key = self.jwks.get_key(header.get("kid"))
+                claims = jwt.decode(
+                    token,
+                    key=key.key,
+                    algorithms=self.ALGORITHMS,
+                    issuer=self.issuer,
+                    leeway=self.leeway,
+                    options={
+                        "require": ["exp", "iat", "sub", "token_use"],
+                        "verify_aud": False,
+                    },
+                )
+            except jwt.ExpiredSignatureError:
+                self.metrics.increment(TOKENS_REJECTED)
+                raise TokenExpiredException()
+            except jwt.PyJWTError as e:
+                raise self.reject(str(e))
+
+        if claims["token_use"] != "access":
+            raise self.reject("token_use")
+        if claims.get("client_id") != self.client_id:
+            raise self.reject("client_id")
+        if self.revocations.is_revoked(claims):
+            raise self.reject("revoked")
+
+        self.metrics.increment(TOKENS_VERIFIED)
+        return claims
@@ -1,21 +1,226 @@
+"""
+Repositório de chats no DynamoDB com um item por mensagem.
+DynamoDB chat repository with one item per message.
+
+Layout da tabela ``<prefix>-<env>-chat-items`` (chave ``chatId`` + ``sk``):
+
+- ``sk = "CHAT"``: metadados do chat (dono, status, datas). Só esses itens
+  têm ``userId``, então o ``userId-index`` lista os chats de um usuário;
+- ``sk = "MSG#<timestamp>#<messageId>"``: uma mensagem. O timestamp tem
+  largura fixa, então a ordem da chave é a ordem cronológica.
+
+Adicionar uma mensagem é uma transação pequena (o item da mensagem mais uma
+verificação de que o chat existe) e o histórico é lido com
+``Query`` paginado, sem reescrever nem carregar a conversa inteira (e sem o
+limite de 400 KB por item do layout antigo, com a lista ``messages``).
+"""
+
+import base64
+import binascii
 import logging
-from typing import Any, Dict, List
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
 
 from configs.load_env import settings
-from core.entities.chat import Chat
-from core.exceptions.base_exceptions import BaseApplicationException
+from core.entities.chat import Chat, ChatMessage, ChatMessagePage
+from core.exceptions.base_exceptions import (
+    BaseApplicationException,
+    ValidationException,
+)
+from core.exceptions.chat import (
+    ChatCreationException,
+    ChatDeletionException,
+    ChatListException,
+    ChatMessageException,
+    ChatNotFoundException,
+    ChatUpdateException,
+)
 from infraestructure.client_factory.aws import AWSClientFactory
 from interface.chat.chat_interface import ChatInterface
 
 logger = logging.getLogger(__name__)
 
+SORT_KEY = "sk"
+CHAT_SORT_KEY = "CHAT"
+MESSAGE_PREFIX = "MSG#"
+USER_CHATS_INDEX = "userId-index"
+# Largura fixa (sempre com microssegundos) para a chave ordenar como o tempo
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def chat_items_table_name() -> str:
+    """Nome da tabela com o layout de um item por mensagem"""
+    return f"{settings.app_prefix}-{settings.environment}-chat-items"
+
+
+def format_timestamp(value: datetime) -> str:
+    """Timestamp ordenável; datas com fuso são convertidas para UTC"""
+    if value.tzinfo:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+def message_sort_key(message: ChatMessage) -> str:
+    """Chave de ordenação de uma mensagem / Sort key of a message"""
+    return f"{MESSAGE_PREFIX}{format_timestamp(message.timestamp)}#{message.message_id}"
+
+
+def chat_item(chat: Chat) -> Dict[str, Any]:
+    """Item de metadados do chat (sem as mensagens)"""
+    now = datetime.now()
+    return {
+        "chatId": chat.chat_id,
+        SORT_KEY: CHAT_SORT_KEY,
+        "userId": chat.user_id,
+        "isActive": chat.is_active,
+        "createdAt": format_timestamp(chat.created_at or now),
+        "updatedAt": format_timestamp(chat.updated_at or now),
+    }
+
+
+def message_item(chat_id: str, message: ChatMessage) -> Dict[str, Any]:
+    """
+    Item de uma mensagem. O remetente fica em ``senderId`` para o
+    ``userId-index`` continuar só com os metadados dos chats.
+    """
+    return {
+        "chatId": chat_id,
+        SORT_KEY: message_sort_key(message),
+        "messageId": message.message_id,
+        "senderId": message.user_id,
+        "content": message.content,
+        "timestamp": format_timestamp(message.timestamp),
+    }
+
+
+def chat_layout_items(chat: Chat) -> List[Dict[str, Any]]:
+    """Todos os itens de um chat no novo layout: metadados e mensagens"""
+    return [chat_item(chat)] + [
+        message_item(chat.chat_id, message) for message in chat.messages or []
+    ]
+
+
+def chat_from_item(item: Dict[str, Any]) -> Chat:
+    return Chat(
+        chatId=item["chatId"],
+        userId=item["userId"],
+        isActive=item.get("isActive", True),
+        createdAt=item.get("createdAt"),
+        updatedAt=item.get("updatedAt"),
+        messages=[],
+    )
+
+
+def message_from_item(item: Dict[str, Any]) -> ChatMessage:
+    return ChatMessage(
+        messageId=item["messageId"],
+        userId=item["senderId"],
+        content=item["content"],
+        timestamp=item["timestamp"],
+    )
+
+
+def encode_message_cursor(
+    last_evaluated_key: Optional[Dict[str, Any]],
+) -> Optional[str]:
+    """Cursor opaco com só a chave de ordenação (o chat vem da rota)"""
+    if not last_evaluated_key:
+        return None
+    raw = last_evaluated_key[SORT_KEY].encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_message_cursor(cursor: str) -> str:
+    """
+    Decodifica um cursor de ``encode_message_cursor``.
+    Decodes a cursor from ``encode_message_cursor``.
+
+    Raises:
+        ValidationException: Se o cursor não for de uma mensagem
+    """
+    try:
+        sort_key = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        sort_key = ""
+    if not sort_key.startswith(MESSAGE_PREFIX):
+        raise ValidationException(
+            message_pt="Cursor de paginação inválido",
+            message_en="Invalid pagination cursor",
+            field="cursor",
+            error_code="INVALID_CURSOR",
+        )
+    return sort_key
+
+
+def message_page_size(limit: Optional[int]) -> int:
+    """Tamanho de página do histórico: padrão das settings, limitado ao máximo"""
+    if limit is None:
+        limit = settings.chat_messages_default_page_size
+    if limit < 1:
+        raise ValidationException(
+            message_pt="O tamanho da página deve ser positivo",
+            message_en="Page size must be positive",
+            field="limit",
+            value=limit,
+            error_code="INVALID_PAGE_SIZE",
+        )
+    return min(limit, settings.chat_messages_max_page_size)
+
+
+def add_message_transaction(
+    table_name: str, chat_id: str, message: ChatMessage
+) -> List[Dict[str, Any]]:
+    """
+    Grava a mensagem só se o item de metadados do chat existir, para não
+    deixar itens ``MSG#`` órfãos fora do alcance do ``delete_chat``.
+    """
+    return [
+        {
+            "Put": {
+                "TableName": table_name,
+                "Item": message_item(chat_id, message),
+                "ConditionExpression": "attribute_not_exists(#sk)",
+                "ExpressionAttributeNames": {"#sk": SORT_KEY},
+            }
+        },
+        {
+            "ConditionCheck": {
+                "TableName": table_name,
+                "Key": {"chatId": chat_id, SORT_KEY: CHAT_SORT_KEY},
+                "ConditionExpression": "attribute_exists(#chatId)",
+                "ExpressionAttributeNames": {"#chatId": "chatId"},
+            }
+        },
+    ]
+
+
+def cancellation_failures(error: Exception) -> List[bool]:
+    """Quais itens de uma transação cancelada falharam na condição"""
+    if not isinstance(error, ClientError):
+        return []
+    return [
+        reason.get("Code") == "ConditionalCheckFailed"
+        for reason in error.response.get("CancellationReasons", [])
+    ]
+
+
+def is_conditional_check_failure(error: Exception) -> bool:
+    return (
+        isinstance(error, ClientError)
+        and error.response.get("Error", {}).get("Code")
+        == "ConditionalCheckFailedException"
+    )
+
 
 class ChatRepository(ChatInterface):
     """Repositório de chats que implementa a interface ChatInterface"""
 
-    def __init__(self, client_factory: AWSClientFactory = AWSClientFactory()):
-        self.table_name = f"{settings.app_prefix}-{settings.environment}-chats"
-        self.aws_factory = client_factory
+    def __init__(self, client_factory: Optional[AWSClientFactory] = None):
+        self.table_name = chat_items_table_name()
+        self.aws_factory = client_factory or AWSClientFactory()
 
         try:
             self.table = self.aws_factory.dynamo_table(self.table_name)
@@ -32,92 +237,204 @@ class ChatRepository(ChatInterface):
                     error_code="DYNAMODB_CONNECTION_ERROR",
                 )
 
-            logger.info(f"UserRepository initialized with table: {self.table_name}")
+            logger.info(f"ChatRepository initialized with table: {self.table_name}")
 
         except Exception as e:
-            logger.error(f"Failed to initialize UserRepository: {str(e)}")
+            logger.error(f"Failed to initialize ChatRepository: {str(e)}")
             raise
 
     def create_chat(self, chat_data: Chat) -> Chat:
         try:
-            self.table.put_item(Item={
-                "chatId": chat_data.chat_id,
-                "userId": chat_data.user_id,
-                "isActive": chat_data.is_active,
-                "messages": chat_data.messages,
-            })
+            self.table.put_item(
+                Item=chat_item(chat_data),
+                ConditionExpression=Attr("chatId").not_exists(),
+            )
+            if chat_data.messages:
+                self._put_messages(chat_data.chat_id, chat_data.messages)
             logger.info(f"Chat created successfully: {chat_data.chat_id}")
-            
             return chat_data
         except Exception as e:
             logger.error(f"Failed to create chat: {str(e)}")
-            raise
+            raise ChatCreationException(
+                details={"original_error": str(e), "user_id": chat_data.user_id}
+            ) from e
 
-    def get_chats(self, chat_id: str) -> Chat:
+    def get_chat(self, chat_id: str) -> Optional[Chat]:
+        """Metadados de um chat, sem o histórico (use ``get_messages``)"""
         try:
-            response = self.table.get_item(Key={"chatId": chat_id})
-            if "Item" not in response:
-                logger.warning(f"Chat not found: {chat_id}")
-                return None
-            chat_data = response["Item"]
-            chat = Chat(**chat_data)
-            logger.info(f"Chat retrieved successfully: {chat.chat_id}")
-            return chat
+            response = self.table.get_item(
+                Key={"chatId": chat_id, SORT_KEY: CHAT_SORT_KEY}
+            )
         except Exception as e:
             logger.error(f"Failed to retrieve chat: {str(e)}")
-            raise BaseApplicationException(
-                message_pt="Erro ao recuperar chat",
-                message_en="Error retrieving chat",
-                details={"chat_id": chat_id},
-                error_code="CHAT_RETRIEVAL_ERROR",
-            )
+            raise ChatListException(
+                details={"original_error": str(e), "chat_id": chat_id}
+            ) from e
+        item = response.get("Item")
+        return chat_from_item(item) if item else None
+
+    def get_chats(self, user_id: str) -> List[Chat]:
+        """Chats de um usuário pelo ``userId-index`` (só itens de metadados)"""
+        chats: List[Chat] = []
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": USER_CHATS_INDEX,
+            "KeyConditionExpression": Key("userId").eq(user_id),
+        }
+        try:
+            while True:
+                response = self.table.query(**query_kwargs)
+                chats.extend(chat_from_item(item) for item in response["Items"])
+                if not response.get("LastEvaluatedKey"):
+                    break
+                query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        except Exception as e:
+            logger.error(f"Failed to list chats: {str(e)}")
+            raise ChatListException(
+                details={"original_error": str(e), "user_id": user_id}
+            ) from e
+        return chats
 
     def delete_chat(self, chat_id: str) -> bool:
+        """Remove os metadados e todas as mensagens do chat, em lotes"""
+        query_kwargs: Dict[str, Any] = {
+            "KeyConditionExpression": Key("chatId").eq(chat_id),
+            "ProjectionExpression": "chatId, sk",
+        }
+        deleted = 0
         try:
-            response = self.table.delete_item(Key={"chatId": chat_id})
-            if "Attributes" not in response:
-                logger.warning(f"Chat not found for deletion: {chat_id}")
-                return False
-            logger.info(f"Chat deleted successfully: {chat_id}")
-            return True
+            with self.table.batch_writer() as batch:
+                while True:
+                    response = self.table.query(**query_kwargs)
+                    for key in response["Items"]:
+                        batch.delete_item(Key=key)
+                        deleted += 1
+                    if not response.get("LastEvaluatedKey"):
+                        break
+                    query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
         except Exception as e:
             logger.error(f"Failed to delete chat: {str(e)}")
-            raise BaseApplicationException(
-                message_pt="Erro ao deletar chat",
-                message_en="Error deleting chat",
-                details={"chat_id": chat_id},
-                error_code="CHAT_DELETION_ERROR",
-            )
+            raise ChatDeletionException(
+                details={"original_error": str(e), "chat_id": chat_id}
+            ) from e
 
-    def update_chat(self, chat_id: str, chat_data: Chat) -> Chat:
-        try:
-            update_expression = "SET isActive = :isActive, messages = :messages"
-            expression_values = {
-                ":isActive": chat_data.is_active,
-                ":messages": chat_data.messages,
-            }
+        if not deleted:
+            logger.warning(f"Chat not found for deletion: {chat_id}")
+            return False
+        logger.info(f"Chat deleted successfully: {chat_id} ({deleted} items)")
+        return True
 
+    def update_chat(self, chat_id: str, chat_data: Chat) -> Optional[Chat]:
+        """
+        Atualiza os metadados do chat e grava as mensagens recebidas.
+        Updates the chat metadata and stores the given messages.
+
+        As mensagens não são reescritas em bloco: cada uma é um item com
+        chave própria, então reenviar uma mensagem existente é idempotente.
+        Para novas mensagens prefira ``add_message``.
+        """
+        try:
             response = self.table.update_item(
-                Key={"chatId": chat_id},
-                UpdateExpression=update_expression,
-                ExpressionAttributeValues=expression_values,
+                Key={"chatId": chat_id, SORT_KEY: CHAT_SORT_KEY},
+                UpdateExpression="SET isActive = :isActive, updatedAt = :updatedAt",
+                ConditionExpression=Attr("chatId").exists(),
+                ExpressionAttributeValues={
+                    ":isActive": chat_data.is_active,
+                    ":updatedAt": format_timestamp(datetime.now()),
+                },
                 ReturnValues="ALL_NEW",
             )
-
-            if "Attributes" not in response:
+            if chat_data.messages:
+                self._put_messages(chat_id, chat_data.messages)
+        except Exception as e:
+            if is_conditional_check_failure(e):
                 logger.warning(f"Chat not found for update: {chat_id}")
                 return None
+            logger.error(f"Failed to update chat: {str(e)}")
+            raise ChatUpdateException(
+                details={"original_error": str(e), "chat_id": chat_id}
+            ) from e
+
+        logger.info(f"Chat updated successfully: {chat_id}")
+        return chat_from_item(response["Attributes"])
 
-            updated_chat_data = response["Attributes"]
-            updated_chat = Chat(**updated_chat_data)
-            logger.info(f"Chat updated successfully: {chat_id}")
-            return updated_chat
+    def add_message(self, chat_id: str, message: ChatMessage) -> ChatMessage:
+        """
+        Adiciona uma mensagem numa única transação, sem ler o chat.
+        Appends a message in a single transaction, without reading the chat.
 
+        Raises:
+            ChatNotFoundException: Se o chat não existir
+            ChatMessageException: Se houver erro na gravação
+        """
+        try:
+            self.table.meta.client.transact_write_items(
+                TransactItems=add_message_transaction(self.table_name, chat_id, message)
+            )
         except Exception as e:
-            logger.error(f"Failed to update chat: {str(e)}")
-            raise BaseApplicationException(
-                message_pt="Erro ao atualizar chat",
-                message_en="Error updating chat",
-                details={"chat_id": chat_id},
-                error_code="CHAT_UPDATE_ERROR",
-            )
\ No newline at end of file
+            failures = cancellation_failures(e)
+            if failures[1:] and failures[1]:
+                logger.warning(f"Chat not found for new message: {chat_id}")
+                raise ChatNotFoundException(
+                    details={"chat_id": chat_id, "operation": "add_message"}
+                ) from e
+            if failures and failures[0]:
+                logger.info(f"Message already stored: {message.message_id}")
+                return message
+            logger.error(f"Failed to add message: {str(e)}")
+            raise ChatMessageException(
+                details={
+                    "original_error": str(e),
+                    "chat_id": chat_id,
+                    "message_id": message.message_id,
+                }
+            ) from e
+        return message
+
+    def get_messages(
+        self,
+        chat_id: str,
+        before: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> ChatMessagePage:
+        """
+        Lê uma página do histórico, das mensagens mais novas para as antigas.
+        Reads one history page, from the newest messages to the oldest.
+
+        Cada página vem em ordem cronológica; ``next_cursor``, passado como
+        ``before``, aponta para as mensagens anteriores à primeira da página.
+
+        Raises:
+            ValidationException: Se o cursor ou o limite forem inválidos
+            ChatMessageException: Se houver erro na leitura
+        """
+        query_kwargs: Dict[str, Any] = {
+            "KeyConditionExpression": Key("chatId").eq(chat_id)
+            & Key(SORT_KEY).begins_with(MESSAGE_PREFIX),
+            "ScanIndexForward": False,
+            "Limit": message_page_size(limit),
+        }
+        if before:
+            query_kwargs["ExclusiveStartKey"] = {
+                "chatId": chat_id,
+                SORT_KEY: decode_message_cursor(before),
+            }
+
+        try:
+            response = self.table.query(**query_kwargs)
+        except Exception as e:
+            logger.error(f"Failed to read messages: {str(e)}")
+            raise ChatMessageException(
+                details={"original_error": str(e), "chat_id": chat_id}
+            ) from e
+
+        messages = [message_from_item(item) for item in response["Items"]]
+        messages.reverse()
+        return ChatMessagePage(
+            messages=messages,
+            next_cursor=encode_message_cursor(response.get("LastEvaluatedKey")),
+        )
+
+    def _put_messages(self, chat_id: str, messages: List[ChatMessage]) -> None:
+        with self.table.batch_writer(overwrite_by_pkeys=["chatId", SORT_KEY]) as batch:
+            for message in messages:
+                batch.put_item(Item=message_item(chat_id, message))
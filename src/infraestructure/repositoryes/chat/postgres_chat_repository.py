@@ -1,16 +1,211 @@
-from typing import List, Optional
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
 
-from core.entities.chat import Chat
+from sqlalchemy import Select, select, true, tuple_, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from core.entities.chat import (
+    Chat,
+    ChatMessage,
+    ChatMessagePage,
+    ChatPage,
+    ChatSummary,
+)
+from core.exceptions import ValidationException
 from core.exceptions.chat import (
     ChatCreationException,
     ChatDeletionException,
     ChatListException,
+    ChatMessageException,
     ChatNotFoundException,
     ChatUpdateException,
 )
-from infraestructure.database.config import AsyncSessionLocal
+from infraestructure.repositoryes.chat.chat_repository import message_page_size
+from infraestructure.resources import get_async_session_factory
 from interface.chat.chat_interface import AsyncChatInterface
 
+# Chave keyset: (updated_at, chat_id) na listagem, (timestamp, message_id)
+# no histórico de mensagens
+KeysetKey = Tuple[datetime, str]
+
+
+def encode_keyset_cursor(at: datetime, identifier: str) -> str:
+    """Cursor opaco com a chave ``(momento, id)`` do último item devolvido"""
+    raw = json.dumps([at.isoformat(), identifier], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_keyset_cursor(cursor: str) -> KeysetKey:
+    """
+    Decodifica um cursor de ``encode_keyset_cursor``.
+    Decodes a cursor from ``encode_keyset_cursor``.
+
+    Raises:
+        ValidationException: Se o cursor não foi gerado por esta listagem
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        at, identifier = json.loads(raw)
+        if isinstance(identifier, str):
+            return datetime.fromisoformat(at), identifier
+    except (binascii.Error, TypeError, ValueError):
+        pass
+    raise ValidationException(
+        message_pt="Cursor de paginação inválido",
+        message_en="Invalid pagination cursor",
+        field="cursor",
+        error_code="INVALID_CURSOR",
+    )
+
+
+def chat_list_statement(
+    user_id: str, limit: Optional[int] = None, after: Optional[KeysetKey] = None
+) -> Select:
+    """
+    Chats de um usuário em ``(updated_at DESC, chat_id DESC)``, só as colunas
+    da listagem. Com ``after``, continua depois dessa chave (keyset), o que
+    percorre o índice ``ix_chats_user_id_updated_at_chat_id`` sem OFFSET.
+    """
+    from infraestructure.database.models import ChatModel
+
+    statement = (
+        select(
+            ChatModel.chat_id,
+            ChatModel.user_id,
+            ChatModel.is_active,
+            ChatModel.created_at,
+            ChatModel.updated_at,
+            ChatModel.last_message_at,
+            ChatModel.message_count,
+        )
+        .where(ChatModel.user_id == user_id)
+        .order_by(ChatModel.updated_at.desc(), ChatModel.chat_id.desc())
+    )
+    if after is not None:
+        statement = statement.where(
+            tuple_(ChatModel.updated_at, ChatModel.chat_id) < tuple_(*after)
+        )
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+
+def chat_summary_statement(
+    user_id: str, limit: Optional[int] = None, after: Optional[KeysetKey] = None
+) -> Select:
+    """
+    Página de ``chat_list_statement`` com a última mensagem de cada chat.
+
+    Um ``LEFT JOIN LATERAL ... LIMIT 1`` lê só a mensagem mais recente de
+    cada chat da página pelo índice ``ix_chat_messages_chat_id_timestamp``;
+    o total vem do contador desnormalizado ``message_count``. A barra lateral
+    custa uma consulta, qualquer que seja o número de chats.
+    """
+    from infraestructure.database.models import ChatMessageModel
+
+    page = chat_list_statement(user_id, limit, after).subquery("page")
+    last_message = (
+        select(
+            ChatMessageModel.message_id,
+            ChatMessageModel.user_id,
+            ChatMessageModel.content,
+            ChatMessageModel.timestamp,
+        )
+        .where(ChatMessageModel.chat_id == page.c.chat_id)
+        .order_by(ChatMessageModel.timestamp.desc(), ChatMessageModel.message_id.desc())
+        .limit(1)
+        .lateral("last_message")
+    )
+    return (
+        select(
+            page,
+            last_message.c.message_id.label("last_message_id"),
+            last_message.c.user_id.label("last_message_user_id"),
+            last_message.c.content.label("last_message_content"),
+            last_message.c.timestamp.label("last_message_timestamp"),
+        )
+        .select_from(page)
+        .outerjoin(last_message, true())
+        .order_by(page.c.updated_at.desc(), page.c.chat_id.desc())
+    )
+
+
+def message_history_statement(
+    chat_id: str, limit: int, before: Optional[KeysetKey] = None
+) -> Select:
+    """
+    Mensagens de um chat da mais nova para a mais antiga, só as colunas.
+
+    Percorre ``ix_chat_messages_chat_id_timestamp`` a partir de ``before``
+    (keyset, sem OFFSET): o custo de uma página não cresce com a
+    profundidade no histórico. Sem entidades ORM, nada do ``ChatModel`` é
+    carregado e nenhum relacionamento é disparado.
+    """
+    from infraestructure.database.models import ChatMessageModel
+
+    statement = (
+        select(
+            ChatMessageModel.message_id,
+            ChatMessageModel.user_id,
+            ChatMessageModel.content,
+            ChatMessageModel.timestamp,
+        )
+        .where(ChatMessageModel.chat_id == chat_id)
+        .order_by(ChatMessageModel.timestamp.desc(), ChatMessageModel.message_id.desc())
+        .limit(limit)
+    )
+    if before is not None:
+        statement = statement.where(
+            tuple_(ChatMessageModel.timestamp, ChatMessageModel.message_id)
+            < tuple_(*before)
+        )
+    return statement
+
+
+def message_from_row(row: Any) -> ChatMessage:
+    return ChatMessage(
+        messageId=str(row.message_id),
+        userId=str(row.user_id),
+        content=row.content,
+        timestamp=row.timestamp,
+    )
+
+
+def chat_from_row(row: Any) -> Chat:
+    return Chat(
+        chatId=str(row.chat_id),
+        userId=str(row.user_id),
+        isActive=bool(row.is_active),
+        createdAt=row.created_at,
+        updatedAt=row.updated_at,
+        messages=[],
+    )
+
+
+def summary_from_row(row: Any) -> ChatSummary:
+    last_message = None
+    if row.last_message_id is not None:
+        last_message = ChatMessage(
+            messageId=str(row.last_message_id),
+            userId=str(row.last_message_user_id),
+            content=row.last_message_content,
+            timestamp=row.last_message_timestamp,
+        )
+    return ChatSummary(
+        chatId=str(row.chat_id),
+        userId=str(row.user_id),
+        isActive=bool(row.is_active),
+        createdAt=row.created_at,
+        updatedAt=row.updated_at,
+        messages=[],
+        lastMessage=last_message,
+        lastMessageAt=row.last_message_at,
+        messageCount=row.message_count or 0,
+    )
+
 
 class PostgresChatRepository(AsyncChatInterface):
     """
@@ -18,12 +213,14 @@ class PostgresChatRepository(AsyncChatInterface):
     PostgreSQL chat repository
     """
 
-    def __init__(self):
+    def __init__(self, session_factory: Optional[async_sessionmaker] = None):
         """
         Inicializa o repositório com a factory de sessão do banco de dados
         Initializes the repository with the database session factory
+
+        Sem factory explícita, usa a do container de recursos do processo.
         """
-        self.session_factory = AsyncSessionLocal
+        self.session_factory = session_factory or get_async_session_factory()
 
     async def create_chat(self, chat_data: Chat) -> Chat:
         """
@@ -57,32 +254,13 @@ class PostgresChatRepository(AsyncChatInterface):
 
     async def get_chats(self, user_id: str) -> Optional[List[Chat]]:
         """
-        Obtém todos os chats de um usuário
-        Gets all chats of a user
+        Obtém todos os chats de um usuário, do mais recente ao mais antigo
+        Gets all chats of a user, most recently updated first
         """
-        from sqlalchemy import select
-
-        from infraestructure.database.models import ChatModel
-
         try:
             async with self.session_factory() as session:
-                result = await session.execute(
-                    select(ChatModel).filter(ChatModel.user_id == user_id)
-                )
-                chats = result.scalars().all()
-                return (
-                    [
-                        Chat(
-                            chatId=str(chat.chat_id),
-                            userId=str(chat.user_id),
-                            isActive=bool(chat.is_active),
-                            messages=[],
-                        )
-                        for chat in chats
-                    ]
-                    if chats
-                    else []
-                )
+                result = await session.execute(chat_list_statement(user_id))
+                return [chat_from_row(row) for row in result]
         except Exception as e:
             raise ChatListException(
                 details={
@@ -161,37 +339,148 @@ class PostgresChatRepository(AsyncChatInterface):
 
     async def list_chats(self, user_id: str) -> list[Chat]:
         """
-        Lista todos os chats de um usuário
-        Lists all chats of a user
+        Lista todos os chats de um usuário, do mais recente ao mais antigo
+        Lists all chats of a user, most recently updated first
         """
-        from sqlalchemy import select
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(chat_list_statement(user_id))
+                return [chat_from_row(row) for row in result]
+        except Exception as e:
+            raise ChatListException(
+                details={
+                    "original_error": str(e),
+                    "user_id": user_id,
+                    "operation": "list_chats",
+                }
+            ) from e
 
-        from infraestructure.database.models import ChatModel
+    async def list_chats_page(
+        self, user_id: str, limit: int, cursor: Optional[str] = None
+    ) -> ChatPage:
+        """
+        Lista uma página de chats, com a última mensagem e o total de cada um,
+        a partir de um cursor opaco.
+        Lists one page of chats, with each one's latest message and count,
+        from an opaque cursor.
+
+        Busca ``limit + 1`` linhas: a linha extra só indica que há uma
+        próxima página, e o cursor aponta para o último chat devolvido.
 
+        Raises:
+            ValidationException: Se o cursor for inválido
+        """
+        after = decode_keyset_cursor(cursor) if cursor else None
         try:
             async with self.session_factory() as session:
                 result = await session.execute(
-                    select(ChatModel).filter(ChatModel.user_id == user_id)
-                )
-                chats = result.scalars().all()
-                return (
-                    [
-                        Chat(
-                            chatId=str(chat.chat_id),
-                            userId=str(chat.user_id),
-                            isActive=bool(chat.is_active),
-                            messages=[],
-                        )
-                        for chat in chats
-                    ]
-                    if chats
-                    else []
+                    chat_summary_statement(user_id, limit + 1, after)
                 )
+                rows = result.all()
         except Exception as e:
             raise ChatListException(
                 details={
                     "original_error": str(e),
                     "user_id": user_id,
-                    "operation": "list_chats",
+                    "operation": "list_chats_page",
                 }
             ) from e
+
+        chats = [summary_from_row(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_keyset_cursor(last.updated_at, str(last.chat_id))
+        return ChatPage(chats=chats, next_cursor=next_cursor)
+
+    async def add_message(self, chat_id: str, message: ChatMessage) -> ChatMessage:
+        """
+        Adiciona uma mensagem e marca a atividade do chat na mesma transação
+        Adds a message and bumps the chat activity in the same transaction
+
+        O ``UPDATE`` do chat vem primeiro: trava a linha do chat e confirma
+        que ele existe, e ``updated_at`` avança para a listagem por atividade
+        recente. ``message_count`` e ``last_message_at`` são mantidos pelo
+        trigger de ``chat_messages`` (migração 52c34806bacf), como em
+        qualquer outra escrita de mensagens.
+        """
+        from infraestructure.database.models import ChatMessageModel, ChatModel
+
+        async with self.session_factory() as session:
+            try:
+                result = await session.execute(
+                    update(ChatModel)
+                    .where(ChatModel.chat_id == chat_id)
+                    .values(updated_at=datetime.utcnow())
+                )
+                if result.rowcount == 0:
+                    raise ChatNotFoundException(
+                        details={"chat_id": chat_id, "operation": "add_message"}
+                    )
+
+                session.add(
+                    ChatMessageModel(
+                        message_id=message.message_id,
+                        chat_id=chat_id,
+                        user_id=message.user_id,
+                        content=message.content,
+                        timestamp=message.timestamp,
+                    )
+                )
+                await session.commit()
+                return message
+            except ChatNotFoundException:
+                await session.rollback()
+                raise
+            except Exception as e:
+                await session.rollback()
+                raise ChatMessageException(
+                    details={
+                        "original_error": str(e),
+                        "chat_id": chat_id,
+                        "operation": "add_message",
+                    }
+                ) from e
+
+    async def get_messages(
+        self,
+        chat_id: str,
+        before: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> ChatMessagePage:
+        """
+        Lê uma página do histórico, da mais recente para trás.
+        Reads one page of the history, newest first and going back.
+
+        A página vem em ordem cronológica; ``next_cursor`` (passado como
+        ``before``) aponta para mensagens mais antigas e é None no início.
+
+        Raises:
+            ValidationException: Se o cursor ou o tamanho forem inválidos
+        """
+        limit = message_page_size(limit)
+        after = decode_keyset_cursor(before) if before else None
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    message_history_statement(chat_id, limit + 1, after)
+                )
+                rows = result.all()
+        except Exception as e:
+            raise ChatMessageException(
+                details={
+                    "original_error": str(e),
+                    "chat_id": chat_id,
+                    "operation": "get_messages",
+                }
+            ) from e
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            oldest = page[-1]
+            next_cursor = encode_keyset_cursor(oldest.timestamp, str(oldest.message_id))
+        return ChatMessagePage(
+            messages=[message_from_row(row) for row in reversed(page)],
+            next_cursor=next_cursor,
+        )
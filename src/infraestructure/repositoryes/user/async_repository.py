@@ -0,0 +1,680 @@
+"""
+Repositório de usuários assíncrono sobre o cliente DynamoDB do aiobotocore.
+Async user repository on the aiobotocore DynamoDB client.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+from configs.load_env import settings
+from core.entities.user import User, UserPage
+from core.exceptions import ServiceUnavailableException
+from core.exceptions.base_exceptions import BaseApplicationException, ConflictException
+from core.exceptions.user import (
+    UserBusinessRuleException,
+    UserNotFoundException,
+)
+from infraestructure.client_factory.aws import AsyncAWSClientFactory
+from infraestructure.repositoryes.user.repository import (
+    BATCH_GET_MAX_KEYS,
+    BATCH_WRITE_MAX_ITEMS,
+    EMAIL_INDEX_AVAILABLE,
+    EMAIL_INDEX_NAME,
+    EMAIL_LOOKUP_INDEX,
+    EMAIL_LOOKUP_SENTINEL,
+    SENTINEL_OWNER_ATTRIBUTE,
+    THROTTLING_ERRORS,
+    apply_update,
+    build_update_expression,
+    change_email_conflict,
+    change_email_transaction,
+    conditional_failures,
+    create_conflict,
+    create_user_transaction,
+    decode_cursor,
+    delete_failure,
+    delete_user_transaction,
+    email_index_missing,
+    email_index_status,
+    email_sentinel_key,
+    encode_cursor,
+    from_item,
+    jittered_backoff,
+    order_batch_results,
+    partial_update_data,
+    serialize_user_data,
+    to_item,
+    typed_transaction,
+    user_batch_items,
+    user_page_scan_params,
+)
+from infraestructure.telemetry.metrics import MetricsRegistry, get_metrics_registry
+from interface.user.user_interface import AsyncUserInterface
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncUserRepository(AsyncUserInterface):
+    """
+    Implementação assíncrona do repositório de usuários no DynamoDB.
+    Async implementation of the DynamoDB user repository.
+
+    Usa o cliente compartilhado do ``AsyncAWSClientFactory`` (um pool de
+    conexões aiohttp por event loop): requisições concorrentes ficam em
+    ``await`` no socket em vez de ocupar uma thread cada. Semântica e
+    códigos de erro são os mesmos do ``UserRepository``.
+    """
+
+    def __init__(
+        self,
+        client_factory: Optional[AsyncAWSClientFactory] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.table_name = f"{settings.app_prefix}-{settings.environment}-users"
+        self.aws_factory = client_factory or AsyncAWSClientFactory()
+        self.metrics = metrics or get_metrics_registry()
+
+    async def _client(self):
+        return await self.aws_factory.dynamo()
+
+    def _failure(
+        self,
+        error: Exception,
+        message_pt: str,
+        message_en: str,
+        error_code: str,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> BaseApplicationException:
+        """Converte erros do DynamoDB no padrão de exceções do repositório"""
+        details = dict(details or {}, error=str(error))
+        if isinstance(error, ClientError):
+            details["error_code"] = error.response.get("Error", {}).get(
+                "Code", "Unknown"
+            )
+            logger.error(f"DynamoDB ClientError: {message_en} - {error}")
+        else:
+            details["error_type"] = type(error).__name__
+            message_pt = f"Erro inesperado: {message_pt}"
+            message_en = f"Unexpected error: {message_en}"
+            error_code = error_code.replace("_ERROR", "_UNEXPECTED_ERROR")
+            logger.error(f"Unexpected error: {message_en} - {error}")
+        return BaseApplicationException(
+            message_pt=message_pt,
+            message_en=message_en,
+            details=details,
+            error_code=error_code,
+            status_code=500,
+        )
+
+    async def create_user(self, user: User) -> User:
+        """
+        Cria um novo usuário no banco de dados.
+        Creates a new user in the database.
+
+        Raises:
+            UserAlreadyExistsException: Se o ID ou o email já existem
+            BaseApplicationException: Se houver erro na criação
+        """
+        try:
+            client = await self._client()
+            await client.transact_write_items(
+                TransactItems=typed_transaction(
+                    create_user_transaction(self.table_name, serialize_user_data(user))
+                )
+            )
+
+            logger.info(f"User created successfully: {user.user_id}")
+            return user
+
+        except ClientError as e:
+            conflict = create_conflict(e, user)
+            if conflict is not None:
+                logger.warning(f"Attempt to create duplicate user: {user.email}")
+                raise conflict
+            raise self._failure(
+                e,
+                f"Falha ao criar usuário: {user.user_id}",
+                f"Failed to create user: {user.user_id}",
+                "USER_CREATION_ERROR",
+                {"user_id": user.user_id, "environment": settings.environment},
+            )
+        except Exception as e:
+            raise self._failure(
+                e,
+                f"Falha ao criar usuário: {user.user_id}",
+                f"Failed to create user: {user.user_id}",
+                "USER_CREATION_ERROR",
+                {"user_id": user.user_id, "environment": settings.environment},
+            )
+
+    async def create_users(self, users: List[User]) -> None:
+        """
+        Grava vários usuários novos com ``BatchWriteItem``.
+        Stores several new users with ``BatchWriteItem``.
+
+        Equivalente assíncrono do ``batch_writer``: lotes de 25 itens
+        enviados em paralelo, com ``UnprocessedItems`` reenviados com backoff.
+
+        Raises:
+            ServiceUnavailableException: Se sobrarem itens não processados
+            BaseApplicationException: Se houver erro na gravação
+        """
+        items = [
+            {"PutRequest": {"Item": to_item(item)}} for item in user_batch_items(users)
+        ]
+        try:
+            client = await self._client()
+            await asyncio.gather(
+                *(
+                    self._batch_write(
+                        client, items[start : start + BATCH_WRITE_MAX_ITEMS]
+                    )
+                    for start in range(0, len(items), BATCH_WRITE_MAX_ITEMS)
+                )
+            )
+        except ServiceUnavailableException:
+            raise
+        except Exception as e:
+            raise self._failure(
+                e,
+                "Falha ao criar usuários em lote",
+                "Failed to batch create users",
+                "USER_BATCH_CREATION_ERROR",
+                {"count": len(users)},
+            )
+
+        logger.info(f"Batch created {len(users)} users")
+
+    async def _batch_write(self, client: Any, requests: List[Dict[str, Any]]) -> None:
+        """Um ``BatchWriteItem``, reenviando ``UnprocessedItems`` com backoff"""
+        pending = {self.table_name: requests}
+        for attempt in range(settings.user_batch_get_max_retries + 1):
+            if attempt:
+                await asyncio.sleep(jittered_backoff(attempt - 1))
+            response = await client.batch_write_item(RequestItems=pending)
+            pending = response.get("UnprocessedItems") or {}
+            if not pending:
+                return
+        raise ServiceUnavailableException(
+            service="dynamodb", reason="unprocessed_items", retry_after=1
+        )
+
+    async def get_user(self, user_id: str) -> User:
+        """
+        Busca um usuário pelo ID.
+        Retrieves a user by ID.
+
+        Raises:
+            UserNotFoundException: Se o usuário não for encontrado
+            BaseApplicationException: Se houver erro na busca
+        """
+        if not user_id:
+            raise UserBusinessRuleException(
+                message_pt="ID de usuário inválido: User ID cannot be empty",
+                message_en="Invalid user ID: User ID cannot be empty",
+                rule="valid_user_id_required",
+                error_code="INVALID_USER_ID",
+            )
+
+        try:
+            client = await self._client()
+            response = await client.get_item(
+                TableName=self.table_name, Key={"userId": {"S": user_id}}
+            )
+        except Exception as e:
+            raise self._failure(
+                e,
+                f"Falha ao obter usuário: {user_id}",
+                f"Failed to get user: {user_id}",
+                "USER_RETRIEVAL_ERROR",
+                {"user_id": user_id},
+            )
+
+        if "Item" not in response:
+            logger.warning(f"User not found: {user_id}")
+            raise UserNotFoundException(identifier=user_id, field="id")
+
+        return User.model_validate(from_item(response["Item"]))
+
+    async def get_users(self, user_ids: List[str]) -> List[User]:
+        """
+        Busca vários usuários com ``BatchGetItem`` concorrentes.
+        Retrieves several users with concurrent ``BatchGetItem`` calls.
+
+        Mesma semântica do ``UserRepository.get_users``; os lotes rodam como
+        tasks, limitados por ``user_batch_get_concurrency``.
+
+        Raises:
+            ServiceUnavailableException: Se sobrarem chaves não processadas
+            BaseApplicationException: Se houver erro na busca
+        """
+        unique_ids = list(dict.fromkeys(user_id for user_id in user_ids if user_id))
+        if not unique_ids:
+            return []
+
+        semaphore = asyncio.Semaphore(settings.user_batch_get_concurrency)
+
+        async def fetch(chunk: List[str]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._batch_get(client, chunk)
+
+        try:
+            client = await self._client()
+            results = await asyncio.gather(
+                *(
+                    fetch(unique_ids[start : start + BATCH_GET_MAX_KEYS])
+                    for start in range(0, len(unique_ids), BATCH_GET_MAX_KEYS)
+                )
+            )
+        except ServiceUnavailableException:
+            raise
+        except Exception as e:
+            raise self._failure(
+                e,
+                "Falha ao obter usuários em lote",
+                "Failed to batch get users",
+                "USER_BATCH_GET_ERROR",
+                {"requested": len(unique_ids)},
+            )
+
+        items = [from_item(item) for chunk in results for item in chunk]
+        return order_batch_results(unique_ids, items)
+
+    async def _batch_get(
+        self, client: Any, user_ids: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Um ``BatchGetItem``, repetindo ``UnprocessedKeys`` com backoff"""
+        request = {
+            self.table_name: {
+                "Keys": [{"userId": {"S": user_id}} for user_id in user_ids]
+            }
+        }
+        items: List[Dict[str, Any]] = []
+        for attempt in range(settings.user_batch_get_max_retries + 1):
+            if attempt:
+                self.metrics.increment("user_batch_get.unprocessed_retries")
+                await asyncio.sleep(jittered_backoff(attempt - 1))
+            response = await client.batch_get_item(RequestItems=request)
+            items.extend(response.get("Responses", {}).get(self.table_name, []))
+            request = response.get("UnprocessedKeys") or {}
+            if not request:
+                return items
+        raise ServiceUnavailableException(
+            service="dynamodb", reason="unprocessed_keys", retry_after=1
+        )
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        """
+        Busca usuário por email em O(1), pelo sentinela ``EMAIL#<email>``.
+        Searches user by email in O(1), through the ``EMAIL#<email>`` sentinel.
+
+        Sem sentinela, consulta o ``email-index`` se
+        ``user_email_index_fallback`` estiver ligado; nunca faz scan.
+
+        Raises:
+            ServiceUnavailableException: Se o ``email-index`` não existir
+        """
+        client = await self._client()
+        response = await client.get_item(
+            TableName=self.table_name,
+            Key={"userId": {"S": email_sentinel_key(email)}},
+            ConsistentRead=True,
+        )
+        sentinel = from_item(response.get("Item", {}))
+        if sentinel:
+            self.metrics.increment(EMAIL_LOOKUP_SENTINEL)
+            response = await client.get_item(
+                TableName=self.table_name,
+                Key={"userId": {"S": sentinel[SENTINEL_OWNER_ATTRIBUTE]}},
+                ConsistentRead=True,
+            )
+            item = response.get("Item")
+            return User.model_validate(from_item(item)) if item else None
+
+        if not settings.user_email_index_fallback:
+            return None
+
+        self.metrics.increment(EMAIL_LOOKUP_INDEX)
+        try:
+            response = await client.query(
+                TableName=self.table_name,
+                IndexName=EMAIL_INDEX_NAME,
+                KeyConditionExpression="#email = :email",
+                ExpressionAttributeNames={"#email": "email"},
+                ExpressionAttributeValues={":email": {"S": email}},
+                Limit=1,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ValidationException":
+                raise email_index_missing(self.metrics)
+            raise
+
+        items = response.get("Items", [])
+        return User.model_validate(from_item(items[0])) if items else None
+
+    async def check_email_index(self) -> bool:
+        """
+        Verifica na inicialização se o ``email-index`` existe e está ACTIVE.
+        Checks at startup whether ``email-index`` exists and is ACTIVE.
+
+        Publica o gauge ``user_email_index.available`` (1 ou 0).
+        """
+        client = await self._client()
+        response = await client.describe_table(TableName=self.table_name)
+        status = email_index_status(response)
+        available = status == "ACTIVE"
+        self.metrics.set_gauge(EMAIL_INDEX_AVAILABLE, 1.0 if available else 0.0)
+        if not available:
+            logger.error(
+                f"DynamoDB index {EMAIL_INDEX_NAME} on {self.table_name} "
+                f"is not available (status: {status})"
+            )
+        return available
+
+    async def update_user(self, user_id: str, user_data: Dict[str, Any]) -> User:
+        """
+        Atualiza parcialmente um usuário com um ``update_item`` condicional.
+        Partially updates a user with a conditional ``update_item``.
+
+        Mesma semântica do ``UserRepository.update_user``: sem leitura prévia,
+        e a troca de email vira uma transação que move o sentinela.
+
+        Raises:
+            UserNotFoundException: Se o usuário não for encontrado
+            UserAlreadyExistsException: Se o novo email já pertence a outro usuário
+            ConflictException: Se o usuário foi alterado concorrentemente
+            BaseApplicationException: Se houver erro na atualização
+        """
+        update = build_update_expression(partial_update_data(user_data))
+        condition = "attribute_exists(#userId)"
+        if ":email" in update["ExpressionAttributeValues"]:
+            condition += " AND #email = :email"
+
+        try:
+            client = await self._client()
+            try:
+                response = await client.update_item(
+                    TableName=self.table_name,
+                    Key={"userId": {"S": user_id}},
+                    UpdateExpression=update["UpdateExpression"],
+                    ExpressionAttributeNames={
+                        **update["ExpressionAttributeNames"],
+                        "#userId": "userId",
+                    },
+                    ExpressionAttributeValues=to_item(
+                        update["ExpressionAttributeValues"]
+                    ),
+                    ConditionExpression=condition,
+                    ReturnValues="ALL_NEW",
+                    ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                )
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != (
+                    "ConditionalCheckFailedException"
+                ):
+                    raise
+                current = e.response.get("Item")
+                if not current:
+                    raise UserNotFoundException(identifier=user_id, field="id")
+                previous = from_item(current)
+                items = change_email_transaction(
+                    self.table_name, user_id, previous, update
+                )
+                try:
+                    await client.transact_write_items(
+                        TransactItems=typed_transaction(items)
+                    )
+                except ClientError as error:
+                    new_email = update["ExpressionAttributeValues"][":email"]
+                    conflict = change_email_conflict(error, user_id, new_email, items)
+                    if conflict is not None:
+                        raise conflict
+                    raise
+                logger.info(f"User email changed: {user_id}")
+                return User.model_validate(apply_update(previous, update))
+
+        except (UserNotFoundException, ConflictException):
+            logger.warning(f"Update rejected for user: {user_id}")
+            raise
+        except Exception as e:
+            raise self._failure(
+                e,
+                f"Falha ao atualizar usuário: {user_id}",
+                f"Failed to update user: {user_id}",
+                "USER_UPDATE_ERROR",
+                {"user_id": user_id},
+            )
+
+        logger.info(f"User updated successfully: {user_id}")
+        return User.model_validate(from_item(response["Attributes"]))
+
+    async def delete_user(self, user_id: str) -> bool:
+        """
+        Deleta um usuário e o sentinela do email numa única transação.
+        Deletes a user and its email sentinel in a single transaction.
+
+        Raises:
+            UserNotFoundException: Se o usuário não for encontrado
+            ConflictException: Se o email do usuário mudou durante a exclusão
+            BaseApplicationException: Se houver erro na deleção
+        """
+        try:
+            client = await self._client()
+            # O sentinela é chaveado pelo email, que só o item do usuário tem
+            response = await client.get_item(
+                TableName=self.table_name,
+                Key={"userId": {"S": user_id}},
+                ConsistentRead=True,
+                ProjectionExpression="#email",
+                ExpressionAttributeNames={"#email": "email"},
+            )
+            if "Item" not in response:
+                raise UserNotFoundException(identifier=user_id, field="id")
+
+            items = typed_transaction(
+                delete_user_transaction(
+                    self.table_name, user_id, from_item(response["Item"]).get("email")
+                )
+            )
+            try:
+                await client.transact_write_items(TransactItems=items)
+            except ClientError as e:
+                failure = delete_failure(e, user_id)
+                if failure is not None:
+                    raise failure
+                if not any(conditional_failures(e)):
+                    raise
+                # O sentinela pertence a outro usuário: apaga só o usuário
+                await client.transact_write_items(TransactItems=items[:1])
+        except (UserNotFoundException, ConflictException):
+            logger.warning(f"Delete rejected for user: {user_id}")
+            raise
+        except Exception as e:
+            raise self._failure(
+                e,
+                f"Falha ao deletar usuário: {user_id}",
+                f"Failed to delete user: {user_id}",
+                "USER_DELETE_ERROR",
+                {"user_id": user_id},
+            )
+
+        logger.info(f"User deleted successfully: {user_id}")
+        return True
+
+    async def list_users(self) -> List[User]:
+        """
+        Lista todos os usuários.
+        Lists all users.
+
+        Raises:
+            BaseApplicationException: Se houver erro na listagem
+        """
+        try:
+            client = await self._client()
+            users: List[User] = []
+            paginator = client.get_paginator("scan")
+            async for page in paginator.paginate(
+                TableName=self.table_name,
+                FilterExpression="attribute_not_exists(#owner)",
+                ExpressionAttributeNames={"#owner": SENTINEL_OWNER_ATTRIBUTE},
+            ):
+                users.extend(
+                    User.model_validate(from_item(item))
+                    for item in page.get("Items", [])
+                )
+        except Exception as e:
+            raise self._failure(
+                e, "Falha ao listar usuários", "Failed to list users", "USER_LIST_ERROR"
+            )
+
+        logger.info(f"Listed {len(users)} total users")
+        return users
+
+    async def list_users_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> UserPage:
+        """
+        Lista uma página de usuários a partir de um cursor opaco.
+        Lists one page of users from an opaque cursor.
+
+        Raises:
+            ValidationException: Se o cursor for inválido
+            BaseApplicationException: Se houver erro na listagem
+        """
+        start_key = decode_cursor(cursor)
+        users: List[User] = []
+        try:
+            client = await self._client()
+            while True:
+                params = {
+                    **user_page_scan_params(),
+                    "TableName": self.table_name,
+                    "Limit": limit - len(users),
+                }
+                if start_key:
+                    params["ExclusiveStartKey"] = to_item(start_key)
+                response = await client.scan(**params)
+                users.extend(
+                    User.model_validate(from_item(item))
+                    for item in response.get("Items", [])
+                )
+                last_key = response.get("LastEvaluatedKey")
+                start_key = from_item(last_key) if last_key else None
+                if not start_key or len(users) >= limit:
+                    break
+        except Exception as e:
+            raise self._failure(
+                e,
+                "Falha ao listar usuários com paginação",
+                "Failed to list users with pagination",
+                "USER_LIST_PAGINATED_ERROR",
+                {"limit": limit},
+            )
+
+        logger.info(f"Listed {len(users)} users (page)")
+        return UserPage(users=users, next_cursor=encode_cursor(start_key))
+
+    async def export_users(self, total_segments: int) -> AsyncIterator[User]:
+        """
+        Exporta todos os usuários com um scan paralelo (``Segment``/``TotalSegments``).
+        Exports every user with a parallel scan (``Segment``/``TotalSegments``).
+
+        Cada segmento roda numa task própria e entrega páginas numa fila
+        limitada (``user_export_queue_pages``): se o consumidor atrasa, os
+        scans param, então a memória fica em poucas páginas. Throttling é
+        repetido com backoff; métricas em ``user_export.*``.
+
+        Raises:
+            BaseApplicationException: Se algum segmento falhar
+        """
+        client = await self._client()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.user_export_queue_pages)
+        workers = [
+            asyncio.create_task(
+                self._scan_segment(client, segment, total_segments, queue)
+            )
+            for segment in range(total_segments)
+        ]
+        started = time.perf_counter()
+        exported = 0
+        pending = total_segments
+        try:
+            while pending:
+                page = await queue.get()
+                if page is None:
+                    pending -= 1
+                    continue
+                if isinstance(page, Exception):
+                    raise self._failure(
+                        page,
+                        "Falha ao exportar usuários",
+                        "Failed to export users",
+                        "USER_EXPORT_ERROR",
+                        {"total_segments": total_segments},
+                    )
+                for item in page:
+                    yield User.model_validate(from_item(item))
+                exported += len(page)
+                self.metrics.increment("user_export.items", len(page))
+                self.metrics.set_gauge(
+                    "user_export.items_per_second",
+                    round(exported / max(time.perf_counter() - started, 1e-6), 1),
+                )
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        logger.info(
+            f"Exported {exported} users from {total_segments} segments "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    async def _scan_segment(
+        self, client: Any, segment: int, total_segments: int, queue: asyncio.Queue
+    ) -> None:
+        """Lê um segmento página a página; termina com None ou com a exceção"""
+        params: Dict[str, Any] = {
+            "TableName": self.table_name,
+            "Segment": segment,
+            "TotalSegments": total_segments,
+            "Limit": settings.user_export_page_size,
+            "FilterExpression": "attribute_not_exists(#owner)",
+            "ExpressionAttributeNames": {"#owner": SENTINEL_OWNER_ATTRIBUTE},
+        }
+        try:
+            while True:
+                response = await self._scan_with_backoff(client, params)
+                items = response.get("Items", [])
+                if items:
+                    await queue.put(items)
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    break
+                params["ExclusiveStartKey"] = last_key
+        except Exception as e:
+            await queue.put(e)
+            return
+        self.metrics.increment("user_export.segments_done")
+        await queue.put(None)
+
+    async def _scan_with_backoff(
+        self, client: Any, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """``scan`` que repete throttling com backoff exponencial e jitter"""
+        for attempt in range(settings.user_export_max_retries + 1):
+            try:
+                return await client.scan(**params)
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code")
+                if (
+                    code not in THROTTLING_ERRORS
+                    or attempt == settings.user_export_max_retries
+                ):
+                    raise
+                self.metrics.increment("user_export.throttled")
+                await asyncio.sleep(jittered_backoff(attempt))
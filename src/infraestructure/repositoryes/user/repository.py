@@ -3,26 +3,510 @@ Repositório de usuários para operações com DynamoDB.
 User repository for DynamoDB operations.
 """
 
+import base64
+import binascii
+import json
 import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from botocore.exceptions import ClientError
 
 from configs.load_env import settings
-from core.entities.user import User
-from core.exceptions.base_exceptions import BaseApplicationException
+from core.entities.user import User, UserPage
+from core.exceptions import ServiceUnavailableException
+from core.exceptions.base_exceptions import (
+    BaseApplicationException,
+    ConflictException,
+    ValidationException,
+)
 from core.exceptions.user import (
     UserAlreadyExistsException,
     UserBusinessRuleException,
     UserNotFoundException,
 )
 from infraestructure.client_factory.aws import AWSClientFactory
+from infraestructure.telemetry.metrics import MetricsRegistry, get_metrics_registry
 from interface.user.user_interface import UserInterface
 
 logger = logging.getLogger(__name__)
 
+# Campos que podem ser atualizados (atributo DynamoDB -> campo do modelo)
+UPDATABLE_FIELDS = {
+    "email": "email",
+    "firstName": "first_name",
+    "lastName": "last_name",
+    "roles": "roles",
+    "isActive": "is_active",
+    "chats": "chats",
+    "slug": "slug",
+    "avatarUrl": "avatar_url",
+    "updatedAt": "updated_at",
+}
+
+
+def serialize_user_data(user: User) -> Dict[str, Any]:
+    """
+    Serializa os dados do usuário para o formato aceito pelo DynamoDB.
+    Serializes user data to DynamoDB-compatible format.
+    """
+    user_data = user.model_dump(by_alias=True)
+
+    # Converter datetime objects para strings ISO
+    for field in ["createdAt", "updatedAt"]:
+        if field in user_data and isinstance(user_data[field], datetime):
+            user_data[field] = user_data[field].isoformat()
+
+    # Garantir que campos datetime existam
+    if "createdAt" not in user_data or user_data["createdAt"] is None:
+        user_data["createdAt"] = datetime.now().isoformat()
+
+    if "updatedAt" not in user_data or user_data["updatedAt"] is None:
+        user_data["updatedAt"] = datetime.now().isoformat()
+
+    return user_data
+
+
+def build_update_expression(user_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Monta ``UpdateExpression`` e placeholders para os campos atualizáveis.
+    Builds ``UpdateExpression`` and placeholders for the updatable fields.
+
+    Returns:
+        Argumentos para ``update_item`` ou None se não houver o que atualizar
+    """
+    update_expression_parts = []
+    expression_attribute_names = {}
+    expression_attribute_values = {}
+
+    for dynamo_field in UPDATABLE_FIELDS:
+        if dynamo_field in user_data:
+            placeholder = f"#{dynamo_field}"
+            value_placeholder = f":{dynamo_field}"
+
+            update_expression_parts.append(f"{placeholder} = {value_placeholder}")
+            expression_attribute_names[placeholder] = dynamo_field
+            expression_attribute_values[value_placeholder] = user_data[dynamo_field]
+
+    if not update_expression_parts:
+        return None
+
+    return {
+        "UpdateExpression": "SET " + ", ".join(update_expression_parts),
+        "ExpressionAttributeNames": expression_attribute_names,
+        "ExpressionAttributeValues": expression_attribute_values,
+    }
+
+
+def partial_update_data(user_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte uma atualização parcial (campos da entidade) em atributos.
+    Converts a partial update (entity fields) into DynamoDB attributes.
+
+    Campos não atualizáveis (ex.: ``user_id``, ``password``) são ignorados e
+    ``updatedAt`` é sempre renovado.
+    """
+    attributes = {field: attribute for attribute, field in UPDATABLE_FIELDS.items()}
+    data = {
+        attributes[field]: value
+        for field, value in user_data.items()
+        if field in attributes
+    }
+    data["updatedAt"] = datetime.now().isoformat()
+    return data
+
+
+def apply_update(item: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """Aplica os ``SET`` de ``update`` sobre um item lido / Applies an update"""
+    values = update["ExpressionAttributeValues"]
+    return {
+        **item,
+        **{
+            attribute: values[f":{attribute}"]
+            for attribute in update["ExpressionAttributeNames"].values()
+        },
+    }
+
+
+# Item sentinela que reserva um email: userId = "EMAIL#<email>", sentinelFor = dono
+EMAIL_SENTINEL_PREFIX = "EMAIL#"
+SENTINEL_OWNER_ATTRIBUTE = "sentinelFor"
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def to_item(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Converte um dict Python para o formato tipado do DynamoDB"""
+    return {key: _serializer.serialize(value) for key, value in data.items()}
+
+
+def from_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Converte um item tipado do DynamoDB para um dict Python"""
+    return {key: _deserializer.deserialize(value) for key, value in item.items()}
+
+
+def email_sentinel_key(email: str) -> str:
+    """Chave do item sentinela de um email (normalizado) / Email sentinel key"""
+    return f"{EMAIL_SENTINEL_PREFIX}{email.strip().lower()}"
+
+
+def is_sentinel(item: Dict[str, Any]) -> bool:
+    return SENTINEL_OWNER_ATTRIBUTE in item
+
+
+# Índice GSI de email, usado só para usuários ainda sem sentinela
+EMAIL_INDEX_NAME = "email-index"
+EMAIL_LOOKUP_SENTINEL = "user_email_lookup.sentinel"
+EMAIL_LOOKUP_INDEX = "user_email_lookup.index"
+EMAIL_LOOKUP_INDEX_MISSING = "user_email_lookup.index_missing"
+EMAIL_INDEX_AVAILABLE = "user_email_index.available"
+
+
+def email_index_status(description: Dict[str, Any]) -> Optional[str]:
+    """``IndexStatus`` do índice de email num ``DescribeTable`` (None se ausente)"""
+    for index in description.get("Table", {}).get("GlobalSecondaryIndexes", []):
+        if index.get("IndexName") == EMAIL_INDEX_NAME:
+            return index.get("IndexStatus")
+    return None
+
+
+def email_index_missing(metrics: MetricsRegistry) -> ServiceUnavailableException:
+    """
+    Falha de busca por email sem o índice: nunca degrada para um scan.
+    Email lookup failure without the index: never degrades into a scan.
+    """
+    metrics.increment(EMAIL_LOOKUP_INDEX_MISSING)
+    logger.error(f"DynamoDB index {EMAIL_INDEX_NAME} is missing; email lookup failed")
+    return ServiceUnavailableException(
+        service="dynamodb", reason="email_index_missing", retry_after=30
+    )
+
+
+def _sentinel_item(email: str, user_id: str) -> Dict[str, Any]:
+    return {"userId": email_sentinel_key(email), SENTINEL_OWNER_ATTRIBUTE: user_id}
+
+
+def _sentinel_put(table_name: str, email: str, user_id: str) -> Dict[str, Any]:
+    return {
+        "Put": {
+            "TableName": table_name,
+            "Item": _sentinel_item(email, user_id),
+            "ConditionExpression": "attribute_not_exists(userId)",
+        }
+    }
+
+
+def create_user_transaction(
+    table_name: str, user_data: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Itens de ``TransactWriteItems`` que criam o usuário e reservam o email.
+    ``TransactWriteItems`` entries that create the user and reserve the email.
+
+    Os dois ``Put`` são condicionais (``attribute_not_exists``): o primeiro
+    impede sobrescrever um ``userId`` existente e o segundo garante a
+    unicidade do email sem consultar o GSI. Valores em formato Python.
+    """
+    items = [
+        {
+            "Put": {
+                "TableName": table_name,
+                "Item": user_data,
+                "ConditionExpression": "attribute_not_exists(userId)",
+            }
+        }
+    ]
+    if user_data.get("email"):
+        items.append(_sentinel_put(table_name, user_data["email"], user_data["userId"]))
+    return items
+
+
+def user_batch_items(users: List[User]) -> List[Dict[str, Any]]:
+    """
+    Itens de escrita em lote: cada usuário e o sentinela do seu email.
+    Batch write items: each user and its email sentinel.
+
+    Escritas em lote não aceitam condições, então só servem para usuários
+    comprovadamente novos (ex.: recém-cadastrados no Cognito).
+    """
+    items = []
+    for user in users:
+        user_data = serialize_user_data(user)
+        items.append(user_data)
+        if user_data.get("email"):
+            items.append(_sentinel_item(user_data["email"], user_data["userId"]))
+    return items
+
+
+def change_email_transaction(
+    table_name: str, user_id: str, previous: Dict[str, Any], update: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Itens de ``TransactWriteItems`` para uma atualização que troca o email.
+    ``TransactWriteItems`` entries for an update that changes the email.
+
+    Atualiza o usuário (desde que ainda seja o item ``previous``, lido na
+    falha da condição), libera o sentinela antigo e reserva o novo,
+    atomicamente. Assim ``apply_update(previous, update)`` é o item gravado.
+    """
+    previous_email = previous.get("email", "")
+    new_email = update["ExpressionAttributeValues"][":email"]
+    condition = "attribute_exists(#userId) AND #email = :previousEmail"
+    values = {**update["ExpressionAttributeValues"], ":previousEmail": previous_email}
+    if previous.get("updatedAt"):
+        condition += " AND #updatedAt = :previousUpdatedAt"
+        values[":previousUpdatedAt"] = previous["updatedAt"]
+    else:
+        condition += " AND attribute_not_exists(#updatedAt)"
+    items: List[Dict[str, Any]] = [
+        {
+            "Update": {
+                "TableName": table_name,
+                "Key": {"userId": user_id},
+                "UpdateExpression": update["UpdateExpression"],
+                "ExpressionAttributeNames": {
+                    **update["ExpressionAttributeNames"],
+                    "#userId": "userId",
+                    "#updatedAt": "updatedAt",
+                },
+                "ExpressionAttributeValues": values,
+                "ConditionExpression": condition,
+            }
+        }
+    ]
+    if email_sentinel_key(previous_email) == email_sentinel_key(new_email):
+        return items
+
+    if previous_email:
+        # Usuários antigos podem não ter sentinela: apagar o inexistente é ok
+        items.append(
+            {
+                "Delete": {
+                    "TableName": table_name,
+                    "Key": {"userId": email_sentinel_key(previous_email)},
+                    "ConditionExpression": (
+                        f"attribute_not_exists(userId) OR {SENTINEL_OWNER_ATTRIBUTE} = :owner"
+                    ),
+                    "ExpressionAttributeValues": {":owner": user_id},
+                }
+            }
+        )
+    if new_email:
+        items.append(_sentinel_put(table_name, new_email, user_id))
+    return items
+
+
+def delete_user_transaction(
+    table_name: str, user_id: str, email: Optional[str]
+) -> List[Dict[str, Any]]:
+    """
+    Itens de ``TransactWriteItems`` que apagam o usuário e o sentinela do email.
+    ``TransactWriteItems`` entries that delete the user and its email sentinel.
+
+    O usuário só é apagado se o email ainda for ``email``; o sentinela, se
+    ainda pertencer ao usuário (ou se nem existir, para usuários antigos).
+    """
+    user_delete: Dict[str, Any] = {
+        "TableName": table_name,
+        "Key": {"userId": user_id},
+        "ConditionExpression": "attribute_exists(#userId)",
+        "ExpressionAttributeNames": {"#userId": "userId"},
+        "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+    }
+    if not email:
+        return [{"Delete": user_delete}]
+
+    user_delete["ConditionExpression"] += " AND #email = :email"
+    user_delete["ExpressionAttributeNames"]["#email"] = "email"
+    user_delete["ExpressionAttributeValues"] = {":email": email}
+    return [
+        {"Delete": user_delete},
+        {
+            "Delete": {
+                "TableName": table_name,
+                "Key": {"userId": email_sentinel_key(email)},
+                "ConditionExpression": (
+                    f"attribute_not_exists(userId) OR {SENTINEL_OWNER_ATTRIBUTE} = :owner"
+                ),
+                "ExpressionAttributeValues": {":owner": user_id},
+            }
+        },
+    ]
+
+
+def typed_transaction(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Converte valores Python de uma transação para o formato tipado"""
+    typed = []
+    for entry in items:
+        (action, params), = entry.items()
+        params = dict(params)
+        for field in ("Item", "Key", "ExpressionAttributeValues"):
+            if field in params:
+                params[field] = to_item(params[field])
+        typed.append({action: params})
+    return typed
+
+
+def conditional_failures(error: ClientError) -> List[bool]:
+    """Quais itens de uma transação cancelada falharam na condição"""
+    return [
+        reason.get("Code") == "ConditionalCheckFailed"
+        for reason in error.response.get("CancellationReasons", [])
+    ]
+
+
+def create_conflict(error: ClientError, user: User) -> Optional[ConflictException]:
+    """Traduz o cancelamento da transação de criação / Maps a cancelled create"""
+    failures = conditional_failures(error)
+    if not any(failures):
+        return None
+    field = "email" if failures[1:] and failures[1] else "user_id"
+    return UserAlreadyExistsException(
+        email=user.email, details={"user_id": user.user_id, "field": field}
+    )
+
+
+def change_email_conflict(
+    error: ClientError, user_id: str, email: str, items: List[Dict[str, Any]]
+) -> Optional[ConflictException]:
+    """Traduz o cancelamento da troca de email / Maps a cancelled email change"""
+    failures = conditional_failures(error)
+    if not any(failures):
+        return None
+    if failures[-1] and "Put" in items[-1]:
+        return UserAlreadyExistsException(email=email)
+    return ConflictException(
+        message_pt=f"Usuário alterado concorrentemente: {user_id}",
+        message_en=f"User was modified concurrently: {user_id}",
+        conflicting_field="email",
+        conflicting_value=email,
+        error_code="USER_UPDATE_CONFLICT",
+    )
+
+
+def delete_failure(
+    error: ClientError, user_id: str
+) -> Optional[BaseApplicationException]:
+    """Traduz o cancelamento da exclusão / Maps a cancelled delete"""
+    reasons = error.response.get("CancellationReasons", [])
+    if not reasons or reasons[0].get("Code") != "ConditionalCheckFailed":
+        return None
+    if not reasons[0].get("Item"):
+        return UserNotFoundException(identifier=user_id, field="id")
+    return ConflictException(
+        message_pt=f"Usuário alterado concorrentemente: {user_id}",
+        message_en=f"User was modified concurrently: {user_id}",
+        conflicting_field="email",
+        error_code="USER_DELETE_CONFLICT",
+    )
+
+
+# Erros de capacidade do DynamoDB que valem nova tentativa com espera
+THROTTLING_ERRORS = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+}
+BACKOFF_BASE_SECONDS = 0.1
+BACKOFF_MAX_SECONDS = 5.0
+
+# Limites por chamada impostos pelo DynamoDB
+BATCH_GET_MAX_KEYS = 100
+BATCH_WRITE_MAX_ITEMS = 25
+
+
+def jittered_backoff(attempt: int) -> float:
+    """Espera exponencial com jitter completo / Full-jitter exponential backoff"""
+    return random.uniform(
+        0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt)
+    )
+
+
+def order_batch_results(
+    user_ids: List[str], items: List[Dict[str, Any]]
+) -> List[User]:
+    """
+    Ordena o resultado de ``BatchGetItem`` na ordem pedida, sem sentinelas.
+    Orders ``BatchGetItem`` results as requested, dropping sentinels.
+    """
+    found = {item["userId"]: item for item in items if not is_sentinel(item)}
+    return [
+        User.model_validate(found[user_id]) for user_id in user_ids if user_id in found
+    ]
+
+
+# Atributos lidos pela listagem paginada (o que o presenter exibe)
+USER_PAGE_ATTRIBUTES = (
+    "userId",
+    "email",
+    "firstName",
+    "lastName",
+    "isActive",
+    "slug",
+    "avatarUrl",
+    "createdAt",
+    "updatedAt",
+)
+
+
+def user_page_scan_params() -> Dict[str, Any]:
+    """
+    Parâmetros de ``scan`` da listagem: projeção e filtro dos sentinelas.
+    ``scan`` parameters of the listing: projection and sentinel filter.
+
+    Sem placeholders de valor, então servem ao cliente tipado e ao resource.
+    """
+    names = {f"#{attribute}": attribute for attribute in USER_PAGE_ATTRIBUTES}
+    names["#owner"] = SENTINEL_OWNER_ATTRIBUTE
+    return {
+        "ProjectionExpression": ", ".join(f"#{a}" for a in USER_PAGE_ATTRIBUTES),
+        "FilterExpression": "attribute_not_exists(#owner)",
+        "ExpressionAttributeNames": names,
+    }
+
+
+def encode_cursor(last_evaluated_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Codifica o ``LastEvaluatedKey`` como cursor opaco (base64 url-safe)"""
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Decodifica um cursor de ``encode_cursor`` em ``ExclusiveStartKey``.
+    Decodes a cursor from ``encode_cursor`` into an ``ExclusiveStartKey``.
+
+    Raises:
+        ValidationException: Se o cursor não foi gerado por esta listagem
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (binascii.Error, ValueError):
+        key = None
+    if not (
+        isinstance(key, dict)
+        and list(key) == ["userId"]
+        and isinstance(key["userId"], str)
+    ):
+        raise ValidationException(
+            message_pt="Cursor de paginação inválido",
+            message_en="Invalid pagination cursor",
+            field="cursor",
+            error_code="INVALID_CURSOR",
+        )
+    return key
+
 
 class UserRepository(UserInterface):
     """
@@ -30,13 +514,14 @@ class UserRepository(UserInterface):
     Implementation of user repository using DynamoDB.
     """
 
-    def __init__(self):
+    def __init__(self, metrics: Optional[MetricsRegistry] = None):
         """
         Inicializa o repositório de usuários.
         Initializes the user repository.
         """
         self.table_name = f"{settings.app_prefix}-{settings.environment}-users"
         self.aws_factory = AWSClientFactory()
+        self.metrics = metrics or get_metrics_registry()
 
         try:
             self.table = self.aws_factory.dynamo_table(self.table_name)
@@ -70,21 +555,7 @@ class UserRepository(UserInterface):
         Returns:
             dict: Serialized user data
         """
-        user_data = user.model_dump(by_alias=True)
-
-        # Converter datetime objects para strings ISO
-        for field in ["createdAt", "updatedAt"]:
-            if field in user_data and isinstance(user_data[field], datetime):
-                user_data[field] = user_data[field].isoformat()
-
-        # Garantir que campos datetime existam
-        if "createdAt" not in user_data or user_data["createdAt"] is None:
-            user_data["createdAt"] = datetime.now().isoformat()
-
-        if "updatedAt" not in user_data or user_data["updatedAt"] is None:
-            user_data["updatedAt"] = datetime.now().isoformat()
-
-        return user_data
+        return serialize_user_data(user)
 
     def create_user(self, user: User) -> User:
         """
@@ -98,20 +569,15 @@ class UserRepository(UserInterface):
             User: Usuário criado
 
         Raises:
-            UserAlreadyExistsException: Se o usuário já existe
+            UserAlreadyExistsException: Se o ID ou o email já existem
             BaseApplicationException: Se houver erro na criação
         """
         try:
-            # Verificar se o usuário já existe pelo email
-            existing_user = self.get_user_by_email(user.email)
-            if existing_user:
-                raise UserAlreadyExistsException(email=user.email)
-
-            # Preparar dados para salvar no DynamoDB
+            # Uma única escrita: usuário + sentinela do email, ambos condicionais
             user_data = self._serialize_user_data(user)
-
-            # Salvar no DynamoDB
-            self.table.put_item(Item=user_data)
+            self.table.meta.client.transact_write_items(
+                TransactItems=create_user_transaction(self.table_name, user_data)
+            )
 
             logger.info(f"User created successfully: {user.user_id}")
             return user
@@ -121,6 +587,11 @@ class UserRepository(UserInterface):
             raise
 
         except ClientError as e:
+            conflict = create_conflict(e, user)
+            if conflict is not None:
+                logger.warning(f"Attempt to create duplicate user: {user.email}")
+                raise conflict
+
             error_code = e.response.get("Error", {}).get("Code", "Unknown")
             logger.error(f"DynamoDB ClientError creating user: {error_code} - {str(e)}")
 
@@ -152,6 +623,45 @@ class UserRepository(UserInterface):
                 status_code=500,
             )
 
+    def create_users(self, users: List[User]) -> None:
+        """
+        Grava vários usuários novos com o ``batch_writer`` do boto3.
+        Stores several new users with boto3's ``batch_writer``.
+
+        O ``batch_writer`` agrupa 25 itens por ``BatchWriteItem`` e reenvia
+        os ``UnprocessedItems``. As escritas não são condicionais: a
+        unicidade do email deve ter sido garantida antes (cadastro no Cognito).
+
+        Raises:
+            BaseApplicationException: Se houver erro na gravação
+        """
+        try:
+            with self.table.batch_writer(overwrite_by_pkeys=["userId"]) as batch:
+                for item in user_batch_items(users):
+                    batch.put_item(Item=item)
+
+        except Exception as e:
+            error_code = (
+                e.response.get("Error", {}).get("Code", "Unknown")
+                if isinstance(e, ClientError)
+                else type(e).__name__
+            )
+            logger.error(f"Error batch creating users: {error_code} - {str(e)}")
+
+            raise BaseApplicationException(
+                message_pt="Falha ao criar usuários em lote",
+                message_en="Failed to batch create users",
+                details={
+                    "error": str(e),
+                    "error_code": error_code,
+                    "count": len(users),
+                },
+                error_code="USER_BATCH_CREATION_ERROR",
+                status_code=500,
+            )
+
+        logger.info(f"Batch created {len(users)} users")
+
     def get_user(self, user_id: str) -> User:
         """
         Busca um usuário pelo ID.
@@ -226,94 +736,75 @@ class UserRepository(UserInterface):
                 status_code=500,
             )
 
-    def update_user(self, user: User) -> User:
+    def update_user(self, user_id: str, user_data: Dict[str, Any]) -> User:
         """
-        Atualiza um usuário existente.
-        Updates an existing user.
+        Atualiza parcialmente um usuário existente.
+        Partially updates an existing user.
+
+        O caminho comum é um único ``update_item`` condicional (usuário existe
+        e, se o email vier na atualização, está inalterado) com
+        ``ReturnValues=ALL_NEW``, sem leitura prévia. Se a condição falha e o
+        item existe, o email mudou: a troca é feita numa transação que move
+        o sentinela do email.
 
         Args:
-            user: Entidade de usuário com os dados atualizados
+            user_id: ID do usuário
+            user_data: Campos da entidade a atualizar
 
         Returns:
-            User: Usuário atualizado
+            User: Usuário atualizado, como gravado no DynamoDB
 
         Raises:
             UserNotFoundException: Se o usuário não for encontrado
+            UserAlreadyExistsException: Se o novo email já pertence a outro usuário
+            ConflictException: Se o usuário foi alterado concorrentemente
             BaseApplicationException: Se houver erro na atualização
         """
         try:
-            # Verificar se o usuário existe
-            existing_user = self.get_user(user.user_id)
-
-            # Preparar dados para atualizar
-            user_data = self._serialize_user_data(user)
-
-            # Construir expressões de atualização
-            update_expression_parts = []
-            expression_attribute_names = {}
-            expression_attribute_values = {}
-
-            # Campos que podem ser atualizados
-            updatable_fields = {
-                "email": "email",
-                "firstName": "first_name",
-                "lastName": "last_name",
-                "roles": "roles",
-                "isActive": "is_active",
-                "chats": "chats",
-                "slug": "slug",
-                "avatarUrl": "avatar_url",
-                "updatedAt": "updated_at",
-            }
-
-            for dynamo_field, model_field in updatable_fields.items():
-                if dynamo_field in user_data:
-                    placeholder = f"#{dynamo_field}"
-                    value_placeholder = f":{dynamo_field}"
-
-                    update_expression_parts.append(
-                        f"{placeholder} = {value_placeholder}"
-                    )
-                    expression_attribute_names[placeholder] = dynamo_field
-                    expression_attribute_values[value_placeholder] = user_data[
-                        dynamo_field
-                    ]
-
-            if not update_expression_parts:
-                logger.warning(f"No fields to update for user: {user.user_id}")
-                return user
-
-            update_expression = "SET " + ", ".join(update_expression_parts)
-
-            # Atualizar no DynamoDB
-            self.table.update_item(
-                Key={"userId": user.user_id},
-                UpdateExpression=update_expression,
-                ExpressionAttributeNames=expression_attribute_names,
-                ExpressionAttributeValues=expression_attribute_values,
-                ConditionExpression=Attr("userId").exists(),
-            )
-
-            logger.info(f"User updated successfully: {user.user_id}")
-            return user
-
-        except UserNotFoundException:
-            logger.warning(f"Attempt to update non-existent user: {user.user_id}")
+            update = build_update_expression(partial_update_data(user_data))
+            condition = "attribute_exists(#userId)"
+            if ":email" in update["ExpressionAttributeValues"]:
+                condition += " AND #email = :email"
+
+            try:
+                response = self.table.update_item(
+                    Key={"userId": user_id},
+                    UpdateExpression=update["UpdateExpression"],
+                    ExpressionAttributeNames={
+                        **update["ExpressionAttributeNames"],
+                        "#userId": "userId",
+                    },
+                    ExpressionAttributeValues=update["ExpressionAttributeValues"],
+                    ConditionExpression=condition,
+                    ReturnValues="ALL_NEW",
+                    ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                )
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != (
+                    "ConditionalCheckFailedException"
+                ):
+                    raise
+                current = e.response.get("Item")
+                if not current:
+                    raise UserNotFoundException(identifier=user_id, field="id")
+                return self._change_email(user_id, from_item(current), update)
+
+            logger.info(f"User updated successfully: {user_id}")
+            return User.model_validate(response["Attributes"])
+
+        except (UserNotFoundException, ConflictException):
+            logger.warning(f"Update rejected for user: {user_id}")
             raise
 
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "Unknown")
-
-            if error_code == "ConditionalCheckFailedException":
-                raise UserNotFoundException(identifier=user.user_id, field="id")
-
             logger.error(f"DynamoDB ClientError updating user: {error_code} - {str(e)}")
 
             raise BaseApplicationException(
-                message_pt=f"Falha ao atualizar usuário: {user.user_id}",
-                message_en=f"Failed to update user: {user.user_id}",
+                message_pt=f"Falha ao atualizar usuário: {user_id}",
+                message_en=f"Failed to update user: {user_id}",
                 details={
-                    "user_id": user.user_id,
+                    "user_id": user_id,
                     "error": str(e),
                     "error_code": error_code,
                 },
@@ -325,10 +816,10 @@ class UserRepository(UserInterface):
             logger.error(f"Unexpected error updating user: {str(e)}")
 
             raise BaseApplicationException(
-                message_pt=f"Erro inesperado ao atualizar usuário: {user.user_id}",
-                message_en=f"Unexpected error updating user: {user.user_id}",
+                message_pt=f"Erro inesperado ao atualizar usuário: {user_id}",
+                message_en=f"Unexpected error updating user: {user_id}",
                 details={
-                    "user_id": user.user_id,
+                    "user_id": user_id,
                     "error": str(e),
                     "error_type": type(e).__name__,
                 },
@@ -336,10 +827,34 @@ class UserRepository(UserInterface):
                 status_code=500,
             )
 
+    def _change_email(
+        self, user_id: str, previous: Dict[str, Any], update: Dict[str, Any]
+    ) -> User:
+        """
+        Atualiza o usuário trocando o email e o sentinela na mesma transação.
+        Updates the user, swapping the email and its sentinel in one transaction.
+
+        ``TransactWriteItems`` não devolve atributos; a transação só passa se
+        o item ainda for ``previous`` (devolvido pelo DynamoDB na falha da
+        condição), então o resultado é ``previous`` com a atualização aplicada.
+        """
+        items = change_email_transaction(self.table_name, user_id, previous, update)
+        try:
+            self.table.meta.client.transact_write_items(TransactItems=items)
+        except ClientError as e:
+            new_email = update["ExpressionAttributeValues"][":email"]
+            conflict = change_email_conflict(e, user_id, new_email, items)
+            if conflict is not None:
+                raise conflict
+            raise
+
+        logger.info(f"User email changed: {user_id}")
+        return User.model_validate(apply_update(previous, update))
+
     def delete_user(self, user_id: str) -> bool:
         """
-        Deleta um usuário.
-        Deletes a user.
+        Deleta um usuário e o sentinela do email numa única transação.
+        Deletes a user and its email sentinel in a single transaction.
 
         Args:
             user_id: ID do usuário a ser deletado
@@ -349,30 +864,44 @@ class UserRepository(UserInterface):
 
         Raises:
             UserNotFoundException: Se o usuário não for encontrado
+            ConflictException: Se o email do usuário mudou durante a exclusão
             BaseApplicationException: Se houver erro na deleção
         """
         try:
-            # Verificar se o usuário existe
-            self.get_user(user_id)
+            # O sentinela é chaveado pelo email, que só o item do usuário tem
+            response = self.table.get_item(
+                Key={"userId": user_id},
+                ConsistentRead=True,
+                ProjectionExpression="#email",
+                ExpressionAttributeNames={"#email": "email"},
+            )
+            if "Item" not in response:
+                raise UserNotFoundException(identifier=user_id, field="id")
 
-            # Deletar usuário
-            self.table.delete_item(
-                Key={"userId": user_id}, ConditionExpression=Attr("userId").exists()
+            items = delete_user_transaction(
+                self.table_name, user_id, response["Item"].get("email")
             )
+            client = self.table.meta.client
+            try:
+                client.transact_write_items(TransactItems=items)
+            except ClientError as e:
+                failure = delete_failure(e, user_id)
+                if failure is not None:
+                    raise failure
+                if not any(conditional_failures(e)):
+                    raise
+                # O sentinela pertence a outro usuário: apaga só o usuário
+                client.transact_write_items(TransactItems=items[:1])
 
             logger.info(f"User deleted successfully: {user_id}")
             return True
 
-        except UserNotFoundException:
-            logger.warning(f"Attempt to delete non-existent user: {user_id}")
+        except (UserNotFoundException, ConflictException):
+            logger.warning(f"Delete rejected for user: {user_id}")
             raise
 
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "Unknown")
-
-            if error_code == "ConditionalCheckFailedException":
-                raise UserNotFoundException(identifier=user_id, field="id")
-
             logger.error(f"DynamoDB ClientError deleting user: {error_code} - {str(e)}")
 
             raise BaseApplicationException(
@@ -419,7 +948,9 @@ class UserRepository(UserInterface):
 
             # Fazer scan completo para obter todos os usuários
             while True:
-                scan_kwargs: Dict[str, Any] = {}
+                scan_kwargs: Dict[str, Any] = {
+                    "FilterExpression": Attr(SENTINEL_OWNER_ATTRIBUTE).not_exists()
+                }
 
                 if last_evaluated_key:
                     scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
@@ -465,50 +996,191 @@ class UserRepository(UserInterface):
                 status_code=500,
             )
 
-    def get_user_by_email(self, email: str) -> Optional[User]:
+    def get_users(self, user_ids: List[str]) -> List[User]:
         """
-        Busca usuário por email.
-        Searches user by email.
+        Busca vários usuários com ``BatchGetItem`` em lotes de 100 chaves.
+        Retrieves several users with ``BatchGetItem`` in chunks of 100 keys.
+
+        IDs repetidos ou vazios são ignorados e os lotes são enviados em
+        paralelo (até ``user_batch_get_concurrency``). O resultado segue a
+        ordem de ``user_ids``; IDs inexistentes ficam de fora.
+
+        Raises:
+            ServiceUnavailableException: Se sobrarem chaves não processadas
+            BaseApplicationException: Se houver erro na busca
         """
+        unique_ids = list(dict.fromkeys(user_id for user_id in user_ids if user_id))
+        if not unique_ids:
+            return []
+
+        chunks = [
+            unique_ids[start : start + BATCH_GET_MAX_KEYS]
+            for start in range(0, len(unique_ids), BATCH_GET_MAX_KEYS)
+        ]
         try:
-            # Assumindo que existe um índice GSI: email-index
-            response = self.table.query(
-                IndexName="email-index",
-                KeyConditionExpression=Key("email").eq(email),
-                Limit=1,
+            if len(chunks) == 1:
+                results = [self._batch_get(chunks[0])]
+            else:
+                workers = min(len(chunks), settings.user_batch_get_concurrency)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(self._batch_get, chunks))
+
+        except ServiceUnavailableException:
+            logger.warning(f"Unprocessed keys left batch getting {len(unique_ids)} users")
+            raise
+
+        except Exception as e:
+            error_code = (
+                e.response.get("Error", {}).get("Code", "Unknown")
+                if isinstance(e, ClientError)
+                else type(e).__name__
             )
+            logger.error(f"Error batch getting users: {error_code} - {str(e)}")
 
-            items = response.get("Items", [])
-            if items:
-                return User.model_validate(items[0])
+            raise BaseApplicationException(
+                message_pt="Falha ao obter usuários em lote",
+                message_en="Failed to batch get users",
+                details={
+                    "error": str(e),
+                    "error_code": error_code,
+                    "requested": len(unique_ids),
+                },
+                error_code="USER_BATCH_GET_ERROR",
+                status_code=500,
+            )
 
+        return order_batch_results(
+            unique_ids, [item for chunk in results for item in chunk]
+        )
+
+    def _batch_get(self, user_ids: List[str]) -> List[Dict[str, Any]]:
+        """Um ``BatchGetItem``, repetindo ``UnprocessedKeys`` com backoff"""
+        client = self.table.meta.client
+        request = {
+            self.table_name: {"Keys": [{"userId": user_id} for user_id in user_ids]}
+        }
+        items: List[Dict[str, Any]] = []
+        for attempt in range(settings.user_batch_get_max_retries + 1):
+            if attempt:
+                time.sleep(jittered_backoff(attempt - 1))
+            response = client.batch_get_item(RequestItems=request)
+            items.extend(response.get("Responses", {}).get(self.table_name, []))
+            request = response.get("UnprocessedKeys") or {}
+            if not request:
+                return items
+        raise ServiceUnavailableException(
+            service="dynamodb", reason="unprocessed_keys", retry_after=1
+        )
+
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        """
+        Busca usuário por email em O(1), pelo sentinela ``EMAIL#<email>``.
+        Searches user by email in O(1), through the ``EMAIL#<email>`` sentinel.
+
+        O sentinela é gravado na mesma transação do usuário, então a leitura
+        é consistente. Sem sentinela (usuários anteriores a ele, até rodar o
+        backfill) consulta o ``email-index`` se ``user_email_index_fallback``
+        estiver ligado; nunca faz scan na tabela.
+
+        Raises:
+            ServiceUnavailableException: Se o ``email-index`` não existir
+        """
+        sentinel = self.table.get_item(
+            Key={"userId": email_sentinel_key(email)}, ConsistentRead=True
+        ).get("Item")
+        if sentinel:
+            self.metrics.increment(EMAIL_LOOKUP_SENTINEL)
+            item = self.table.get_item(
+                Key={"userId": sentinel[SENTINEL_OWNER_ATTRIBUTE]}, ConsistentRead=True
+            ).get("Item")
+            return User.model_validate(item) if item else None
+
+        if not settings.user_email_index_fallback:
             return None
 
+        self.metrics.increment(EMAIL_LOOKUP_INDEX)
+        try:
+            response = self.table.query(
+                IndexName=EMAIL_INDEX_NAME,
+                KeyConditionExpression=Key("email").eq(email),
+                Limit=1,
+            )
         except ClientError as e:
-            # Se o índice não existir, fazer scan
             if e.response.get("Error", {}).get("Code") == "ValidationException":
-                return self._scan_user_by_email(email)
+                raise email_index_missing(self.metrics)
             raise
 
-    def _scan_user_by_email(self, email: str) -> Optional[User]:
+        items = response.get("Items", [])
+        return User.model_validate(items[0]) if items else None
+
+    def backfill_email_sentinel(self, user_id: str, email: str) -> bool:
         """
-        Busca usuário por email usando scan (fallback).
-        Searches user by email using scan (fallback).
+        Cria o sentinela de email de um usuário antigo, se ainda não existir.
+        Creates the email sentinel of a legacy user, if still missing.
+
+        Returns:
+            bool: False se o email já estiver reservado por outro usuário
         """
         try:
-            response = self.table.scan(
-                FilterExpression=Attr("email").eq(email), Limit=1
+            self.table.put_item(
+                Item=_sentinel_item(email, user_id),
+                ConditionExpression=Attr("userId").not_exists()
+                | Attr(SENTINEL_OWNER_ATTRIBUTE).eq(user_id),
             )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != (
+                "ConditionalCheckFailedException"
+            ):
+                raise
+            return False
+        return True
+
+    def list_users_page(self, limit: int, cursor: Optional[str] = None) -> UserPage:
+        """
+        Lista uma página de usuários a partir de um cursor opaco.
+        Lists one page of users from an opaque cursor.
 
-            items = response.get("Items", [])
-            if items:
-                return User.model_validate(items[0])
+        Lê só os atributos exibidos (``USER_PAGE_ATTRIBUTES``). Como o
+        filtro dos sentinelas roda depois do ``Limit``, o scan continua até
+        completar a página ou acabar a tabela.
 
-            return None
+        Raises:
+            ValidationException: Se o cursor for inválido
+            BaseApplicationException: Se houver erro na listagem
+        """
+        start_key = decode_cursor(cursor)
+        users: List[User] = []
+        try:
+            while True:
+                scan_kwargs = {**user_page_scan_params(), "Limit": limit - len(users)}
+                if start_key:
+                    scan_kwargs["ExclusiveStartKey"] = start_key
+                response = self.table.scan(**scan_kwargs)
+                users.extend(
+                    User.model_validate(item) for item in response.get("Items", [])
+                )
+                start_key = response.get("LastEvaluatedKey")
+                if not start_key or len(users) >= limit:
+                    break
 
         except Exception as e:
-            logger.error(f"Error scanning user by email: {str(e)}")
-            return None
+            error_code = (
+                e.response.get("Error", {}).get("Code", "Unknown")
+                if isinstance(e, ClientError)
+                else type(e).__name__
+            )
+            logger.error(f"Error listing users page: {error_code} - {str(e)}")
+
+            raise BaseApplicationException(
+                message_pt="Falha ao listar usuários com paginação",
+                message_en="Failed to list users with pagination",
+                details={"error": str(e), "error_code": error_code, "limit": limit},
+                error_code="USER_LIST_PAGINATED_ERROR",
+                status_code=500,
+            )
+
+        logger.info(f"Listed {len(users)} users (page)")
+        return UserPage(users=users, next_cursor=encode_cursor(start_key))
 
     def list_users_paginated(
         self, limit: int = 100, last_evaluated_key: Optional[Dict[str, Any]] = None
@@ -528,7 +1200,10 @@ class UserRepository(UserInterface):
             BaseApplicationException: Se houver erro na listagem
         """
         try:
-            scan_kwargs: Dict[str, Any] = {"Limit": limit}
+            scan_kwargs: Dict[str, Any] = {
+                "Limit": limit,
+                "FilterExpression": Attr(SENTINEL_OWNER_ATTRIBUTE).not_exists(),
+            }
 
             if last_evaluated_key:
                 scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
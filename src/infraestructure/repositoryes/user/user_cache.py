@@ -0,0 +1,409 @@
+"""
+Cache read-through de usuários com invalidação entre workers.
+Read-through user cache with cross-worker invalidation.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from configs.load_env import settings
+from core.entities.user import User, UserPage
+from infraestructure.telemetry.metrics import MetricsRegistry, get_metrics_registry
+from interface.user.user_interface import AsyncUserInterface, UserInterface
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_HITS = "user.cache.hits"
+USER_CACHE_MISSES = "user.cache.misses"
+USER_CACHE_ENTRIES = "user.cache.entries"
+USER_CACHE_INVALIDATIONS = "user.cache.invalidations"
+USER_CACHE_BUS_CONNECTED = "user.cache.bus_connected"
+USER_CACHE_PUBLISH_FAILURES = "user.cache.publish_failures"
+
+
+def email_key(email: str) -> str:
+    return email.strip().lower()
+
+
+class _Entry:
+    __slots__ = ("user", "expires_at")
+
+    def __init__(self, user: User, expires_at: float):
+        self.user = user
+        self.expires_at = expires_at
+
+
+class UserCache:
+    """
+    Cache TTL + LRU de usuários por ID, com índice de email.
+    TTL + LRU user cache keyed by ID, with an email index.
+
+    Cada invalidação incrementa ``generation``; um ``put`` só grava se a
+    geração não mudou desde o início da leitura, então uma leitura que
+    cruzou um update não repõe o valor antigo. Desabilitado (ex.: sem
+    conexão com o barramento de invalidação), o cache não serve nem guarda.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        self.ttl = ttl if ttl is not None else settings.user_cache_ttl_seconds
+        self.max_entries = max_entries or settings.user_cache_max_entries
+        self.clock = clock
+        self.metrics = metrics or get_metrics_registry()
+        self.enabled = True
+        self.generation = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._emails: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(user_id) if self.enabled else None
+            if entry is None or entry.expires_at <= self.clock():
+                self.metrics.increment(USER_CACHE_MISSES)
+                return None
+            self._entries.move_to_end(user_id)
+        self.metrics.increment(USER_CACHE_HITS)
+        # Cópia rasa: quem altera o usuário não altera a entrada do cache
+        return entry.user.model_copy()
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        user_id = self._emails.get(email_key(email))
+        if user_id is None:
+            self.metrics.increment(USER_CACHE_MISSES)
+            return None
+        return self.get(user_id)
+
+    def put(self, user: User, generation: int) -> None:
+        with self._lock:
+            if not self.enabled or generation != self.generation:
+                return
+            self._drop(user.user_id)
+            self._entries[user.user_id] = _Entry(
+                user.model_copy(), self.clock() + self.ttl
+            )
+            if user.email:
+                self._emails[email_key(user.email)] = user.user_id
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+            self.metrics.set_gauge(USER_CACHE_ENTRIES, len(self._entries))
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self.generation += 1
+            self._drop(user_id)
+            self.metrics.set_gauge(USER_CACHE_ENTRIES, len(self._entries))
+        self.metrics.increment(USER_CACHE_INVALIDATIONS)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._emails.clear()
+            self.metrics.set_gauge(USER_CACHE_ENTRIES, 0)
+
+    def _drop(self, user_id: str) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is not None and entry.user.email:
+            key = email_key(entry.user.email)
+            if self._emails.get(key) == user_id:
+                del self._emails[key]
+
+
+class PostgresUserCacheBus:
+    """
+    Barramento de invalidação via Postgres ``LISTEN``/``NOTIFY``.
+    Invalidation bus over Postgres ``LISTEN``/``NOTIFY``.
+
+    Cada worker escuta ``user_cache_channel`` e remove o ``userId`` recebido
+    do seu cache local. Sem conexão, avisos podem ter sido perdidos: o cache
+    é limpo e desabilitado até reconectar.
+    """
+
+    def __init__(
+        self,
+        cache: UserCache,
+        dsn: Optional[str] = None,
+        channel: Optional[str] = None,
+        reconnect_delay: float = 1.0,
+        connect: Optional[Callable[..., Any]] = None,
+    ):
+        self.cache = cache
+        self.dsn = dsn
+        self.channel = channel or settings.user_cache_channel
+        self.reconnect_delay = reconnect_delay
+        self._connect = connect
+        self._connection: Any = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lost: Optional[asyncio.Event] = None
+        self._publish_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None
+
+    async def start(self) -> None:
+        """Começa a escutar em background; o cache fica desligado até conectar"""
+        if self._task is not None:
+            return
+        self._set_connected(None)
+        self._loop = asyncio.get_running_loop()
+        self._publish_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._close()
+
+    async def publish(self, user_id: str) -> None:
+        """Avisa os outros workers; falhas só limitam a invalidação ao TTL"""
+        connection = self._connection
+        if connection is None or self._publish_lock is None:
+            self.cache.metrics.increment(USER_CACHE_PUBLISH_FAILURES)
+            return
+        try:
+            # Uma conexão asyncpg não aceita operações concorrentes
+            async with self._publish_lock:
+                await connection.execute(
+                    "SELECT pg_notify($1, $2)", self.channel, user_id
+                )
+        except Exception as e:
+            self.cache.metrics.increment(USER_CACHE_PUBLISH_FAILURES)
+            logger.warning(f"Failed to publish user cache invalidation: {e}")
+
+    def publish_threadsafe(self, user_id: str) -> None:
+        """``publish`` a partir de uma thread (repositório síncrono)"""
+        if self._loop is not None and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.publish(user_id), self._loop)
+
+    def _on_notification(
+        self, _connection: Any, _pid: int, _channel: str, payload: str
+    ) -> None:
+        self.cache.invalidate(payload)
+
+    def _on_termination(self, _connection: Any) -> None:
+        if self._lost is not None:
+            self._lost.set()
+
+    def _set_connected(self, connection: Any) -> None:
+        self._connection = connection
+        self.cache.clear()
+        self.cache.enabled = connection is not None
+        self.cache.metrics.set_gauge(
+            USER_CACHE_BUS_CONNECTED, int(connection is not None)
+        )
+
+    async def _open(self) -> Any:
+        if self._connect is not None:
+            return await self._connect()
+        import asyncpg
+
+        from infraestructure.database.config import get_database_url
+
+        return await asyncpg.connect(self.dsn or get_database_url())
+
+    async def _close(self) -> None:
+        connection, self._connection = self._connection, None
+        self.cache.enabled = False
+        if connection is not None:
+            try:
+                await connection.close()
+            except Exception:
+                pass
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        while True:
+            self._lost = asyncio.Event()
+            try:
+                connection = await self._open()
+                connection.add_termination_listener(self._on_termination)
+                await connection.add_listener(self.channel, self._on_notification)
+                self._set_connected(connection)
+                delay = self.reconnect_delay
+                logger.info(f"Listening for user cache invalidations on {self.channel}")
+                await self._lost.wait()
+                logger.warning("User cache invalidation connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"User cache invalidation bus unavailable: {e}")
+            await self._close()
+            self._set_connected(None)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+class CachedUserRepository(UserInterface):
+    """
+    Decorator de ``UserInterface`` com cache read-through em
+    ``get_user``/``get_user_by_email``/``get_users``; escritas invalidam o
+    cache local e avisam os outros workers pelo barramento.
+    """
+
+    def __init__(
+        self,
+        inner: UserInterface,
+        cache: Optional[UserCache] = None,
+        bus: Optional[PostgresUserCacheBus] = None,
+    ):
+        self.inner = inner
+        self.cache = cache if cache is not None else UserCache()
+        self.bus = bus
+
+    def __getattr__(self, name: str) -> Any:
+        # Métodos fora da interface (list_users_paginated...)
+        return getattr(self.inner, name)
+
+    def _invalidate(self, user_id: str) -> None:
+        self.cache.invalidate(user_id)
+        if self.bus is not None:
+            self.bus.publish_threadsafe(user_id)
+
+    def create_user(self, user: User) -> User:
+        return self.inner.create_user(user)
+
+    def create_users(self, users: List[User]) -> None:
+        self.inner.create_users(users)
+
+    def get_user(self, user_id: str) -> User:
+        user = self.cache.get(user_id)
+        if user is None:
+            generation = self.cache.generation
+            user = self.inner.get_user(user_id)
+            self.cache.put(user, generation)
+        return user
+
+    def get_user_by_email(self, email: str) -> User:
+        user = self.cache.get_by_email(email)
+        if user is None:
+            generation = self.cache.generation
+            user = self.inner.get_user_by_email(email)
+            if user is not None:
+                self.cache.put(user, generation)
+        return user
+
+    def get_users(self, user_ids: List[str]) -> List[User]:
+        generation = self.cache.generation
+        cached = {
+            user_id: self.cache.get(user_id) for user_id in dict.fromkeys(user_ids)
+        }
+        missing = [
+            user_id for user_id, user in cached.items() if user is None and user_id
+        ]
+        for user in self.inner.get_users(missing) if missing else []:
+            self.cache.put(user, generation)
+            cached[user.user_id] = user
+        return [user for user in cached.values() if user is not None]
+
+    def update_user(self, user_id: str, user_data: Dict[str, Any]) -> User:
+        try:
+            return self.inner.update_user(user_id, user_data)
+        finally:
+            self._invalidate(user_id)
+
+    def delete_user(self, user_id: str) -> bool:
+        try:
+            return self.inner.delete_user(user_id)
+        finally:
+            self._invalidate(user_id)
+
+    def list_users(self) -> List[User]:
+        return self.inner.list_users()
+
+    def list_users_page(self, limit: int, cursor: Optional[str] = None) -> UserPage:
+        return self.inner.list_users_page(limit, cursor)
+
+
+class AsyncCachedUserRepository(AsyncUserInterface):
+    """Versão assíncrona do ``CachedUserRepository`` / Async ``CachedUserRepository``"""
+
+    def __init__(
+        self,
+        inner: AsyncUserInterface,
+        cache: Optional[UserCache] = None,
+        bus: Optional[PostgresUserCacheBus] = None,
+    ):
+        self.inner = inner
+        self.cache = cache if cache is not None else UserCache()
+        self.bus = bus
+
+    async def _invalidate(self, user_id: str) -> None:
+        self.cache.invalidate(user_id)
+        if self.bus is not None:
+            await self.bus.publish(user_id)
+
+    async def create_user(self, user: User) -> User:
+        return await self.inner.create_user(user)
+
+    async def create_users(self, users: List[User]) -> None:
+        await self.inner.create_users(users)
+
+    async def get_user(self, user_id: str) -> User:
+        user = self.cache.get(user_id)
+        if user is None:
+            generation = self.cache.generation
+            user = await self.inner.get_user(user_id)
+            self.cache.put(user, generation)
+        return user
+
+    async def get_user_by_email(self, email: str) -> User:
+        user = self.cache.get_by_email(email)
+        if user is None:
+            generation = self.cache.generation
+            user = await self.inner.get_user_by_email(email)
+            if user is not None:
+                self.cache.put(user, generation)
+        return user
+
+    async def get_users(self, user_ids: List[str]) -> List[User]:
+        generation = self.cache.generation
+        cached = {
+            user_id: self.cache.get(user_id) for user_id in dict.fromkeys(user_ids)
+        }
+        missing = [
+            user_id for user_id, user in cached.items() if user is None and user_id
+        ]
+        for user in await self.inner.get_users(missing) if missing else []:
+            self.cache.put(user, generation)
+            cached[user.user_id] = user
+        return [user for user in cached.values() if user is not None]
+
+    async def update_user(self, user_id: str, user_data: Dict[str, Any]) -> User:
+        try:
+            return await self.inner.update_user(user_id, user_data)
+        finally:
+            await self._invalidate(user_id)
+
+    async def delete_user(self, user_id: str) -> bool:
+        try:
+            return await self.inner.delete_user(user_id)
+        finally:
+            await self._invalidate(user_id)
+
+    async def list_users(self) -> List[User]:
+        return await self.inner.list_users()
+
+    async def list_users_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> UserPage:
+        return await self.inner.list_users_page(limit, cursor)
+
+    def export_users(self, total_segments: int) -> AsyncIterator[User]:
+        return self.inner.export_users(total_segments)
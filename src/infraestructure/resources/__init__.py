@@ -0,0 +1,22 @@
+"""
+Recursos de processo (engines, pools e clientes) com ciclo de vida explícito.
+Process resources (engines, pools and clients) with an explicit lifecycle.
+"""
+
+from .container import (
+    ResourceContainer,
+    get_agent_storage,
+    get_async_session_factory,
+    get_db_session,
+    get_resources,
+    get_session_factory,
+)
+
+__all__ = [
+    "ResourceContainer",
+    "get_agent_storage",
+    "get_async_session_factory",
+    "get_db_session",
+    "get_resources",
+    "get_session_factory",
+]
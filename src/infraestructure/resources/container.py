@@ -0,0 +1,183 @@
+"""
+Container dos recursos de processo e dependencies de sessão.
+Process resource container and session dependencies.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from agno.storage.postgres import PostgresStorage
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from infraestructure.bulkhead import shutdown_bulkheads
+from infraestructure.client_factory.aws import AsyncAWSClientFactory, AWSClientFactory
+from infraestructure.database.config import DatabaseConfig
+from infraestructure.knowledge.vector_store import (
+    get_knowledge_base,
+    get_knowledge_engine,
+)
+
+logger = logging.getLogger(__name__)
+
+AGENT_STORAGE_TABLE = "chat_messages"
+
+
+class ResourceContainer:
+    """
+    Dono dos engines, pools e clientes de um processo worker.
+    Owner of the engines, pools and clients of a worker process.
+
+    Nada é criado no import: cada recurso nasce no primeiro uso ou no
+    ``startup()`` do lifespan, já dentro do worker (depois do fork), e é
+    liberado no ``shutdown()``. Se o processo mudar (fork depois do uso),
+    os engines herdados são descartados sem fechar as conexões do pai.
+    """
+
+    def __init__(self, db_config: Optional[DatabaseConfig] = None):
+        self.db_config = db_config or DatabaseConfig()
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._engine: Optional[Engine] = None
+        self._session_factory: Optional[sessionmaker] = None
+        self._async_engine: Optional[AsyncEngine] = None
+        self._async_session_factory: Optional[async_sessionmaker] = None
+        self._agent_storage: Optional[PostgresStorage] = None
+
+    def _check_pid(self) -> None:
+        if self._pid == os.getpid():
+            return
+        if self._engine is not None:
+            self._engine.dispose(close=False)
+        if self._async_engine is not None:
+            self._async_engine.sync_engine.dispose(close=False)
+        self._reset()
+
+    @property
+    def engine(self) -> Engine:
+        """Engine síncrono (agno e sessões síncronas)"""
+        with self._lock:
+            self._check_pid()
+            if self._engine is None:
+                self._engine = self.db_config.get_engine()
+            return self._engine
+
+    @property
+    def session_factory(self) -> sessionmaker:
+        engine = self.engine
+        with self._lock:
+            if self._session_factory is None:
+                self._session_factory = sessionmaker(
+                    bind=engine, autocommit=False, autoflush=False
+                )
+            return self._session_factory
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        """Engine assíncrono com o pool configurado (``db_pool_*``)"""
+        with self._lock:
+            self._check_pid()
+            if self._async_engine is None:
+                self._async_engine = self.db_config.get_async_engine()
+            return self._async_engine
+
+    @property
+    def async_session_factory(self) -> async_sessionmaker:
+        engine = self.async_engine
+        with self._lock:
+            if self._async_session_factory is None:
+                self._async_session_factory = async_sessionmaker(
+                    bind=engine, autoflush=False, expire_on_commit=False
+                )
+            return self._async_session_factory
+
+    @property
+    def agent_storage(self) -> PostgresStorage:
+        """Storage do agno, sobre o engine síncrono compartilhado"""
+        engine = self.engine
+        with self._lock:
+            if self._agent_storage is None:
+                self._agent_storage = PostgresStorage(
+                    table_name=AGENT_STORAGE_TABLE, db_engine=engine
+                )
+            return self._agent_storage
+
+    async def startup(self) -> None:
+        """
+        Cria os recursos e abre uma conexão de cada um antes do tráfego.
+        Builds the resources and opens one connection of each before traffic.
+
+        Falhas no aquecimento só geram aviso: o pool (com pre-ping) e o
+        cliente AWS tentam de novo na primeira requisição.
+        """
+        try:
+            async with self.async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning(f"Could not warm up the Postgres pool: {e}")
+        try:
+            # O PostgresStorage do agno inspeciona o banco ao ser criado
+            await asyncio.to_thread(lambda: self.agent_storage)
+        except Exception as e:
+            logger.warning(f"Could not create the agent storage: {e}")
+        try:
+            await AsyncAWSClientFactory().dynamo()
+        except Exception as e:
+            logger.warning(f"Could not warm up the DynamoDB client: {e}")
+
+    async def shutdown(self) -> None:
+        """Libera engines, pools, clientes e threads do processo"""
+        with self._lock:
+            engine, async_engine = self._engine, self._async_engine
+            self._reset()
+        if async_engine is not None:
+            await async_engine.dispose()
+        if engine is not None:
+            engine.dispose()
+        if get_knowledge_engine.cache_info().currsize:
+            get_knowledge_engine().dispose()
+            get_knowledge_engine.cache_clear()
+        # As bases de conhecimento em cache guardam o engine descartado acima
+        get_knowledge_base.cache_clear()
+        await AsyncAWSClientFactory.close()
+        AWSClientFactory.clear()
+        shutdown_bulkheads()
+
+
+@lru_cache()
+def get_resources() -> ResourceContainer:
+    """Container de recursos do processo / Process resource container"""
+    return ResourceContainer()
+
+
+def get_session_factory() -> sessionmaker:
+    return get_resources().session_factory
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    return get_resources().async_session_factory
+
+
+def get_agent_storage() -> PostgresStorage:
+    return get_resources().agent_storage
+
+
+def get_db_session() -> Iterator[Session]:
+    """
+    Dependency que entrega uma sessão e a fecha ao fim da requisição.
+    Dependency that yields a session and closes it after the request.
+    """
+    session = get_session_factory()()
+    try:
+        yield session
+    finally:
+        session.close()
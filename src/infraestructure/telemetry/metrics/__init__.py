@@ -0,0 +1,6 @@
+from infraestructure.telemetry.metrics.registry import (
+    MetricsRegistry,
+    get_metrics_registry,
+)
+
+__all__ = ["MetricsRegistry", "get_metrics_registry"]
@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterator
+
+SUMMARY_WINDOW = 1024
+
+
+class _Summary:
+    """Janela deslizante de observações / Sliding window of observations"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.window: Deque[float] = deque(maxlen=SUMMARY_WINDOW)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.window.append(value)
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        if not self.window:
+            return 0.0
+        ordered = sorted(self.window)
+        position = min(int(round(percentile * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[position]
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "avg": round(self.average, 4),
+            "p50": round(self.percentile(0.50), 4),
+            "p95": round(self.percentile(0.95), 4),
+        }
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas em processo (contadores, gauges e sumários).
+    In-process metrics registry (counters, gauges and summaries).
+
+    Thread-safe, pois é usado tanto pelo event loop quanto pelas threads
+    em que o agno executa ferramentas síncronas.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._summaries: Dict[str, _Summary] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            self._summaries.setdefault(name, _Summary()).observe(value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Observa a duração do bloco em milissegundos"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - started) * 1000)
+
+    def counter(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def gauge(self, name: str) -> float:
+        with self._lock:
+            return self._gauges.get(name, 0)
+
+    def average(self, name: str) -> float:
+        with self._lock:
+            summary = self._summaries.get(name)
+            return summary.average if summary else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "summaries": {
+                    name: summary.snapshot()
+                    for name, summary in self._summaries.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+@lru_cache()
+def get_metrics_registry() -> MetricsRegistry:
+    """Registro de métricas compartilhado pelo processo"""
+    return MetricsRegistry()
@@ -0,0 +1,24 @@
+import asyncio
+
+
+class AsyncRateLimiter:
+    """
+    Espaça chamadas para no máximo ``rate`` por segundo (sem rajadas).
+    Spaces calls to at most ``rate`` per second (no bursts).
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
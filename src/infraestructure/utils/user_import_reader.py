@@ -0,0 +1,75 @@
+"""
+Leitura incremental de arquivos de importação de usuários (CSV ou NDJSON).
+Incremental reading of user import files (CSV or NDJSON).
+"""
+
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Tuple, Union
+
+CSV = "csv"
+NDJSON = "ndjson"
+IMPORT_FORMATS = (CSV, NDJSON)
+
+
+def import_format(filename: str) -> str:
+    """Formato pela extensão do arquivo (``.csv`` ou NDJSON)"""
+    return CSV if filename.lower().endswith(".csv") else NDJSON
+
+
+async def iter_lines(
+    chunks: AsyncIterable[Union[bytes, str]], encoding: str = "utf-8"
+) -> AsyncIterator[str]:
+    """Quebra um stream de bytes em linhas sem carregá-lo inteiro"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def read_import_rows(
+    lines: AsyncIterable[str], fmt: str
+) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], Exception]]]:
+    """
+    Produz ``(número da linha de dados, registro)`` a partir de 1.
+    Yields ``(data row number, record)`` starting at 1.
+
+    Linhas que não podem ser lidas viram a exceção no lugar do registro,
+    para o chamador reportar a falha e seguir. No CSV, a primeira linha é
+    o cabeçalho e cada registro ocupa uma linha.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unknown import format: {fmt}. Use one of {IMPORT_FORMATS}")
+
+    header = None
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        if fmt == CSV and header is None:
+            header = [column.strip() for column in next(csv.reader([line]))]
+            continue
+
+        row += 1
+        try:
+            if fmt == CSV:
+                values = next(csv.reader([line]))
+                record: Any = {
+                    column: value.strip() or None
+                    for column, value in zip(header, values)
+                }
+            else:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("Each NDJSON line must be an object")
+        except (csv.Error, ValueError) as e:
+            yield row, e
+            continue
+        yield row, record
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from core.entities.chat import Chat
+from core.entities.chat import Chat, ChatMessage, ChatMessagePage, ChatPage
 
 
 class AsyncChatInterface(ABC):
@@ -47,6 +47,48 @@ class AsyncChatInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    async def list_chats_page(
+        self, user_id: str, limit: int, cursor: Optional[str] = None
+    ) -> ChatPage:
+        """
+        Retrieve one page of a user's chats, most recently updated first.
+
+        :param user_id: Unique identifier for the user.
+        :param limit: Maximum number of chats in the page.
+        :param cursor: Opaque cursor returned by the previous page.
+        :return: The page and the cursor for the next one.
+        """
+        pass
+
+    @abstractmethod
+    async def add_message(self, chat_id: str, message: ChatMessage) -> ChatMessage:
+        """
+        Append one message to a chat and update its activity counters.
+
+        :param chat_id: Unique identifier for the chat.
+        :param message: Message to append.
+        :return: The stored message.
+        """
+        pass
+
+    @abstractmethod
+    async def get_messages(
+        self,
+        chat_id: str,
+        before: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> ChatMessagePage:
+        """
+        Read one page of a chat's history, newest page first.
+
+        :param chat_id: Unique identifier for the chat.
+        :param before: Opaque cursor returned by the previous (newer) page.
+        :param limit: Maximum number of messages in the page.
+        :return: The page, oldest message first, and the cursor for older ones.
+        """
+        pass
+
 
 class ChatInterface(ABC):
     @abstractmethod
@@ -90,3 +132,31 @@ class ChatInterface(ABC):
         :return: True if deletion was successful, False otherwise.
         """
         pass
+
+    @abstractmethod
+    def add_message(self, chat_id: str, message: ChatMessage) -> ChatMessage:
+        """
+        Append one message to a chat without rewriting its history.
+
+        :param chat_id: Unique identifier for the chat.
+        :param message: Message to append.
+        :return: The stored message.
+        """
+        pass
+
+    @abstractmethod
+    def get_messages(
+        self,
+        chat_id: str,
+        before: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> ChatMessagePage:
+        """
+        Read one page of a chat's history, newest page first.
+
+        :param chat_id: Unique identifier for the chat.
+        :param before: Opaque cursor returned by the previous (newer) page.
+        :param limit: Maximum number of messages in the page.
+        :return: The page, oldest message first, and the cursor for older ones.
+        """
+        pass
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from core.entities.user import User
+from typing import Any, AsyncIterator, Dict, Optional
+
+from core.entities.user import User, UserPage
 
 class UserInterface(ABC):
     @abstractmethod
@@ -12,6 +14,15 @@ class UserInterface(ABC):
         
         pass
     
+    @abstractmethod
+    def create_users(self, users: list[User]) -> None:
+        """
+        Persist many new users with batched writes.
+        The caller guarantees the users are new (e.g. just signed up).
+        :param users: User objects to store.
+        """
+        pass
+
     @abstractmethod
     def get_user(self, user_id: str) -> User:
         """
@@ -22,6 +33,15 @@ class UserInterface(ABC):
         
         pass
 
+    @abstractmethod
+    def get_users(self, user_ids: list[str]) -> list[User]:
+        """
+        Retrieve several users by their IDs in as few round trips as possible.
+        :param user_ids: The IDs to retrieve; duplicates are ignored.
+        :return: The users found, in the order of ``user_ids``.
+        """
+        pass
+
     @abstractmethod
     def get_user_by_email(self, email: str) -> User:
         """
@@ -32,11 +52,13 @@ class UserInterface(ABC):
         pass
 
     @abstractmethod
-    def update_user(self, user: User) -> User:
+    def update_user(self, user_id: str, user_data: Dict[str, Any]) -> User:
         """
-        Update an existing user.
-        :param user: User object containing updated user details.
-        :return: The updated User object.
+        Partially update an existing user, without reading it first.
+        :param user_id: The ID of the user to update.
+        :param user_data: The user fields to change.
+        :return: The updated User object, as stored.
+        :raises UserNotFoundException: If the user does not exist.
         """
         
         pass
@@ -59,6 +81,115 @@ class UserInterface(ABC):
         """
         
         pass
-    
-    
-    
\ No newline at end of file
+
+    @abstractmethod
+    def list_users_page(self, limit: int, cursor: Optional[str] = None) -> UserPage:
+        """
+        List one page of users.
+        :param limit: Maximum number of users in the page.
+        :param cursor: Opaque cursor returned by the previous page, if any.
+        :return: The users and the cursor of the next page.
+        """
+        pass
+
+
+class AsyncUserInterface(ABC):
+    """
+    Versão assíncrona do UserInterface, para repositórios com cliente async.
+    Async version of UserInterface, for repositories on an async client.
+    """
+
+    @abstractmethod
+    async def create_user(self, user: User) -> User:
+        """
+        Create a new user.
+        :param user: User object containing user details.
+        :return: The created User object.
+        """
+        pass
+
+    @abstractmethod
+    async def create_users(self, users: list[User]) -> None:
+        """
+        Persist many new users with batched writes.
+        The caller guarantees the users are new (e.g. just signed up).
+        :param users: User objects to store.
+        """
+        pass
+
+    @abstractmethod
+    async def get_user(self, user_id: str) -> User:
+        """
+        Retrieve a user by their ID.
+        :param user_id: The ID of the user to retrieve.
+        :return: The User object if found, otherwise None.
+        """
+        pass
+
+    @abstractmethod
+    async def get_users(self, user_ids: list[str]) -> list[User]:
+        """
+        Retrieve several users by their IDs in as few round trips as possible.
+        :param user_ids: The IDs to retrieve; duplicates are ignored.
+        :return: The users found, in the order of ``user_ids``.
+        """
+        pass
+
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> User:
+        """
+        Retrieve a user by their email.
+        :param email: The email of the user to retrieve.
+        :return: The User object if found, otherwise None.
+        """
+        pass
+
+    @abstractmethod
+    async def update_user(self, user_id: str, user_data: Dict[str, Any]) -> User:
+        """
+        Partially update an existing user, without reading it first.
+        :param user_id: The ID of the user to update.
+        :param user_data: The user fields to change.
+        :return: The updated User object, as stored.
+        :raises UserNotFoundException: If the user does not exist.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_user(self, user_id: str) -> bool:
+        """
+        Delete a user by their ID.
+        :param user_id: The ID of the user to delete.
+        :return: True if the user was deleted successfully, otherwise False.
+        """
+        pass
+
+    @abstractmethod
+    async def list_users(self) -> list[User]:
+        """
+        List all users.
+        :return: A list of User objects.
+        """
+        pass
+
+    @abstractmethod
+    async def list_users_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> UserPage:
+        """
+        List one page of users.
+        :param limit: Maximum number of users in the page.
+        :param cursor: Opaque cursor returned by the previous page, if any.
+        :return: The users and the cursor of the next page.
+        """
+        pass
+
+    @abstractmethod
+    def export_users(self, total_segments: int) -> AsyncIterator[User]:
+        """
+        Stream every user, reading the table in parallel segments.
+        :param total_segments: Number of segments scanned concurrently.
+        :return: An async iterator of User objects, in no particular order.
+        """
+        pass
+
@@ -1,8 +1,15 @@
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from configs.load_env import settings
+from core.exceptions import InfrastructureException
+from infraestructure.repositoryes.user.async_repository import AsyncUserRepository
+from infraestructure.resources import get_resources
+from presentation.dependencies import get_user_cache_bus
 from presentation.exception_handlers import register_exception_handlers
 from presentation.middleware.middleware import (
     ErrorContextMiddleware,
@@ -16,6 +23,49 @@ from presentation.routes.router import app_router
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
+logger = logging.getLogger(__name__)
+
+
+async def check_email_lookup() -> None:
+    """
+    Impede a subida com o ``email-index`` ausente enquanto ele ainda for
+    usado na busca por email; se o DynamoDB não responder, só avisa.
+    """
+    if not settings.user_email_index_fallback:
+        return
+    try:
+        available = await AsyncUserRepository().check_email_index()
+    except Exception as e:
+        logger.warning(f"Could not verify the users email-index: {e}")
+        return
+    if not available:
+        raise InfrastructureException(
+            message_pt="Índice email-index ausente na tabela de usuários",
+            message_en="Missing email-index on the users table",
+            service="dynamodb",
+            operation="describe_table",
+            error_code="EMAIL_INDEX_MISSING",
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Cria e aquece os recursos do worker (engines, pools e clientes AWS),
+    verifica o índice de email, escuta invalidações do cache de usuários e
+    libera todos os recursos ao desligar a aplicação, inclusive quando a
+    subida falha no meio.
+    """
+    try:
+        await get_resources().startup()
+        await check_email_lookup()
+        if settings.user_cache_enabled:
+            await get_user_cache_bus().start()
+        yield
+    finally:
+        if settings.user_cache_enabled:
+            await get_user_cache_bus().stop()
+        await get_resources().shutdown()
 
 
 def create_app() -> FastAPI:
@@ -28,6 +78,7 @@ def create_app() -> FastAPI:
         version="1.0.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     # Middlewares - ordem importa! Os primeiros são executados por último na resposta
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Any, AsyncGenerator, Dict, List
 
 from core.dtos.agent.agent_dtos import CreateAgentDTO
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
 
 
 class AgentControllerInterface(ABC):
@@ -11,12 +12,12 @@ class AgentControllerInterface(ABC):
 
     @abstractmethod
     async def create_agent(
-        self, token: str, agent_data: CreateAgentDTO
+        self, user: UserDetailsResponseDto, agent_data: CreateAgentDTO
     ) -> Dict[str, Any]:
         pass
 
     @abstractmethod
     async def stream_chat_response(
-        self, token: str, messages: List[Dict[str, Any]]
+        self, user: UserDetailsResponseDto, messages: List[Dict[str, Any]]
     ) -> AsyncGenerator:
         pass
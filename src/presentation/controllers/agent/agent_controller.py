@@ -1,6 +1,7 @@
 from typing import Any, AsyncGenerator, Dict, List
 
 from core.dtos.agent.agent_dtos import CreateAgentDTO
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
 from core.entities.agent import BaseAgent
 from core.exceptions.agent import (
     AgentAuthenticationException,
@@ -28,7 +29,7 @@ class AgentController(AgentControllerInterface):
         self._presenter = presenter
 
     async def create_agent(
-        self, token: str, agent_data: CreateAgentDTO
+        self, user: UserDetailsResponseDto, agent_data: CreateAgentDTO
     ) -> Dict[str, Any]:
         """Create a new agent"""
         try:
@@ -66,14 +67,14 @@ class AgentController(AgentControllerInterface):
                 description=agent_data.description,
                 instructions=agent_data.instructions,
                 tools=[],  # Lista vazia por padrão
-                user_id=None,  # Será preenchido pelo use case após validar token
+                user_id=user.user_id,
                 session_id=None,  # Session ID opcional
                 model_id="default-model",
                 storage=None,
                 knowledge_base=None,
             )
 
-            result = await self._create_agent_usecase.execute(token, base_agent)
+            result = await self._create_agent_usecase.execute(user, base_agent)
             # Converter o objeto Agent para dict antes de passar para o presenter
             agent_dict = {
                 "agent_id": getattr(result, "agent_id", str(id(result))),
@@ -116,7 +117,7 @@ class AgentController(AgentControllerInterface):
             ) from e
 
     async def stream_chat_response(
-        self, token: str, messages: List[Dict[str, Any]]
+        self, user: UserDetailsResponseDto, messages: List[Dict[str, Any]]
     ) -> AsyncGenerator:
         try:
             # Validar dados de entrada
@@ -164,7 +165,7 @@ class AgentController(AgentControllerInterface):
 
         # Envolver o streaming em try/catch para capturar erros durante o streaming
         try:
-            response = self._stream_agent_response_usecase.execute(token, messages)
+            response = self._stream_agent_response_usecase.execute(user, messages)
             async for chunk in response:
                 try:
                     # Garantir que chunk não seja None ou vazio
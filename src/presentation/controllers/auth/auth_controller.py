@@ -1,7 +1,7 @@
 from typing import Any, Dict
 
-from core.usecases.user.usecases import LoginUserUseCase
-from core.usecases.auth.auth_usecases import ConfirmUserUseCase
+from core.usecases.user.usecases import AsyncLoginUserUseCase, LoginUserUseCase
+from core.usecases.auth.auth_usecases import AsyncConfirmUserUseCase, ConfirmUserUseCase
 from presentation.controllers.auth import AuthControllerInterface
 from presentation.presenters.user.user_presenter import UserPresenterInterface
 
@@ -25,4 +25,28 @@ class AuthController(AuthControllerInterface):
     def confirm_email(self, email: str, token: str) -> Dict[str, Any]:
         """Confirma o email do usuário com o token fornecido"""
         confirmation = self.confirm_usecase.execute(email, token)
-        return self.presenter.present_email_confirmation(confirmation)
\ No newline at end of file
+        return self.presenter.present_email_confirmation(confirmation)
+
+
+class AsyncAuthController(AuthControllerInterface):
+    """Controller de autenticação cujas chamadas ao Cognito não bloqueiam o event loop"""
+
+    def __init__(
+        self,
+        login_usecase: AsyncLoginUserUseCase,
+        confirm_usecase: AsyncConfirmUserUseCase,
+        presenter: UserPresenterInterface,
+    ):
+        self.login_usecase = login_usecase
+        self.confirm_usecase = confirm_usecase
+        self.presenter = presenter
+
+    async def login(self, email: str, password: str) -> Dict[str, Any]:
+        """Realiza o login do usuário e retorna os detalhes de autenticação"""
+        auth_details = await self.login_usecase.execute(email, password)
+        return self.presenter.present_user_authentication(auth_details)
+
+    async def confirm_email(self, email: str, token: str) -> Dict[str, Any]:
+        """Confirma o email do usuário com o token fornecido"""
+        confirmation = await self.confirm_usecase.execute(email, token)
+        return self.presenter.present_email_confirmation(confirmation)
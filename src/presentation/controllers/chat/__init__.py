@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
 from core.dtos.chat.chat_dtos import CreateChatResponseDto
 
 
@@ -7,6 +8,6 @@ class ChatControllerInterface(ABC):
     """Interface para o controller de chat seguindo Clean Architecture"""
 
     @abstractmethod
-    async def create_chat(self, token: str) -> CreateChatResponseDto:
+    async def create_chat(self, user: UserDetailsResponseDto) -> CreateChatResponseDto:
         """Cria um novo chat"""
         pass
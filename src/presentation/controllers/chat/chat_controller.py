@@ -1,12 +1,24 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
 from core.dtos.chat.chat_dtos import CreateChatResponseDto
 from presentation.controllers.chat import ChatControllerInterface
-from core.usecases.chat.chat_usecases import AsyncCreateChatUseCase, CreateChatUseCase
+from presentation.presenters.chat import ChatPresenterInterface
+from core.usecases.chat.chat_usecases import (
+    AsyncCreateChatUseCase,
+    AsyncListChatsUseCase,
+    CreateChatUseCase,
+)
+from infraestructure.bulkhead import DYNAMODB, run_in_bulkhead
 
 
 
 class ChatController(ChatControllerInterface):
-    """Implementação do controller de chat seguindo a interface"""
+    """
+    Implementação do controller de chat seguindo a interface
+
+    O ``ChatRepository`` usa boto3 síncrono, então o caso de uso roda no
+    bulkhead ``dynamodb``, como no ``UserController``.
+    """
 
     def __init__(
         self, create_chat_usecase: CreateChatUseCase
@@ -14,18 +26,33 @@ class ChatController(ChatControllerInterface):
         """Inicializa o controller com o caso de uso de criação de chat"""
         self.create_chat_usecase = create_chat_usecase
 
-    def create_chat(self, token: str) -> CreateChatResponseDto:
-        return self.create_chat_usecase.execute(token)
+    async def create_chat(self, user: UserDetailsResponseDto) -> CreateChatResponseDto:
+        return await run_in_bulkhead(DYNAMODB, self.create_chat_usecase.execute, user)
     
     
 class AsyncChatController(ChatControllerInterface):
     """Implementação assíncrona do controller de chat seguindo a interface"""
 
     def __init__(
-        self, create_chat_usecase: AsyncCreateChatUseCase
+        self,
+        create_chat_usecase: AsyncCreateChatUseCase,
+        list_chats_usecase: Optional[AsyncListChatsUseCase] = None,
+        presenter: Optional[ChatPresenterInterface] = None,
     ) -> None:
-        """Inicializa o controller com o caso de uso assíncrono de criação de chat"""
+        """Inicializa o controller com os casos de uso assíncronos de chat"""
         self.create_chat_usecase = create_chat_usecase
+        self.list_chats_usecase = list_chats_usecase
+        self.presenter = presenter
+
+    async def create_chat(self, user: UserDetailsResponseDto) -> CreateChatResponseDto:
+        return await self.create_chat_usecase.execute(user)
 
-    async def create_chat(self, token: str) -> CreateChatResponseDto:
-        return await self.create_chat_usecase.execute(token)
\ No newline at end of file
+    async def list_chats(
+        self,
+        user: UserDetailsResponseDto,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Lista uma página dos chats do usuário, do mais recente ao mais antigo"""
+        page = await self.list_chats_usecase.execute(user, limit, cursor)
+        return self.presenter.present_chats_page(page)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Optional
 
 from core.dtos.user.user_dtos import CreateRequestUserDto
 
@@ -23,3 +23,10 @@ class UserControllerInterface(ABC):
     ) -> Dict[str, Any]:
         """Atualiza um usuário"""
         pass
+
+    @abstractmethod
+    async def list_users(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> Iterator[str]:
+        """Lista uma página de usuários, serializada em pedaços de JSON"""
+        pass
@@ -1,18 +1,41 @@
-from typing import Any, Dict
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    Optional,
+    Union,
+)
 
 from core.dtos.user.user_dtos import CreateRequestUserDto
 from core.exceptions.user.exceptions import UserNotFoundException
 from core.usecases.user.usecases import (
+    AsyncCreateUserUseCase,
+    AsyncExportUsersUseCase,
+    AsyncGetUserUseCase,
+    AsyncImportUsersUseCase,
+    AsyncListUsersPageUseCase,
+    AsyncUpdateUserUseCase,
     CreateUserUseCase,
     GetUserUseCase,
+    ListUsersPageUseCase,
     UpdateUserUseCase,
 )
+from infraestructure.bulkhead import COGNITO, DYNAMODB, run_in_bulkhead
+from infraestructure.utils.user_import_reader import iter_lines, read_import_rows
 from presentation.controllers.user import UserControllerInterface
 from presentation.presenters.user.user_presenter import UserPresenterInterface
 
 
 class UserController(UserControllerInterface):
-    """Controller responsável por orquestrar as operações de usuário"""
+    """
+    Controller responsável por orquestrar as operações de usuário.
+
+    Os use cases são síncronos (boto3), então rodam nos bulkheads em vez de
+    bloquear o event loop: chamadas ao Cognito no ``cognito`` e ao DynamoDB
+    no ``dynamodb``, para que um Cognito lento não esgote o pool do DynamoDB.
+    """
 
     def __init__(
         self,
@@ -20,20 +43,25 @@ class UserController(UserControllerInterface):
         get_user_usecase: GetUserUseCase,
         update_user_usecase: UpdateUserUseCase,
         presenter: UserPresenterInterface,
+        list_users_page_usecase: Optional[ListUsersPageUseCase] = None,
     ):
         self._create_user_usecase = create_user_usecase
         self._get_user_usecase = get_user_usecase
         self._update_user_usecase = update_user_usecase
+        self._list_users_page_usecase = list_users_page_usecase
         self._presenter = presenter
 
     async def create_user(self, user_data: CreateRequestUserDto) -> Dict[str, Any]:
         """Cria um novo usuário e retorna a resposta formatada"""
-        user = self._create_user_usecase.execute(user_data)
+        user = await run_in_bulkhead(
+            COGNITO, self._create_user_usecase.signup, user_data
+        )
+        user = await run_in_bulkhead(DYNAMODB, self._create_user_usecase.store, user)
         return self._presenter.present_user_created(user)
 
     async def get_user(self, user_id: str) -> Dict[str, Any]:
         """Obtém um usuário por ID e retorna a resposta formatada"""
-        user = self._get_user_usecase.execute(user_id)
+        user = await run_in_bulkhead(DYNAMODB, self._get_user_usecase.execute, user_id)
 
         if user is None:
             raise UserNotFoundException(identifier=user_id, field="id")
@@ -44,11 +72,91 @@ class UserController(UserControllerInterface):
         self, user_id: str, user_data: CreateRequestUserDto
     ) -> Dict[str, Any]:
         """Atualiza um usuário e retorna a resposta formatada"""
-        # Converter DTO para dict para o UseCase
-        user_dict = user_data.model_dump()
-        user = self._update_user_usecase.execute(user_id, user_dict)
+        # Só os campos enviados; o repositório ignora os não atualizáveis
+        user_dict = user_data.model_dump(exclude_unset=True)
+        user = await run_in_bulkhead(
+            DYNAMODB, self._update_user_usecase.execute, user_id, user_dict
+        )
+
+        return self._presenter.present_user_updated(user)
+
+    async def list_users(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> Iterator[str]:
+        """Lista uma página de usuários, serializada em pedaços de JSON"""
+        page = await run_in_bulkhead(
+            DYNAMODB, self._list_users_page_usecase.execute, limit, cursor
+        )
+        return self._presenter.stream_users_page(page)
+
+
+class AsyncUserController(UserControllerInterface):
+    """
+    Controller de usuário sobre use cases assíncronos: a concorrência é
+    limitada pelo pool de conexões do DynamoDB, não pelo número de threads.
+    """
+
+    def __init__(
+        self,
+        create_user_usecase: AsyncCreateUserUseCase,
+        get_user_usecase: AsyncGetUserUseCase,
+        update_user_usecase: AsyncUpdateUserUseCase,
+        list_users_page_usecase: AsyncListUsersPageUseCase,
+        export_users_usecase: AsyncExportUsersUseCase,
+        import_users_usecase: AsyncImportUsersUseCase,
+        presenter: UserPresenterInterface,
+    ):
+        self._create_user_usecase = create_user_usecase
+        self._get_user_usecase = get_user_usecase
+        self._update_user_usecase = update_user_usecase
+        self._list_users_page_usecase = list_users_page_usecase
+        self._export_users_usecase = export_users_usecase
+        self._import_users_usecase = import_users_usecase
+        self._presenter = presenter
+
+    async def create_user(self, user_data: CreateRequestUserDto) -> Dict[str, Any]:
+        """Cria um novo usuário e retorna a resposta formatada"""
+        user = await self._create_user_usecase.execute(user_data)
+        return self._presenter.present_user_created(user)
+
+    async def get_user(self, user_id: str) -> Dict[str, Any]:
+        """Obtém um usuário por ID e retorna a resposta formatada"""
+        user = await self._get_user_usecase.execute(user_id)
 
         if user is None:
             raise UserNotFoundException(identifier=user_id, field="id")
 
+        return self._presenter.present_user(user)
+
+    async def update_user(
+        self, user_id: str, user_data: CreateRequestUserDto
+    ) -> Dict[str, Any]:
+        """Atualiza um usuário e retorna a resposta formatada"""
+        user = await self._update_user_usecase.execute(
+            user_id, user_data.model_dump(exclude_unset=True)
+        )
+
         return self._presenter.present_user_updated(user)
+
+    async def list_users(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> Iterator[str]:
+        """Lista uma página de usuários, serializada em pedaços de JSON"""
+        page = await self._list_users_page_usecase.execute(limit, cursor)
+        return self._presenter.stream_users_page(page)
+
+    def export_users(self, total_segments: Optional[int] = None) -> AsyncIterator[str]:
+        """Exporta todos os usuários como NDJSON, à medida que são lidos"""
+        users = self._export_users_usecase.execute(total_segments)
+        return self._presenter.stream_users_ndjson(users)
+
+    def import_users(
+        self,
+        body: AsyncIterable[Union[bytes, str]],
+        fmt: str,
+        start_row: int = 1,
+    ) -> AsyncIterator[str]:
+        """Importa usuários de um arquivo em stream e relata o progresso em NDJSON"""
+        rows = read_import_rows(iter_lines(body), fmt)
+        events = self._import_users_usecase.execute(rows, start_row)
+        return self._presenter.stream_import_events(events)
@@ -1,54 +1,122 @@
 from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from configs.load_env import settings
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
+from core.exceptions.auth.auth_exceptions import (
+    InsufficientPermissionsException,
+    InvalidTokenException,
+    UserNotActiveException,
+)
+
 from core.usecases.agent.agent_usecases import (
     CreateAgentUseCase,
     StreamAgentResponseUseCase,
 )
-from core.usecases.auth.auth_usecases import ConfirmUserUseCase
-from core.usecases.chat.chat_usecases import AsyncCreateChatUseCase, CreateChatUseCase
+from core.usecases.auth.auth_usecases import AsyncConfirmUserUseCase, ConfirmUserUseCase
+from core.usecases.chat.chat_usecases import (
+    AsyncCreateChatUseCase,
+    AsyncListChatsUseCase,
+    CreateChatUseCase,
+)
 from core.usecases.user.usecases import (
+    AsyncCreateUserUseCase,
+    AsyncExportUsersUseCase,
+    AsyncGetUserUseCase,
+    AsyncImportUsersUseCase,
+    AsyncListUsersPageUseCase,
+    AsyncLoginUserUseCase,
+    AsyncUpdateUserUseCase,
     CreateUserUseCase,
     GetUserUseCase,
+    ListUsersPageUseCase,
     ListUsersUseCase,
     LoginUserUseCase,
     UpdateUserUseCase,
 )
-from infraestructure.database.config import get_db_session
 from infraestructure.repositoryes.agent.agent_repository import AgentRepository
+from infraestructure.repositoryes.auth.async_repository import AsyncAuthRepository
+from infraestructure.repositoryes.auth.principal_cache import CachedAuthRepository
 from infraestructure.repositoryes.auth.repository import AuthRepository
 from infraestructure.repositoryes.chat.chat_repository import ChatRepository
 from infraestructure.repositoryes.chat.postgres_chat_repository import (
     PostgresChatRepository,
 )
+from infraestructure.repositoryes.user.async_repository import AsyncUserRepository
 from infraestructure.repositoryes.user.repository import UserRepository
-from interface.auth.auth_interface import AuthInterface
+from infraestructure.repositoryes.user.user_cache import (
+    AsyncCachedUserRepository,
+    CachedUserRepository,
+    PostgresUserCacheBus,
+    UserCache,
+)
+from infraestructure.telemetry.metrics import get_metrics_registry
+from interface.auth.auth_interface import AsyncAuthInterface, AuthInterface
 from interface.chat.chat_interface import AsyncChatInterface, ChatInterface
-from interface.user.user_interface import UserInterface
+from interface.user.user_interface import AsyncUserInterface, UserInterface
 from presentation.controllers.agent.agent_controller import AgentController
-from presentation.controllers.auth.auth_controller import AuthController
+from presentation.controllers.auth.auth_controller import (
+    AsyncAuthController,
+    AuthController,
+)
 from presentation.controllers.chat.chat_controller import (
     AsyncChatController,
     ChatController,
 )
-from presentation.controllers.user.user_controller import UserController
+from presentation.controllers.user.user_controller import (
+    AsyncUserController,
+    UserController,
+)
 from presentation.presenters.agent.agent_presenter import AgentPresenter
+from presentation.presenters.chat.chat_presenter import ChatPresenter
 from presentation.presenters.user.user_presenter import UserPresenter
 
 
 @lru_cache()
 def get_auth_interface() -> AuthInterface:
     """Factory para a interface de autenticação"""
-    return AuthRepository()
+    return CachedAuthRepository(AuthRepository())
+
+
+@lru_cache()
+def get_async_auth_interface() -> AsyncAuthInterface:
+    """Factory para a interface assíncrona de autenticação (executor dedicado)"""
+    return AsyncAuthRepository(get_auth_interface())
+
+
+@lru_cache()
+def get_user_cache() -> UserCache:
+    """Cache de usuários do worker, compartilhado pelos repositórios"""
+    return UserCache()
+
+
+@lru_cache()
+def get_user_cache_bus() -> PostgresUserCacheBus:
+    """Barramento LISTEN/NOTIFY que invalida o cache de usuários entre workers"""
+    return PostgresUserCacheBus(get_user_cache())
 
 
 @lru_cache()
 def get_user_repository() -> UserInterface:
     """Factory para o repositório de usuário"""
-    return UserRepository()
+    if not settings.user_cache_enabled:
+        return UserRepository()
+    return CachedUserRepository(
+        UserRepository(), get_user_cache(), get_user_cache_bus()
+    )
+
+
+@lru_cache()
+def get_async_user_repository() -> AsyncUserInterface:
+    """Factory para o repositório de usuário assíncrono (cliente DynamoDB async)"""
+    if not settings.user_cache_enabled:
+        return AsyncUserRepository()
+    return AsyncCachedUserRepository(
+        AsyncUserRepository(), get_user_cache(), get_user_cache_bus()
+    )
 
 
 @lru_cache()
@@ -79,6 +147,12 @@ def get_list_users_usecase() -> ListUsersUseCase:
     return ListUsersUseCase(repository)
 
 
+@lru_cache()
+def get_list_users_page_usecase() -> ListUsersPageUseCase:
+    """Factory para o caso de uso de listagem paginada de usuários"""
+    return ListUsersPageUseCase(get_user_repository())
+
+
 @lru_cache()
 def get_update_user_usecase() -> UpdateUserUseCase:
     """Factory para o caso de uso de atualização de usuário"""
@@ -94,6 +168,26 @@ def get_user_controller() -> UserController:
         get_user_usecase=get_get_user_usecase(),
         update_user_usecase=get_update_user_usecase(),
         presenter=get_user_presenter(),
+        list_users_page_usecase=get_list_users_page_usecase(),
+    )
+
+
+@lru_cache()
+def get_async_user_controller() -> AsyncUserController:
+    """Factory para o controller de usuário assíncrono"""
+    repository = get_async_user_repository()
+    return AsyncUserController(
+        create_user_usecase=AsyncCreateUserUseCase(
+            repository, get_async_auth_interface()
+        ),
+        get_user_usecase=AsyncGetUserUseCase(repository),
+        update_user_usecase=AsyncUpdateUserUseCase(repository),
+        list_users_page_usecase=AsyncListUsersPageUseCase(repository),
+        export_users_usecase=AsyncExportUsersUseCase(repository),
+        import_users_usecase=AsyncImportUsersUseCase(
+            repository, get_async_auth_interface()
+        ),
+        presenter=get_user_presenter(),
     )
 
 
@@ -108,6 +202,18 @@ def get_auth_controller() -> AuthController:
     )
 
 
+@lru_cache()
+def get_async_auth_controller() -> AsyncAuthController:
+    """Factory para o controller assíncrono de autenticação"""
+    return AsyncAuthController(
+        login_usecase=AsyncLoginUserUseCase(get_async_auth_interface()),
+        confirm_usecase=AsyncConfirmUserUseCase(
+            get_async_user_repository(), get_async_auth_interface()
+        ),
+        presenter=get_user_presenter(),
+    )
+
+
 @lru_cache()
 def get_chat_interface() -> ChatInterface:
     """Factory para a interface de chat"""
@@ -124,14 +230,14 @@ def get_async_chat_interface() -> AsyncChatInterface:
 def get_create_chat_usecase() -> CreateChatUseCase:
     """Factory para o caso de uso de criação de chat"""
     chat_interface = get_chat_interface()
-    return CreateChatUseCase(chat_interface, get_auth_interface())
+    return CreateChatUseCase(chat_interface)
 
 
 @lru_cache()
 def get_async_create_chat_usecase() -> AsyncCreateChatUseCase:
     """Factory para o caso de uso assíncrono de criação de chat"""
     chat_interface = get_async_chat_interface()
-    return AsyncCreateChatUseCase(chat_interface, get_auth_interface())
+    return AsyncCreateChatUseCase(chat_interface)
 
 
 @lru_cache()
@@ -140,12 +246,20 @@ def get_chat_controller() -> ChatController:
     return ChatController(create_chat_usecase=get_create_chat_usecase())
 
 
-lru_cache()
+@lru_cache()
+def get_chat_presenter() -> ChatPresenter:
+    """Factory para o presenter de chat"""
+    return ChatPresenter()
 
 
+@lru_cache()
 def get_async_chat_controller() -> AsyncChatController:
     """Factory para o controller assíncrono de chat"""
-    return AsyncChatController(create_chat_usecase=get_async_create_chat_usecase())
+    return AsyncChatController(
+        create_chat_usecase=get_async_create_chat_usecase(),
+        list_chats_usecase=AsyncListChatsUseCase(get_async_chat_interface()),
+        presenter=get_chat_presenter(),
+    )
 
 
 # Configuração do esquema de autenticação Bearer
@@ -196,6 +310,63 @@ def get_optional_bearer_token(
     return None
 
 
+PRINCIPAL_RESOLUTIONS = "auth.principal.resolutions"
+PRINCIPAL_RESOLUTION_LATENCY_MS = "auth.principal.resolution_latency_ms"
+
+
+async def get_current_user(
+    request: Request,
+    token: str = Depends(get_bearer_token),
+    auth_interface: AsyncAuthInterface = Depends(get_async_auth_interface),
+) -> UserDetailsResponseDto:
+    """
+    Resolve o usuário autenticado uma única vez por requisição.
+
+    O principal fica em ``request.state.user``; chamadas seguintes na mesma
+    requisição reutilizam o valor. Acertos no cache de principals voltam
+    direto; o resto roda no bulkhead ``principal``, fora do event loop e
+    separado das chamadas ao Cognito (login, cadastro).
+
+    Raises:
+        InvalidTokenException: Se o token for inválido ou expirado
+        UserNotActiveException: Se o usuário estiver inativo
+    """
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
+
+    metrics = get_metrics_registry()
+    with metrics.timer(PRINCIPAL_RESOLUTION_LATENCY_MS):
+        user = await auth_interface.get_user_details(token)
+    metrics.increment(PRINCIPAL_RESOLUTIONS)
+
+    if user is None or not user.user_id:
+        raise InvalidTokenException()
+    if not user.is_active:
+        raise UserNotActiveException(username=user.email)
+
+    request.state.user = user
+    return user
+
+
+async def get_current_admin(
+    user: UserDetailsResponseDto = Depends(get_current_user),
+) -> UserDetailsResponseDto:
+    """
+    Usuário autenticado que pertence a um dos grupos ``auth_admin_groups``.
+    Authenticated user that belongs to one of the ``auth_admin_groups``.
+
+    Os grupos vêm da claim ``cognito:groups`` do token verificado; sem
+    verificação local (JWKS inacessível) não há grupos e o acesso é negado.
+
+    Raises:
+        InsufficientPermissionsException: Se o usuário não for administrador
+    """
+    if not set(user.groups) & set(settings.auth_admin_groups):
+        raise InsufficientPermissionsException(required_permission="admin")
+    return user
+
+
 @lru_cache()
 def get_agent_repository() -> AgentRepository:
     """Factory para o repositório de agente"""
@@ -205,14 +376,14 @@ def get_agent_repository() -> AgentRepository:
 @lru_cache()
 def get_create_agent_usecase() -> CreateAgentUseCase:
     """Factory para o caso de uso de criação de agente"""
-    return CreateAgentUseCase(get_auth_interface(), get_agent_repository())
+    return CreateAgentUseCase(get_agent_repository())
 
 
 @lru_cache()
 def get_agent_stream_usecase() -> StreamAgentResponseUseCase:
     """Factory para o caso de uso de streaming de resposta de agente"""
     return StreamAgentResponseUseCase(
-        get_create_agent_usecase(), get_auth_interface(), get_agent_repository()
+        get_create_agent_usecase(), get_agent_repository()
     )
 
 
@@ -12,19 +12,17 @@ from presentation.playground.auth import agent_repository, auth_repository, logi
 async def create_playground_team():
     """Cria um team para o playground sem necessidade de autenticação"""
     create_agent_usecase = CreateAgentUseCase(
-        auth_repository=auth_repository, 
         agent_repository=agent_repository,
     )
 
     define_team_usecase = DefineTeamToPlaygroundUseCase(
         agent_create_usecase=create_agent_usecase,
-        auth_repository=auth_repository,
         agent_repository=agent_repository,
     )
 
-    token = login_user["access_token"]
+    user = auth_repository.get_user_details(login_user["access_token"])
 
-    return await define_team_usecase.execute(token)
+    return await define_team_usecase.execute(user)
 
 
 # Executar de forma síncrona para criar o playground
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List
 
-from core.entities.chat import Chat
+from core.entities.chat import Chat, ChatPage
 
 
 class ChatPresenterInterface(ABC):
@@ -22,6 +22,11 @@ class ChatPresenterInterface(ABC):
         """Apresenta uma lista de chats"""
         pass
 
+    @abstractmethod
+    def present_chats_page(self, page: ChatPage) -> Dict[str, Any]:
+        """Apresenta uma página da listagem de chats"""
+        pass
+
     @abstractmethod
     def present_chat_updated(self, chat: Chat) -> Dict[str, Any]:
         """Apresenta o resultado da atualização de um chat"""
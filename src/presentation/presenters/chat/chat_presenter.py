@@ -1,6 +1,6 @@
 from typing import Any, Dict, List
 from fastapi import status
-from core.entities.chat import Chat
+from core.entities.chat import Chat, ChatMessage, ChatPage, ChatSummary
 from core.exceptions.base_exceptions import BaseApplicationException
 from presentation.presenters.chat import ChatPresenterInterface
 
@@ -30,6 +30,15 @@ class ChatPresenter(ChatPresenterInterface):
             "total": len(chats),
         }
 
+    def present_chats_page(self, page: ChatPage) -> Dict[str, Any]:
+        """Apresenta uma página de chats com o cursor da próxima"""
+        return {
+            "success": True,
+            "chats": [self._format_summary(chat) for chat in page.chats],
+            "count": len(page.chats),
+            "next_cursor": page.next_cursor,
+        }
+
     def present_chat_updated(self, chat: Chat) -> Dict[str, Any]:
         """Apresenta o resultado da atualização de um chat"""
         return {
@@ -61,4 +70,26 @@ class ChatPresenter(ChatPresenterInterface):
             "messages": chat.messages,
             "created_at": chat.created_at.isoformat() if chat.created_at else None,
             "updated_at": chat.updated_at.isoformat() if chat.updated_at else None,
-        }
\ No newline at end of file
+        }
+
+    def _format_summary(self, chat: ChatSummary) -> Dict[str, Any]:
+        """Formata um chat da barra lateral com a prévia da última mensagem"""
+        return {
+            **self._format_chat(chat),
+            "last_message": (
+                self._format_message(chat.last_message) if chat.last_message else None
+            ),
+            "last_message_at": (
+                chat.last_message_at.isoformat() if chat.last_message_at else None
+            ),
+            "message_count": chat.message_count,
+        }
+
+    def _format_message(self, message: ChatMessage) -> Dict[str, Any]:
+        """Formata uma mensagem para a resposta"""
+        return {
+            "id": message.message_id,
+            "user_id": message.user_id,
+            "content": message.content,
+            "timestamp": message.timestamp.isoformat(),
+        }
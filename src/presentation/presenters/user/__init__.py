@@ -1,7 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Union,
+)
 
-from core.entities.user import User
+from core.dtos.user.user_dtos import UserImportCheckpointDto, UserImportFailureDto
+from core.entities.user import User, UserPage
 
 
 class UserPresenterInterface(ABC):
@@ -36,6 +45,24 @@ class UserPresenterInterface(ABC):
         """Apresenta uma lista de usuários"""
         pass
 
+    @abstractmethod
+    def stream_users_page(self, page: UserPage) -> Iterator[str]:
+        """Serializa uma página de usuários em pedaços de JSON"""
+        pass
+
+    @abstractmethod
+    def stream_users_ndjson(self, users: AsyncIterator[User]) -> AsyncIterator[str]:
+        """Serializa usuários como NDJSON, uma linha por usuário"""
+        pass
+
+    @abstractmethod
+    def stream_import_events(
+        self,
+        events: AsyncIterable[Union[UserImportFailureDto, UserImportCheckpointDto]],
+    ) -> AsyncIterator[str]:
+        """Serializa o progresso de uma importação como NDJSON"""
+        pass
+
     @abstractmethod
     def present_user_updated(self, user: User) -> Dict[str, Any]:
         """Apresenta o resultado da atualização de usuário"""
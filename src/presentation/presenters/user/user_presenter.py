@@ -1,8 +1,18 @@
-from typing import Any, Dict, List
+import json
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Union,
+)
 
 from fastapi import status
 
-from core.entities.user import User
+from core.dtos.user.user_dtos import UserImportCheckpointDto, UserImportFailureDto
+from core.entities.user import User, UserPage
 from core.exceptions.base_exceptions import BaseApplicationException
 from presentation.presenters.user import UserPresenterInterface
 
@@ -54,6 +64,42 @@ class UserPresenter(UserPresenterInterface):
             "total": len(users),
         }
 
+    def stream_users_page(self, page: UserPage) -> Iterator[str]:
+        """
+        Serializa uma página de usuários em pedaços de JSON, um por usuário.
+
+        O corpo completo é ``{"success", "users", "count", "next_cursor"}``,
+        mas nunca é montado inteiro em memória.
+        """
+        yield '{"success":true,"users":['
+        for index, user in enumerate(page.users):
+            yield ("," if index else "") + json.dumps(self._format_user(user))
+        # Fecha a lista e reaproveita o dict de metadados sem o "{" inicial
+        yield "]," + json.dumps(
+            {"count": len(page.users), "next_cursor": page.next_cursor}
+        )[1:]
+
+    async def stream_users_ndjson(
+        self, users: AsyncIterator[User]
+    ) -> AsyncIterator[str]:
+        """Serializa usuários como NDJSON, uma linha por usuário"""
+        async for user in users:
+            yield json.dumps(self._format_user(user)) + "\n"
+
+    async def stream_import_events(
+        self,
+        events: AsyncIterable[Union[UserImportFailureDto, UserImportCheckpointDto]],
+    ) -> AsyncIterator[str]:
+        """
+        Serializa o progresso de uma importação como NDJSON: uma linha por
+        falha (``"type": "failure"``) e por lote concluído (``"checkpoint"``).
+        """
+        async for event in events:
+            kind = (
+                "failure" if isinstance(event, UserImportFailureDto) else "checkpoint"
+            )
+            yield json.dumps({"type": kind, **event.model_dump()}) + "\n"
+
     def present_user_updated(self, user: User) -> Dict[str, Any]:
         """Apresenta o resultado da atualização de usuário"""
         return {
@@ -4,8 +4,9 @@ from fastapi import APIRouter, Body, Depends, Path, status
 from fastapi.responses import StreamingResponse
 
 from core.dtos.agent.agent_dtos import CreateAgentDTO, StreamChatRequestDTO
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
 from presentation.controllers.agent.agent_controller import AgentController
-from presentation.dependencies import get_agent_controller, get_bearer_token
+from presentation.dependencies import get_agent_controller, get_current_user
 
 router = APIRouter(
     prefix="/agents",
@@ -33,7 +34,7 @@ router = APIRouter(
 async def stream_chat(
     request_data: StreamChatRequestDTO,
     controller: AgentController = Depends(get_agent_controller),
-    token: str = Depends(get_bearer_token),
+    user: UserDetailsResponseDto = Depends(get_current_user),
 ) -> StreamingResponse:
     """
     Stream chat messages for a specific agent.
@@ -55,6 +56,6 @@ async def stream_chat(
 
         messages.append(message_dict)
 
-    response = controller.stream_chat_response(token, messages)
+    response = controller.stream_chat_response(user, messages)
 
     return StreamingResponse(response, media_type="text/event-stream")
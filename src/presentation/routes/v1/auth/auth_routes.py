@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Body, Depends, status
 
 from core.dtos.auth.auth_dtos import ConfirmEmailDto, LoginDto
-from presentation.controllers.auth.auth_controller import AuthController
-from presentation.dependencies import get_auth_controller
+from presentation.controllers.auth.auth_controller import AsyncAuthController
+from presentation.dependencies import get_async_auth_controller
 
 router = APIRouter(
     prefix="/auth",
@@ -25,16 +25,16 @@ router = APIRouter(
         401: {"description": "Unauthorized"},
     },
 )
-def login(
+async def login(
     credentials: LoginDto = Body(..., description="User credentials for login"),
-    auth_controller: AuthController = Depends(get_auth_controller),
+    auth_controller: AsyncAuthController = Depends(get_async_auth_controller),
 ):
     """
     User login
     """
     LoginDto.model_validate(credentials)
 
-    return auth_controller.login(credentials.email, credentials.password)
+    return await auth_controller.login(credentials.email, credentials.password)
 
 
 @router.post(
@@ -47,15 +47,15 @@ def login(
         400: {"description": "Invalid confirmation token"},
     },
 )
-def confirm_email(
+async def confirm_email(
     confirmation_data: ConfirmEmailDto = Body(
         ..., description="Email confirmation data"
     ),
-    auth_controller: AuthController = Depends(get_auth_controller),
+    auth_controller: AsyncAuthController = Depends(get_async_auth_controller),
 ):
     """
     Confirm user email
     """
-    return auth_controller.confirm_email(
+    return await auth_controller.confirm_email(
         confirmation_data.email, confirmation_data.confirmation_token
     )
@@ -1,9 +1,11 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Body, Depends, Path, status
+from fastapi import APIRouter, Body, Depends, Path, Query, status
 
+from configs.load_env import settings
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
 from presentation.controllers.chat.chat_controller import ChatController, AsyncChatController
-from presentation.dependencies import get_bearer_token, get_async_chat_controller
+from presentation.dependencies import get_async_chat_controller, get_current_user
 
 router = APIRouter(
     prefix="/chats",
@@ -29,12 +31,45 @@ router = APIRouter(
 )
 async def create_chat(
     controller: AsyncChatController = Depends(get_async_chat_controller),
-    token: str = Depends(get_bearer_token),
+    user: UserDetailsResponseDto = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """
     Create a new chat in the system.
 
     - **chat_data**: Data for the new chat
     """
-    result = await controller.create_chat(token)
+    result = await controller.create_chat(user)
     return result.model_dump()
+
+
+@router.get(
+    "/",
+    status_code=status.HTTP_200_OK,
+    summary="List chats",
+    description="Lista os chats do usuário por atividade recente, com cursor",
+    response_description="Página de chats",
+    responses={
+        200: {"description": "Página de chats e cursor da próxima"},
+        400: {"description": "Cursor ou tamanho de página inválido"},
+    },
+)
+async def list_chats(
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.chat_list_max_page_size,
+        description="Chats por página",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Cursor opaco devolvido pela página anterior"
+    ),
+    controller: AsyncChatController = Depends(get_async_chat_controller),
+    user: UserDetailsResponseDto = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """
+    List the user's chats one page at a time, most recently active first.
+
+    - **limit**: Chats per page (default and maximum come from settings)
+    - **cursor**: ``next_cursor`` from the previous page; omit on the first
+    """
+    return await controller.list_chats(user, limit, cursor)
@@ -1,5 +1,8 @@
 from fastapi import APIRouter, Depends
 
+from infraestructure.bulkhead import bulkheads_snapshot
+from infraestructure.telemetry.metrics import get_metrics_registry
+
 router = APIRouter(
     prefix="/health",
     tags=["health"]
@@ -7,4 +10,10 @@ router = APIRouter(
 
 @router.get("/")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@router.get("/metrics")
+async def metrics():
+    """Snapshot das métricas em processo / In-process metrics snapshot"""
+    return {**get_metrics_registry().snapshot(), "bulkheads": bulkheads_snapshot()}
@@ -1,10 +1,13 @@
-from typing import Any, Dict
+from typing import Any, Dict, Literal, Optional
 
-from fastapi import APIRouter, Body, Depends, Path, status
+from fastapi import APIRouter, Body, Depends, Path, Query, Request, status
+from fastapi.responses import StreamingResponse
 
+from configs.load_env import settings
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
 from core.dtos.user.user_dtos import CreateRequestUserDto
-from presentation.controllers.user.user_controller import UserController
-from presentation.dependencies import get_user_controller
+from presentation.controllers.user.user_controller import AsyncUserController
+from presentation.dependencies import get_async_user_controller, get_current_admin
 
 router = APIRouter(
     prefix="/users",
@@ -30,7 +33,7 @@ router = APIRouter(
 )
 async def create_user(
     user_data: CreateRequestUserDto,
-    controller: UserController = Depends(get_user_controller),
+    controller: AsyncUserController = Depends(get_async_user_controller),
 ) -> Dict[str, Any]:
     """
     Criar um novo usuário no sistema.
@@ -41,6 +44,109 @@ async def create_user(
     return result
 
 
+@router.get(
+    "/",
+    status_code=status.HTTP_200_OK,
+    summary="List users",
+    description="Lista usuários paginados por cursor",
+    response_description="Página de usuários",
+    responses={
+        200: {"description": "Página de usuários e cursor da próxima"},
+        400: {"description": "Cursor ou tamanho de página inválido"},
+        401: {"description": "Token inválido"},
+        403: {"description": "Usuário não é administrador"},
+    },
+)
+async def list_users(
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.user_list_max_page_size,
+        description="Usuários por página",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Cursor opaco devolvido pela página anterior"
+    ),
+    controller: AsyncUserController = Depends(get_async_user_controller),
+    admin: UserDetailsResponseDto = Depends(get_current_admin),
+) -> StreamingResponse:
+    """
+    Listar usuários uma página por vez (somente administradores).
+
+    - **limit**: Usuários por página (padrão e máximo vêm das settings)
+    - **cursor**: ``next_cursor`` da página anterior; ausente na primeira
+    """
+    page = await controller.list_users(limit, cursor)
+    return StreamingResponse(page, media_type="application/json")
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export users",
+    description="Exporta todos os usuários como NDJSON (scan paralelo)",
+    response_description="Um usuário por linha",
+    responses={
+        200: {"description": "Exportação iniciada"},
+        400: {"description": "Número de segmentos inválido"},
+        401: {"description": "Token inválido"},
+        403: {"description": "Usuário não é administrador"},
+    },
+)
+async def export_users(
+    segments: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.user_export_max_segments,
+        description="Segmentos lidos em paralelo",
+    ),
+    controller: AsyncUserController = Depends(get_async_user_controller),
+    admin: UserDetailsResponseDto = Depends(get_current_admin),
+) -> StreamingResponse:
+    """
+    Exportar todos os usuários, um JSON por linha, à medida que são lidos
+    (somente administradores).
+
+    - **segments**: Segmentos do scan paralelo (padrão das settings)
+    """
+    lines = controller.export_users(segments)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@router.post(
+    "/import",
+    status_code=status.HTTP_200_OK,
+    summary="Import users",
+    description="Importa usuários de um arquivo CSV ou NDJSON enviado em stream",
+    response_description="Progresso da importação em NDJSON",
+    responses={
+        200: {"description": "Falhas por linha e checkpoints por lote"},
+        401: {"description": "Token inválido"},
+        403: {"description": "Usuário não é administrador"},
+    },
+)
+async def import_users(
+    request: Request,
+    format: Literal["csv", "ndjson"] = Query(
+        "ndjson", description="Formato do corpo da requisição"
+    ),
+    start_row: int = Query(
+        1, ge=1, description="Linha onde retomar (next_row do último checkpoint)"
+    ),
+    controller: AsyncUserController = Depends(get_async_user_controller),
+    admin: UserDetailsResponseDto = Depends(get_current_admin),
+) -> StreamingResponse:
+    """
+    Importar usuários em massa sem carregar o arquivo em memória
+    (somente administradores).
+
+    - **format**: ``csv`` (com cabeçalho) ou ``ndjson``
+    - **start_row**: retoma uma importação interrompida
+    """
+    events = controller.import_users(request.stream(), format, start_row)
+    return StreamingResponse(events, media_type="application/x-ndjson")
+
+
 @router.get(
     "/{user_id}",
     status_code=status.HTTP_200_OK,
@@ -54,7 +160,7 @@ async def create_user(
 )
 async def get_user(
     user_id: str = Path(..., description="ID do usuário"),
-    controller: UserController = Depends(get_user_controller),
+    controller: AsyncUserController = Depends(get_async_user_controller),
 ) -> Dict[str, Any]:
     """
     Obter informações de um usuário específico.
@@ -81,7 +187,7 @@ async def get_user(
 async def update_user(
     user_id: str = Path(..., description="ID do usuário"),
     user_data: CreateRequestUserDto = Body(..., description="Novos dados do usuário"),
-    controller: UserController = Depends(get_user_controller),
+    controller: AsyncUserController = Depends(get_async_user_controller),
 ) -> Dict[str, Any]:
     """
     Atualizar os dados de um usuário existente.
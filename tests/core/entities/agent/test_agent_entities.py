@@ -11,6 +11,7 @@ from src.core.entities.agent import (
     ComplexityAgent,
     GeneratorImageAgent,
     JudgingBaseAgent,
+    OutputIntent,
     TeamAgent,
 )
 
@@ -150,6 +151,37 @@ class TestGeneratorImageAgent:
         assert isinstance(agent, BaseAgent)
 
 
+class TestKnowledgeIntents:
+    """Testes para o acesso à base de conhecimento por intenção"""
+
+    def test_simple_and_image_agents_skip_knowledge(self):
+        """Testa que simple_task e generate_image não recebem conhecimento"""
+        simple = BaseAgent(name="simple", intent="simple_task")
+        image = GeneratorImageAgent(name="image")
+
+        assert simple.requires_knowledge() is False
+        assert image.requires_knowledge() is False
+
+    def test_complexity_and_generic_agents_use_knowledge(self):
+        """Testa que agentes complexos e genéricos mantêm o conhecimento"""
+        assert ComplexityAgent(name="complex").requires_knowledge() is True
+        assert BaseAgent(name="generic").requires_knowledge() is True
+        assert JudgingBaseAgent(name="judge").requires_knowledge() is False
+
+    def test_routed_intents_disable_retrieval(self):
+        """Testa que o roteamento para simple_task desabilita o retrieval"""
+        routed = ComplexityAgent(name="complex", routed_intents=["simple_task"])
+        unrouted = ComplexityAgent(name="complex")
+
+        assert routed.retrieval_enabled() is False
+        assert unrouted.retrieval_enabled() is True
+
+    def test_output_intent_requires_knowledge(self):
+        """Testa OutputIntent.requires_knowledge"""
+        assert OutputIntent(intent=["complexity_task"]).requires_knowledge is True
+        assert OutputIntent(intent=["generate_image"]).requires_knowledge is False
+
+
 class TestTeamAgent:
     """Testes para TeamAgent"""
 
@@ -0,0 +1,100 @@
+"""
+Testes para os casos de uso de chat.
+Tests for the chat use cases.
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from configs.load_env import settings
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
+from core.entities.chat import ChatPage
+from core.exceptions import ValidationException
+from core.usecases.chat.chat_usecases import (
+    AsyncCreateChatUseCase,
+    AsyncListChatsUseCase,
+    CreateChatUseCase,
+)
+from interface.chat.chat_interface import AsyncChatInterface, ChatInterface
+
+
+@pytest.fixture
+def user():
+    return UserDetailsResponseDto(
+        user_id="user_123",
+        user_sub="user_123",
+        email="test@example.com",
+        is_active=True,
+    )
+
+
+class TestCreateChatUseCase:
+    """Testes para o caso de uso de criação de chat"""
+
+    def test_creates_chat_for_resolved_principal(self, user):
+        """Testa que o chat usa o principal já resolvido pela requisição"""
+        chat_interface = Mock(spec=ChatInterface)
+        usecase = CreateChatUseCase(chat_interface)
+
+        result = usecase.execute(user)
+
+        chat = chat_interface.create_chat.call_args.kwargs["chat_data"]
+        assert chat.user_id == "user_123"
+        assert result.chat_id == chat.chat_id
+
+    def test_inactive_user_is_rejected(self, user):
+        """Testa usuário inativo"""
+        usecase = CreateChatUseCase(Mock(spec=ChatInterface))
+
+        with pytest.raises(ValueError, match="not active"):
+            usecase.execute(user.model_copy(update={"is_active": False}))
+
+
+class TestAsyncCreateChatUseCase:
+    """Testes para o caso de uso assíncrono de criação de chat"""
+
+    @pytest.mark.asyncio
+    async def test_creates_chat_without_identity_lookup(self, user):
+        """Testa que nenhuma consulta ao provedor de identidade é feita"""
+        chat_interface = Mock(spec=AsyncChatInterface)
+        chat_interface.create_chat = AsyncMock()
+        usecase = AsyncCreateChatUseCase(chat_interface)
+
+        result = await usecase.execute(user)
+
+        chat_interface.create_chat.assert_awaited_once()
+        assert result.message == "Chat created successfully"
+
+    @pytest.mark.asyncio
+    async def test_missing_principal_is_rejected(self):
+        """Testa a ausência de principal"""
+        usecase = AsyncCreateChatUseCase(Mock(spec=AsyncChatInterface))
+
+        with pytest.raises(ValueError, match="Invalid token"):
+            await usecase.execute(None)
+
+
+class TestAsyncListChatsUseCase:
+    """Testes para o caso de uso de listagem paginada de chats"""
+
+    @pytest.mark.asyncio
+    async def test_caps_page_size_and_forwards_cursor(self, user):
+        """Testa o limite máximo de página e o repasse do cursor"""
+        chat_interface = Mock(spec=AsyncChatInterface)
+        chat_interface.list_chats_page = AsyncMock(return_value=ChatPage())
+        usecase = AsyncListChatsUseCase(chat_interface)
+
+        await usecase.execute(user, limit=10_000, cursor="abc")
+
+        chat_interface.list_chats_page.assert_awaited_once_with(
+            "user_123", settings.chat_list_max_page_size, "abc"
+        )
+
+    @pytest.mark.asyncio
+    async def test_non_positive_page_size_is_rejected(self, user):
+        """Testa tamanho de página inválido"""
+        usecase = AsyncListChatsUseCase(Mock(spec=AsyncChatInterface))
+
+        with pytest.raises(ValidationException):
+            await usecase.execute(user, limit=0)
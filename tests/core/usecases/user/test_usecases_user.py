@@ -1,20 +1,36 @@
 from datetime import datetime
-from unittest.mock import MagicMock, Mock
+from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
 
-from core.dtos.user.user_dtos import CreateRequestUserDto
-from core.entities.user import User
+from core.dtos.user.user_dtos import (
+    CreateRequestUserDto,
+    UserImportCheckpointDto,
+    UserImportFailureDto,
+)
+from core.entities.user import User, UserPage
+from core.exceptions import ServiceUnavailableException, ValidationException
+from core.exceptions.user.exceptions import (
+    UserAlreadyExistsException,
+    UserNotFoundException,
+)
 from core.usecases.user.usecases import (
+    AsyncCreateUserUseCase,
+    AsyncExportUsersUseCase,
+    AsyncGetUserUseCase,
+    AsyncImportUsersUseCase,
+    AsyncListUsersPageUseCase,
+    AsyncUpdateUserUseCase,
     CreateUserUseCase,
     DeleteUserUseCase,
     GetUserUseCase,
+    ListUsersPageUseCase,
     ListUsersUseCase,
     LoginUserUseCase,
     UpdateUserUseCase,
 )
-from interface.auth.auth_interface import AuthInterface
-from interface.user.user_interface import UserInterface
+from interface.auth.auth_interface import AsyncAuthInterface, AuthInterface
+from interface.user.user_interface import AsyncUserInterface, UserInterface
 
 
 class TestCreateUserUseCase:
@@ -81,6 +97,24 @@ class TestCreateUserUseCase:
             create_user_dto.last_name,
         )
 
+    def test_signup_does_not_touch_the_database(
+        self,
+        create_user_use_case,
+        create_user_dto,
+        user_interface_mock,
+        auth_interface_mock,
+    ):
+        """Testa que as etapas separadas usam só a sua dependência"""
+        user = create_user_use_case.signup(create_user_dto)
+
+        assert user.user_id == "auth_user_123"
+        user_interface_mock.create_user.assert_not_called()
+
+        create_user_use_case.store(user)
+
+        user_interface_mock.create_user.assert_called_once_with(user)
+        auth_interface_mock.signup.assert_called_once()
+
     def test_execute_calls_interfaces_in_correct_order(
         self,
         create_user_use_case,
@@ -445,6 +479,34 @@ class TestListUsersUseCase:
         user_interface_mock.list_users.assert_called_once()
 
 
+class TestListUsersPageUseCase:
+    """Testes para o caso de uso de listagem paginada de usuários"""
+
+    @pytest.fixture
+    def user_interface_mock(self):
+        mock = Mock(spec=UserInterface)
+        mock.list_users_page.return_value = UserPage(users=[], next_cursor=None)
+        return mock
+
+    def test_uses_default_page_size_and_forwards_cursor(self, user_interface_mock):
+        """Testa o tamanho padrão e o repasse do cursor"""
+        ListUsersPageUseCase(user_interface_mock).execute(cursor="abc")
+
+        user_interface_mock.list_users_page.assert_called_once_with(25, "abc")
+
+    def test_caps_page_size(self, user_interface_mock):
+        """Testa que o tamanho de página é limitado ao máximo das settings"""
+        ListUsersPageUseCase(user_interface_mock).execute(limit=10_000)
+
+        user_interface_mock.list_users_page.assert_called_once_with(100, None)
+
+    def test_rejects_non_positive_page_size(self, user_interface_mock):
+        """Testa que limit < 1 é rejeitado antes de chegar ao repositório"""
+        with pytest.raises(ValidationException):
+            ListUsersPageUseCase(user_interface_mock).execute(limit=0)
+        user_interface_mock.list_users_page.assert_not_called()
+
+
 class TestUpdateUserUseCase:
     """Testes para o caso de uso de atualização de usuário"""
 
@@ -473,32 +535,34 @@ class TestUpdateUserUseCase:
         self, update_user_use_case, user_interface_mock, sample_user
     ):
         # Arrange
-        user_interface_mock.get_user.return_value = sample_user
+        updated_user = sample_user.model_copy(
+            update={"first_name": "Updated", "last_name": "Name"}
+        )
+        user_interface_mock.update_user.return_value = updated_user
         update_data = {"first_name": "Updated", "last_name": "Name"}
 
         # Act
         result = update_user_use_case.execute("user_123", update_data)
 
         # Assert
-        assert result is not None
         assert result.name == "Updated Name"
-        user_interface_mock.get_user.assert_called_once_with("user_123")
-        user_interface_mock.update_user.assert_called_once()
+        user_interface_mock.update_user.assert_called_once_with(
+            "user_123", update_data
+        )
+        user_interface_mock.get_user.assert_not_called()
 
-    def test_execute_returns_none_when_user_not_found(
+    def test_execute_raises_when_user_not_found(
         self, update_user_use_case, user_interface_mock
     ):
         # Arrange
-        user_interface_mock.get_user.return_value = None
-        update_data = {"name": "Updated Name"}
-
-        # Act
-        result = update_user_use_case.execute("nonexistent_user", update_data)
+        user_interface_mock.update_user.side_effect = UserNotFoundException(
+            identifier="nonexistent_user", field="id"
+        )
 
-        # Assert
-        assert result is None
-        user_interface_mock.get_user.assert_called_once_with("nonexistent_user")
-        user_interface_mock.update_user.assert_not_called()
+        # Act & Assert
+        with pytest.raises(UserNotFoundException):
+            update_user_use_case.execute("nonexistent_user", {"first_name": "New"})
+        user_interface_mock.get_user.assert_not_called()
 
 
 class TestDeleteUserUseCase:
@@ -537,3 +601,254 @@ class TestDeleteUserUseCase:
         # Assert
         assert result is False
         user_interface_mock.delete_user.assert_called_once_with("nonexistent_user")
+
+
+@pytest.fixture
+def async_user_interface():
+    mock = Mock(spec=AsyncUserInterface)
+    for method in (
+        "create_user",
+        "create_users",
+        "get_user",
+        "update_user",
+        "list_users_page",
+    ):
+        setattr(mock, method, AsyncMock())
+    return mock
+
+
+@pytest.fixture
+def async_auth_interface():
+    mock = Mock(spec=AsyncAuthInterface)
+    mock.signup = AsyncMock(return_value={"user_sub": "auth_user_123"})
+    return mock
+
+
+class TestAsyncCreateUserUseCase:
+    """Testes para o caso de uso assíncrono de criação de usuário"""
+
+    @pytest.fixture
+    def create_user_dto(self):
+        return CreateRequestUserDto(
+            email="test@example.com",
+            password="secure_password",
+            first_name="Test",
+            last_name="User",
+        )
+
+    @pytest.mark.asyncio
+    async def test_creates_user_with_auth_sub(
+        self, async_user_interface, async_auth_interface, create_user_dto
+    ):
+        """Testa que o usuário é criado com o sub devolvido pelo Cognito"""
+        async_user_interface.create_user.side_effect = lambda user: user
+        usecase = AsyncCreateUserUseCase(async_user_interface, async_auth_interface)
+
+        user = await usecase.execute(create_user_dto)
+
+        assert user.user_id == "auth_user_123"
+        assert user.slug
+        async_auth_interface.signup.assert_awaited_once_with(
+            "test@example.com", "secure_password", "Test", "User"
+        )
+
+    @pytest.mark.asyncio
+    async def test_propagates_domain_and_saturation_errors(
+        self, async_user_interface, async_auth_interface, create_user_dto
+    ):
+        """Testa que duplicidade e 503 não viram erro genérico"""
+        usecase = AsyncCreateUserUseCase(async_user_interface, async_auth_interface)
+
+        async_user_interface.create_user.side_effect = UserAlreadyExistsException(
+            email="test@example.com"
+        )
+        with pytest.raises(UserAlreadyExistsException):
+            await usecase.execute(create_user_dto)
+
+        async_auth_interface.signup.side_effect = ServiceUnavailableException(
+            service="cognito"
+        )
+        with pytest.raises(ServiceUnavailableException):
+            await usecase.execute(create_user_dto)
+
+
+class TestAsyncGetAndUpdateUserUseCase:
+    """Testes para os casos de uso assíncronos de leitura e atualização"""
+
+    @pytest.mark.asyncio
+    async def test_get_user(self, async_user_interface):
+        """Testa a busca assíncrona por ID"""
+        user = User(userId="user_123", email="test@example.com")
+        async_user_interface.get_user.return_value = user
+
+        assert await AsyncGetUserUseCase(async_user_interface).execute("user_123") is user
+
+    @pytest.mark.asyncio
+    async def test_update_user_applies_changes(self, async_user_interface):
+        """Testa que a atualização parcial vai direto ao repositório"""
+        async_user_interface.update_user.return_value = User(
+            userId="user_123", email="test@example.com", firstName="New"
+        )
+
+        updated = await AsyncUpdateUserUseCase(async_user_interface).execute(
+            "user_123", {"first_name": "New"}
+        )
+
+        assert updated.first_name == "New"
+        async_user_interface.update_user.assert_awaited_once_with(
+            "user_123", {"first_name": "New"}
+        )
+        async_user_interface.get_user.assert_not_awaited()
+
+
+class TestAsyncListUsersPageUseCase:
+    """Testes para o caso de uso assíncrono de listagem paginada"""
+
+    @pytest.mark.asyncio
+    async def test_returns_repository_page(self, async_user_interface):
+        """Testa que a página do repositório é devolvida com o limite aplicado"""
+        page = UserPage(users=[User(userId="user_1")], next_cursor="next")
+        async_user_interface.list_users_page.return_value = page
+
+        result = await AsyncListUsersPageUseCase(async_user_interface).execute(5, None)
+
+        assert result is page
+        async_user_interface.list_users_page.assert_awaited_once_with(5, None)
+
+
+class TestAsyncExportUsersUseCase:
+    """Testes para o caso de uso de exportação de usuários"""
+
+    def test_uses_default_segments(self, async_user_interface):
+        """Testa que o número padrão de segmentos vem das settings"""
+        AsyncExportUsersUseCase(async_user_interface).execute()
+
+        async_user_interface.export_users.assert_called_once_with(4)
+
+    def test_rejects_segments_out_of_range(self, async_user_interface):
+        """Testa que segmentos fora do limite são rejeitados"""
+        for segments in (0, 33):
+            with pytest.raises(ValidationException):
+                AsyncExportUsersUseCase(async_user_interface).execute(segments)
+        async_user_interface.export_users.assert_not_called()
+
+
+async def import_rows(*records):
+    for row, record in enumerate(records, start=1):
+        yield row, record
+
+
+def import_record(email):
+    return {"email": email, "password": "secure_password", "first_name": "Test"}
+
+
+class TestAsyncImportUsersUseCase:
+    """Testes para o caso de uso de importação em massa"""
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_each_batch_and_reports_failures(
+        self, async_user_interface, async_auth_interface
+    ):
+        """Testa lotes gravados em bloco, falhas por linha e checkpoints"""
+        async_auth_interface.signup.side_effect = lambda email, *_: (
+            {"error": "UsernameExistsException"}
+            if email == "taken@example.com"
+            else {"user_sub": f"sub-{email}"}
+        )
+        usecase = AsyncImportUsersUseCase(
+            async_user_interface, async_auth_interface, batch_size=2
+        )
+        rows = import_rows(
+            import_record("a@example.com"),
+            ValueError("bad line"),
+            import_record("taken@example.com"),
+            {"email": "not-an-email"},
+            import_record("b@example.com"),
+        )
+
+        events = [event async for event in usecase.execute(rows)]
+
+        failures = [e for e in events if isinstance(e, UserImportFailureDto)]
+        checkpoints = [e for e in events if isinstance(e, UserImportCheckpointDto)]
+        assert [(f.row, f.error_code) for f in failures] == [
+            (2, "INVALID_ROW"),
+            (3, "USER_AUTH_CREATION_ERROR"),
+            (4, "INVALID_ROW"),
+        ]
+        assert [(c.next_row, c.imported, c.failed) for c in checkpoints] == [
+            (3, 1, 1),
+            (5, 1, 3),
+            (6, 2, 3),
+            (6, 2, 3),
+        ]
+        assert checkpoints[-1].done
+        created = [
+            [user.user_id for user in call.args[0]]
+            for call in async_user_interface.create_users.await_args_list
+        ]
+        assert created == [["sub-a@example.com"], ["sub-b@example.com"]]
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_start_row(
+        self, async_user_interface, async_auth_interface
+    ):
+        """Testa que linhas antes de start_row não são reprocessadas"""
+        usecase = AsyncImportUsersUseCase(async_user_interface, async_auth_interface)
+        rows = import_rows(
+            import_record("a@example.com"), import_record("b@example.com")
+        )
+
+        events = [event async for event in usecase.execute(rows, start_row=2)]
+
+        async_auth_interface.signup.assert_awaited_once()
+        assert events[-1] == UserImportCheckpointDto(
+            next_row=3, imported=1, failed=0, done=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_batch_write_failure_fails_its_rows(
+        self, async_user_interface, async_auth_interface
+    ):
+        """Testa que uma falha na gravação do lote vira falha de cada linha"""
+        async_user_interface.create_users.side_effect = ServiceUnavailableException(
+            service="dynamodb", reason="unprocessed_items"
+        )
+        usecase = AsyncImportUsersUseCase(async_user_interface, async_auth_interface)
+        rows = import_rows(
+            import_record("a@example.com"), import_record("b@example.com")
+        )
+
+        events = [event async for event in usecase.execute(rows)]
+
+        assert [event.row for event in events[:2]] == [1, 2]
+        assert events[-1].imported == 0 and events[-1].failed == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_write_failure_rolls_back_signups(
+        self, async_user_interface, async_auth_interface
+    ):
+        """Testa que os cadastros do lote são desfeitos se a gravação falha"""
+        async_user_interface.create_users.side_effect = ServiceUnavailableException(
+            service="dynamodb", reason="unprocessed_items"
+        )
+        async_auth_interface.signup.side_effect = lambda email, *_: {
+            "user_sub": f"sub-{email}"
+        }
+        async_auth_interface.delete_user = AsyncMock(
+            side_effect=lambda email: email == "a@example.com"
+        )
+        usecase = AsyncImportUsersUseCase(async_user_interface, async_auth_interface)
+        rows = import_rows(
+            import_record("a@example.com"), import_record("b@example.com")
+        )
+
+        events = [event async for event in usecase.execute(rows)]
+
+        deleted = [
+            call.args[0] for call in async_auth_interface.delete_user.await_args_list
+        ]
+        assert sorted(deleted) == ["a@example.com", "b@example.com"]
+        assert [(event.row, event.error_code) for event in events[:2]] == [
+            (1, "SERVICE_UNAVAILABLE"),
+            (2, "USER_IMPORT_AUTH_ORPHANED"),
+        ]
@@ -0,0 +1,131 @@
+"""
+Testes para os bulkheads de dependências síncronas.
+Tests for the synchronous dependency bulkheads.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.exceptions import ServiceUnavailableException, TimeoutException
+from infraestructure.bulkhead import (
+    BULKHEADS,
+    DYNAMODB,
+    Bulkhead,
+    bulkheads_snapshot,
+    get_bulkhead,
+    run_in_bulkhead,
+)
+from infraestructure.telemetry.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry()
+
+
+def sleeper(delay: float, value: str = "ok"):
+    def call():
+        time.sleep(delay)
+        return value
+
+    return call
+
+
+class TestBulkhead:
+    """Testes para o Bulkhead"""
+
+    @pytest.mark.asyncio
+    async def test_runs_on_named_threads(self, metrics):
+        """Testa que a chamada roda no pool nomeado e devolve o resultado"""
+        bulkhead = Bulkhead("dynamodb", 2, 4, 5.0, metrics=metrics)
+
+        thread_name = await bulkhead.run(lambda: threading.current_thread().name)
+
+        assert thread_name.startswith("bulkhead-dynamodb")
+        assert bulkhead.inflight == 0
+        assert metrics.snapshot()["summaries"]["bulkhead.dynamodb.latency_ms"]["count"] == 1
+        bulkhead.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_passes_arguments(self, metrics):
+        """Testa o repasse de args e kwargs para a função"""
+        bulkhead = Bulkhead("s3", 1, 1, 5.0, metrics=metrics)
+
+        result = await bulkhead.run(lambda a, b=0: a + b, 1, b=2)
+
+        assert result == 3
+        bulkhead.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_saturation_fails_fast(self, metrics):
+        """Testa que acima de workers + fila a chamada recebe 503 na hora"""
+        bulkhead = Bulkhead("s3", 1, 1, 5.0, metrics=metrics)
+
+        results = await asyncio.gather(
+            *(bulkhead.run(sleeper(0.2)) for _ in range(3)), return_exceptions=True
+        )
+
+        rejected = [r for r in results if isinstance(r, ServiceUnavailableException)]
+        assert len(rejected) == 1
+        assert metrics.counter("bulkhead.s3.rejected") == 1
+        bulkhead.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_slot_until_thread_finishes(self, metrics):
+        """Testa o 504 e a liberação do slot só ao fim da thread"""
+        bulkhead = Bulkhead("dynamodb", 1, 0, 0.05, metrics=metrics)
+
+        with pytest.raises(TimeoutException):
+            await bulkhead.run(sleeper(0.2), operation="get_item")
+        assert bulkhead.inflight == 1
+        assert metrics.gauge("bulkhead.dynamodb.saturation") == 1.0
+
+        with pytest.raises(ServiceUnavailableException):
+            await bulkhead.run(sleeper(0.0))
+
+        await asyncio.sleep(0.3)
+        assert bulkhead.inflight == 0
+        assert metrics.counter("bulkhead.dynamodb.timeouts") == 1
+        bulkhead.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_exception_propagates_and_releases(self, metrics):
+        """Testa que erros da função sobem e o slot é liberado"""
+        bulkhead = Bulkhead("dynamodb", 1, 0, 5.0, metrics=metrics)
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await bulkhead.run(fail)
+        await asyncio.sleep(0)
+        assert bulkhead.inflight == 0
+        bulkhead.shutdown()
+
+
+class TestSharedBulkheads:
+    """Testes para os bulkheads compartilhados"""
+
+    def test_get_bulkhead_is_shared_and_configured(self):
+        """Testa que cada nome tem um único pool configurado pelas settings"""
+        bulkhead = get_bulkhead(DYNAMODB)
+
+        assert get_bulkhead(DYNAMODB) is bulkhead
+        assert bulkhead.capacity == bulkhead.max_workers + bulkhead.max_queue
+
+    def test_unknown_bulkhead(self):
+        """Testa que nomes desconhecidos são rejeitados"""
+        with pytest.raises(ValueError):
+            get_bulkhead("postgres")
+
+    @pytest.mark.asyncio
+    async def test_run_in_bulkhead(self):
+        """Testa o atalho awaitable"""
+        assert await run_in_bulkhead(DYNAMODB, lambda: "item") == "item"
+
+    def test_snapshot_lists_every_bulkhead(self):
+        """Testa o snapshot exposto em /health/metrics"""
+        assert set(bulkheads_snapshot()) == set(BULKHEADS)
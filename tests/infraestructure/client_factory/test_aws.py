@@ -0,0 +1,75 @@
+"""
+Testes para a fábrica de clientes AWS.
+Tests for the AWS client factory.
+"""
+
+import threading
+
+import pytest
+
+from infraestructure.client_factory.aws import AWSClientFactory, client_config
+
+
+@pytest.fixture
+def factory():
+    AWSClientFactory.clear()
+    yield AWSClientFactory(region_name="us-east-1")
+    AWSClientFactory.clear()
+
+
+class TestAWSClientFactory:
+    """Testes para o AWSClientFactory"""
+
+    def test_clients_are_cached_across_instances(self, factory):
+        """Testa que o cliente é criado uma vez por serviço e região"""
+        client = factory.dynamo()
+
+        assert factory.dynamo() is client
+        assert AWSClientFactory(region_name="us-east-1").dynamo() is client
+        assert factory.cognito() is not client
+
+    def test_regions_are_cached_separately(self, factory):
+        """Testa que regiões diferentes usam clientes diferentes"""
+        other = AWSClientFactory(region_name="sa-east-1")
+
+        assert other.s3() is not factory.s3()
+        assert other.s3().meta.region_name == "sa-east-1"
+
+    def test_client_uses_shared_config(self, factory):
+        """Testa pool, retries, timeouts e keepalive vindos das settings"""
+        config = factory.dynamo().meta.config
+        expected = client_config()
+
+        assert config.max_pool_connections == expected.max_pool_connections
+        assert config.retries["mode"] == expected.retries["mode"]
+        assert config.connect_timeout == expected.connect_timeout
+        assert config.read_timeout == expected.read_timeout
+        assert config.tcp_keepalive == expected.tcp_keepalive
+
+    def test_concurrent_creation_builds_one_client(self, factory):
+        """Testa que threads concorrentes recebem o mesmo cliente"""
+        clients = []
+        threads = [
+            threading.Thread(target=lambda: clients.append(factory.s3()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(client) for client in clients}) == 1
+
+    def test_resources_are_cached_per_thread(self, factory):
+        """Testa que resources (não thread-safe) são cacheados por thread"""
+        resource = factory.resource("dynamodb")
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(factory.resource("dynamodb"))
+        )
+        thread.start()
+        thread.join()
+
+        assert factory.resource("dynamodb") is resource
+        assert other[0] is not resource
+        assert factory.dynamo_table("users").name == "users"
@@ -0,0 +1,69 @@
+"""
+Testes para o pool de conexões assíncrono instrumentado.
+Tests for the instrumented async connection pool.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from configs.load_env import settings
+from infraestructure.database.config import DatabaseConfig
+from infraestructure.database.pool import InstrumentedAsyncPool
+from infraestructure.telemetry.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry()
+
+
+def make_pool(metrics, pool_size=1, max_overflow=1, timeout=0.05):
+    pool = InstrumentedAsyncPool(
+        MagicMock, pool_size=pool_size, max_overflow=max_overflow, timeout=timeout
+    )
+    pool.metrics = metrics
+    return pool
+
+
+class TestInstrumentedAsyncPool:
+    """Testes para o InstrumentedAsyncPool"""
+
+    @pytest.mark.asyncio
+    async def test_tracks_utilization_and_checkout_wait(self, metrics):
+        """Testa os gauges de ocupação e o sumário de espera por conexão"""
+        pool = make_pool(metrics)
+
+        first = await greenlet_spawn(pool.connect)
+        second = await greenlet_spawn(pool.connect)
+        assert metrics.gauge("db_pool.utilization") == 1.0
+
+        first.close()
+        second.close()
+        assert metrics.gauge("db_pool.checked_out") == 0
+        assert metrics.snapshot()["summaries"]["db_pool.checkout_wait_ms"]["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_counts_checkout_timeouts(self, metrics):
+        """Testa que a espera além do pool_timeout é contada e propagada"""
+        pool = make_pool(metrics, max_overflow=0)
+        held = await greenlet_spawn(pool.connect)
+
+        with pytest.raises(exc.TimeoutError):
+            await greenlet_spawn(pool.connect)
+
+        assert metrics.counter("db_pool.checkout_timeouts") == 1
+        held.close()
+
+
+def test_async_engine_uses_configured_queue_pool():
+    """Testa que o engine assíncrono usa o pool configurado nas settings"""
+    engine = DatabaseConfig().get_async_engine()
+
+    pool = engine.sync_engine.pool
+    assert isinstance(pool, InstrumentedAsyncPool)
+    assert pool.size() == settings.db_pool_size
+    assert pool._max_overflow == settings.db_max_overflow
+    assert pool._pre_ping is settings.db_pool_pre_ping
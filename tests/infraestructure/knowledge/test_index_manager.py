@@ -0,0 +1,384 @@
+"""
+Testes para o gerenciamento de índices da base de conhecimento.
+Tests for the knowledge base index management.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from agno.vectordb.pgvector import HNSW, Ivfflat
+
+from core.exceptions import DatabaseException
+from infraestructure.knowledge.index_manager import KnowledgeIndexManager
+from infraestructure.knowledge.vector_store import (
+    BATCH,
+    COMPLEX,
+    INTERACTIVE,
+    KnowledgeVectorDb,
+    VectorLayout,
+    build_vector_index,
+    get_search_profile,
+    get_vector_layout,
+)
+
+
+@pytest.fixture
+def mock_settings():
+    with patch("infraestructure.knowledge.index_manager.settings") as index_settings:
+        with patch("infraestructure.knowledge.vector_store.settings") as store_settings:
+            for mocked in (index_settings, store_settings):
+                mocked.knowledge_index_type = "hnsw"
+                mocked.knowledge_hnsw_m = 16
+                mocked.knowledge_hnsw_ef_construction = 200
+                mocked.knowledge_ivfflat_lists = 0
+                mocked.knowledge_ef_search_interactive = 40
+                mocked.knowledge_ef_search_complex = 100
+                mocked.knowledge_ef_search_batch = 200
+                mocked.knowledge_probes_interactive = 10
+                mocked.knowledge_probes_complex = 20
+                mocked.knowledge_probes_batch = 40
+                mocked.knowledge_vector_precision = "full"
+                mocked.knowledge_embedding_dimensions = 1536
+                mocked.knowledge_tenant_index_threshold = 10_000
+            yield store_settings
+
+
+class TestSearchProfiles:
+    """Testes para os perfis de busca por classe de requisição"""
+
+    def test_profiles_trade_latency_for_recall(self, mock_settings):
+        """Testa que classes mais pesadas usam ef_search/probes maiores"""
+        interactive = get_search_profile(INTERACTIVE)
+        complex_ = get_search_profile(COMPLEX)
+        batch = get_search_profile(BATCH)
+
+        assert interactive.ef_search < complex_.ef_search < batch.ef_search
+        assert interactive.probes < complex_.probes < batch.probes
+
+    def test_unknown_profile_raises(self, mock_settings):
+        """Testa classe de requisição desconhecida"""
+        with pytest.raises(ValueError):
+            get_search_profile("unknown")
+
+    def test_build_hnsw_index_uses_profile_ef_search(self, mock_settings):
+        """Testa que o índice HNSW recebe o ef_search do perfil"""
+        index = build_vector_index(get_search_profile(COMPLEX))
+
+        assert isinstance(index, HNSW)
+        assert index.ef_search == 100
+        assert index.name == "agent_knowledge_base_hnsw_index"
+
+    def test_build_ivfflat_index_uses_profile_probes(self, mock_settings):
+        """Testa que o índice IVFFlat recebe os probes do perfil"""
+        mock_settings.knowledge_index_type = "ivfflat"
+
+        index = build_vector_index(get_search_profile(BATCH))
+
+        assert isinstance(index, Ivfflat)
+        assert index.probes == 40
+        assert index.dynamic_lists is True
+
+
+class TestKnowledgeVectorDb:
+    """Testes para a criação da tabela de conhecimento"""
+
+    @pytest.fixture
+    def vector_db(self):
+        embedder = MagicMock(dimensions=3)
+        embedder.get_embedding.return_value = [0.1, 0.2, 0.3]
+        vector_db = KnowledgeVectorDb(
+            table_name="agent_knowledge_base",
+            schema="ai",
+            db_engine=MagicMock(),
+            embedder=embedder,
+            vector_index=HNSW(name="agent_knowledge_base_hnsw_index", ef_search=10),
+            layout=VectorLayout(precision="full", dimensions=3),
+        )
+        vector_db.Session = MagicMock()
+        return vector_db
+
+    @pytest.fixture
+    def session(self, vector_db):
+        session = vector_db.Session.return_value.__enter__.return_value
+        session.execute.return_value.mappings.return_value.all.return_value = [
+            {
+                "id": "doc-1",
+                "name": "guide",
+                "meta_data": {"source": "docs"},
+                "content": "hnsw tuning guide",
+                "usage": None,
+            }
+        ]
+        return session
+
+    def test_new_table_gets_tenant_column(self, vector_db):
+        """Testa que a tabela criada pelo agno já recebe a coluna user_id"""
+        session = vector_db.Session.return_value.__enter__.return_value
+        with patch.object(
+            KnowledgeVectorDb, "table_exists", return_value=False
+        ), patch("agno.vectordb.pgvector.PgVector.create") as mock_create:
+            vector_db.create()
+
+        mock_create.assert_called_once()
+        statements = [str(call.args[0]) for call in session.execute.call_args_list]
+        assert "ADD COLUMN IF NOT EXISTS user_id text GENERATED ALWAYS" in statements[0]
+        assert '"agent_knowledge_base_user_id_index"' in statements[1]
+
+    def test_new_table_uses_layout_column_type(self, vector_db):
+        """Testa que no layout half a coluna já nasce halfvec"""
+        vector_db.layout = VectorLayout(precision="half", dimensions=3)
+        session = vector_db.Session.return_value.__enter__.return_value
+        with patch.object(
+            KnowledgeVectorDb, "table_exists", return_value=False
+        ), patch("agno.vectordb.pgvector.PgVector.create"):
+            vector_db.create()
+
+        statements = [str(call.args[0]) for call in session.execute.call_args_list]
+        assert "ALTER COLUMN embedding TYPE halfvec(3)" in statements[0]
+        assert "ADD COLUMN IF NOT EXISTS user_id" in statements[1]
+
+    def test_existing_table_is_left_alone(self, vector_db):
+        """Testa que uma tabela existente não é alterada"""
+        with patch.object(
+            KnowledgeVectorDb, "table_exists", return_value=True
+        ), patch("agno.vectordb.pgvector.PgVector.create") as mock_create:
+            vector_db.create()
+
+        mock_create.assert_not_called()
+        vector_db.Session.assert_not_called()
+
+    def test_hybrid_search_rescores_index_candidates(
+        self, mock_settings, vector_db, session
+    ):
+        """Testa que a busca híbrida une candidatos do ANN e do GIN antes de pontuar"""
+        mock_settings.knowledge_hybrid_candidate_factor = 4
+
+        documents = vector_db.hybrid_search("hnsw tuning", limit=5)
+
+        statements = [str(call.args[0]) for call in session.execute.call_args_list]
+        sql, params = session.execute.call_args.args
+        assert statements[0] == "SET LOCAL hnsw.ef_search = 20"
+        assert (
+            "ORDER BY embedding <=> CAST(:embedding AS vector(3)) LIMIT :candidates"
+            in str(sql)
+        )
+        assert ") UNION (" in str(sql)
+        assert (
+            "to_tsvector('english', content) @@ websearch_to_tsquery('english', :query)"
+            in str(sql)
+        )
+        assert str(sql).endswith("DESC LIMIT :limit")
+        assert params["candidates"] == 20
+        assert params["embedding"] == "[0.1,0.2,0.3]"
+        assert documents[0].content == "hnsw tuning guide"
+
+    def test_hybrid_search_rescores_binary_candidates(
+        self, mock_settings, vector_db, session
+    ):
+        """Testa que o layout binário busca por Hamming e repontua pela distância exata"""
+        mock_settings.knowledge_binary_rescore_factor = 8
+        vector_db.layout = VectorLayout(precision="binary", dimensions=3)
+
+        vector_db.hybrid_search("hnsw", limit=5)
+
+        statements = [str(call.args[0]) for call in session.execute.call_args_list]
+        sql, params = session.execute.call_args.args
+        assert statements[0] == "SET LOCAL hnsw.ef_search = 40"
+        assert "(binary_quantize(embedding)::bit(3)) <~>" in str(sql)
+        assert "(1 + (embedding <=> CAST(:embedding AS vector(3))))" in str(sql)
+        assert params["candidates"] == 40
+
+    def test_hybrid_search_applies_filters_to_both_candidate_sets(
+        self, mock_settings, vector_db, session
+    ):
+        """Testa que os filtros de metadados restringem ANN e GIN"""
+        mock_settings.knowledge_hybrid_candidate_factor = 4
+
+        vector_db.hybrid_search("hnsw", filters={"source": "docs"})
+
+        sql, params = session.execute.call_args.args
+        assert str(sql).count("meta_data @> CAST(:filters AS jsonb)") == 2
+        assert params["filters"] == '{"source": "docs"}'
+
+    def test_hybrid_search_errors_return_no_documents(self, mock_settings, vector_db):
+        """Testa que falhas no banco não derrubam o agente"""
+        mock_settings.knowledge_hybrid_candidate_factor = 4
+        vector_db.Session.side_effect = RuntimeError("connection refused")
+
+        assert vector_db.hybrid_search("hnsw") == []
+
+
+class TestKnowledgeIndexManager:
+    """Testes para o KnowledgeIndexManager"""
+
+    @pytest.fixture
+    def engine(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def manager(self, mock_settings, engine):
+        return KnowledgeIndexManager(engine=engine)
+
+    def test_invalid_index_type(self, mock_settings, engine):
+        """Testa tipo de índice não suportado"""
+        with pytest.raises(ValueError):
+            KnowledgeIndexManager(engine=engine, index_type="diskann")
+
+    @pytest.mark.parametrize(
+        "row_count, expected",
+        [(0, 10), (5_000, 10), (100_000, 100), (1_000_000, 1000), (4_000_000, 2000)],
+    )
+    def test_ivfflat_lists(self, mock_settings, row_count, expected):
+        """Testa o número de listas derivado do volume da tabela"""
+        assert KnowledgeIndexManager.ivfflat_lists(row_count) == expected
+
+    def test_hnsw_index_sql_is_concurrent(self, manager):
+        """Testa SQL do índice HNSW"""
+        sql = manager.vector_index_sql(manager.vector_index_name)
+
+        assert "CREATE INDEX CONCURRENTLY IF NOT EXISTS" in sql
+        assert '"agent_knowledge_base_hnsw_index"' in sql
+        assert "USING hnsw (embedding vector_cosine_ops)" in sql
+        assert "m = 16, ef_construction = 200" in sql
+
+    def test_ivfflat_index_sql(self, mock_settings, engine):
+        """Testa SQL do índice IVFFlat"""
+        manager = KnowledgeIndexManager(engine=engine, index_type="ivfflat")
+
+        sql = manager.vector_index_sql(manager.vector_index_name, row_count=250_000)
+
+        assert "USING ivfflat (embedding vector_cosine_ops)" in sql
+        assert "lists = 250" in sql
+
+    def test_fulltext_index_matches_search_expression(self, manager):
+        """Testa que o GIN usa a mesma expressão da busca híbrida"""
+        sql = manager.fulltext_index_sql()
+
+        assert "USING GIN (to_tsvector('english', content))" in sql
+        assert "CONCURRENTLY" in sql
+
+    def test_create_indexes_skips_missing_table(self, manager):
+        """Testa que nada é criado se a tabela ainda não existe"""
+        with patch.object(manager, "table_exists", return_value=False):
+            assert manager.create_indexes() == {}
+
+    def test_create_indexes_runs_in_autocommit(self, manager, engine):
+        """Testa criação dos índices em autocommit"""
+        connection = MagicMock()
+        engine.connect.return_value.execution_options.return_value.__enter__.return_value = (
+            connection
+        )
+
+        with patch.object(manager, "table_exists", return_value=True), patch.object(
+            manager, "row_count", return_value=1000
+        ), patch.object(manager, "index_status", return_value=[]):
+            result = manager.create_indexes()
+
+        engine.connect.return_value.execution_options.assert_called_once_with(
+            isolation_level="AUTOCOMMIT"
+        )
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        assert statements[0] == "SET maintenance_work_mem = '2GB'"
+        assert any("USING hnsw" in statement for statement in statements)
+        assert any("USING GIN" in statement for statement in statements)
+        assert result["vector_index"] == "agent_knowledge_base_hnsw_index"
+
+    def test_rebuild_swaps_index(self, manager, engine):
+        """Testa que o rebuild cria o novo índice antes de remover o antigo"""
+        connection = MagicMock()
+        engine.connect.return_value.execution_options.return_value.__enter__.return_value = (
+            connection
+        )
+
+        with patch.object(manager, "row_count", return_value=1000), patch.object(
+            manager, "index_status", return_value=[]
+        ):
+            manager.rebuild_vector_index()
+
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        create_position = next(
+            i for i, s in enumerate(statements) if "_hnsw_index_rebuild" in s
+        )
+        drop_position = next(i for i, s in enumerate(statements) if "DROP INDEX" in s)
+        assert create_position < drop_position
+        assert "RENAME TO" in statements[-1]
+
+    def test_create_indexes_wraps_errors(self, manager):
+        """Testa que falhas viram DatabaseException"""
+        with patch.object(manager, "table_exists", side_effect=Exception("boom")):
+            with pytest.raises(DatabaseException) as exc_info:
+                manager.create_indexes()
+
+        assert exc_info.value.error_code == "KNOWLEDGE_INDEX_CREATION_ERROR"
+
+
+class TestVectorLayouts:
+    """Testes para os layouts de precisão reduzida"""
+
+    def test_unknown_precision_raises(self, mock_settings):
+        """Testa precisão não suportada"""
+        with pytest.raises(ValueError):
+            get_vector_layout("int8")
+
+    def test_half_layout_uses_halfvec(self):
+        """Testa o layout halfvec"""
+        layout = VectorLayout(precision="half", dimensions=1536)
+
+        assert layout.column_type == "halfvec(1536)"
+        assert layout.operator_class == "halfvec_cosine_ops"
+        assert layout.index_order_expression() == (
+            "embedding <=> CAST(:embedding AS halfvec(1536))"
+        )
+        assert layout.rescored is False
+
+    def test_binary_layout_keeps_full_vectors_for_rescoring(self):
+        """Testa o layout binário com rescoring"""
+        layout = VectorLayout(precision="binary", dimensions=1536)
+
+        assert layout.column_type == "vector(1536)"
+        assert layout.operator_class == "bit_hamming_ops"
+        assert "binary_quantize(embedding)::bit(1536)" in layout.index_expression
+        assert "<~>" in layout.index_order_expression()
+        assert layout.distance_expression() == (
+            "embedding <=> CAST(:embedding AS vector(1536))"
+        )
+        assert layout.rescored is True
+
+    def test_binary_index_sql(self, mock_settings):
+        """Testa SQL do índice sobre a quantização binária"""
+        manager = KnowledgeIndexManager(
+            engine=MagicMock(), layout=VectorLayout(precision="binary", dimensions=8)
+        )
+
+        sql = manager.vector_index_sql(manager.vector_index_name)
+
+        assert "USING hnsw ((binary_quantize(embedding)::bit(8)) bit_hamming_ops)" in sql
+
+    def test_convert_precision_rewrites_column_when_type_changes(self, mock_settings):
+        """Testa a conversão de vector para halfvec"""
+        engine = MagicMock()
+        connection = MagicMock()
+        engine.begin.return_value.__enter__.return_value = connection
+        manager = KnowledgeIndexManager(
+            engine=engine, layout=VectorLayout(precision="half", dimensions=1536)
+        )
+        indexes = [
+            {
+                "name": "agent_knowledge_base_hnsw_index",
+                "definition": "CREATE INDEX ... USING hnsw (embedding vector_cosine_ops)",
+            }
+        ]
+
+        with patch.object(manager, "column_type", return_value="vector(1536)"), patch.object(
+            manager, "index_status", return_value=indexes
+        ), patch.object(manager, "rebuild_vector_index") as mock_rebuild, patch.object(
+            manager, "tenant_row_counts", return_value={"big": 50_000}
+        ), patch.object(
+            manager, "create_tenant_index"
+        ) as mock_tenant:
+            assert manager.convert_precision() == "halfvec(1536)"
+
+        alter = str(connection.execute.call_args.args[0])
+        assert "TYPE halfvec(1536) USING embedding::halfvec(1536)" in alter
+        mock_rebuild.assert_called_once()
+        mock_tenant.assert_called_once_with("big", 50_000)
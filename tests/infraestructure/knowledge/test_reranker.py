@@ -0,0 +1,197 @@
+"""
+Testes para o reranker BM25.
+Tests for the BM25 reranker.
+"""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from agno.document import Document
+
+from infraestructure.knowledge.reranker import (
+    CONTEXT_TOKENS,
+    TOKENS_SAVED,
+    BM25Reranker,
+    TermStatisticsIndex,
+    tokenize,
+)
+from infraestructure.knowledge.retriever import KnowledgeRetriever
+from infraestructure.telemetry.metrics import MetricsRegistry
+
+
+def word_counter(text: str) -> int:
+    return len(text.split())
+
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def reranker(metrics):
+    return BM25Reranker(
+        token_budget=1000,
+        index=TermStatisticsIndex(max_chunks=100, token_counter=word_counter),
+        metrics=metrics,
+    )
+
+
+class TestTermStatisticsIndex:
+    """Testes para o índice de estatísticas de termos"""
+
+    def test_tokenize_drops_stopwords_and_case(self):
+        """Testa a tokenização léxica"""
+        assert tokenize("What is the HNSW index?") == ["hnsw", "index"]
+
+    def test_chunk_is_cached(self):
+        """Testa que o mesmo conteúdo é tokenizado uma única vez"""
+        counter = Mock(side_effect=word_counter)
+        index = TermStatisticsIndex(token_counter=counter)
+
+        first = index.chunk("vector index build")
+        second = index.chunk("vector index build")
+
+        assert first is second
+        counter.assert_called_once()
+        assert len(index) == 1
+
+    def test_eviction_updates_document_frequency(self):
+        """Testa que a evicção LRU mantém as frequências consistentes"""
+        index = TermStatisticsIndex(max_chunks=2, token_counter=word_counter)
+        index.chunk("alpha beta")
+        index.chunk("alpha gamma")
+        index.chunk("delta")
+
+        alpha = index.vocabulary["alpha"]
+        assert len(index) == 2
+        assert index._document_frequency[alpha] == 1
+        assert index.average_length == pytest.approx(1.5)
+
+    def test_vocabulary_is_bounded(self):
+        """Testa que o vocabulário não cresce com termos de chunks evictados"""
+        index = TermStatisticsIndex(max_chunks=2, token_counter=word_counter, max_terms=4)
+        for position in range(50):
+            index.chunk(f"term{position} shared")
+
+        assert len(index) == 2
+        assert len(index.vocabulary) <= 2 * index.max_terms
+        assert index.generation > 0
+        assert "term0" not in index.vocabulary
+        shared = index.vocabulary["shared"]
+        assert index._document_frequency[shared] == 2
+
+    def test_live_terms_cap_evicts_chunks(self):
+        """Testa que o limite de termos vivos evicta os chunks mais antigos"""
+        index = TermStatisticsIndex(max_chunks=100, token_counter=word_counter, max_terms=3)
+        index.chunk("alpha beta")
+        index.chunk("gamma delta")
+
+        assert len(index) == 1
+        assert index._document_frequency[index.vocabulary["alpha"]] == 0
+        assert index._document_frequency[index.vocabulary["gamma"]] == 1
+
+    def test_compaction_keeps_scores(self, metrics):
+        """Testa que a renumeração dos IDs preserva a pontuação"""
+        index = TermStatisticsIndex(max_chunks=3, token_counter=word_counter, max_terms=6)
+        reranker = BM25Reranker(token_budget=1000, index=index, metrics=metrics)
+        contents = ["hnsw index build", "vector index", "unrelated text"]
+        before = reranker.score("hnsw index", contents)
+        for position in range(20):
+            index.chunk(f"noise{position}")
+        after = reranker.score("hnsw index", contents)
+
+        assert index.generation > 0
+        np.testing.assert_allclose(after, before)
+
+
+class TestBM25Reranker:
+    """Testes para o BM25Reranker"""
+
+    def test_scores_prefer_lexical_matches(self, reranker):
+        """Testa que documentos com os termos da consulta pontuam mais"""
+        scores = reranker.score(
+            "hnsw ef_search",
+            [
+                "cooking recipes and pasta",
+                "hnsw graphs use ef_search at query time",
+                "hnsw index",
+            ],
+        )
+
+        assert scores[0] == 0
+        assert scores[1] > scores[2] > 0
+
+    def test_rare_terms_weigh_more(self, reranker):
+        """Testa o peso do IDF"""
+        contents = [f"index common {i}" for i in range(5)] + ["index rare"]
+        scores = reranker.score("rare common", contents)
+
+        assert np.argmax(scores) == 5
+
+    def test_rerank_drops_non_matching_chunks(self, reranker):
+        """Testa o descarte de candidatos sem correspondência léxica"""
+        documents = [
+            Document(content="weather is sunny today"),
+            Document(content="pgvector hnsw index tuning"),
+            Document(content="football results"),
+        ]
+
+        result = reranker.rerank("hnsw tuning", documents, top_k=3)
+
+        assert [d.content for d in result] == ["pgvector hnsw index tuning"]
+
+    def test_rerank_keeps_vector_order_without_matches(self, reranker):
+        """Testa que sem correspondências a ordem vetorial é preservada"""
+        documents = [Document(content="first chunk"), Document(content="second chunk")]
+
+        result = reranker.rerank("unrelated words", documents, top_k=1)
+
+        assert [d.content for d in result] == ["first chunk"]
+
+    def test_rerank_respects_token_budget(self, reranker, metrics):
+        """Testa o corte pelo orçamento de tokens"""
+        documents = [
+            Document(content="hnsw " + "filler " * 50),
+            Document(content="hnsw recall " + "filler " * 20),
+            Document(content="hnsw recall short"),
+        ]
+
+        result = reranker.rerank("hnsw recall", documents, top_k=3, token_budget=30)
+
+        used = sum(word_counter(d.content) for d in result)
+        assert used <= 30
+        assert result[0].content.startswith("hnsw recall")
+        assert metrics.counter(TOKENS_SAVED) > 0
+        assert metrics.snapshot()["summaries"][CONTEXT_TOKENS]["count"] == 1
+
+    def test_first_chunk_always_kept(self, reranker):
+        """Testa que o melhor chunk é mantido mesmo acima do orçamento"""
+        documents = [Document(content="hnsw " * 100)]
+
+        assert len(reranker.rerank("hnsw", documents, token_budget=10)) == 1
+
+
+class TestRetrieverWithReranker:
+    """Testes para o retriever com reranking"""
+
+    @pytest.mark.asyncio
+    async def test_retriever_overfetches_and_trims(self, reranker, metrics):
+        """Testa que o retriever busca mais candidatos e devolve top_k"""
+        knowledge = Mock()
+        knowledge.num_documents = 2
+        knowledge.search.return_value = [
+            Document(content=f"chunk {i} about hnsw" if i % 2 else f"chunk {i}")
+            for i in range(6)
+        ]
+        retriever = KnowledgeRetriever(reranker=reranker, overfetch=3, metrics=metrics)
+        retriever._knowledge = knowledge
+
+        result = await retriever(query="hnsw")
+
+        knowledge.search.assert_called_once_with(
+            query="hnsw", num_documents=6, filters=None
+        )
+        assert len(result) == 2
+        assert all("hnsw" in document["content"] for document in result)
@@ -0,0 +1,106 @@
+"""
+Testes para o retriever lazy e sensível à intenção.
+Tests for the lazy, intent-aware retriever.
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from infraestructure.knowledge.retriever import (
+    LATENCY_SAVED_MS,
+    RETRIEVAL_LATENCY_MS,
+    RETRIEVALS_AVOIDED,
+    RETRIEVALS_PERFORMED,
+    KnowledgeRetriever,
+)
+from infraestructure.telemetry.metrics import MetricsRegistry
+
+
+class TestKnowledgeRetriever:
+    """Testes para o KnowledgeRetriever"""
+
+    @pytest.fixture
+    def metrics(self):
+        return MetricsRegistry()
+
+    @pytest.fixture
+    def knowledge(self):
+        document = Mock()
+        document.to_dict.return_value = {"content": "pgvector"}
+        knowledge = Mock()
+        knowledge.num_documents = 5
+        knowledge.search.return_value = [document]
+        return knowledge
+
+    @pytest.mark.asyncio
+    async def test_knowledge_is_resolved_lazily(self, metrics, knowledge):
+        """Testa que a base de conhecimento só é criada na primeira busca"""
+        with patch(
+            "infraestructure.knowledge.retriever.get_knowledge_base",
+            return_value=knowledge,
+        ) as mock_get:
+            retriever = KnowledgeRetriever(request_class="complex", metrics=metrics)
+            mock_get.assert_not_called()
+
+            result = await retriever(query="what is hnsw?")
+
+        mock_get.assert_called_once_with("complex")
+        knowledge.search.assert_called_once_with(
+            query="what is hnsw?", num_documents=5, filters=None
+        )
+        assert result == [{"content": "pgvector"}]
+        assert metrics.counter(RETRIEVALS_PERFORMED) == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_retriever_never_touches_vector_store(self, metrics):
+        """Testa que retrievals desabilitados não acessam o vector store"""
+        with patch(
+            "infraestructure.knowledge.retriever.get_knowledge_base"
+        ) as mock_get:
+            retriever = KnowledgeRetriever(enabled=False, metrics=metrics)
+
+            assert await retriever(query="hello!") is None
+
+        mock_get.assert_not_called()
+        assert metrics.counter(RETRIEVALS_AVOIDED) == 1
+
+    @pytest.mark.asyncio
+    async def test_latency_saved_uses_average_retrieval_latency(self, metrics):
+        """Testa a estimativa de latência economizada"""
+        metrics.observe(RETRIEVAL_LATENCY_MS, 30.0)
+        metrics.observe(RETRIEVAL_LATENCY_MS, 50.0)
+        retriever = KnowledgeRetriever(enabled=False, metrics=metrics)
+
+        await retriever(query="hi")
+        await retriever(query="thanks")
+
+        assert metrics.counter(LATENCY_SAVED_MS) == pytest.approx(80.0)
+
+    @pytest.mark.asyncio
+    async def test_empty_search_returns_none(self, metrics, knowledge):
+        """Testa busca sem documentos"""
+        knowledge.search.return_value = []
+        retriever = KnowledgeRetriever(metrics=metrics)
+        retriever._knowledge = knowledge
+
+        assert await retriever(query="nothing", num_documents=3) is None
+        knowledge.search.assert_called_once_with(
+            query="nothing", num_documents=3, filters=None
+        )
+
+    @pytest.mark.asyncio
+    async def test_search_runs_off_the_event_loop(self, metrics, knowledge):
+        """Testa que a busca bloqueante roda numa thread, fora do event loop"""
+        loop_thread = threading.get_ident()
+        search_threads = []
+        knowledge.search.side_effect = lambda **kwargs: search_threads.append(
+            threading.get_ident()
+        )
+        retriever = KnowledgeRetriever(metrics=metrics)
+        retriever._knowledge = knowledge
+
+        await retriever(query="hnsw")
+
+        assert search_threads and search_threads[0] != loop_thread
@@ -0,0 +1,222 @@
+"""
+Testes para a busca restrita ao tenant.
+Tests for the tenant scoped search.
+"""
+
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from infraestructure.knowledge.index_manager import KnowledgeIndexManager
+from infraestructure.knowledge.retriever import KnowledgeRetriever
+from infraestructure.knowledge.tenant_search import (
+    DEDICATED_SEARCHES,
+    SHARED_SEARCHES,
+    TenantKnowledgeSearch,
+)
+from infraestructure.knowledge.vector_store import VectorLayout, tenant_index_name
+from infraestructure.telemetry.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def connection():
+    connection = MagicMock()
+    connection.execute.return_value.mappings.return_value = [
+        {
+            "id": "doc-1",
+            "name": "guide",
+            "meta_data": {"user_id": "user_123"},
+            "content": "hnsw tuning guide",
+            "usage": None,
+        }
+    ]
+    return connection
+
+
+@pytest.fixture
+def tenant_search(metrics, connection):
+    engine = MagicMock()
+    engine.begin.return_value.__enter__.return_value = connection
+    embedder = Mock()
+    embedder.get_embedding.return_value = [0.1, 0.2, 0.3]
+    return TenantKnowledgeSearch(
+        engine=engine,
+        embedder=embedder,
+        layout=VectorLayout(precision="full", dimensions=3),
+        metrics=metrics,
+    )
+
+
+class TestTenantKnowledgeSearch:
+    """Testes para o TenantKnowledgeSearch"""
+
+    def test_tenant_filter_is_mandatory(self, tenant_search):
+        """Testa que buscas sem user_id são rejeitadas"""
+        with pytest.raises(ValueError):
+            tenant_search.search(user_id=None, query="hnsw")
+
+    def test_small_tenant_uses_exact_scan_on_tenant_rows(
+        self, tenant_search, connection, metrics
+    ):
+        """Testa que tenants pequenos filtram pelo btree antes de ordenar"""
+        with patch.object(tenant_search, "tenant_indexes", return_value=set()):
+            documents = tenant_search.search(user_id="user_123", query="hnsw", limit=3)
+
+        sql, params = connection.execute.call_args.args
+        assert "AS MATERIALIZED" in str(sql)
+        assert "user_id = :user_id" in str(sql)
+        assert params["user_id"] == "user_123"
+        assert params["limit"] == 3
+        assert documents[0].content == "hnsw tuning guide"
+        assert metrics.counter(SHARED_SEARCHES) == 1
+
+    def test_large_tenant_repeats_partial_index_predicate(
+        self, tenant_search, connection, metrics
+    ):
+        """Testa que tenants grandes usam o predicado literal do índice parcial"""
+        with patch.object(
+            tenant_search,
+            "tenant_indexes",
+            return_value={tenant_index_name("user_123")},
+        ):
+            tenant_search.search(user_id="user_123", query="hnsw")
+
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        assert statements[0].startswith("SET LOCAL hnsw.ef_search")
+        assert "user_id = 'user_123'" in statements[1]
+        assert "MATERIALIZED" not in statements[1]
+        assert metrics.counter(DEDICATED_SEARCHES) == 1
+
+    def test_ranking_keeps_keyword_half_of_hybrid_search(
+        self, tenant_search, connection
+    ):
+        """Testa que as duas consultas ordenam pela pontuação híbrida"""
+        for indexes in (set(), {tenant_index_name("user_123")}):
+            with patch.object(tenant_search, "tenant_indexes", return_value=indexes):
+                tenant_search.search(user_id="user_123", query="hnsw tuning")
+
+            sql, params = connection.execute.call_args.args
+            assert "ts_rank_cd(to_tsvector('english', content)" in str(sql)
+            assert "websearch_to_tsquery('english', :query)" in str(sql)
+            assert str(sql).endswith("DESC LIMIT :limit")
+            assert params["query"] == "hnsw tuning"
+
+    def test_predicate_escapes_quotes(self, tenant_search):
+        """Testa o escape do user_id no predicado literal"""
+        sql = tenant_search.search_sql("o'brien", dedicated=True, filters=False)
+
+        assert "user_id = 'o''brien'" in sql
+
+    def test_extra_filters_are_applied(self, tenant_search, connection):
+        """Testa filtros adicionais de metadados"""
+        with patch.object(tenant_search, "tenant_indexes", return_value=set()):
+            tenant_search.search(
+                user_id="user_123", query="hnsw", filters={"source": "docs"}
+            )
+
+        sql, params = connection.execute.call_args.args
+        assert "meta_data @> CAST(:filters AS jsonb)" in str(sql)
+        assert params["filters"] == '{"source": "docs"}'
+
+    @pytest.mark.asyncio
+    async def test_retriever_routes_through_tenant_search(self, metrics):
+        """Testa que o retriever delega ao tenant_search com o user_id do agente"""
+        tenant_search = Mock()
+        tenant_search.search.return_value = []
+        retriever = KnowledgeRetriever(
+            tenant_search=tenant_search, user_id="user_123", metrics=metrics
+        )
+        retriever._knowledge = Mock(num_documents=4)
+
+        await retriever(query="hnsw")
+
+        tenant_search.search.assert_called_once_with(
+            user_id="user_123", query="hnsw", limit=4, filters=None
+        )
+
+
+class TestTenantIndexes:
+    """Testes para os índices parciais por tenant"""
+
+    def test_tenant_index_name_fits_postgres_limit(self):
+        """Testa que o nome do índice respeita o limite de 63 bytes"""
+        name = tenant_index_name("x" * 200)
+
+        assert len(name) <= 63
+        assert name == tenant_index_name("x" * 200)
+
+    def test_partial_index_sql(self):
+        """Testa SQL do índice parcial"""
+        manager = KnowledgeIndexManager(engine=MagicMock(), index_type="hnsw")
+
+        sql = manager.vector_index_sql(
+            "tenant_index", where=manager.tenant_predicate("user_123")
+        )
+
+        assert sql.endswith("WHERE user_id = 'user_123'")
+
+    def test_sync_creates_indexes_only_for_large_tenants(self):
+        """Testa que apenas tenants acima do limite ganham índice"""
+        manager = KnowledgeIndexManager(engine=MagicMock(), index_type="hnsw")
+
+        with patch.object(
+            manager, "tenant_row_counts", return_value={"big": 50_000}
+        ) as mock_counts, patch.object(
+            manager, "index_status", return_value=[]
+        ), patch.object(
+            manager, "create_tenant_index", return_value="idx"
+        ) as mock_create:
+            created = manager.sync_tenant_indexes(threshold=10_000)
+
+        mock_counts.assert_called_once_with(10_000)
+        mock_create.assert_called_once_with("big", 50_000)
+        assert created == ["idx"]
+
+
+class TestQuantizedTenantSearch:
+    """Testes para a busca com quantização binária"""
+
+    def test_binary_layout_rescores_candidates(self, metrics, connection):
+        """Testa que o layout binário reordena candidatos pela distância exata"""
+        engine = MagicMock()
+        engine.begin.return_value.__enter__.return_value = connection
+        embedder = Mock()
+        embedder.get_embedding.return_value = [0.1, 0.2]
+        tenant_search = TenantKnowledgeSearch(
+            engine=engine,
+            embedder=embedder,
+            layout=VectorLayout(precision="binary", dimensions=2),
+            metrics=metrics,
+        )
+
+        with patch.object(
+            tenant_search, "tenant_indexes", return_value={tenant_index_name("big")}
+        ), patch(
+            "infraestructure.knowledge.tenant_search.settings"
+        ) as mock_settings, patch(
+            "infraestructure.knowledge.vector_store.settings"
+        ) as store_settings:
+            mock_settings.knowledge_index_type = "hnsw"
+            store_settings.knowledge_binary_rescore_factor = 4
+            tenant_search.search(user_id="big", query="hnsw", limit=5)
+
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        sql, params = connection.execute.call_args.args
+        assert statements[0] == "SET LOCAL hnsw.ef_search = 40"
+        assert "<~>" in str(sql)
+        assert "LIMIT :candidates) AS candidates" in str(sql)
+        assert "(1 + (embedding <=> CAST(:embedding AS vector(2))))" in str(sql)
+        assert params["candidates"] == 20
+
+    def test_half_layout_casts_query_to_halfvec(self, tenant_search):
+        """Testa o cast da consulta no layout halfvec"""
+        tenant_search.layout = VectorLayout(precision="half", dimensions=3)
+
+        sql = tenant_search.search_sql("user_123", dedicated=False, filters=False)
+
+        assert "embedding <=> CAST(:embedding AS halfvec(3))" in sql
@@ -0,0 +1,163 @@
+"""
+Testes para o repositório de autenticação assíncrono.
+Tests for the async authentication repository.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
+from core.exceptions import ServiceUnavailableException, TimeoutException
+from infraestructure.bulkhead import COGNITO, PRINCIPAL, Bulkhead
+from infraestructure.repositoryes.auth.async_repository import AsyncAuthRepository
+from infraestructure.repositoryes.auth.principal_cache import (
+    CachedAuthRepository,
+    PrincipalCache,
+)
+from infraestructure.telemetry.metrics import MetricsRegistry
+from interface.auth.auth_interface import AuthInterface
+
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry()
+
+
+def cognito_bulkhead(metrics, max_workers=2, max_queue=8, timeout=5.0) -> Bulkhead:
+    return Bulkhead(COGNITO, max_workers, max_queue, timeout, metrics=metrics)
+
+
+def slow_inner(delay: float) -> Mock:
+    inner = Mock(spec=AuthInterface)
+
+    def login(email, password):
+        time.sleep(delay)
+        return {"access_token": f"token-{email}"}
+
+    inner.login.side_effect = login
+    return inner
+
+
+class TestAsyncAuthRepository:
+    """Testes para o AsyncAuthRepository"""
+
+    @pytest.mark.asyncio
+    async def test_calls_run_on_dedicated_threads(self, metrics):
+        """Testa que o boto3 roda fora do event loop, no pool do Cognito"""
+        inner = Mock(spec=AuthInterface)
+        inner.confirm_email.side_effect = lambda *_: threading.current_thread().name
+        repository = AsyncAuthRepository(inner, cognito_bulkhead(metrics))
+
+        thread_name = await repository.confirm_email("test@example.com", "123")
+
+        assert thread_name.startswith("bulkhead-cognito")
+        repository.bulkhead.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self, metrics):
+        """Testa que uma rajada de logins não congela o event loop"""
+        repository = AsyncAuthRepository(
+            slow_inner(0.1), cognito_bulkhead(metrics, max_workers=4, max_queue=16)
+        )
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        monitor = asyncio.create_task(heartbeat())
+        results = await asyncio.gather(
+            *(repository.login(f"user{i}", "pwd") for i in range(8))
+        )
+        monitor.cancel()
+
+        assert len(results) == 8
+        assert ticks >= 10
+        repository.bulkhead.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_saturated_executor_fails_fast(self, metrics):
+        """Testa que a fila cheia responde 503 imediatamente"""
+        repository = AsyncAuthRepository(
+            slow_inner(0.2), cognito_bulkhead(metrics, max_workers=1, max_queue=1)
+        )
+
+        results = await asyncio.gather(
+            *(repository.login(f"user{i}", "pwd") for i in range(3)),
+            return_exceptions=True,
+        )
+
+        rejected = [r for r in results if isinstance(r, ServiceUnavailableException)]
+        assert len(rejected) == 1
+        assert metrics.counter("bulkhead.cognito.rejected") == 1
+        repository.bulkhead.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_slot_until_thread_finishes(self, metrics):
+        """Testa o timeout e a liberação do slot apenas ao fim da thread"""
+        repository = AsyncAuthRepository(
+            slow_inner(0.2),
+            cognito_bulkhead(metrics, max_workers=1, max_queue=0, timeout=0.05),
+        )
+
+        with pytest.raises(TimeoutException):
+            await repository.login("user", "pwd")
+        assert repository.bulkhead.inflight == 1
+
+        await asyncio.sleep(0.3)
+        assert repository.bulkhead.inflight == 0
+        repository.bulkhead.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_principal_resolution_survives_saturated_cognito(self, metrics):
+        """Testa que cadastros lotando o Cognito não derrubam a autenticação"""
+        inner = slow_inner(0.2)
+        inner.signup.side_effect = lambda *_: time.sleep(0.2)
+        inner.get_user_details.return_value = UserDetailsResponseDto(
+            user_id="user_sub_123",
+            user_sub="user_sub_123",
+            email="test@example.com",
+            is_active=True,
+        )
+        principal = Bulkhead(PRINCIPAL, 2, 8, 5.0, metrics=metrics)
+        repository = AsyncAuthRepository(
+            inner, cognito_bulkhead(metrics, max_workers=1, max_queue=0), principal
+        )
+
+        signup = asyncio.create_task(repository.signup("new@example.com", "pwd"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(ServiceUnavailableException):
+            await repository.signup("other@example.com", "pwd")
+        user = await repository.get_user_details("token")
+        await signup
+
+        assert user.user_sub == "user_sub_123"
+        repository.bulkhead.shutdown()
+        principal.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cached_principal_is_answered_inline(self, metrics):
+        """Testa que um acerto no cache não passa por nenhum pool"""
+        inner = Mock(spec=AuthInterface)
+        inner.get_user_details.return_value = UserDetailsResponseDto(
+            user_id="user_sub_123",
+            user_sub="user_sub_123",
+            email="test@example.com",
+            is_active=True,
+        )
+        cached = CachedAuthRepository(inner, PrincipalCache(ttl=300, metrics=metrics))
+        cached.get_user_details("token")
+        principal = Mock()
+        repository = AsyncAuthRepository(cached, Mock(), principal)
+
+        user = await repository.get_user_details("token")
+
+        assert user.user_sub == "user_sub_123"
+        principal.run.assert_not_called()
+        inner.get_user_details.assert_called_once()
@@ -9,6 +9,7 @@ import pytest
 from botocore.exceptions import ClientError
 
 from core.exceptions.auth.auth_exceptions import InvalidCredentialsException
+from core.exceptions.infrastructure_exceptions import ExternalServiceException
 from infraestructure.repositoryes.auth.repository import AuthRepository
 
 
@@ -22,6 +23,7 @@ class TestAuthRepository:
         ) as mock_settings:
             mock_settings.cognito_user_pool_id = "us-east-1_XXXXXXXXX"
             mock_settings.cognito_user_pool_client_id = "mock_client_id"
+            mock_settings.cognito_local_verification = False
 
             with patch(
                 "infraestructure.repositoryes.auth.repository.AWSClientFactory"
@@ -190,6 +192,23 @@ class TestAuthRepository:
         # Assert
         assert result is None
 
+    @pytest.mark.parametrize(
+        "error",
+        [
+            ClientError(
+                error_response={"Error": {"Code": "TooManyRequestsException"}},
+                operation_name="GetUser",
+            ),
+            ConnectionError("unreachable"),
+        ],
+    )
+    def test_get_user_details_transient_error_raises(self, auth_repository, error):
+        """Testa que falhas transitórias do Cognito não viram token inválido"""
+        auth_repository.cognito.get_user.side_effect = error
+
+        with pytest.raises(ExternalServiceException):
+            auth_repository.get_user_details("mock_access_token")
+
     def test_refresh_access_token_success(self, auth_repository):
         """Testa renovação de token bem-sucedida"""
         # Arrange
@@ -249,6 +268,32 @@ class TestAuthRepository:
         # Assert
         assert result is False
 
+    @pytest.mark.parametrize(
+        "error, expected",
+        [
+            (None, True),
+            ("UserNotFoundException", True),
+            ("TooManyRequestsException", False),
+        ],
+    )
+    def test_delete_user(self, auth_repository, error, expected):
+        """Testa a exclusão no pool (usuário já ausente conta como excluído)"""
+        # Arrange
+        if error:
+            auth_repository.cognito.admin_delete_user.side_effect = ClientError(
+                error_response={"Error": {"Code": error}},
+                operation_name="AdminDeleteUser",
+            )
+
+        # Act
+        result = auth_repository.delete_user("test@example.com")
+
+        # Assert
+        assert result is expected
+        auth_repository.cognito.admin_delete_user.assert_called_once_with(
+            UserPoolId=auth_repository.user_pool_id, Username="test@example.com"
+        )
+
     def test_resend_confirmation_code_success(self, auth_repository):
         """Testa reenvio de código de confirmação bem-sucedido"""
         # Arrange
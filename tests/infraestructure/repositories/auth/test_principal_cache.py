@@ -0,0 +1,280 @@
+"""
+Testes para o cache de principals.
+Tests for the principal cache.
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import jwt
+import pytest
+
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
+from core.exceptions.infrastructure_exceptions import ExternalServiceException
+from infraestructure.repositoryes.auth.principal_cache import (
+    PRINCIPAL_COALESCED,
+    PRINCIPAL_NEGATIVE_HITS,
+    PRINCIPAL_REVOKED,
+    CachedAuthRepository,
+    PrincipalCache,
+    token_key,
+)
+from infraestructure.repositoryes.auth.token_verifier import RevocationList
+from infraestructure.telemetry.metrics import MetricsRegistry
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_user(sub: str = "user_sub_123") -> UserDetailsResponseDto:
+    return UserDetailsResponseDto(
+        user_id=sub, user_sub=sub, email="test@example.com", is_active=True
+    )
+
+
+def make_token(exp: float, sub: str = "user_sub_123") -> str:
+    return jwt.encode({"sub": sub, "exp": int(exp)}, "secret", algorithm="HS256")
+
+
+class InMemoryRevocationStore:
+    """Store compartilhado entre os "workers" dos testes"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def save(self, kind, subject, revoked_at, expires_at):
+        self.rows[(kind, subject)] = (revoked_at, expires_at)
+
+    def active(self, now):
+        return [
+            (kind, subject, revoked_at, expires_at)
+            for (kind, subject), (revoked_at, expires_at) in self.rows.items()
+            if expires_at > now
+        ]
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def cache(clock, metrics):
+    return PrincipalCache(
+        ttl=300, negative_ttl=10, max_entries=2, clock=clock, metrics=metrics
+    )
+
+
+class TestPrincipalCache:
+    """Testes para o PrincipalCache"""
+
+    def test_keys_are_token_hashes(self, cache, clock):
+        """Testa que o token bruto nunca é usado como chave"""
+        token = make_token(clock.now + 3600)
+        cache.get_or_load(token, Mock(return_value=make_user()))
+
+        assert token not in cache._entries
+        assert token_key(token) in cache._entries
+
+    def test_entry_expires_at_token_exp(self, cache, clock):
+        """Testa que o TTL é limitado pelo exp do token"""
+        loader = Mock(return_value=make_user())
+        token = make_token(clock.now + 60)
+
+        cache.get_or_load(token, loader)
+        clock.now += 59
+        cache.get_or_load(token, loader)
+        clock.now += 2
+        cache.get_or_load(token, loader)
+
+        assert loader.call_count == 2
+
+    def test_invalid_tokens_are_cached_briefly(self, cache, clock, metrics):
+        """Testa o cache negativo"""
+        loader = Mock(return_value=None)
+
+        assert cache.get_or_load("garbage", loader) is None
+        assert cache.get_or_load("garbage", loader) is None
+        clock.now += 11
+        cache.get_or_load("garbage", loader)
+
+        assert loader.call_count == 2
+        assert metrics.counter(PRINCIPAL_NEGATIVE_HITS) == 1
+
+    def test_errors_are_not_cached(self, cache, clock):
+        """Testa que falhas do loader não são memorizadas"""
+        loader = Mock(side_effect=[RuntimeError("cognito down"), make_user()])
+        token = make_token(clock.now + 3600)
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_load(token, loader)
+
+        assert cache.get_or_load(token, loader).user_sub == "user_sub_123"
+
+    def test_lru_eviction(self, cache, clock):
+        """Testa o limite de entradas"""
+        for sub in ("a", "b", "c"):
+            cache.get_or_load(make_token(clock.now + 3600, sub), Mock(return_value=make_user(sub)))
+
+        assert len(cache) == 2
+
+    def test_single_flight(self, clock, metrics):
+        """Testa que requisições concorrentes geram uma única chamada"""
+        cache = PrincipalCache(ttl=300, negative_ttl=10, max_entries=10, metrics=metrics)
+        release = threading.Event()
+        calls = []
+
+        def slow_loader(token):
+            calls.append(token)
+            release.wait(2)
+            return make_user()
+
+        token = make_token(time.time() + 3600)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load(token, slow_loader)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        while metrics.counter(PRINCIPAL_COALESCED) < 7:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert len(results) == 8
+        assert all(user.user_sub == "user_sub_123" for user in results)
+
+    def test_load_overlapping_invalidation_is_not_stored(self, cache, clock):
+        """Testa que uma carga que cruzou um logout não repõe o principal"""
+        token = make_token(clock.now + 3600)
+
+        def loader(value):
+            cache.invalidate(value)
+            return make_user()
+
+        assert cache.get_or_load(token, loader).user_sub == "user_sub_123"
+        assert len(cache) == 0
+
+    def test_invalidate_drops_all_user_principals(self, cache, clock):
+        """Testa que o logout remove os principals do usuário"""
+        first = make_token(clock.now + 3600)
+        second = make_token(clock.now + 1800)
+        cache.get_or_load(first, Mock(return_value=make_user()))
+        cache.get_or_load(second, Mock(return_value=make_user()))
+
+        cache.invalidate(first)
+
+        assert len(cache) == 0
+
+
+    def test_logout_in_another_worker_drops_cached_principals(self, clock, metrics):
+        """Testa que um logout atendido por outro worker derruba os acertos"""
+        store = InMemoryRevocationStore()
+        worker_a = PrincipalCache(
+            ttl=300,
+            clock=clock,
+            metrics=metrics,
+            revocations=RevocationList(store=store, refresh_seconds=3600),
+        )
+        worker_b = RevocationList(store=store, refresh_seconds=3600)
+        exp = int(time.time()) + 3600
+        tokens = [
+            jwt.encode(
+                {"sub": "user_sub_123", "jti": jti, "iat": 0, "exp": exp},
+                "secret",
+                algorithm="HS256",
+            )
+            for jti in ("jti-1", "jti-2")
+        ]
+        loader = Mock(return_value=make_user())
+        for token in tokens:
+            worker_a.get_or_load(token, loader)
+            assert worker_a.peek(token) == (True, make_user())
+
+        worker_b.revoke_user("user_sub_123")
+        # Recarga periódica (``auth_revocation_refresh_seconds``) do worker A
+        worker_a.revocations.refresh()
+
+        assert all(worker_a.peek(token) == (False, None) for token in tokens)
+        assert metrics.counter(PRINCIPAL_REVOKED) == 2
+        assert len(worker_a) == 0
+
+
+class TestCachedAuthRepository:
+    """Testes para o decorator CachedAuthRepository"""
+
+    def test_get_user_details_is_cached(self, cache, clock):
+        """Testa que o repositório interno é chamado uma vez por token"""
+        inner = Mock()
+        inner.get_user_details.return_value = make_user()
+        repository = CachedAuthRepository(inner, cache=cache)
+        token = make_token(clock.now + 3600)
+
+        repository.get_user_details(token)
+        repository.get_user_details(token)
+
+        inner.get_user_details.assert_called_once_with(token)
+
+    def test_transient_failure_is_not_cached_as_invalid(self, cache, clock):
+        """Testa que uma falha transitória não vira entrada negativa"""
+        inner = Mock()
+        inner.get_user_details.side_effect = [
+            ExternalServiceException(
+                service="cognito", message_pt="falha", message_en="failure"
+            ),
+            make_user(),
+        ]
+        repository = CachedAuthRepository(inner, cache=cache)
+        token = make_token(clock.now + 3600)
+
+        with pytest.raises(ExternalServiceException):
+            repository.get_user_details(token)
+
+        assert repository.get_user_details(token).user_sub == "user_sub_123"
+        assert len(cache) == 1
+
+    def test_logout_invalidates_and_delegates(self, cache, clock):
+        """Testa que o logout invalida o cache e chama o repositório"""
+        inner = Mock()
+        inner.get_user_details.return_value = make_user()
+        inner.logout.return_value = True
+        repository = CachedAuthRepository(inner, cache=cache)
+        token = make_token(clock.now + 3600)
+        repository.get_user_details(token)
+
+        assert repository.logout(token) is True
+        repository.get_user_details(token)
+
+        assert inner.get_user_details.call_count == 2
+
+    def test_uses_the_verifier_revocations(self, cache):
+        """Testa que o cache reconfere a lista de revogações do verificador"""
+        inner = Mock()
+        inner.verifier.revocations = RevocationList()
+
+        CachedAuthRepository(inner, cache=cache)
+
+        assert cache.revocations is inner.verifier.revocations
+
+    def test_extra_methods_are_delegated(self, cache):
+        """Testa a delegação de métodos fora da interface"""
+        inner = Mock()
+        inner.refresh_access_token.return_value = {"access_token": "new"}
+
+        repository = CachedAuthRepository(inner, cache=cache)
+
+        assert repository.refresh_access_token("refresh") == {"access_token": "new"}
@@ -0,0 +1,355 @@
+"""
+Testes para a verificação local de tokens do Cognito.
+Tests for the local Cognito token verification.
+"""
+
+import json
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from core.exceptions.auth.auth_exceptions import (
+    InvalidTokenException,
+    TokenExpiredException,
+)
+from infraestructure.repositoryes.auth.repository import AuthRepository
+from infraestructure.repositoryes.auth.revocation_store import PostgresRevocationStore
+from infraestructure.repositoryes.auth.token_verifier import (
+    JWKS_REFRESHES,
+    CognitoTokenVerifier,
+    JWKSCache,
+    JWKSUnavailableError,
+    RevocationList,
+    cognito_issuer,
+)
+from infraestructure.telemetry.metrics import MetricsRegistry
+
+REGION = "us-east-1"
+POOL_ID = "us-east-1_XXXXXXXXX"
+CLIENT_ID = "mock_client_id"
+
+
+def generate_key(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return private_key, jwk
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    return generate_key("kid-1")
+
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def fetcher(signing_key):
+    return Mock(return_value={"keys": [signing_key[1]]})
+
+
+@pytest.fixture
+def verifier(fetcher, metrics):
+    return CognitoTokenVerifier(
+        user_pool_id=POOL_ID,
+        client_id=CLIENT_ID,
+        region=REGION,
+        jwks=JWKSCache("https://jwks", fetcher=fetcher, metrics=metrics),
+        metrics=metrics,
+    )
+
+
+def make_token(signing_key, kid="kid-1", **overrides):
+    now = int(time.time())
+    claims = {
+        "sub": "user_sub_123",
+        "iss": cognito_issuer(REGION, POOL_ID),
+        "client_id": CLIENT_ID,
+        "token_use": "access",
+        "jti": "jti-1",
+        "iat": now - 10,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, signing_key[0], algorithm="RS256", headers={"kid": kid})
+
+
+class TestCognitoTokenVerifier:
+    """Testes para o CognitoTokenVerifier"""
+
+    def test_valid_token_returns_claims(self, verifier, signing_key, fetcher):
+        """Testa a validação local de um access token"""
+        claims = verifier.verify(make_token(signing_key))
+        verifier.verify(make_token(signing_key))
+
+        assert claims["sub"] == "user_sub_123"
+        fetcher.assert_called_once()
+
+    def test_expired_token(self, verifier, signing_key):
+        """Testa token expirado"""
+        token = make_token(signing_key, exp=int(time.time()) - 120)
+
+        with pytest.raises(TokenExpiredException):
+            verifier.verify(token)
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"token_use": "id"},
+            {"client_id": "another_client"},
+            {"iss": "https://cognito-idp.us-east-1.amazonaws.com/other_pool"},
+        ],
+    )
+    def test_rejects_wrong_claims(self, verifier, signing_key, overrides):
+        """Testa uso, cliente e emissor incorretos"""
+        with pytest.raises(InvalidTokenException):
+            verifier.verify(make_token(signing_key, **overrides))
+
+    def test_rejects_foreign_signature(self, verifier):
+        """Testa assinatura com chave que não pertence ao pool"""
+        foreign = generate_key("kid-1")
+
+        with pytest.raises(InvalidTokenException):
+            verifier.verify(make_token(foreign))
+
+    def test_revoked_user_tokens_are_rejected(self, verifier, signing_key):
+        """Testa que tokens emitidos antes do global_sign_out são rejeitados"""
+        token = make_token(signing_key)
+        verifier.revocations.revoke_user("user_sub_123")
+
+        with pytest.raises(InvalidTokenException) as exc_info:
+            verifier.verify(token)
+
+        assert exc_info.value.details["reason"] == "revoked"
+        later = make_token(signing_key, iat=int(time.time()) + 5)
+        assert verifier.verify(later)["sub"] == "user_sub_123"
+
+
+class TestJWKSCache:
+    """Testes para o cache de JWKS"""
+
+    def test_unknown_kid_forces_rate_limited_refresh(self, signing_key, metrics):
+        """Testa a recarga ao encontrar uma chave rotacionada"""
+        rotated = generate_key("kid-2")
+        fetcher = Mock(
+            side_effect=[{"keys": [signing_key[1]]}, {"keys": [rotated[1]]}]
+        )
+        cache = JWKSCache("https://jwks", fetcher=fetcher, metrics=metrics)
+        cache.get_key("kid-1")
+
+        with pytest.raises(InvalidTokenException):
+            cache.get_key("kid-2")
+
+        cache._loaded_at -= JWKSCache.MIN_REFRESH_SECONDS
+        assert cache.get_key("kid-2").key_id == "kid-2"
+        assert metrics.counter(JWKS_REFRESHES) == 2
+
+    def test_stale_keys_refresh_in_background(self, fetcher, metrics):
+        """Testa que chaves vencidas continuam servindo durante a recarga"""
+        cache = JWKSCache(
+            "https://jwks", refresh_seconds=10, fetcher=fetcher, metrics=metrics
+        )
+        cache.get_key("kid-1")
+        cache._loaded_at -= 20
+
+        with patch.object(cache, "refresh_in_background") as mock_background:
+            assert cache.get_key("kid-1").key_id == "kid-1"
+
+        mock_background.assert_called_once()
+
+    def test_unreachable_jwks_backs_off(self, metrics):
+        """Testa que um JWKS inacessível não é buscado a cada requisição"""
+        fetcher = Mock(side_effect=ConnectionError("unreachable"))
+        cache = JWKSCache("https://jwks", fetcher=fetcher, metrics=metrics)
+
+        with pytest.raises(ConnectionError):
+            cache.get_key("kid-1")
+        for _ in range(5):
+            with pytest.raises(JWKSUnavailableError):
+                cache.get_key("kid-1")
+
+        fetcher.assert_called_once()
+        cache._retry_at = 0.0
+        with pytest.raises(ConnectionError):
+            cache.get_key("kid-1")
+        assert cache._failures == 2
+
+
+class TestRevocationList:
+    """Testes para a lista de revogações"""
+
+    def test_expired_entries_are_pruned(self):
+        """Testa a limpeza de entradas expiradas"""
+        revocations = RevocationList()
+        revocations.revoke_token("old", expires_at=time.time() - 1)
+        revocations.revoke_token("new", expires_at=time.time() + 60)
+
+        assert len(revocations) == 1
+        assert revocations.is_revoked({"jti": "new"})
+
+    def test_token_issued_in_the_logout_second_is_accepted(self):
+        """Testa o limite estrito: só tokens emitidos antes do logout caem"""
+        revocations = RevocationList()
+        revocations.revoke_user("user_sub_123", revoked_at=time.time() + 0.7)
+        revoked_at = revocations._users["user_sub_123"][0]
+
+        assert revocations.is_revoked({"sub": "user_sub_123", "iat": revoked_at - 1})
+        assert not revocations.is_revoked({"sub": "user_sub_123", "iat": revoked_at})
+
+    def test_revocations_are_shared_through_the_store(self):
+        """Testa que um logout em um worker vale nos outros"""
+        store = InMemoryRevocationStore()
+        worker_a = RevocationList(store=store)
+        worker_b = RevocationList(store=store)
+
+        worker_a.revoke_user("user_sub_123")
+
+        assert worker_b.is_revoked({"sub": "user_sub_123", "iat": 0})
+
+    def test_store_failure_keeps_local_revocation(self):
+        """Testa que falhas do store não desfazem a revogação local"""
+        store = Mock()
+        store.save.side_effect = ConnectionError("down")
+        store.active.side_effect = ConnectionError("down")
+        revocations = RevocationList(store=store)
+
+        revocations.revoke_user("user_sub_123")
+
+        assert revocations.is_revoked({"sub": "user_sub_123", "iat": 0})
+
+    def test_verifier_keeps_an_empty_revocation_list(self):
+        """Testa que uma lista vazia (falsy) passada explicitamente é mantida"""
+        revocations = RevocationList()
+
+        verifier = CognitoTokenVerifier(
+            user_pool_id=POOL_ID,
+            client_id=CLIENT_ID,
+            region=REGION,
+            jwks=Mock(),
+            revocations=revocations,
+        )
+
+        assert verifier.revocations is revocations
+
+
+class InMemoryRevocationStore:
+    def __init__(self):
+        self.rows = {}
+
+    def save(self, kind, subject, revoked_at, expires_at):
+        self.rows[(kind, subject)] = (revoked_at, expires_at)
+
+    def active(self, now):
+        return [
+            (kind, subject, revoked_at, expires_at)
+            for (kind, subject), (revoked_at, expires_at) in self.rows.items()
+            if expires_at > now
+        ]
+
+
+class TestPostgresRevocationStore:
+    """Testes para o store de revogações no Postgres"""
+
+    def test_save_upserts_and_prunes(self):
+        """Testa o upsert da revogação e a limpeza das expiradas"""
+        session = MagicMock()
+        store = PostgresRevocationStore(session_factory=Mock(return_value=session))
+
+        store.save("user", "user_sub_123", 1000.0, 2000.0)
+
+        statements = [
+            str(call.args[0])
+            for call in session.__enter__.return_value.execute.call_args_list
+        ]
+        assert "ON CONFLICT (kind, subject) DO UPDATE" in statements[0]
+        assert "greatest" in statements[0]
+        assert statements[1].startswith("DELETE FROM auth_revocations")
+        session.__enter__.return_value.commit.assert_called_once()
+
+
+class TestAuthRepositoryLocalVerification:
+    """Testes para o AuthRepository com verificação local"""
+
+    @pytest.fixture
+    def repository(self, verifier):
+        with patch(
+            "infraestructure.repositoryes.auth.repository.AWSClientFactory"
+        ) as mock_aws_factory:
+            mock_aws_factory.return_value.cognito.return_value = Mock()
+            return AuthRepository(verifier=verifier)
+
+    def test_profile_is_fetched_once_per_user(self, repository, signing_key):
+        """Testa que o Cognito só é chamado no primeiro acesso do usuário"""
+        repository.cognito.get_user.return_value = {
+            "UserAttributes": [
+                {"Name": "sub", "Value": "user_sub_123"},
+                {"Name": "email", "Value": "test@example.com"},
+                {"Name": "name", "Value": "Test User"},
+            ]
+        }
+        token = make_token(signing_key)
+
+        first = repository.get_user_details(token)
+        second = repository.get_user_details(token)
+
+        assert first.email == second.email == "test@example.com"
+        repository.cognito.get_user.assert_called_once()
+
+    def test_groups_come_from_the_token(self, repository, signing_key):
+        """Testa que os grupos do token valem mesmo com o perfil em cache"""
+        repository.cognito.get_user.return_value = {
+            "UserAttributes": [{"Name": "email", "Value": "test@example.com"}]
+        }
+        admin = make_token(signing_key, **{"cognito:groups": ["admin"]})
+        member = make_token(signing_key, jti="member")
+
+        assert repository.get_user_details(admin).groups == ["admin"]
+        assert repository.get_user_details(member).groups == []
+        repository.cognito.get_user.assert_called_once()
+
+    def test_profile_cache_is_bounded(self, repository, signing_key):
+        """Testa a evicção LRU dos perfis em cache"""
+        repository.cognito.get_user.side_effect = lambda AccessToken: {
+            "UserAttributes": [{"Name": "email", "Value": "test@example.com"}]
+        }
+
+        with patch(
+            "infraestructure.repositoryes.auth.repository.settings"
+        ) as mock_settings:
+            mock_settings.cognito_profile_cache_seconds = 900
+            mock_settings.cognito_profile_cache_max_entries = 2
+            for sub in ("a", "b", "a", "c"):
+                repository.get_user_details(make_token(signing_key, sub=sub))
+
+        assert list(repository._profiles) == ["a", "c"]
+
+    def test_invalid_token_never_reaches_cognito(self, repository, signing_key):
+        """Testa que tokens rejeitados localmente não geram chamada de rede"""
+        token = make_token(signing_key, client_id="another_client")
+
+        assert repository.get_user_details(token) is None
+        repository.cognito.get_user.assert_not_called()
+
+    def test_logout_revokes_locally(self, repository, signing_key):
+        """Testa que o logout invalida o token na verificação local"""
+        token = make_token(signing_key, email="test@example.com")
+        assert repository.get_user_details(token) is not None
+
+        assert repository.logout(token) is True
+        assert repository.get_user_details(token) is None
+
+    def test_falls_back_to_cognito_when_jwks_unavailable(self, repository, fetcher):
+        """Testa o fallback remoto quando o JWKS não pode ser obtido"""
+        fetcher.side_effect = ConnectionError("unreachable")
+        repository.cognito.get_user.return_value = {
+            "UserAttributes": [{"Name": "sub", "Value": "user_sub_123"}]
+        }
+        token = jwt.encode({"sub": "x"}, "secret", headers={"kid": "kid-9"})
+
+        assert repository.get_user_details(token).user_sub == "user_sub_123"
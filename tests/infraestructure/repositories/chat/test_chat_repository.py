@@ -0,0 +1,165 @@
+"""
+Testes para o repositório de chats DynamoDB (um item por mensagem).
+Tests for the DynamoDB chat repository (one item per message).
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from core.entities.chat import Chat, ChatMessage
+from core.exceptions.base_exceptions import ValidationException
+from core.exceptions.chat import ChatNotFoundException
+from infraestructure.repositoryes.chat.chat_repository import (
+    ChatRepository,
+    chat_layout_items,
+    message_item,
+)
+
+
+def make_message(message_id: str, second: int) -> ChatMessage:
+    return ChatMessage(
+        messageId=message_id,
+        userId="user_123",
+        content=f"message {message_id}",
+        timestamp=datetime(2024, 1, 1, 12, 0, second),
+    )
+
+
+@pytest.fixture
+def table():
+    return MagicMock()
+
+
+@pytest.fixture
+def repository(table):
+    factory = Mock()
+    factory.dynamo_table.return_value = table
+    return ChatRepository(client_factory=factory)
+
+
+class TestChatRepository:
+    """Testes para o ChatRepository"""
+
+    def test_add_message_is_a_single_conditional_write(self, repository, table):
+        """Testa que adicionar mensagem não lê nem reescreve o chat"""
+        repository.add_message("chat_1", make_message("m1", 5))
+
+        client = table.meta.client
+        client.transact_write_items.assert_called_once()
+        put, check = client.transact_write_items.call_args.kwargs["TransactItems"]
+        item = put["Put"]["Item"]
+        assert item["sk"] == "MSG#2024-01-01T12:00:05.000000#m1"
+        assert item["senderId"] == "user_123" and "userId" not in item
+        assert check["ConditionCheck"]["Key"] == {"chatId": "chat_1", "sk": "CHAT"}
+        table.get_item.assert_not_called()
+        table.update_item.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "reasons, raises",
+        [
+            (["None", "ConditionalCheckFailed"], True),
+            (["ConditionalCheckFailed", "None"], False),
+        ],
+    )
+    def test_add_message_cancellation(self, repository, table, reasons, raises):
+        """Testa chat inexistente (404) e mensagem já gravada (idempotente)"""
+        table.meta.client.transact_write_items.side_effect = ClientError(
+            {
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [{"Code": code} for code in reasons],
+            },
+            "TransactWriteItems",
+        )
+        message = make_message("m1", 5)
+
+        if raises:
+            with pytest.raises(ChatNotFoundException):
+                repository.add_message("chat_1", message)
+        else:
+            assert repository.add_message("chat_1", message) is message
+
+    def test_get_messages_pages_backwards_in_chronological_order(
+        self, repository, table
+    ):
+        """Testa a query do mais novo para o mais antigo e o cursor da página"""
+        newest = message_item("chat_1", make_message("m2", 2))
+        older = message_item("chat_1", make_message("m1", 1))
+        table.query.return_value = {
+            "Items": [newest, older],
+            "LastEvaluatedKey": {"chatId": "chat_1", "sk": older["sk"]},
+        }
+
+        page = repository.get_messages("chat_1", limit=1000)
+        repository.get_messages("chat_1", before=page.next_cursor)
+
+        assert [message.message_id for message in page.messages] == ["m1", "m2"]
+        first, second = table.query.call_args_list
+        assert first.kwargs["ScanIndexForward"] is False
+        assert first.kwargs["Limit"] == 200
+        assert second.kwargs["ExclusiveStartKey"] == {
+            "chatId": "chat_1",
+            "sk": older["sk"],
+        }
+
+    def test_get_messages_rejects_foreign_cursor(self, repository):
+        """Testa que um cursor que não é de mensagem é rejeitado"""
+        with pytest.raises(ValidationException):
+            repository.get_messages("chat_1", before="Q0hBVA")
+
+    def test_update_chat_only_touches_metadata(self, repository, table):
+        """Testa que o update não regrava a lista de mensagens"""
+        table.update_item.return_value = {
+            "Attributes": {"chatId": "chat_1", "sk": "CHAT", "userId": "user_123"}
+        }
+
+        chat = repository.update_chat(
+            "chat_1", Chat(chatId="chat_1", userId="user_123", isActive=False)
+        )
+
+        assert chat.chat_id == "chat_1"
+        assert "messages" not in table.update_item.call_args.kwargs["UpdateExpression"]
+        table.batch_writer.assert_not_called()
+
+    def test_update_missing_chat_returns_none(self, repository, table):
+        """Testa o chat inexistente no update condicional"""
+        table.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        )
+
+        assert repository.update_chat("missing", Chat(chatId="x", userId="u")) is None
+
+    def test_delete_chat_removes_every_page_of_items(self, repository, table):
+        """Testa que o delete apaga metadados e mensagens de todas as páginas"""
+        table.query.side_effect = [
+            {
+                "Items": [{"chatId": "chat_1", "sk": "CHAT"}],
+                "LastEvaluatedKey": {"chatId": "chat_1", "sk": "CHAT"},
+            },
+            {"Items": [{"chatId": "chat_1", "sk": "MSG#x"}]},
+        ]
+        batch = table.batch_writer.return_value.__enter__.return_value
+
+        assert repository.delete_chat("chat_1") is True
+        assert batch.delete_item.call_count == 2
+
+
+def test_chat_layout_items_split_legacy_chat():
+    """Testa a conversão de um chat antigo em metadados + um item por mensagem"""
+    chat = Chat.model_validate(
+        {
+            "chatId": "chat_1",
+            "userId": "user_123",
+            "messages": [
+                {"messageId": "m1", "userId": "user_123", "content": "oi"},
+                {"messageId": "m2", "userId": "agent", "content": "olá"},
+            ],
+        }
+    )
+
+    items = chat_layout_items(chat)
+
+    assert [item["sk"][:4] for item in items] == ["CHAT", "MSG#", "MSG#"]
+    assert all("messages" not in item for item in items)
@@ -0,0 +1,244 @@
+"""
+Testes para a listagem paginada e as mensagens do repositório de chat PostgreSQL.
+Tests for the paginated listing and messages of the PostgreSQL chat repository.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from core.entities.chat import ChatMessage
+from core.exceptions import ValidationException
+from core.exceptions.chat import ChatNotFoundException
+from infraestructure.repositoryes.chat.postgres_chat_repository import (
+    PostgresChatRepository,
+    chat_list_statement,
+    chat_summary_statement,
+    message_history_statement,
+    decode_keyset_cursor,
+    encode_keyset_cursor,
+)
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+def chat_rows(count):
+    return [
+        SimpleNamespace(
+            chat_id=f"chat-{index}",
+            user_id="user-1",
+            is_active=True,
+            created_at=NOW,
+            updated_at=NOW - timedelta(minutes=index),
+            last_message_at=NOW - timedelta(minutes=index) if index else None,
+            message_count=index,
+            last_message_id=f"msg-{index}" if index else None,
+            last_message_user_id="user-1",
+            last_message_content=f"hello {index}",
+            last_message_timestamp=NOW - timedelta(minutes=index),
+        )
+        for index in range(count)
+    ]
+
+
+def make_repository(rows):
+    session = AsyncMock()
+    session.__aenter__.return_value = session
+    session.__aexit__.return_value = None
+    result = MagicMock()
+    result.all.return_value = rows
+    session.execute.return_value = result
+    return (
+        PostgresChatRepository(session_factory=MagicMock(return_value=session)),
+        session,
+    )
+
+
+def compiled(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestChatCursor:
+    """Testes para o cursor opaco da listagem de chats"""
+
+    def test_round_trip(self):
+        """Testa que o cursor devolve a mesma chave (updated_at, chat_id)"""
+        cursor = encode_keyset_cursor(NOW, "chat-1")
+
+        assert decode_keyset_cursor(cursor) == (NOW, "chat-1")
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "e30", "WyJ4IiwxXQ"])
+    def test_invalid_cursor(self, cursor):
+        """Testa cursores que não vieram desta listagem"""
+        with pytest.raises(ValidationException) as exc_info:
+            decode_keyset_cursor(cursor)
+
+        assert exc_info.value.error_code == "INVALID_CURSOR"
+
+
+class TestChatListStatement:
+    """Testes para a consulta keyset da listagem de chats"""
+
+    def test_orders_by_recent_activity(self):
+        """Testa a ordenação (updated_at DESC, chat_id DESC) sem OFFSET"""
+        sql = compiled(chat_list_statement("user-1", 21))
+
+        assert "ORDER BY chats.updated_at DESC, chats.chat_id DESC" in sql
+        assert "LIMIT" in sql and "OFFSET" not in sql
+
+    def test_continues_after_cursor_key(self):
+        """Testa a comparação de linha que continua depois do cursor"""
+        sql = compiled(chat_list_statement("user-1", 21, (NOW, "chat-1")))
+
+        assert "(chats.updated_at, chats.chat_id) <" in sql
+
+    def test_summary_reads_last_message_with_lateral_join(self):
+        """Testa que a última mensagem vem de um LATERAL sobre a página"""
+        sql = compiled(chat_summary_statement("user-1", 21))
+
+        assert "LEFT OUTER JOIN LATERAL" in sql
+        assert "WHERE chat_messages.chat_id = page.chat_id" in sql
+        assert "count(" not in sql.lower()
+
+
+class TestListChatsPage:
+    """Testes para PostgresChatRepository.list_chats_page"""
+
+    @pytest.mark.asyncio
+    async def test_returns_cursor_when_more_rows_exist(self):
+        """Testa que a linha extra vira o cursor da próxima página"""
+        repository, session = make_repository(chat_rows(3))
+
+        page = await repository.list_chats_page("user-1", limit=2)
+
+        assert [chat.chat_id for chat in page.chats] == ["chat-0", "chat-1"]
+        assert page.chats[0].last_message is None
+        assert page.chats[1].last_message.content == "hello 1"
+        assert page.chats[1].message_count == 1
+        assert decode_keyset_cursor(page.next_cursor) == (
+            NOW - timedelta(minutes=1),
+            "chat-1",
+        )
+        statement = session.execute.call_args.args[0]
+        assert 3 in statement.compile().params.values()
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self):
+        """Testa que a última página não tem cursor"""
+        repository, _ = make_repository(chat_rows(2))
+
+        page = await repository.list_chats_page("user-1", limit=2)
+
+        assert len(page.chats) == 2
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_does_not_query(self):
+        """Testa que um cursor inválido falha antes de abrir sessão"""
+        repository, session = make_repository([])
+
+        with pytest.raises(ValidationException):
+            await repository.list_chats_page("user-1", limit=2, cursor="bad")
+
+        session.execute.assert_not_called()
+
+
+class TestAddMessage:
+    """Testes para PostgresChatRepository.add_message"""
+
+    @pytest.fixture
+    def message(self):
+        return ChatMessage(
+            messageId="msg-1", userId="user-1", content="hello", timestamp=NOW
+        )
+
+    @pytest.mark.asyncio
+    async def test_bumps_activity_before_inserting(self, message):
+        """Testa que o chat é travado e marcado antes de gravar a mensagem"""
+        repository, session = make_repository([])
+        session.add = MagicMock()
+        session.execute.return_value = MagicMock(rowcount=1)
+
+        stored = await repository.add_message("chat-1", message)
+
+        assert stored == message
+        sql = compiled(session.execute.call_args.args[0])
+        assert sql.startswith("UPDATE chats SET")
+        assert "updated_at=" in sql
+        # Os contadores ficam com o trigger, para não contar duas vezes
+        assert "message_count" not in sql
+        assert session.add.call_args.args[0].chat_id == "chat-1"
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_chat_raises_not_found(self, message):
+        """Testa que mensagens para chats inexistentes não são gravadas"""
+        repository, session = make_repository([])
+        session.add = MagicMock()
+        session.execute.return_value = MagicMock(rowcount=0)
+
+        with pytest.raises(ChatNotFoundException):
+            await repository.add_message("missing", message)
+
+        session.add.assert_not_called()
+        session.commit.assert_not_called()
+
+
+def message_rows(count):
+    return [
+        SimpleNamespace(
+            message_id=f"msg-{index}",
+            user_id="user-1",
+            content=f"hello {index}",
+            timestamp=NOW - timedelta(seconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+class TestGetMessages:
+    """Testes para PostgresChatRepository.get_messages"""
+
+    def test_history_statement_uses_keyset_without_orm_entities(self):
+        """Testa a consulta keyset por (timestamp, message_id) só com colunas"""
+        statement = message_history_statement("chat-1", 51, (NOW, "msg-9"))
+        sql = compiled(statement)
+
+        assert "FROM chat_messages" in sql and "JOIN" not in sql
+        assert "(chat_messages.timestamp, chat_messages.message_id) <" in sql
+        assert (
+            "ORDER BY chat_messages.timestamp DESC, chat_messages.message_id DESC"
+            in sql
+        )
+        # Só colunas: nenhuma entidade ORM (e seus relacionamentos) é carregada
+        assert not any(
+            isinstance(column["expr"], type) for column in statement.column_descriptions
+        )
+
+    @pytest.mark.asyncio
+    async def test_returns_chronological_page_and_older_cursor(self):
+        """Testa a página em ordem cronológica e o cursor para as mais antigas"""
+        repository, _ = make_repository(message_rows(3))
+
+        page = await repository.get_messages("chat-1", limit=2)
+
+        assert [m.message_id for m in page.messages] == ["msg-1", "msg-0"]
+        assert decode_keyset_cursor(page.next_cursor) == (
+            NOW - timedelta(seconds=1),
+            "msg-1",
+        )
+
+    @pytest.mark.asyncio
+    async def test_oldest_page_has_no_cursor(self):
+        """Testa que a página mais antiga não tem cursor"""
+        repository, _ = make_repository(message_rows(1))
+
+        page = await repository.get_messages(
+            "chat-1", before=encode_keyset_cursor(NOW, "x")
+        )
+
+        assert [m.message_id for m in page.messages] == ["msg-0"]
+        assert page.next_cursor is None
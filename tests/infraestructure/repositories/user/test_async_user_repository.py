@@ -0,0 +1,381 @@
+"""
+Testes para o repositório de usuários assíncrono.
+Tests for the async user repository.
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from core.entities.user import User
+from core.exceptions import ServiceUnavailableException
+from core.exceptions.base_exceptions import BaseApplicationException
+from core.exceptions.user import UserAlreadyExistsException, UserNotFoundException
+from infraestructure.repositoryes.user.async_repository import (
+    AsyncUserRepository,
+    decode_cursor,
+    from_item,
+    to_item,
+)
+
+
+def client_error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, "Operation")
+
+
+@pytest.fixture
+def client():
+    client = Mock()
+    for method in (
+        "get_item",
+        "query",
+        "scan",
+        "update_item",
+        "delete_item",
+        "transact_write_items",
+        "batch_get_item",
+        "batch_write_item",
+        "describe_table",
+    ):
+        setattr(client, method, AsyncMock(return_value={}))
+    return client
+
+
+@pytest.fixture
+def repository(client):
+    factory = Mock()
+    factory.dynamo = AsyncMock(return_value=client)
+    return AsyncUserRepository(client_factory=factory)
+
+
+@pytest.fixture
+def sample_user():
+    return User(
+        userId="user_123",
+        email="test@example.com",
+        firstName="Test",
+        lastName="User",
+        isActive=True,
+        slug="test-user",
+    )
+
+
+class TestAsyncUserRepository:
+    """Testes para o AsyncUserRepository"""
+
+    @pytest.mark.asyncio
+    async def test_get_user_deserializes_item(self, repository, client, sample_user):
+        """Testa a conversão do item tipado do DynamoDB para a entidade"""
+        item = to_item({"userId": "user_123", "email": "test@example.com"})
+        client.get_item.return_value = {"Item": item}
+
+        user = await repository.get_user("user_123")
+
+        assert user.user_id == "user_123"
+        assert client.get_item.call_args.kwargs["Key"] == {"userId": {"S": "user_123"}}
+
+    @pytest.mark.asyncio
+    async def test_get_user_not_found(self, repository):
+        """Testa usuário inexistente"""
+        with pytest.raises(UserNotFoundException):
+            await repository.get_user("missing")
+
+    @pytest.mark.asyncio
+    async def test_create_user_rejects_duplicate_email(
+        self, repository, client, sample_user
+    ):
+        """Testa que o sentinela existente cancela a criação"""
+        client.transact_write_items.side_effect = ClientError(
+            {
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {"Code": "None"},
+                    {"Code": "ConditionalCheckFailed"},
+                ],
+            },
+            "TransactWriteItems",
+        )
+
+        with pytest.raises(UserAlreadyExistsException):
+            await repository.create_user(sample_user)
+        client.query.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_create_user_writes_typed_transaction(
+        self, repository, client, sample_user
+    ):
+        """Testa que usuário e sentinela são gravados tipados numa transação"""
+        await repository.create_user(sample_user)
+
+        user_put, sentinel_put = [
+            item["Put"]
+            for item in client.transact_write_items.call_args.kwargs["TransactItems"]
+        ]
+        assert user_put["Item"]["userId"] == {"S": "user_123"}
+        assert from_item(user_put["Item"])["isActive"] is True
+        assert sentinel_put["Item"] == {
+            "userId": {"S": "EMAIL#test@example.com"},
+            "sentinelFor": {"S": "user_123"},
+        }
+
+    @pytest.mark.asyncio
+    async def test_update_returns_all_new(self, repository, client):
+        """Testa que a atualização parcial devolve o item gravado (ALL_NEW)"""
+        client.update_item.return_value = {
+            "Attributes": to_item(
+                {"userId": "user_123", "email": "test@example.com", "firstName": "New"}
+            )
+        }
+
+        user = await repository.update_user("user_123", {"first_name": "New"})
+
+        assert user.first_name == "New"
+        kwargs = client.update_item.call_args.kwargs
+        assert kwargs["ReturnValues"] == "ALL_NEW"
+        assert kwargs["ConditionExpression"] == "attribute_exists(#userId)"
+        assert client.get_item.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_update_missing_user_is_not_found(self, repository, client):
+        """Testa que a condição de existência vira UserNotFoundException"""
+        client.update_item.side_effect = client_error("ConditionalCheckFailedException")
+
+        with pytest.raises(UserNotFoundException):
+            await repository.update_user("user_123", {"first_name": "New"})
+        assert client.get_item.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_update_email_change_returns_stored_attributes(
+        self, repository, client
+    ):
+        """Testa que a troca de email devolve o item lido com a atualização"""
+        client.update_item.side_effect = ClientError(
+            {
+                "Error": {"Code": "ConditionalCheckFailedException"},
+                "Item": to_item(
+                    {
+                        "userId": "user_123",
+                        "email": "old@example.com",
+                        "firstName": "Stored",
+                        "updatedAt": "2024-01-01T00:00:00",
+                    }
+                ),
+            },
+            "UpdateItem",
+        )
+
+        user = await repository.update_user("user_123", {"email": "new@example.com"})
+
+        assert user.email == "new@example.com"
+        assert user.first_name == "Stored"
+        update = client.transact_write_items.call_args.kwargs["TransactItems"][0]
+        assert "#updatedAt = :previousUpdatedAt" in (
+            update["Update"]["ConditionExpression"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_update_to_taken_email_conflicts(self, repository, client):
+        """Testa que trocar para um email já reservado gera conflito"""
+        client.update_item.side_effect = ClientError(
+            {
+                "Error": {"Code": "ConditionalCheckFailedException"},
+                "Item": to_item({"userId": "user_123", "email": "old@example.com"}),
+            },
+            "UpdateItem",
+        )
+        client.transact_write_items.side_effect = ClientError(
+            {
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {"Code": "None"},
+                    {"Code": "None"},
+                    {"Code": "ConditionalCheckFailed"},
+                ],
+            },
+            "TransactWriteItems",
+        )
+
+        with pytest.raises(UserAlreadyExistsException):
+            await repository.update_user("user_123", {"email": "test@example.com"})
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_user_and_sentinel_atomically(
+        self, repository, client
+    ):
+        """Testa que usuário e sentinela são apagados num único TransactWriteItems"""
+        client.get_item.return_value = {"Item": to_item({"email": "test@example.com"})}
+
+        assert await repository.delete_user("user_123") is True
+
+        items = client.transact_write_items.call_args.kwargs["TransactItems"]
+        assert [item["Delete"]["Key"] for item in items] == [
+            {"userId": {"S": "user_123"}},
+            {"userId": {"S": "EMAIL#test@example.com"}},
+        ]
+        assert client.delete_item.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_delete_missing_user_is_not_found(self, repository, client):
+        """Testa exclusão de usuário inexistente"""
+        with pytest.raises(UserNotFoundException):
+            await repository.delete_user("user_123")
+        assert client.transact_write_items.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_wrapped(self, repository, client):
+        """Testa a conversão de ClientError para BaseApplicationException"""
+        client.get_item.side_effect = client_error("ProvisionedThroughputExceeded")
+
+        with pytest.raises(BaseApplicationException) as error:
+            await repository.delete_user("user_123")
+        assert error.value.error_code == "USER_DELETE_ERROR"
+
+    @pytest.mark.asyncio
+    async def test_email_lookup_reads_sentinel(self, repository, client):
+        """Testa a busca por email em duas leituras consistentes, sem query"""
+        client.get_item.side_effect = [
+            {"Item": to_item({"userId": "EMAIL#a@x.com", "sentinelFor": "user_123"})},
+            {"Item": to_item({"userId": "user_123", "email": "a@x.com"})},
+        ]
+
+        user = await repository.get_user_by_email("A@x.com")
+
+        assert user.user_id == "user_123"
+        assert client.get_item.call_args_list[0].kwargs["Key"] == {
+            "userId": {"S": "EMAIL#a@x.com"}
+        }
+        client.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_email_lookup_without_index_never_scans(self, repository, client):
+        """Testa que, sem sentinela e sem email-index, a busca falha com 503"""
+        client.query.side_effect = client_error("ValidationException")
+
+        with pytest.raises(ServiceUnavailableException):
+            await repository.get_user_by_email("legacy@x.com")
+        client.scan.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_check_email_index_sets_gauge(self, repository, client):
+        """Testa a verificação de inicialização do email-index"""
+        def described(status):
+            index = {"IndexName": "email-index", "IndexStatus": status}
+            return {"Table": {"GlobalSecondaryIndexes": [index]}}
+
+        client.describe_table.return_value = described("ACTIVE")
+        assert await repository.check_email_index() is True
+        assert repository.metrics.gauge("user_email_index.available") == 1.0
+
+        client.describe_table.return_value = described("CREATING")
+        assert await repository.check_email_index() is False
+        assert repository.metrics.gauge("user_email_index.available") == 0.0
+
+    @pytest.mark.asyncio
+    async def test_list_users_page_uses_typed_keys(self, repository, client):
+        """Testa que cursor e LastEvaluatedKey são convertidos do formato tipado"""
+        client.scan.return_value = {
+            "Items": [to_item({"userId": "user_123", "email": "test@example.com"})],
+            "LastEvaluatedKey": {"userId": {"S": "user_123"}},
+        }
+
+        page = await repository.list_users_page(1)
+        await repository.list_users_page(1, page.next_cursor)
+
+        assert [user.user_id for user in page.users] == ["user_123"]
+        assert decode_cursor(page.next_cursor) == {"userId": "user_123"}
+        assert client.scan.call_args.kwargs["ExclusiveStartKey"] == {
+            "userId": {"S": "user_123"}
+        }
+
+    @pytest.mark.asyncio
+    async def test_export_users_reads_every_segment(self, repository, client):
+        """Testa que todos os segmentos são lidos, com retry de throttling"""
+        pages = {
+            0: [
+                {
+                    "Items": [to_item({"userId": "a"})],
+                    "LastEvaluatedKey": {"userId": {"S": "a"}},
+                },
+                {"Items": [to_item({"userId": "b"})]},
+            ],
+            1: [
+                client_error("ProvisionedThroughputExceededException"),
+                {"Items": [to_item({"userId": "c"})]},
+            ],
+        }
+
+        async def scan(**params):
+            assert params["TotalSegments"] == 2
+            assert params["FilterExpression"] == "attribute_not_exists(#owner)"
+            response = pages[params["Segment"]].pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        client.scan.side_effect = scan
+
+        users = [user async for user in repository.export_users(2)]
+
+        assert sorted(user.user_id for user in users) == ["a", "b", "c"]
+        assert repository.metrics.counter("user_export.throttled") >= 1
+
+    @pytest.mark.asyncio
+    async def test_export_users_surfaces_segment_failure(self, repository, client):
+        """Testa que a falha de um segmento interrompe a exportação"""
+        client.scan.side_effect = client_error("AccessDeniedException")
+
+        with pytest.raises(BaseApplicationException) as error:
+            async for _ in repository.export_users(3):
+                pass
+        assert error.value.error_code == "USER_EXPORT_ERROR"
+
+    @pytest.mark.asyncio
+    async def test_get_users_retries_unprocessed_keys(
+        self, repository, client, monkeypatch
+    ):
+        """Testa chaves tipadas, retry de UnprocessedKeys e ordem de entrada"""
+        monkeypatch.setattr(
+            "infraestructure.repositoryes.user.async_repository.jittered_backoff",
+            lambda attempt: 0,
+        )
+        table = repository.table_name
+        client.batch_get_item.side_effect = [
+            {
+                "Responses": {table: [to_item({"userId": "b"})]},
+                "UnprocessedKeys": {table: {"Keys": [{"userId": {"S": "a"}}]}},
+            },
+            {"Responses": {table: [to_item({"userId": "a"})]}},
+        ]
+
+        users = await repository.get_users(["a", "b", "a"])
+
+        assert [user.user_id for user in users] == ["a", "b"]
+        first_request = client.batch_get_item.call_args_list[0].kwargs["RequestItems"]
+        assert first_request[table]["Keys"] == [
+            {"userId": {"S": "a"}},
+            {"userId": {"S": "b"}},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_create_users_retries_unprocessed_items(
+        self, repository, client, sample_user, monkeypatch
+    ):
+        """Testa o usuário e o sentinela em lote e o reenvio de UnprocessedItems"""
+        monkeypatch.setattr(
+            "infraestructure.repositoryes.user.async_repository.jittered_backoff",
+            lambda attempt: 0,
+        )
+        table = repository.table_name
+        unprocessed = {table: [{"PutRequest": {"Item": {"userId": {"S": "x"}}}}]}
+        client.batch_write_item.side_effect = [{"UnprocessedItems": unprocessed}, {}]
+
+        await repository.create_users([sample_user])
+
+        first, retry = client.batch_write_item.call_args_list
+        keys = [
+            request["PutRequest"]["Item"]["userId"]["S"]
+            for request in first.kwargs["RequestItems"][table]
+        ]
+        assert keys == ["user_123", "EMAIL#test@example.com"]
+        assert retry.kwargs["RequestItems"] == unprocessed
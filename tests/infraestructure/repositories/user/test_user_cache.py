@@ -0,0 +1,207 @@
+"""
+Testes para o cache de usuários e o barramento de invalidação.
+Tests for the user cache and the invalidation bus.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from core.entities.user import User
+from infraestructure.repositoryes.user.user_cache import (
+    USER_CACHE_HITS,
+    AsyncCachedUserRepository,
+    CachedUserRepository,
+    PostgresUserCacheBus,
+    UserCache,
+)
+from infraestructure.telemetry.metrics import MetricsRegistry
+from interface.user.user_interface import AsyncUserInterface, UserInterface
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_user(user_id: str = "user_123", email: str = "test@example.com") -> User:
+    return User(userId=user_id, email=email, firstName="Test")
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def cache(clock, metrics):
+    return UserCache(ttl=60, max_entries=2, clock=clock, metrics=metrics)
+
+
+@pytest.fixture
+def inner():
+    inner = Mock(spec=UserInterface)
+    inner.get_user.side_effect = lambda user_id: make_user(user_id)
+    return inner
+
+
+class TestUserCache:
+    """Testes para o UserCache"""
+
+    def test_serves_by_id_and_email_until_ttl(self, cache, clock):
+        """Testa hits por ID e por email e a expiração pelo TTL"""
+        cache.put(make_user(), cache.generation)
+
+        assert cache.get("user_123").user_id == "user_123"
+        assert cache.get_by_email(" TEST@example.com").user_id == "user_123"
+
+        clock.now += 61
+        assert cache.get("user_123") is None
+
+    def test_evicts_least_recently_used(self, cache):
+        """Testa a remoção LRU ao passar de max_entries"""
+        for user_id in ("a", "b"):
+            cache.put(make_user(user_id, f"{user_id}@example.com"), cache.generation)
+        cache.get("a")
+        cache.put(make_user("c", "c@example.com"), cache.generation)
+
+        assert cache.get("b") is None
+        assert cache.get_by_email("b@example.com") is None
+        assert cache.get("a") is not None
+
+    def test_put_after_invalidation_is_dropped(self, cache):
+        """Testa que uma leitura que cruzou um update não repõe o valor antigo"""
+        generation = cache.generation
+        cache.invalidate("user_123")
+
+        cache.put(make_user(), generation)
+
+        assert cache.get("user_123") is None
+
+    def test_returned_user_is_a_copy(self, cache):
+        """Testa que alterar o usuário devolvido não altera o cache"""
+        cache.put(make_user(), cache.generation)
+
+        cache.get("user_123").first_name = "Changed"
+
+        assert cache.get("user_123").first_name == "Test"
+
+
+class TestCachedUserRepository:
+    """Testes para o CachedUserRepository"""
+
+    def test_repeated_reads_hit_memory(self, inner, cache, metrics):
+        """Testa que leituras repetidas não chegam ao DynamoDB"""
+        repository = CachedUserRepository(inner, cache)
+
+        repository.get_user("user_123")
+        repository.get_user("user_123")
+
+        inner.get_user.assert_called_once_with("user_123")
+        assert metrics.counter(USER_CACHE_HITS) == 1
+
+    def test_update_invalidates_and_broadcasts(self, inner, cache):
+        """Testa que o update invalida localmente e avisa os outros workers"""
+        bus = Mock(spec=PostgresUserCacheBus)
+        repository = CachedUserRepository(inner, cache, bus)
+        repository.get_user("user_123")
+
+        repository.update_user("user_123", {"first_name": "New"})
+        repository.get_user("user_123")
+
+        assert inner.get_user.call_count == 2
+        bus.publish_threadsafe.assert_called_once_with("user_123")
+
+    def test_get_users_only_fetches_misses(self, inner, cache):
+        """Testa que o lote só busca os IDs fora do cache, mantendo a ordem"""
+        inner.get_users.side_effect = lambda ids: [make_user(i, f"{i}@x.com") for i in ids]
+        repository = CachedUserRepository(inner, cache)
+        repository.get_user("b")
+
+        users = repository.get_users(["a", "b", "a"])
+
+        assert [user.user_id for user in users] == ["a", "b"]
+        inner.get_users.assert_called_once_with(["a"])
+
+
+class TestAsyncCachedUserRepository:
+    """Testes para o AsyncCachedUserRepository"""
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates_and_publishes(self, cache):
+        """Testa que o delete invalida e publica a invalidação"""
+        inner = Mock(spec=AsyncUserInterface)
+        inner.get_user = AsyncMock(return_value=make_user())
+        inner.delete_user = AsyncMock(return_value=True)
+        bus = Mock(spec=PostgresUserCacheBus)
+        bus.publish = AsyncMock()
+        repository = AsyncCachedUserRepository(inner, cache, bus)
+
+        await repository.get_user("user_123")
+        await repository.delete_user("user_123")
+
+        assert cache.get("user_123") is None
+        bus.publish.assert_awaited_once_with("user_123")
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.listeners = {}
+        self.on_termination = None
+        self.execute = AsyncMock()
+        self.close = AsyncMock()
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback):
+        self.on_termination = callback
+
+
+class TestPostgresUserCacheBus:
+    """Testes para o PostgresUserCacheBus"""
+
+    @pytest.mark.asyncio
+    async def test_notifications_invalidate_and_loss_disables(self, cache):
+        """Testa NOTIFY recebido, publicação e cache desligado sem conexão"""
+        connections = [FakeConnection(), FakeConnection()]
+        bus = PostgresUserCacheBus(
+            cache,
+            channel="users",
+            reconnect_delay=0.01,
+            connect=AsyncMock(side_effect=connections),
+        )
+
+        await bus.start()
+        assert cache.enabled is False
+        await asyncio.sleep(0.01)
+        assert cache.enabled is True
+
+        cache.put(make_user(), cache.generation)
+        connections[0].listeners["users"](connections[0], 1, "users", "user_123")
+        assert cache.get("user_123") is None
+
+        await bus.publish("user_456")
+        connections[0].execute.assert_awaited_once_with(
+            "SELECT pg_notify($1, $2)", "users", "user_456"
+        )
+
+        cache.put(make_user(), cache.generation)
+        connections[0].on_termination(connections[0])
+        await asyncio.sleep(0)
+        assert cache.enabled is False
+        assert len(cache) == 0
+
+        await asyncio.sleep(0.05)
+        assert bus.connected and cache.enabled
+        await bus.stop()
+        assert cache.enabled is False
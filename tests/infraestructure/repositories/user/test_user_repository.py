@@ -3,18 +3,27 @@ Testes para o repositório de usuários.
 Tests for user repository.
 """
 
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from botocore.exceptions import ClientError
 
 from core.entities.user import User
-from core.exceptions.base_exceptions import BaseApplicationException
+from core.exceptions import ServiceUnavailableException
+from core.exceptions.base_exceptions import (
+    BaseApplicationException,
+    ConflictException,
+    ValidationException,
+)
 from core.exceptions.user.exceptions import (
     UserAlreadyExistsException,
     UserNotFoundException,
 )
-from infraestructure.repositoryes.user.repository import UserRepository
+from infraestructure.repositoryes.user.repository import (
+    UserRepository,
+    decode_cursor,
+    encode_cursor,
+)
 
 
 class TestUserRepository:
@@ -66,62 +75,59 @@ class TestUserRepository:
         }
 
     def test_create_user_success(self, user_repository, sample_user, sample_user_dict):
-        """Testa criação de usuário bem-sucedida"""
+        """Testa criação de usuário com uma única escrita transacional"""
         # Arrange
-        # Mock para get_user_by_email retornar None (usuário não existe)
-        user_repository.table.query.side_effect = ClientError(
-            error_response={"Error": {"Code": "ValidationException"}},
-            operation_name="Query",
-        )
-        user_repository.table.scan.return_value = {
-            "Items": []
-        }  # Usuário não existe no scan por email
-
-        user_repository.table.put_item.return_value = {
-            "ResponseMetadata": {"HTTPStatusCode": 200}
-        }
+        client = user_repository.table.meta.client
+        client.transact_write_items.return_value = {}
 
         # Act
         result = user_repository.create_user(sample_user)
 
         # Assert
         assert result == sample_user
-        user_repository.table.put_item.assert_called_once()
+        items = client.transact_write_items.call_args.kwargs["TransactItems"]
+        assert [item["Put"]["ConditionExpression"] for item in items] == [
+            "attribute_not_exists(userId)",
+            "attribute_not_exists(userId)",
+        ]
+        assert items[1]["Put"]["Item"] == {
+            "userId": "EMAIL#test@example.com",
+            "sentinelFor": "user_123",
+        }
+        user_repository.table.query.assert_not_called()
+        user_repository.table.scan.assert_not_called()
 
     def test_create_user_already_exists_exception(
         self, user_repository, sample_user, sample_user_dict
     ):
-        """Testa exceção quando usuário já existe"""
+        """Testa exceção quando o sentinela do email já existe"""
         # Arrange
-        # Mock para get_user_by_email retornar usuário existente
-        user_repository.table.query.side_effect = ClientError(
-            error_response={"Error": {"Code": "ValidationException"}},
-            operation_name="Query",
+        user_repository.table.meta.client.transact_write_items.side_effect = ClientError(
+            error_response={
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {"Code": "None"},
+                    {"Code": "ConditionalCheckFailed"},
+                ],
+            },
+            operation_name="TransactWriteItems",
         )
-        user_repository.table.scan.return_value = {"Items": [sample_user_dict]}
 
         # Act & Assert
         with pytest.raises(UserAlreadyExistsException) as exc_info:
             user_repository.create_user(sample_user)
 
         assert exc_info.value.details["conflicting_value"] == sample_user.email
+        assert exc_info.value.details["field"] == "email"
 
     def test_create_user_handles_client_error(
         self, user_repository, sample_user, sample_user_dict
     ):
         """Testa tratamento de ClientError do DynamoDB"""
         # Arrange
-        # Mock get_user_by_email para retornar None
-        user_repository.table.query.side_effect = ClientError(
-            error_response={"Error": {"Code": "ValidationException"}},
-            operation_name="Query",
-        )
-        user_repository.table.scan.return_value = {"Items": []}
-
-        # Mock put_item para gerar ClientError genérico (não ConditionalCheckFailedException)
-        user_repository.table.put_item.side_effect = ClientError(
+        user_repository.table.meta.client.transact_write_items.side_effect = ClientError(
             error_response={"Error": {"Code": "ResourceNotFoundException"}},
-            operation_name="PutItem",
+            operation_name="TransactWriteItems",
         )
 
         # Act & Assert - Esperando BaseApplicationException para erro genérico
@@ -150,94 +156,190 @@ class TestUserRepository:
             user_repository.get_user("nonexistent_user")
 
     def test_get_user_by_email_success(self, user_repository, sample_user_dict):
-        """Testa busca por email bem-sucedida"""
-        # Arrange - Fazer query falhar para usar scan
-        user_repository.table.query.side_effect = ClientError(
-            error_response={"Error": {"Code": "ValidationException"}},
-            operation_name="Query",
-        )
-        user_repository.table.scan.return_value = {"Items": [sample_user_dict]}
+        """Testa busca por email pelo sentinela, sem query nem scan"""
+        # Arrange
+        user_repository.table.get_item.side_effect = [
+            {"Item": {"userId": "EMAIL#test@example.com", "sentinelFor": "user_123"}},
+            {"Item": sample_user_dict},
+        ]
 
         # Act
-        result = user_repository.get_user_by_email("test@example.com")
+        result = user_repository.get_user_by_email("Test@example.com")
 
         # Assert
         assert result.email == "test@example.com"
+        user_repository.table.get_item.assert_called_with(
+            Key={"userId": "user_123"}, ConsistentRead=True
+        )
+        user_repository.table.query.assert_not_called()
+        user_repository.table.scan.assert_not_called()
 
     def test_get_user_by_email_not_found(self, user_repository):
         """Testa busca por email quando não encontrado"""
-        # Arrange - Fazer query falhar para usar scan
-        user_repository.table.query.side_effect = ClientError(
-            error_response={"Error": {"Code": "ValidationException"}},
-            operation_name="Query",
-        )
-        user_repository.table.scan.return_value = {"Items": []}
+        # Arrange - sem sentinela, o email-index também não encontra
+        user_repository.table.get_item.return_value = {}
+        user_repository.table.query.return_value = {"Items": []}
 
         # Act
         result = user_repository.get_user_by_email("nonexistent@example.com")
 
         # Assert
         assert result is None
+        user_repository.table.scan.assert_not_called()
 
-    def test_update_user_success(self, user_repository, sample_user, sample_user_dict):
-        """Testa atualização bem-sucedida de usuário"""
+    def test_get_user_by_email_missing_index_never_scans(self, user_repository):
+        """Testa que um email-index ausente vira 503 em vez de scan"""
         # Arrange
-        # Mock get_user para retornar usuário existente
-        user_repository.table.get_item.return_value = {"Item": sample_user_dict}
+        user_repository.table.get_item.return_value = {}
+        user_repository.table.query.side_effect = ClientError(
+            error_response={"Error": {"Code": "ValidationException"}},
+            operation_name="Query",
+        )
 
+        # Act & Assert
+        with pytest.raises(ServiceUnavailableException):
+            user_repository.get_user_by_email("legacy@example.com")
+        user_repository.table.scan.assert_not_called()
+        assert user_repository.metrics.counter("user_email_lookup.index_missing") >= 1
+
+    def test_update_user_success(self, user_repository, sample_user_dict):
+        """Testa atualização parcial com um único update_item condicional"""
+        # Arrange
         user_repository.table.update_item.return_value = {
-            "ResponseMetadata": {"HTTPStatusCode": 200}
+            "Attributes": {**sample_user_dict, "firstName": "Updated"}
         }
 
         # Act
-        result = user_repository.update_user(sample_user)
+        result = user_repository.update_user(
+            "user_123", {"first_name": "Updated", "password": "ignored"}
+        )
 
         # Assert
-        assert result == sample_user
-        user_repository.table.update_item.assert_called_once()
+        assert result.first_name == "Updated"
+        kwargs = user_repository.table.update_item.call_args.kwargs
+        assert kwargs["ReturnValues"] == "ALL_NEW"
+        assert kwargs["ConditionExpression"] == "attribute_exists(#userId)"
+        assert set(kwargs["ExpressionAttributeNames"].values()) == {
+            "firstName",
+            "updatedAt",
+            "userId",
+        }
+        user_repository.table.get_item.assert_not_called()
 
-    def test_update_user_not_found(self, user_repository, sample_user):
+    def test_update_user_not_found(self, user_repository):
         """Testa atualização quando usuário não existe"""
         # Arrange
-        # Mock get_user para retornar usuário não encontrado
-        user_repository.table.get_item.return_value = {}
+        user_repository.table.update_item.side_effect = ClientError(
+            error_response={"Error": {"Code": "ConditionalCheckFailedException"}},
+            operation_name="UpdateItem",
+        )
 
         # Act & Assert
         with pytest.raises(UserNotFoundException):
-            user_repository.update_user(sample_user)
+            user_repository.update_user("user_123", {"first_name": "Updated"})
 
-    def test_delete_user_success(self, user_repository, sample_user_dict):
-        """Testa exclusão bem-sucedida de usuário"""
+    def test_update_user_email_change_moves_sentinel(self, user_repository):
+        """Testa que a troca de email move o sentinela na mesma transação"""
         # Arrange
-        # Mock get_user para retornar usuário existente
-        user_repository.table.get_item.return_value = {"Item": sample_user_dict}
+        user_repository.table.update_item.side_effect = ClientError(
+            error_response={
+                "Error": {"Code": "ConditionalCheckFailedException"},
+                "Item": {
+                    "userId": {"S": "user_123"},
+                    "email": {"S": "old@example.com"},
+                    "firstName": {"S": "Stored"},
+                    "updatedAt": {"S": "2024-01-01T00:00:00"},
+                },
+            },
+            operation_name="UpdateItem",
+        )
+        client = user_repository.table.meta.client
+
+        # Act
+        result = user_repository.update_user("user_123", {"email": "test@example.com"})
 
-        user_repository.table.delete_item.return_value = {
-            "ResponseMetadata": {"HTTPStatusCode": 200}
+        # Assert
+        assert result.email == "test@example.com"
+        assert result.first_name == "Stored"
+        items = client.transact_write_items.call_args.kwargs["TransactItems"]
+        assert [next(iter(item)) for item in items] == ["Update", "Delete", "Put"]
+        assert items[0]["Update"]["ExpressionAttributeValues"][
+            ":previousUpdatedAt"
+        ] == "2024-01-01T00:00:00"
+        assert items[1]["Delete"]["Key"] == {"userId": "EMAIL#old@example.com"}
+        assert items[2]["Put"]["Item"]["userId"] == "EMAIL#test@example.com"
+
+    def test_delete_user_success(self, user_repository):
+        """Testa exclusão do usuário e do sentinela na mesma transação"""
+        # Arrange
+        user_repository.table.get_item.return_value = {
+            "Item": {"email": "test@example.com"}
         }
+        client = user_repository.table.meta.client
 
         # Act
         result = user_repository.delete_user("user_123")
 
         # Assert
         assert result is True
-        user_repository.table.delete_item.assert_called_once()
+        items = client.transact_write_items.call_args.kwargs["TransactItems"]
+        assert [item["Delete"]["Key"] for item in items] == [
+            {"userId": "user_123"},
+            {"userId": "EMAIL#test@example.com"},
+        ]
+        user_repository.table.delete_item.assert_not_called()
+
+    def test_delete_user_not_found(self, user_repository):
+        """Testa exclusão de usuário inexistente"""
+        # Arrange
+        user_repository.table.get_item.return_value = {}
 
-    def test_delete_user_handles_client_error(self, user_repository, sample_user_dict):
-        """Testa tratamento de erro na exclusão"""
+        # Act & Assert
+        with pytest.raises(UserNotFoundException):
+            user_repository.delete_user("user_123")
+        user_repository.table.meta.client.transact_write_items.assert_not_called()
+
+    def test_delete_user_email_changed_conflicts(self, user_repository):
+        """Testa exclusão cancelada porque o email mudou depois da leitura"""
         # Arrange
-        # Mock get_user para retornar usuário existente
-        user_repository.table.get_item.return_value = {"Item": sample_user_dict}
+        user_repository.table.get_item.return_value = {
+            "Item": {"email": "test@example.com"}
+        }
+        user_repository.table.meta.client.transact_write_items.side_effect = (
+            ClientError(
+                error_response={
+                    "Error": {"Code": "TransactionCanceledException"},
+                    "CancellationReasons": [
+                        {
+                            "Code": "ConditionalCheckFailed",
+                            "Item": {"email": {"S": "new@example.com"}},
+                        },
+                        {"Code": "None"},
+                    ],
+                },
+                operation_name="TransactWriteItems",
+            )
+        )
 
-        user_repository.table.delete_item.side_effect = ClientError(
-            error_response={"Error": {"Code": "ResourceNotFoundException"}},
-            operation_name="DeleteItem",
+        # Act & Assert
+        with pytest.raises(ConflictException):
+            user_repository.delete_user("user_123")
+
+    def test_delete_user_handles_client_error(self, user_repository):
+        """Testa tratamento de erro na exclusão"""
+        # Arrange
+        user_repository.table.get_item.return_value = {
+            "Item": {"email": "test@example.com"}
+        }
+        user_repository.table.meta.client.transact_write_items.side_effect = (
+            ClientError(
+                error_response={"Error": {"Code": "ResourceNotFoundException"}},
+                operation_name="TransactWriteItems",
+            )
         )
 
         # Act & Assert
-        with pytest.raises(
-            BaseApplicationException
-        ):  # O método atual não converte para UserNotFoundException
+        with pytest.raises(BaseApplicationException):
             user_repository.delete_user("user_123")
 
     def test_list_users_success(self, user_repository, sample_user_dict):
@@ -262,3 +364,134 @@ class TestUserRepository:
 
         # Assert
         assert result == []
+
+    def test_list_users_page_fills_page_across_filtered_scans(
+        self, user_repository, sample_user_dict
+    ):
+        """Testa que o scan continua quando o filtro de sentinelas esvazia a página"""
+        # Arrange
+        second = dict(sample_user_dict, userId="user_456")
+        user_repository.table.scan.side_effect = [
+            {"Items": [sample_user_dict], "LastEvaluatedKey": {"userId": "EMAIL#a"}},
+            {"Items": [second], "LastEvaluatedKey": {"userId": "user_456"}},
+        ]
+
+        # Act
+        page = user_repository.list_users_page(2)
+
+        # Assert
+        assert [user.user_id for user in page.users] == ["user_123", "user_456"]
+        assert decode_cursor(page.next_cursor) == {"userId": "user_456"}
+        first_call, second_call = user_repository.table.scan.call_args_list
+        assert first_call.kwargs["Limit"] == 2
+        assert "#chats" not in first_call.kwargs["ProjectionExpression"]
+        assert second_call.kwargs["Limit"] == 1
+        assert second_call.kwargs["ExclusiveStartKey"] == {"userId": "EMAIL#a"}
+
+    def test_list_users_page_resumes_from_cursor(self, user_repository):
+        """Testa que o cursor vira ExclusiveStartKey e a última página não tem cursor"""
+        # Arrange
+        user_repository.table.scan.return_value = {"Items": []}
+
+        # Act
+        page = user_repository.list_users_page(10, encode_cursor({"userId": "u1"}))
+
+        # Assert
+        assert page.next_cursor is None
+        assert user_repository.table.scan.call_args.kwargs["ExclusiveStartKey"] == {
+            "userId": "u1"
+        }
+
+    def test_list_users_page_rejects_forged_cursor(self, user_repository):
+        """Testa que um cursor inválido vira ValidationException sem scan"""
+        forged = encode_cursor({"userId": "u1", "email": "x"})
+
+        for cursor in ("not-base64!", forged):
+            with pytest.raises(ValidationException):
+                user_repository.list_users_page(10, cursor)
+        user_repository.table.scan.assert_not_called()
+
+    def test_get_users_dedupes_chunks_and_keeps_order(self, user_repository):
+        """Testa deduplicação, lotes de 100 chaves e ordem de entrada"""
+        # Arrange
+        ids = [f"user_{i}" for i in range(150)]
+        requested = ["user_149", "user_0", "user_149", "", "missing"] + ids
+
+        def batch_get_item(RequestItems):
+            keys = RequestItems["test-test-users"]["Keys"]
+            return {
+                "Responses": {
+                    "test-test-users": [
+                        {"userId": key["userId"], "email": "u@example.com"}
+                        for key in keys
+                        if key["userId"] != "missing"
+                    ]
+                }
+            }
+
+        client = user_repository.table.meta.client
+        client.batch_get_item.side_effect = batch_get_item
+
+        # Act
+        users = user_repository.get_users(requested)
+
+        # Assert
+        assert [user.user_id for user in users[:2]] == ["user_149", "user_0"]
+        assert len(users) == 150
+        chunk_sizes = sorted(
+            len(call.kwargs["RequestItems"]["test-test-users"]["Keys"])
+            for call in client.batch_get_item.call_args_list
+        )
+        assert chunk_sizes == [51, 100]
+
+    @patch("infraestructure.repositoryes.user.repository.time.sleep")
+    def test_get_users_retries_unprocessed_keys(self, sleep, user_repository):
+        """Testa que UnprocessedKeys é repetido com backoff"""
+        # Arrange
+        unprocessed = {"test-test-users": {"Keys": [{"userId": "user_2"}]}}
+        client = user_repository.table.meta.client
+        client.batch_get_item.side_effect = [
+            {
+                "Responses": {"test-test-users": [{"userId": "user_1"}]},
+                "UnprocessedKeys": unprocessed,
+            },
+            {"Responses": {"test-test-users": [{"userId": "user_2"}]}},
+        ]
+
+        # Act
+        users = user_repository.get_users(["user_1", "user_2"])
+
+        # Assert
+        assert [user.user_id for user in users] == ["user_1", "user_2"]
+        assert client.batch_get_item.call_args.kwargs["RequestItems"] == unprocessed
+        sleep.assert_called_once()
+
+    @patch("infraestructure.repositoryes.user.repository.time.sleep")
+    def test_get_users_gives_up_with_service_unavailable(self, sleep, user_repository):
+        """Testa que chaves não processadas após os retries viram 503"""
+        # Arrange
+        unprocessed = {"test-test-users": {"Keys": [{"userId": "user_1"}]}}
+        user_repository.table.meta.client.batch_get_item.return_value = {
+            "Responses": {},
+            "UnprocessedKeys": unprocessed,
+        }
+
+        # Act & Assert
+        with pytest.raises(ServiceUnavailableException):
+            user_repository.get_users(["user_1"])
+
+    def test_create_users_uses_batch_writer(self, user_repository, sample_user):
+        """Testa que o lote grava cada usuário e o sentinela do email"""
+        # Arrange
+        writer = user_repository.table.batch_writer.return_value = MagicMock()
+        batch = writer.__enter__.return_value
+
+        # Act
+        user_repository.create_users([sample_user])
+
+        # Assert
+        user_repository.table.batch_writer.assert_called_once_with(
+            overwrite_by_pkeys=["userId"]
+        )
+        keys = [call.kwargs["Item"]["userId"] for call in batch.put_item.call_args_list]
+        assert keys == ["user_123", "EMAIL#test@example.com"]
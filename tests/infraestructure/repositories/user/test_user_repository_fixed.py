@@ -66,65 +66,62 @@ class TestUserRepository:
         }
 
     def test_create_user_success(self, user_repository, sample_user, sample_user_dict):
-        """Testa criação de usuário bem-sucedida"""
+        """Testa criação de usuário com uma única escrita transacional"""
         # Arrange
-        # Mock para get_user_by_email retornar None (usuário não existe)
-        user_repository.table.query.side_effect = ClientError(
-            error_response={"Error": {"Code": "ValidationException"}},
-            operation_name="Query",
-        )
-        user_repository.table.scan.return_value = {
-            "Items": []
-        }  # Usuário não existe no scan por email
-
-        user_repository.table.put_item.return_value = {
-            "ResponseMetadata": {"HTTPStatusCode": 200}
-        }
+        client = user_repository.table.meta.client
+        client.transact_write_items.return_value = {}
 
         # Act
         result = user_repository.create_user(sample_user)
 
         # Assert
         assert result == sample_user
-        user_repository.table.put_item.assert_called_once()
+        items = client.transact_write_items.call_args.kwargs["TransactItems"]
+        assert [item["Put"]["ConditionExpression"] for item in items] == [
+            "attribute_not_exists(userId)",
+            "attribute_not_exists(userId)",
+        ]
+        assert items[1]["Put"]["Item"] == {
+            "userId": "EMAIL#test@example.com",
+            "sentinelFor": "user_123",
+        }
+        user_repository.table.query.assert_not_called()
+        user_repository.table.scan.assert_not_called()
 
     def test_create_user_already_exists_exception(
         self, user_repository, sample_user, sample_user_dict
     ):
-        """Testa exceção quando usuário já existe"""
+        """Testa exceção quando o sentinela do email já existe"""
         # Arrange
-        # Mock para get_user_by_email retornar usuário existente
-        user_repository.table.query.side_effect = ClientError(
-            error_response={"Error": {"Code": "ValidationException"}},
-            operation_name="Query",
+        user_repository.table.meta.client.transact_write_items.side_effect = ClientError(
+            error_response={
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {"Code": "None"},
+                    {"Code": "ConditionalCheckFailed"},
+                ],
+            },
+            operation_name="TransactWriteItems",
         )
-        user_repository.table.scan.return_value = {"Items": [sample_user_dict]}
 
         # Act & Assert
         with pytest.raises(UserAlreadyExistsException) as exc_info:
             user_repository.create_user(sample_user)
 
         assert exc_info.value.details["conflicting_value"] == sample_user.email
+        assert exc_info.value.details["field"] == "email"
 
     def test_create_user_handles_client_error(
         self, user_repository, sample_user, sample_user_dict
     ):
         """Testa tratamento de ClientError do DynamoDB"""
         # Arrange
-        # Mock get_user_by_email para retornar None
-        user_repository.table.query.side_effect = ClientError(
-            error_response={"Error": {"Code": "ValidationException"}},
-            operation_name="Query",
-        )
-        user_repository.table.scan.return_value = {"Items": []}
-
-        # Mock put_item para gerar ClientError que não é ConditionalCheckFailedException
-        user_repository.table.put_item.side_effect = ClientError(
+        user_repository.table.meta.client.transact_write_items.side_effect = ClientError(
             error_response={"Error": {"Code": "ResourceNotFoundException"}},
-            operation_name="PutItem",
+            operation_name="TransactWriteItems",
         )
 
-        # Act & Assert - Deve gerar BaseApplicationException para erro genérico
+        # Act & Assert - Esperando BaseApplicationException para erro genérico
         with pytest.raises(BaseApplicationException):
             user_repository.create_user(sample_user)
 
@@ -150,91 +147,138 @@ class TestUserRepository:
             user_repository.get_user("nonexistent_user")
 
     def test_get_user_by_email_success(self, user_repository, sample_user_dict):
-        """Testa busca por email bem-sucedida"""
-        # Arrange - Fazer query falhar para usar scan
-        user_repository.table.query.side_effect = ClientError(
-            error_response={"Error": {"Code": "ValidationException"}},
-            operation_name="Query",
-        )
-        user_repository.table.scan.return_value = {"Items": [sample_user_dict]}
+        """Testa busca por email pelo sentinela, sem query nem scan"""
+        # Arrange
+        user_repository.table.get_item.side_effect = [
+            {"Item": {"userId": "EMAIL#test@example.com", "sentinelFor": "user_123"}},
+            {"Item": sample_user_dict},
+        ]
 
         # Act
-        result = user_repository.get_user_by_email("test@example.com")
+        result = user_repository.get_user_by_email("Test@example.com")
 
         # Assert
         assert result.email == "test@example.com"
+        user_repository.table.get_item.assert_called_with(
+            Key={"userId": "user_123"}, ConsistentRead=True
+        )
+        user_repository.table.query.assert_not_called()
+        user_repository.table.scan.assert_not_called()
 
     def test_get_user_by_email_not_found(self, user_repository):
         """Testa busca por email quando não encontrado"""
-        # Arrange - Fazer query falhar para usar scan
-        user_repository.table.query.side_effect = ClientError(
-            error_response={"Error": {"Code": "ValidationException"}},
-            operation_name="Query",
-        )
-        user_repository.table.scan.return_value = {"Items": []}
+        # Arrange - sem sentinela, o email-index também não encontra
+        user_repository.table.get_item.return_value = {}
+        user_repository.table.query.return_value = {"Items": []}
 
         # Act
         result = user_repository.get_user_by_email("nonexistent@example.com")
 
         # Assert
         assert result is None
+        user_repository.table.scan.assert_not_called()
 
-    def test_update_user_success(self, user_repository, sample_user, sample_user_dict):
-        """Testa atualização bem-sucedida de usuário"""
+    def test_update_user_success(self, user_repository, sample_user_dict):
+        """Testa atualização parcial com um único update_item condicional"""
         # Arrange
-        # Mock get_user para retornar usuário existente
-        user_repository.table.get_item.return_value = {"Item": sample_user_dict}
-
         user_repository.table.update_item.return_value = {
-            "ResponseMetadata": {"HTTPStatusCode": 200}
+            "Attributes": {**sample_user_dict, "firstName": "Updated"}
         }
 
         # Act
-        result = user_repository.update_user(sample_user)
+        result = user_repository.update_user(
+            "user_123", {"first_name": "Updated", "password": "ignored"}
+        )
 
         # Assert
-        assert result == sample_user
-        user_repository.table.update_item.assert_called_once()
+        assert result.first_name == "Updated"
+        kwargs = user_repository.table.update_item.call_args.kwargs
+        assert kwargs["ReturnValues"] == "ALL_NEW"
+        assert kwargs["ConditionExpression"] == "attribute_exists(#userId)"
+        assert set(kwargs["ExpressionAttributeNames"].values()) == {
+            "firstName",
+            "updatedAt",
+            "userId",
+        }
+        user_repository.table.get_item.assert_not_called()
 
-    def test_update_user_not_found(self, user_repository, sample_user):
+    def test_update_user_not_found(self, user_repository):
         """Testa atualização quando usuário não existe"""
         # Arrange
-        # Mock get_user para retornar usuário não encontrado
-        user_repository.table.get_item.return_value = {}
+        user_repository.table.update_item.side_effect = ClientError(
+            error_response={"Error": {"Code": "ConditionalCheckFailedException"}},
+            operation_name="UpdateItem",
+        )
 
         # Act & Assert
         with pytest.raises(UserNotFoundException):
-            user_repository.update_user(sample_user)
+            user_repository.update_user("user_123", {"first_name": "Updated"})
 
-    def test_delete_user_success(self, user_repository, sample_user_dict):
-        """Testa exclusão bem-sucedida de usuário"""
+    def test_update_user_email_change_moves_sentinel(self, user_repository):
+        """Testa que a troca de email move o sentinela na mesma transação"""
         # Arrange
-        # Mock get_user para retornar usuário existente
-        user_repository.table.get_item.return_value = {"Item": sample_user_dict}
+        user_repository.table.update_item.side_effect = ClientError(
+            error_response={
+                "Error": {"Code": "ConditionalCheckFailedException"},
+                "Item": {
+                    "userId": {"S": "user_123"},
+                    "email": {"S": "old@example.com"},
+                    "firstName": {"S": "Stored"},
+                    "updatedAt": {"S": "2024-01-01T00:00:00"},
+                },
+            },
+            operation_name="UpdateItem",
+        )
+        client = user_repository.table.meta.client
+
+        # Act
+        result = user_repository.update_user("user_123", {"email": "test@example.com"})
 
-        user_repository.table.delete_item.return_value = {
-            "ResponseMetadata": {"HTTPStatusCode": 200}
+        # Assert
+        assert result.email == "test@example.com"
+        assert result.first_name == "Stored"
+        items = client.transact_write_items.call_args.kwargs["TransactItems"]
+        assert [next(iter(item)) for item in items] == ["Update", "Delete", "Put"]
+        assert items[0]["Update"]["ExpressionAttributeValues"][
+            ":previousUpdatedAt"
+        ] == "2024-01-01T00:00:00"
+        assert items[1]["Delete"]["Key"] == {"userId": "EMAIL#old@example.com"}
+        assert items[2]["Put"]["Item"]["userId"] == "EMAIL#test@example.com"
+
+    def test_delete_user_success(self, user_repository):
+        """Testa exclusão do usuário e do sentinela na mesma transação"""
+        # Arrange
+        user_repository.table.get_item.return_value = {
+            "Item": {"email": "test@example.com"}
         }
+        client = user_repository.table.meta.client
 
         # Act
         result = user_repository.delete_user("user_123")
 
         # Assert
         assert result is True
-        user_repository.table.delete_item.assert_called_once()
-
-    def test_delete_user_handles_client_error(self, user_repository, sample_user_dict):
+        items = client.transact_write_items.call_args.kwargs["TransactItems"]
+        assert [item["Delete"]["Key"] for item in items] == [
+            {"userId": "user_123"},
+            {"userId": "EMAIL#test@example.com"},
+        ]
+        user_repository.table.delete_item.assert_not_called()
+
+    def test_delete_user_handles_client_error(self, user_repository):
         """Testa tratamento de erro na exclusão"""
         # Arrange
-        # Mock get_user para retornar usuário existente
-        user_repository.table.get_item.return_value = {"Item": sample_user_dict}
-
-        user_repository.table.delete_item.side_effect = ClientError(
-            error_response={"Error": {"Code": "ResourceNotFoundException"}},
-            operation_name="DeleteItem",
+        user_repository.table.get_item.return_value = {
+            "Item": {"email": "test@example.com"}
+        }
+        user_repository.table.meta.client.transact_write_items.side_effect = (
+            ClientError(
+                error_response={"Error": {"Code": "ResourceNotFoundException"}},
+                operation_name="TransactWriteItems",
+            )
         )
 
-        # Act & Assert - O método atual lança BaseApplicationException para erro genérico
+        # Act & Assert
         with pytest.raises(BaseApplicationException):
             user_repository.delete_user("user_123")
 
@@ -0,0 +1,84 @@
+"""
+Testes para o container de recursos do processo.
+Tests for the process resource container.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from infraestructure.resources import ResourceContainer
+
+CONTAINER = "infraestructure.resources.container"
+
+
+@pytest.fixture
+def db_config():
+    config = MagicMock()
+    config.get_engine.return_value = MagicMock(name="engine")
+    async_engine = MagicMock(name="async_engine")
+    async_engine.dispose = AsyncMock()
+    config.get_async_engine.return_value = async_engine
+    return config
+
+
+class TestResourceContainer:
+    """Testes para o ResourceContainer"""
+
+    def test_builds_resources_lazily_once(self, db_config):
+        """Testa que nada é criado no construtor e cada engine nasce uma vez"""
+        container = ResourceContainer(db_config=db_config)
+        db_config.get_engine.assert_not_called()
+        db_config.get_async_engine.assert_not_called()
+
+        assert container.engine is container.engine
+        assert container.async_session_factory is container.async_session_factory
+        db_config.get_engine.assert_called_once()
+        db_config.get_async_engine.assert_called_once()
+
+    def test_rebuilds_engines_after_fork(self, db_config):
+        """Testa que um novo processo descarta os engines herdados sem fechá-los"""
+        container = ResourceContainer(db_config=db_config)
+        inherited, inherited_async = container.engine, container.async_engine
+
+        with patch(f"{CONTAINER}.os.getpid", return_value=container._pid + 1):
+            container.engine
+
+        inherited.dispose.assert_called_once_with(close=False)
+        inherited_async.sync_engine.dispose.assert_called_once_with(close=False)
+        assert db_config.get_engine.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_shutdown_disposes_everything(self, db_config):
+        """Testa que o shutdown libera engines, clientes AWS, bulkheads e caches"""
+        container = ResourceContainer(db_config=db_config)
+        engine, async_engine = container.engine, container.async_engine
+
+        with patch(
+            f"{CONTAINER}.AsyncAWSClientFactory.close", new=AsyncMock()
+        ) as close, patch(f"{CONTAINER}.AWSClientFactory.clear") as clear, patch(
+            f"{CONTAINER}.shutdown_bulkheads"
+        ) as shutdown_bulkheads, patch(
+            f"{CONTAINER}.get_knowledge_base"
+        ) as get_knowledge_base:
+            await container.shutdown()
+
+        engine.dispose.assert_called_once_with()
+        async_engine.dispose.assert_awaited_once()
+        close.assert_awaited_once()
+        clear.assert_called_once()
+        shutdown_bulkheads.assert_called_once()
+        get_knowledge_base.cache_clear.assert_called_once_with()
+        assert container._engine is None and container._async_engine is None
+
+    @pytest.mark.asyncio
+    async def test_startup_tolerates_unreachable_services(self, db_config):
+        """Testa que falhas no aquecimento não impedem a aplicação de subir"""
+        container = ResourceContainer(db_config=db_config)
+        db_config.get_async_engine.return_value.connect.side_effect = OSError("down")
+
+        with patch(
+            f"{CONTAINER}.AsyncAWSClientFactory.dynamo",
+            new=AsyncMock(side_effect=OSError("down")),
+        ):
+            await container.startup()
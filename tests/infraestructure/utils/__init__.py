@@ -0,0 +1 @@
+# Init file for infraestructure utils tests
@@ -0,0 +1,58 @@
+"""
+Testes para a leitura de arquivos de importação de usuários.
+Tests for reading user import files.
+"""
+
+import pytest
+
+from infraestructure.utils.user_import_reader import (
+    import_format,
+    iter_lines,
+    read_import_rows,
+)
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(rows):
+    return [row async for row in rows]
+
+
+class TestUserImportReader:
+    """Testes para iter_lines e read_import_rows"""
+
+    @pytest.mark.asyncio
+    async def test_iter_lines_splits_across_chunks(self):
+        """Testa linhas e caracteres multibyte quebrados entre blocos"""
+        data = "a,ção\r\nb\nc".encode()
+
+        lines = await collect(iter_lines(stream(data[:3], data[3:9], data[9:])))
+
+        assert lines == ["a,ção", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_csv_uses_header_and_numbers_data_rows(self):
+        """Testa o cabeçalho do CSV, campos vazios como None e a numeração"""
+        lines = stream("email, first_name", "", "a@x.com,Ana", "b@x.com,")
+
+        rows = await collect(read_import_rows(lines, "csv"))
+
+        assert rows == [
+            (1, {"email": "a@x.com", "first_name": "Ana"}),
+            (2, {"email": "b@x.com", "first_name": None}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_bad_ndjson_lines_become_errors(self):
+        """Testa que linhas inválidas viram exceções sem interromper a leitura"""
+        lines = stream('{"email": "a@x.com"}', "{broken", "[1]", '{"email": "b"}')
+
+        rows = await collect(read_import_rows(lines, import_format("users.ndjson")))
+
+        assert [row for row, _ in rows] == [1, 2, 3, 4]
+        assert isinstance(rows[1][1], ValueError)
+        assert isinstance(rows[2][1], ValueError)
+        assert rows[3][1] == {"email": "b"}
@@ -0,0 +1,4 @@
+"""
+Testes para controllers de chat.
+Tests for chat controllers.
+"""
@@ -0,0 +1,46 @@
+"""
+Testes para o controller de chat.
+Tests for the chat controller.
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
+from core.dtos.chat.chat_dtos import CreateChatResponseDto
+from core.usecases.chat.chat_usecases import CreateChatUseCase
+from infraestructure.bulkhead import DYNAMODB
+from presentation.controllers.chat.chat_controller import ChatController
+
+CONTROLLER = "presentation.controllers.chat.chat_controller"
+
+
+class TestChatController:
+    """Testes para o controller síncrono de chat"""
+
+    @pytest.mark.asyncio
+    async def test_create_chat_runs_in_dynamodb_bulkhead(self):
+        """Testa que o caso de uso (boto3) não roda no event loop"""
+        usecase = Mock(spec=CreateChatUseCase)
+        usecase.execute.return_value = CreateChatResponseDto(
+            chat_id="chat_1", message="Chat created successfully"
+        )
+        user = UserDetailsResponseDto(
+            user_id="user_123",
+            user_sub="user_123",
+            email="test@example.com",
+            is_active=True,
+        )
+        calls = []
+
+        async def run_in_bulkhead(name, func, *args):
+            calls.append(name)
+            return func(*args)
+
+        with patch(f"{CONTROLLER}.run_in_bulkhead", run_in_bulkhead):
+            response = await ChatController(usecase).create_chat(user)
+
+        assert response.chat_id == "chat_1"
+        assert calls == [DYNAMODB]
+        usecase.execute.assert_called_once_with(user)
@@ -4,21 +4,25 @@ Tests for user controller.
 """
 
 from typing import Any, Dict
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
 from core.dtos.user.user_dtos import CreateRequestUserDto
-from core.entities.user import User
+from core.entities.user import User, UserPage
 from core.exceptions.user.exceptions import UserNotFoundException
 from core.usecases.user.usecases import (
     CreateUserUseCase,
     GetUserUseCase,
+    ListUsersPageUseCase,
     UpdateUserUseCase,
 )
+from infraestructure.bulkhead import COGNITO, DYNAMODB
 from presentation.controllers.user.user_controller import UserController
 from presentation.presenters.user.user_presenter import UserPresenterInterface
 
+CONTROLLER = "presentation.controllers.user.user_controller"
+
 
 class TestUserController:
     """Testes para o controller de usuários"""
@@ -35,6 +39,10 @@ class TestUserController:
     def update_user_usecase_mock(self):
         return Mock(spec=UpdateUserUseCase)
 
+    @pytest.fixture
+    def list_users_page_usecase_mock(self):
+        return Mock(spec=ListUsersPageUseCase)
+
     @pytest.fixture
     def presenter_mock(self):
         return Mock(spec=UserPresenterInterface)
@@ -45,6 +53,7 @@ class TestUserController:
         create_user_usecase_mock,
         get_user_usecase_mock,
         update_user_usecase_mock,
+        list_users_page_usecase_mock,
         presenter_mock,
     ):
         return UserController(
@@ -52,6 +61,7 @@ class TestUserController:
             get_user_usecase=get_user_usecase_mock,
             update_user_usecase=update_user_usecase_mock,
             presenter=presenter_mock,
+            list_users_page_usecase=list_users_page_usecase_mock,
         )
 
     @pytest.fixture
@@ -87,7 +97,8 @@ class TestUserController:
     ):
         """Testa criação bem-sucedida de usuário"""
         # Arrange
-        create_user_usecase_mock.execute.return_value = sample_user
+        create_user_usecase_mock.signup.return_value = sample_user
+        create_user_usecase_mock.store.return_value = sample_user
         expected_response = {
             "success": True,
             "message": "User created successfully",
@@ -100,9 +111,31 @@ class TestUserController:
 
         # Assert
         assert result == expected_response
-        create_user_usecase_mock.execute.assert_called_once_with(create_user_dto)
+        create_user_usecase_mock.signup.assert_called_once_with(create_user_dto)
+        create_user_usecase_mock.store.assert_called_once_with(sample_user)
         presenter_mock.present_user_created.assert_called_once_with(sample_user)
 
+    @pytest.mark.asyncio
+    async def test_create_user_isolates_cognito_from_dynamodb(
+        self, user_controller, create_user_usecase_mock, create_user_dto, sample_user
+    ):
+        """Testa que o cadastro no Cognito não ocupa o bulkhead do DynamoDB"""
+        create_user_usecase_mock.signup.return_value = sample_user
+        create_user_usecase_mock.store.return_value = sample_user
+        calls = []
+
+        async def run_in_bulkhead(name, func, *args):
+            calls.append((name, func))
+            return func(*args)
+
+        with patch(f"{CONTROLLER}.run_in_bulkhead", run_in_bulkhead):
+            await user_controller.create_user(create_user_dto)
+
+        assert calls == [
+            (COGNITO, create_user_usecase_mock.signup),
+            (DYNAMODB, create_user_usecase_mock.store),
+        ]
+
     @pytest.mark.asyncio
     async def test_create_user_handles_usecase_exception(
         self, user_controller, create_user_usecase_mock, presenter_mock, create_user_dto
@@ -111,7 +144,8 @@ class TestUserController:
         from core.exceptions.user.exceptions import UserAlreadyExistsException
 
         # Arrange
-        create_user_usecase_mock.execute.side_effect = UserAlreadyExistsException(
+        create_user_usecase_mock.signup.return_value = Mock(spec=User)
+        create_user_usecase_mock.store.side_effect = UserAlreadyExistsException(
             email="test@example.com"
         )
 
@@ -119,7 +153,7 @@ class TestUserController:
         with pytest.raises(UserAlreadyExistsException):
             await user_controller.create_user(create_user_dto)
 
-        create_user_usecase_mock.execute.assert_called_once_with(create_user_dto)
+        create_user_usecase_mock.signup.assert_called_once_with(create_user_dto)
         presenter_mock.present_user_created.assert_not_called()
 
     @pytest.mark.asyncio
@@ -229,7 +263,9 @@ class TestUserController:
     ):
         """Testa atualização quando usuário não é encontrado"""
         # Arrange
-        update_user_usecase_mock.execute.return_value = None
+        update_user_usecase_mock.execute.side_effect = UserNotFoundException(
+            identifier="nonexistent_user", field="id"
+        )
 
         # Act & Assert
         with pytest.raises(UserNotFoundException):
@@ -259,6 +295,24 @@ class TestUserController:
         update_user_usecase_mock.execute.assert_called_once()
         presenter_mock.present_user_updated.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_list_users_streams_page(
+        self, user_controller, list_users_page_usecase_mock, presenter_mock, sample_user
+    ):
+        """Testa que a página do use case é entregue ao presenter de streaming"""
+        # Arrange
+        page = UserPage(users=[sample_user], next_cursor="next")
+        list_users_page_usecase_mock.execute.return_value = page
+        presenter_mock.stream_users_page.return_value = iter(["{}"])
+
+        # Act
+        result = await user_controller.list_users(10, "cursor")
+
+        # Assert
+        assert list(result) == ["{}"]
+        list_users_page_usecase_mock.execute.assert_called_once_with(10, "cursor")
+        presenter_mock.stream_users_page.assert_called_once_with(page)
+
 
 class TestUserControllerIntegration:
     """Testes de integração para o controller de usuários"""
@@ -327,7 +381,8 @@ class TestUserControllerIntegration:
         )
 
         # Configurar mocks
-        create_usecase.execute.return_value = created_user
+        create_usecase.signup.return_value = created_user
+        create_usecase.store.return_value = created_user
         get_usecase.execute.return_value = created_user
         update_usecase.execute.return_value = updated_user
 
@@ -363,7 +418,8 @@ class TestUserControllerIntegration:
         assert update_result["success"] is True
 
         # Verificar todas as chamadas
-        create_usecase.execute.assert_called_once()
+        create_usecase.signup.assert_called_once()
+        create_usecase.store.assert_called_once()
         get_usecase.execute.assert_called_once()
         update_usecase.execute.assert_called_once()
         assert presenter.present_user_created.call_count == 1
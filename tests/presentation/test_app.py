@@ -0,0 +1,43 @@
+"""
+Testes para o ciclo de vida da aplicação.
+Tests for the application lifespan.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from core.exceptions import InfrastructureException
+from presentation.app import lifespan
+
+APP = "presentation.app"
+
+
+class TestLifespan:
+    """Testes para o lifespan da aplicação"""
+
+    @pytest.mark.asyncio
+    async def test_failed_startup_still_releases_resources(self):
+        """Testa que uma falha depois do startup ainda libera os recursos"""
+        resources = MagicMock()
+        resources.startup = AsyncMock()
+        resources.shutdown = AsyncMock()
+        bus = MagicMock(start=AsyncMock(), stop=AsyncMock())
+        failure = InfrastructureException(
+            message_pt="Índice email-index ausente na tabela de usuários",
+            message_en="Missing email-index on the users table",
+            service="dynamodb",
+            operation="describe_table",
+            error_code="EMAIL_INDEX_MISSING",
+        )
+
+        with patch(f"{APP}.get_resources", return_value=resources), patch(
+            f"{APP}.get_user_cache_bus", return_value=bus
+        ), patch(f"{APP}.check_email_lookup", AsyncMock(side_effect=failure)):
+            with pytest.raises(InfrastructureException):
+                async with lifespan(MagicMock()):
+                    pass
+
+        resources.startup.assert_awaited_once()
+        bus.start.assert_not_awaited()
+        resources.shutdown.assert_awaited_once()
@@ -0,0 +1,236 @@
+"""
+Testes para a dependency get_current_user.
+Tests for the get_current_user dependency.
+"""
+
+import json
+import time
+from unittest.mock import Mock, patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from core.dtos.auth.auth_dtos import UserDetailsResponseDto
+from infraestructure.bulkhead import COGNITO, PRINCIPAL, Bulkhead
+from infraestructure.repositoryes.auth.async_repository import AsyncAuthRepository
+from infraestructure.repositoryes.auth.principal_cache import (
+    CachedAuthRepository,
+    PrincipalCache,
+)
+from infraestructure.repositoryes.auth.repository import AuthRepository
+from infraestructure.repositoryes.auth.token_verifier import (
+    CognitoTokenVerifier,
+    JWKSCache,
+    RevocationList,
+    cognito_issuer,
+)
+from infraestructure.telemetry.metrics import MetricsRegistry
+from presentation.dependencies import (
+    get_async_auth_interface,
+    get_current_admin,
+    get_current_user,
+)
+from presentation.exception_handlers import register_exception_handlers
+
+REGION = "us-east-1"
+POOL_ID = "us-east-1_XXXXXXXXX"
+CLIENT_ID = "mock_client_id"
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": "kid-1", "alg": "RS256", "use": "sig"})
+    return private_key, jwk
+
+
+def make_token(signing_key, **overrides) -> str:
+    now = int(time.time())
+    claims = {
+        "sub": "user_sub_123",
+        "iss": cognito_issuer(REGION, POOL_ID),
+        "client_id": CLIENT_ID,
+        "token_use": "access",
+        "iat": now - 10,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(
+        claims, signing_key[0], algorithm="RS256", headers={"kid": "kid-1"}
+    )
+
+
+class TestGetCurrentUser:
+    """Testes para a resolução do usuário autenticado"""
+
+    @pytest.fixture
+    def metrics(self):
+        return MetricsRegistry()
+
+    @pytest.fixture
+    def fetcher(self, signing_key):
+        return Mock(return_value={"keys": [signing_key[1]]})
+
+    @pytest.fixture
+    def verifier(self, fetcher, metrics):
+        verifier = CognitoTokenVerifier(
+            user_pool_id=POOL_ID,
+            client_id=CLIENT_ID,
+            region=REGION,
+            jwks=JWKSCache("https://jwks", fetcher=fetcher, metrics=metrics),
+            revocations=RevocationList(),
+            metrics=metrics,
+        )
+        verifier.verify = Mock(wraps=verifier.verify)
+        return verifier
+
+    @pytest.fixture
+    def cognito(self):
+        cognito = Mock()
+        cognito.get_user.return_value = {
+            "UserAttributes": [
+                {"Name": "sub", "Value": "user_sub_123"},
+                {"Name": "email", "Value": "test@example.com"},
+                {"Name": "name", "Value": "Test User"},
+            ]
+        }
+        return cognito
+
+    @pytest.fixture
+    def bulkheads(self, metrics):
+        bulkheads = (
+            Bulkhead(COGNITO, 1, 1, 5.0, metrics=metrics),
+            Bulkhead(PRINCIPAL, 2, 4, 5.0, metrics=metrics),
+        )
+        yield bulkheads
+        for bulkhead in bulkheads:
+            bulkhead.shutdown()
+
+    @pytest.fixture
+    def client(self, verifier, cognito, bulkheads, metrics):
+        with patch("infraestructure.repositoryes.auth.repository.AWSClientFactory"):
+            repository = AuthRepository(verifier=verifier, cognito=cognito)
+        auth_interface = AsyncAuthRepository(
+            CachedAuthRepository(repository, PrincipalCache(metrics=metrics)),
+            *bulkheads,
+        )
+
+        app = FastAPI()
+        register_exception_handlers(app)
+
+        @app.get("/me")
+        async def me(user: UserDetailsResponseDto = Depends(get_current_user)):
+            return {"user_sub": user.user_sub, "email": user.email}
+
+        @app.get("/admin")
+        async def admin(user: UserDetailsResponseDto = Depends(get_current_admin)):
+            return {"groups": user.groups}
+
+        app.dependency_overrides[get_async_auth_interface] = lambda: auth_interface
+        return TestClient(app)
+
+    def test_local_verification_uses_token_claims(self, client, signing_key, cognito):
+        """Testa a verificação local sem chamada ao Cognito"""
+        token = make_token(signing_key, email="test@example.com")
+
+        response = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "user_sub": "user_sub_123",
+            "email": "test@example.com",
+        }
+        cognito.get_user.assert_not_called()
+
+    def test_cache_hit_skips_verification(self, client, signing_key, verifier):
+        """Testa que a segunda requisição com o mesmo token vem do cache"""
+        headers = {"Authorization": f"Bearer {make_token(signing_key)}"}
+
+        first = client.get("/me", headers=headers)
+        second = client.get("/me", headers=headers)
+
+        assert first.status_code == second.status_code == 200
+        verifier.verify.assert_called_once()
+
+    def test_revoked_token_is_rejected(self, client, signing_key, verifier, cognito):
+        """Testa que um token emitido antes do logout recebe 401"""
+        token = make_token(signing_key, email="test@example.com")
+        verifier.revocations.revoke_user("user_sub_123")
+
+        response = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 401
+        cognito.get_user.assert_not_called()
+
+    def test_falls_back_to_cognito_without_jwks(self, client, fetcher, cognito):
+        """Testa o fallback ao Cognito quando o JWKS está inacessível"""
+        fetcher.side_effect = ConnectionError("unreachable")
+        token = jwt.encode({"sub": "x"}, "secret", headers={"kid": "kid-9"})
+
+        response = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert response.json()["email"] == "test@example.com"
+        cognito.get_user.assert_called_once_with(AccessToken=token)
+
+    def test_missing_token_is_rejected(self, client):
+        """Testa requisição sem header Authorization"""
+        assert client.get("/me").status_code in (401, 403)
+
+    def test_admin_requires_admin_group(self, client, signing_key):
+        """Testa que só membros de um grupo administrador passam"""
+        admin = make_token(signing_key, **{"cognito:groups": ["admin"]})
+        member = make_token(signing_key, jti="member", **{"cognito:groups": ["staff"]})
+
+        allowed = client.get("/admin", headers={"Authorization": f"Bearer {admin}"})
+        denied = client.get("/admin", headers={"Authorization": f"Bearer {member}"})
+
+        assert allowed.status_code == 200
+        assert allowed.json() == {"groups": ["admin"]}
+        assert denied.status_code == 403
+        assert denied.json()["error_code"] == "INSUFFICIENT_PERMISSIONS"
+
+
+class TestUserAdminRoutes:
+    """Testes de autorização das rotas administrativas de usuários"""
+
+    def test_list_users_requires_token(self):
+        """Testa que a listagem sem token é recusada antes do repositório"""
+        from presentation.app import app
+        from presentation.dependencies import get_async_user_controller
+
+        controller = Mock()
+        app.dependency_overrides[get_async_user_controller] = lambda: controller
+        try:
+            response = TestClient(app).get("/api/v1/users/")
+        finally:
+            app.dependency_overrides.pop(get_async_user_controller, None)
+
+        assert response.status_code in (401, 403)
+        controller.list_users.assert_not_called()
+
+    def test_export_rejects_non_admin(self):
+        """Testa que a exportação recusa um usuário sem grupo administrador"""
+        from presentation.app import app
+        from presentation.dependencies import get_async_user_controller
+
+        controller = Mock()
+        app.dependency_overrides[get_async_user_controller] = lambda: controller
+        app.dependency_overrides[get_current_user] = lambda: UserDetailsResponseDto(
+            user_id="user_sub_123",
+            user_sub="user_sub_123",
+            email="test@example.com",
+            is_active=True,
+        )
+        try:
+            response = TestClient(app).get("/api/v1/users/export")
+        finally:
+            app.dependency_overrides.pop(get_async_user_controller, None)
+            app.dependency_overrides.pop(get_current_user, None)
+
+        assert response.status_code == 403
+        controller.export_users.assert_not_called()
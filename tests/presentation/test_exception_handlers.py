@@ -3,7 +3,7 @@ Testes para os exception handlers da aplicação.
 Tests for application exception handlers.
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import HTTPException
@@ -34,6 +34,8 @@ class TestExceptionHandlers:
             get_create_user_usecase,
             get_get_user_usecase,
             get_update_user_usecase,
+            get_async_user_controller,
+            get_async_user_repository,
             get_user_controller,
             get_user_presenter,
             get_user_repository,
@@ -44,6 +46,8 @@ class TestExceptionHandlers:
             get_create_user_usecase,
             get_get_user_usecase,
             get_update_user_usecase,
+            get_async_user_controller,
+            get_async_user_repository,
             get_user_controller,
             get_user_presenter,
             get_user_repository,
@@ -54,7 +58,7 @@ class TestExceptionHandlers:
     def test_validation_exception_handler(self):
         """Testa o handler para ValidationException"""
         with patch(
-            "presentation.controllers.user.user_controller.UserController.create_user"
+            "presentation.controllers.user.user_controller.AsyncUserController.create_user"
         ) as mock_create_user:
             mock_create_user.side_effect = ValidationException(
                 message_pt="Email inválido",
@@ -100,16 +104,15 @@ class TestExceptionHandlers:
 
     def test_conflict_exception_handler(self):
         """Testa o handler para ConflictException"""
-        # Limpar cache do lru_cache antes do teste
-        from presentation.dependencies import get_create_user_usecase
+        from presentation.dependencies import get_async_user_controller
 
-        get_create_user_usecase.cache_clear()
-
-        with patch("presentation.dependencies.get_create_user_usecase") as mock_usecase:
-            mock_usecase.return_value.execute.side_effect = UserAlreadyExistsException(
-                email="test@example.com"
-            )
+        controller = MagicMock()
+        controller.create_user = AsyncMock(
+            side_effect=UserAlreadyExistsException(email="test@example.com")
+        )
+        app.dependency_overrides[get_async_user_controller] = lambda: controller
 
+        try:
             response = client.post(
                 "/api/v1/users",
                 json={
@@ -118,16 +121,18 @@ class TestExceptionHandlers:
                     "first_name": "Test",
                 },
             )
+        finally:
+            app.dependency_overrides.pop(get_async_user_controller, None)
 
-            assert response.status_code == 409
-            data = response.json()
-            assert data["error"] is True
-            assert data["error_code"] == "USER_ALREADY_EXISTS"
+        assert response.status_code == 409
+        data = response.json()
+        assert data["error"] is True
+        assert data["error_code"] == "USER_ALREADY_EXISTS"
 
     def test_unauthorized_exception_handler(self):
         """Testa o handler para UnauthorizedException"""
         with patch(
-            "presentation.controllers.user.user_controller.UserController.get_user"
+            "presentation.controllers.user.user_controller.AsyncUserController.get_user"
         ) as mock_get_user:
             mock_get_user.side_effect = UnauthorizedException(
                 action="read", resource="user"
@@ -143,7 +148,7 @@ class TestExceptionHandlers:
     def test_database_exception_handler(self):
         """Testa o handler para DatabaseException"""
         with patch(
-            "presentation.controllers.user.user_controller.UserController.create_user"
+            "presentation.controllers.user.user_controller.AsyncUserController.create_user"
         ) as mock_create_user:
             mock_create_user.side_effect = DatabaseException(
                 operation="insert", table="users", error_code="DB_CONNECTION_ERROR"
@@ -162,7 +167,7 @@ class TestExceptionHandlers:
     def test_rate_limit_exception_handler(self):
         """Testa o handler para RateLimitException"""
         with patch(
-            "presentation.controllers.user.user_controller.UserController.get_user"
+            "presentation.controllers.user.user_controller.AsyncUserController.get_user"
         ) as mock_get_user:
             mock_get_user.side_effect = RateLimitException(
                 limit=100, period="hour", retry_after=3600